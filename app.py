@@ -4,36 +4,62 @@ Aplicação Principal - HGU Digital Core
 Servidor Flask que gerencia todas as rotas e funcionalidades do sistema
 """
 
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, send_file
+from flask import (
+    Flask, render_template, request, jsonify, session, redirect, url_for, send_file,
+    Response, stream_with_context, make_response
+)
 from flask_wtf.csrf import CSRFProtect
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 import os
 import json
 import logging
-from io import BytesIO
+from io import BytesIO, TextIOWrapper
 from datetime import datetime, timedelta
 from functools import wraps
 
 # Importar módulos do sistema
 from src.config import (
     SERVER, SECURITY, SYSTEM_CONFIG, TIPOS_DOCUMENTOS,
-    STATUS_AUDITORIA, NIVEIS_ACESSO, RATE_LIMITING, DATABASE
+    STATUS_AUDITORIA, NIVEIS_ACESSO, RATE_LIMITING, DATABASE, IMPORTACAO
 )
 from src.core.database import (
     inicializar_db, verificar_setup_inicial, salvar_configuracao,
     obter_configuracao, criar_setores_padrao, criar_usuario_admin,
     registrar_log, listar_setores, cadastrar_paciente, cadastrar_profissional,
-    criar_documento, listar_documentos, buscar_paciente_por_prec, listar_profissionais,
-    init_bcrypt, verificar_senha, get_db_connection
+    emitir_documento, iterar_documentos_pagina, buscar_paciente_por_prec,
+    iterar_setores, iterar_profissionais, obter_versoes_tabelas,
+    init_bcrypt, verificar_senha, get_db_leitura, get_db_escrita,
+    estatisticas_pools, estatisticas_logs, estatisticas_hash_senhas, obter_contadores
 )
+from src.core.hash_senhas import HashSobrecarregadoError
+# Registra o esquema sqlite:// usado em RATE_LIMITING['storage_uri']
+from src.core import limiter_sqlite  # noqa: F401
 from src.services.pdf_generator import gerar_pdf_documento
+from src.services.documentos import iterar_busca_documentos, pesquisar_conteudo_documentos
+from src.services.pacientes import sugerir_pacientes, listar_pacientes
+from src.services.relatorios import relatorio_documentos
+from src.services.exportacao import exportar_documentos, exportar_pacientes, exportar_logs
+from src.services.logs import listar_logs_pagina, obter_log
+from src.services.auditoria import (
+    fila_auditoria, reservar_documentos, liberar_reservas, transicionar_documentos
+)
+from src.services.importacao import (
+    FORMATOS_IMPORTACAO, ler_registros, importar_pacientes, importar_profissionais,
+    registrar_importacao
+)
 from src.schemas import (
     LoginSchema, SetupSchema, PacienteSchema, ProfissionalSchema,
-    DocumentoSchema, validate_request
+    DocumentoSchema, BuscaDocumentosSchema, RelatorioDocumentosSchema,
+    ExportarDocumentosSchema, ExportarLogsSchema, BuscaLogsSchema, FilaAuditoriaSchema,
+    ReservaAuditoriaSchema, LiberarReservasSchema, TransicaoLoteSchema, validate_request
 )
+from marshmallow import ValidationError
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
 from src.core.logger import setup_logging, log_api_call
-from src.utils.helpers import find_free_port, get_local_ip
+from src.core import metricas
+from src.core.compressao import compactar_resposta
+from src.utils.helpers import find_free_port, get_local_ip, gerar_json_stream
 from src.core.security import add_security_headers, validate_content_type, sanitize_filename, log_security_event
 
 # Criar aplicação Flask
@@ -75,16 +101,23 @@ def apply_security_headers(response):
     """Aplica headers de segurança HTTP"""
     return add_security_headers(response)
 
-# Inicializar banco de dados na primeira execução
+# Compactar respostas JSON/HTML em gzip para clientes que aceitam
+@app.after_request
+def apply_compression(response):
+    """Aplica compressão gzip à resposta"""
+    return compactar_resposta(response)
+
+# Inicializar banco de dados (na primeira execução cria tudo; em bancos de
+# versões anteriores migra o esquema; em bancos atualizados só lê user_version)
 if not os.path.exists(DATABASE['name']):
     logger.info("Primeira execução detectada. Inicializando banco de dados...")
     print("🔧 Primeira execução detectada. Inicializando banco de dados...")
-    try:
-        inicializar_db()
-    except Exception as e:
-        logger.critical(f"Erro ao inicializar banco de dados: {e}")
-        print(f"❌ Erro crítico ao inicializar banco de dados: {e}")
-        raise
+try:
+    inicializar_db()
+except Exception as e:
+    logger.critical(f"Erro ao inicializar banco de dados: {e}")
+    print(f"❌ Erro crítico ao inicializar banco de dados: {e}")
+    raise
 
 
 # ============================================================================
@@ -184,6 +217,82 @@ def nivel_acesso_requerido(*niveis_permitidos):
     return decorator
 
 
+# Revisão do formato das listagens com ETag: incrementar ao mudar os campos
+# retornados, para que navegadores não reutilizem respostas no formato antigo
+REVISAO_RESPOSTAS = 1
+
+# Respostas com ETag: só o navegador guarda (sessão) e sempre revalida
+CACHE_CONTROL_VERSIONADO = 'private, no-cache'
+
+
+def cache_por_versao(*tabelas):
+    """
+    Decorador de GET condicional para rotas cuja resposta depende apenas
+    das tabelas informadas
+
+    O ETag é formado pelas versões das tabelas em versoes_tabelas (mantidas
+    por triggers). Se o If-None-Match do navegador corresponder, a resposta
+    é 304 sem executar a rota: nenhuma consulta nem serialização. A versão
+    é lida antes da rota; uma alteração durante a consulta só faz a
+    próxima requisição baixar a lista de novo.
+
+    Args:
+        *tabelas: Tabelas de TABELAS_VERSIONADAS lidas pela rota
+
+    Usage:
+        @cache_por_versao('profissionais', 'setores')
+        def minha_rota():
+            pass
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            versoes = obter_versoes_tabelas(tabelas)
+            etag = f'r{REVISAO_RESPOSTAS}-' + '-'.join(
+                f'{tabela}.{versao}' for tabela, versao in versoes.items()
+            )
+
+            if request.if_none_match.contains_weak(etag):
+                resposta = Response(status=304)
+            else:
+                resposta = make_response(f(*args, **kwargs))
+                if resposta.status_code != 200:
+                    return resposta
+
+            resposta.set_etag(etag, weak=True)
+            resposta.headers['Cache-Control'] = CACHE_CONTROL_VERSIONADO
+            resposta.vary.add('Cookie')
+            return resposta
+        return decorated_function
+    return decorator
+
+
+def resposta_json_stream(campos):
+    """
+    Resposta JSON em streaming (chunked): cada lista é serializada à medida
+    que os registros são lidos do banco, sem montar a lista inteira
+
+    Erros durante a leitura interrompem a resposta já iniciada e são
+    registrados no log (o cliente recebe um JSON incompleto).
+
+    Args:
+        campos: Dicionário da resposta; geradores viram arrays e funções
+                são avaliadas ao final (ver gerar_json_stream)
+    """
+    def pedacos():
+        try:
+            yield from gerar_json_stream(campos)
+        except Exception as e:
+            logger.error(f"Erro na resposta JSON em streaming ({request.path}): {e}")
+            raise
+
+    return Response(
+        stream_with_context(pedacos()),
+        mimetype='application/json',
+        headers={'X-Accel-Buffering': 'no'}
+    )
+
+
 # ============================================================================
 # ROTAS - AUTENTICAÇÃO
 # ============================================================================
@@ -224,7 +333,7 @@ def login():
             senha = dados['senha']
 
             # Buscar usuário
-            with get_db_connection() as conn:
+            with get_db_leitura() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, nome, senha_hash, nivel_acesso, ativo
@@ -253,7 +362,7 @@ def login():
                     logger.info(f"Sessão regenerada para usuário ID: {usuario['id']}")
 
                 # Atualizar último acesso
-                with get_db_connection() as conn:
+                with get_db_escrita() as conn:
                     cursor = conn.cursor()
                     cursor.execute("""
                         UPDATE usuarios
@@ -297,6 +406,16 @@ def login():
                     'mensagem': 'Login ou senha incorretos'
                 }), 401
 
+        except HashSobrecarregadoError as e:
+            # Pico de logins: falhar rápido em vez de acumular threads
+            logger.warning(f"Login recusado por sobrecarga do hash de senhas: {e}")
+            resposta = jsonify({
+                'sucesso': False,
+                'mensagem': 'Servidor ocupado. Tente novamente em instantes.'
+            })
+            resposta.headers['Retry-After'] = str(e.retry_after)
+            return resposta, 503
+
         except Exception as e:
             logger.error(f"Erro no login: {e}")
             return jsonify({
@@ -406,36 +525,8 @@ def dashboard():
     Painel principal do sistema
     """
     try:
-        # Obter estatísticas básicas
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-
-            # Total de documentos
-            cursor.execute("SELECT COUNT(*) as total FROM documentos")
-            total_docs = cursor.fetchone()['total']
-
-            # Total de pacientes
-            cursor.execute("SELECT COUNT(*) as total FROM pacientes WHERE ativo = 1")
-            total_pacientes = cursor.fetchone()['total']
-
-            # Total de profissionais
-            cursor.execute("SELECT COUNT(*) as total FROM profissionais WHERE ativo = 1")
-            total_profissionais = cursor.fetchone()['total']
-
-            # Documentos por status
-            cursor.execute("""
-                SELECT status, COUNT(*) as total
-                FROM documentos
-                GROUP BY status
-            """)
-            docs_por_status = cursor.fetchall()
-
-        estatisticas = {
-            'total_documentos': total_docs,
-            'total_pacientes': total_pacientes,
-            'total_profissionais': total_profissionais,
-            'documentos_por_status': [dict(row) for row in docs_por_status]
-        }
+        # Estatísticas básicas (tabela contadores, mantida por triggers)
+        estatisticas = obter_contadores()
 
         return render_template('dashboard.html',
                              usuario=session['usuario_nome'],
@@ -467,15 +558,26 @@ def documentos():
 @limiter.limit("100 per minute")
 def api_listar_documentos():
     """
-    API para listar documentos
+    API para listar documentos (paginada por cursor)
+    Parâmetros: 'limite' (máx. 1000) e 'cursor' (next_cursor da página anterior)
     """
     try:
         limite = request.args.get('limite', 100, type=int)
-        limite = min(limite, 1000)  # Máximo de 1000 documentos por vez
+        limite = max(1, min(limite, 1000))  # Máximo de 1000 documentos por vez
 
-        docs = listar_documentos(limite)
+        documentos, pagina = iterar_documentos_pagina(limite, request.args.get('cursor'))
+
+        return resposta_json_stream({
+            'sucesso': True,
+            'documentos': documentos,
+            'next_cursor': lambda: pagina['next_cursor']
+        })
 
-        return jsonify({'sucesso': True, 'documentos': docs})
+    except ValueError:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Cursor de paginação inválido'
+        }), 400
 
     except Exception as e:
         logger.error(f"Erro ao listar documentos: {e}")
@@ -485,6 +587,83 @@ def api_listar_documentos():
         }), 500
 
 
+@app.route('/api/documentos/buscar', methods=['GET'])
+@login_requerido
+@limiter.limit("100 per minute")
+def api_buscar_documentos():
+    """
+    API de busca de documentos com filtros combináveis (paginada por cursor)
+    Filtros: tipo_documento, status, setor_origem_id, setor_destino_id,
+    profissional_id, paciente_id, prec_cp, data_inicio e data_fim (AAAA-MM-DD)
+    """
+    try:
+        filtros = BuscaDocumentosSchema().load(request.args.to_dict())
+    except ValidationError as err:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro de validação',
+            'erros': err.messages
+        }), 400
+
+    try:
+        limite = filtros.pop('limite', 100)
+        cursor = filtros.pop('cursor', None)
+
+        documentos, pagina = iterar_busca_documentos(filtros, limite, cursor)
+
+        return resposta_json_stream({
+            'sucesso': True,
+            'documentos': documentos,
+            'next_cursor': lambda: pagina['next_cursor']
+        })
+
+    except ValueError:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Cursor de paginação inválido'
+        }), 400
+
+    except Exception as e:
+        logger.error(f"Erro ao buscar documentos: {e}")
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro ao buscar documentos'
+        }), 500
+
+
+@app.route('/api/documentos/pesquisar', methods=['GET'])
+@login_requerido
+@limiter.limit("60 per minute")
+def api_pesquisar_documentos():
+    """
+    API de pesquisa textual no conteúdo dos documentos, ordenada por relevância
+    Parâmetros: 'q', 'tipo_documento' (opcional), 'limite' (máx. 100) e 'offset'
+    """
+    try:
+        tipo_documento = request.args.get('tipo_documento') or None
+        if tipo_documento and tipo_documento not in TIPOS_DOCUMENTOS:
+            return jsonify({
+                'sucesso': False,
+                'mensagem': 'Tipo de documento inválido'
+            }), 400
+
+        limite = max(1, min(request.args.get('limite', 20, type=int), 100))
+        deslocamento = max(0, request.args.get('offset', 0, type=int))
+
+        documentos = pesquisar_conteudo_documentos(
+            request.args.get('q', ''), tipo_documento, limite, deslocamento
+        )
+
+        return jsonify({'sucesso': True, 'documentos': documentos})
+
+    except Exception as e:
+        logger.error(f"Erro ao pesquisar documentos: {e}")
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro ao pesquisar documentos'
+        }), 500
+
+
 @app.route('/api/documentos/criar', methods=['POST'])
 @login_requerido
 @limiter.limit("20 per minute")
@@ -494,21 +673,19 @@ def api_criar_documento(validated_data):
     API para criar novo documento
     """
     try:
-        codigo = criar_documento(
+        # Emissão e log de auditoria em uma única transação
+        emissao = emitir_documento(
             tipo_documento=validated_data['tipo_documento'],
             paciente_id=validated_data['paciente_id'],
             profissional_id=validated_data['profissional_id'],
             setor_origem_id=validated_data['setor_origem_id'],
             setor_destino_id=validated_data.get('setor_destino_id'),
             conteudo_json=validated_data['conteudo'],
-            usuario_criador_id=session['usuario_id']
-        )
-
-        # Registrar log
-        registrar_log(
-            session['usuario_id'], session['usuario_nome'], obter_ip_cliente(),
-            'Documentos', f'Documento criado: {codigo}'
+            usuario_criador_id=session['usuario_id'],
+            usuario_nome=session['usuario_nome'],
+            ip_local=obter_ip_cliente()
         )
+        codigo = emissao['codigo']
 
         logger.info(f"Documento criado: {codigo} por {session['usuario_nome']}")
 
@@ -579,6 +756,148 @@ def api_cadastrar_paciente(validated_data):
         }), 500
 
 
+def abrir_arquivo_importacao():
+    """
+    Valida o arquivo de importação enviado em 'file' (multipart) e o abre
+    como texto em fluxo (o arquivo nunca é carregado inteiro na memória)
+
+    Returns:
+        tuple: (arquivo, None) com arquivo = {'texto', 'nome', 'formato', 'simular'},
+               ou (None, resposta de erro)
+    """
+    if 'file' not in request.files or request.files['file'].filename == '':
+        return None, (jsonify({
+            'sucesso': False,
+            'mensagem': 'Nenhum arquivo enviado'
+        }), 400)
+
+    file = request.files['file']
+    nome = sanitize_filename(file.filename) or 'importacao'
+    formato = request.form.get('formato') or ('ndjson' if nome.lower().endswith(('.ndjson', '.jsonl')) else 'csv')
+
+    if formato not in FORMATOS_IMPORTACAO:
+        return None, (jsonify({
+            'sucesso': False,
+            'mensagem': f"Formato inválido (use {' ou '.join(FORMATOS_IMPORTACAO)})"
+        }), 400)
+
+    # Validar tamanho
+    file.seek(0, os.SEEK_END)
+    file_size = file.tell()
+    file.seek(0)
+
+    if file_size > IMPORTACAO['tamanho_max_mb'] * 1024 * 1024:
+        return None, (jsonify({
+            'sucesso': False,
+            'mensagem': f"Arquivo muito grande (máximo {IMPORTACAO['tamanho_max_mb']}MB)"
+        }), 400)
+
+    return {
+        'texto': TextIOWrapper(file.stream, encoding='utf-8-sig', newline=''),
+        'nome': nome,
+        'formato': formato,
+        'simular': request.form.get('simular', 'false').lower() in ('1', 'true')
+    }, None
+
+
+@app.route('/api/pacientes/importar', methods=['POST'])
+@login_requerido
+@nivel_acesso_requerido('administrador')
+@limiter.limit("10 per minute")
+def api_importar_pacientes():
+    """
+    API de importação de pacientes em lote (arquivo CSV ou NDJSON em 'file')
+    Formulário: 'formato' ('csv' ou 'ndjson', padrão pela extensão) e
+    'simular=true' para apenas validar
+    """
+    arquivo, erro = abrir_arquivo_importacao()
+    if erro:
+        return erro
+
+    try:
+        relatorio = importar_pacientes(
+            ler_registros(arquivo['texto'], arquivo['formato']), simular=arquivo['simular']
+        )
+
+        if not arquivo['simular']:
+            registrar_importacao(
+                'Pacientes', f"Importação em lote: {relatorio['importados']} paciente(s) cadastrado(s)",
+                relatorio, session['usuario_id'], session['usuario_nome'], obter_ip_cliente(), arquivo['nome']
+            )
+
+        return jsonify({'sucesso': True, 'simulacao': arquivo['simular'], **relatorio})
+
+    except UnicodeDecodeError:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'O arquivo deve estar codificado em UTF-8'
+        }), 400
+
+    except Exception as e:
+        logger.error(f"Erro ao importar pacientes: {e}")
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro ao importar pacientes'
+        }), 500
+
+
+@app.route('/api/pacientes/sugestoes', methods=['GET'])
+@login_requerido
+@limiter.limit("300 per minute")
+def api_sugerir_pacientes():
+    """
+    API de sugestões de pacientes enquanto o usuário digita
+    Parâmetros: 'q' (nome, PREC-CP, posto ou OM, parcial) e 'limite' (máx. 20)
+    """
+    try:
+        limite = max(1, min(request.args.get('limite', 10, type=int), 20))
+        pacientes = sugerir_pacientes(request.args.get('q', ''), limite)
+
+        return jsonify({'sucesso': True, 'pacientes': pacientes})
+
+    except Exception as e:
+        logger.error(f"Erro ao sugerir pacientes: {e}")
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro ao buscar pacientes'
+        }), 500
+
+
+@app.route('/api/pacientes/listar', methods=['GET'])
+@login_requerido
+@limiter.limit("100 per minute")
+def api_listar_pacientes():
+    """
+    API para listar pacientes ativos em ordem alfabética (paginada por cursor)
+    Parâmetros: 'limite' (máx. 200), 'cursor' e 'q' (filtro textual opcional)
+    """
+    try:
+        limite = max(1, min(request.args.get('limite', 50, type=int), 200))
+
+        pagina = listar_pacientes(
+            limite, request.args.get('cursor'), request.args.get('q')
+        )
+
+        return jsonify({
+            'sucesso': True,
+            'pacientes': pagina['pacientes'],
+            'next_cursor': pagina['next_cursor']
+        })
+
+    except ValueError:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Cursor de paginação inválido'
+        }), 400
+
+    except Exception as e:
+        logger.error(f"Erro ao listar pacientes: {e}")
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro ao listar pacientes'
+        }), 500
+
+
 @app.route('/api/pacientes/buscar/<prec_cp>', methods=['GET'])
 @login_requerido
 def api_buscar_paciente(prec_cp):
@@ -663,15 +982,67 @@ def api_cadastrar_profissional(validated_data):
         }), 500
 
 
+@app.route('/api/profissionais/importar', methods=['POST'])
+@login_requerido
+@nivel_acesso_requerido('administrador')
+@limiter.limit("10 per minute")
+def api_importar_profissionais():
+    """
+    API de importação do roster de profissionais (arquivo CSV ou NDJSON em 'file')
+    Atualiza por CRM/COREN, cadastra os novos e desativa os ausentes
+    Formulário: 'formato', 'simular=true' e 'manter_ausentes=true' (não desativar)
+    """
+    arquivo, erro = abrir_arquivo_importacao()
+    if erro:
+        return erro
+
+    desativar_ausentes = request.form.get('manter_ausentes', 'false').lower() not in ('1', 'true')
+
+    try:
+        relatorio = importar_profissionais(
+            ler_registros(arquivo['texto'], arquivo['formato']),
+            desativar_ausentes=desativar_ausentes, simular=arquivo['simular']
+        )
+
+        if not arquivo['simular']:
+            registrar_importacao(
+                'Profissionais',
+                f"Roster importado: {relatorio['inseridos']} novo(s), {relatorio['atualizados']} atualizado(s), "
+                f"{relatorio['desativados']} desativado(s)",
+                relatorio, session['usuario_id'], session['usuario_nome'], obter_ip_cliente(), arquivo['nome']
+            )
+
+        return jsonify({'sucesso': True, 'simulacao': arquivo['simular'], **relatorio})
+
+    except UnicodeDecodeError:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'O arquivo deve estar codificado em UTF-8'
+        }), 400
+
+    except ValueError as e:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': str(e)
+        }), 400
+
+    except Exception as e:
+        logger.error(f"Erro ao importar roster de profissionais: {e}")
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro ao importar roster de profissionais'
+        }), 500
+
+
 @app.route('/api/profissionais/listar', methods=['GET'])
 @login_requerido
+@cache_por_versao('profissionais', 'setores')
 def api_listar_profissionais():
     """
     API para listar profissionais
     """
     try:
-        profs = listar_profissionais()
-        return jsonify({'sucesso': True, 'profissionais': profs})
+        return resposta_json_stream({'sucesso': True, 'profissionais': iterar_profissionais()})
     except Exception as e:
         logger.error(f"Erro ao listar profissionais: {e}")
         return jsonify({
@@ -686,13 +1057,13 @@ def api_listar_profissionais():
 
 @app.route('/api/setores/listar', methods=['GET'])
 @login_requerido
+@cache_por_versao('setores')
 def api_listar_setores():
     """
     API para listar setores
     """
     try:
-        setores = listar_setores()
-        return jsonify({'sucesso': True, 'setores': setores})
+        return resposta_json_stream({'sucesso': True, 'setores': iterar_setores()})
     except Exception as e:
         logger.error(f"Erro ao listar setores: {e}")
         return jsonify({
@@ -714,6 +1085,212 @@ def relatorios():
     return render_template('relatorios.html', usuario=session['usuario_nome'])
 
 
+@app.route('/api/relatorios/documentos', methods=['GET'])
+@login_requerido
+@limiter.limit("60 per minute")
+def api_relatorio_documentos():
+    """
+    API de relatórios de documentos, lida dos resumos diário e mensal
+    Parâmetros: 'agrupar' (ex: 'tipo_documento', 'mes' ou 'mes,status'),
+    'data_inicio' e 'data_fim' (AAAA-MM-DD, opcionais)
+    """
+    try:
+        parametros = RelatorioDocumentosSchema().load(request.args.to_dict())
+    except ValidationError as err:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro de validação',
+            'erros': err.messages
+        }), 400
+
+    try:
+        agrupar = [chave.strip() for chave in parametros['agrupar'].split(',')]
+
+        linhas = relatorio_documentos(
+            agrupar, parametros.get('data_inicio'), parametros.get('data_fim')
+        )
+
+        return jsonify({'sucesso': True, 'agrupar': agrupar, 'linhas': linhas})
+
+    except ValueError as e:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': str(e)
+        }), 400
+
+    except Exception as e:
+        logger.error(f"Erro ao gerar relatório: {e}")
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro ao gerar relatório'
+        }), 500
+
+
+@app.route('/api/logs', methods=['GET'])
+@login_requerido
+@nivel_acesso_requerido('auditor', 'administrador')
+@limiter.limit("100 per minute")
+def api_listar_logs():
+    """
+    Consulta dos logs de auditoria, do mais recente ao mais antigo (paginada por cursor)
+    Filtros: usuario_id, modulo, operacao (trecho), ip_local, data_inicio e data_fim (AAAA-MM-DD)
+    Parâmetros: 'limite' (máx. 200) e 'cursor' (next_cursor da página anterior)
+    """
+    try:
+        filtros = BuscaLogsSchema().load(request.args.to_dict())
+    except ValidationError as err:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro de validação',
+            'erros': err.messages
+        }), 400
+
+    try:
+        limite = filtros.pop('limite', 50)
+        cursor = filtros.pop('cursor', None)
+
+        pagina = listar_logs_pagina(filtros, limite, cursor)
+
+        return jsonify({
+            'sucesso': True,
+            'logs': pagina['logs'],
+            'next_cursor': pagina['next_cursor']
+        })
+
+    except ValueError:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Cursor de paginação inválido'
+        }), 400
+
+    except Exception as e:
+        logger.error(f"Erro ao consultar logs: {e}")
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro ao consultar logs'
+        }), 500
+
+
+@app.route('/api/logs/<int:log_id>', methods=['GET'])
+@login_requerido
+@nivel_acesso_requerido('auditor', 'administrador')
+@limiter.limit("100 per minute")
+def api_obter_log(log_id):
+    """
+    Retorna um log com os detalhes completos (a listagem traz apenas o início)
+    """
+    log = obter_log(log_id)
+    if log is None:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Log não encontrado'
+        }), 404
+
+    return jsonify({
+        'sucesso': True,
+        'log': log
+    })
+
+
+def resposta_csv(pedacos, nome_base, compactar):
+    """
+    Resposta em streaming para exportações CSV (bytes enviados à medida que
+    o gerador produz cada lote)
+
+    Args:
+        pedacos: Gerador de bytes do arquivo
+        nome_base: Nome do arquivo sem extensão
+        compactar: Se o conteúdo é gzip (.csv.gz)
+    """
+    data = datetime.now().strftime('%Y%m%d_%H%M')
+    if compactar:
+        nome, tipo = f'{nome_base}_{data}.csv.gz', 'application/gzip'
+    else:
+        nome, tipo = f'{nome_base}_{data}.csv', 'text/csv; charset=utf-8'
+
+    return Response(
+        stream_with_context(pedacos),
+        mimetype=tipo,
+        headers={
+            'Content-Disposition': f'attachment; filename="{nome}"',
+            'Cache-Control': 'no-store',
+            'X-Accel-Buffering': 'no'  # Proxy reverso não deve acumular a resposta
+        }
+    )
+
+
+@app.route('/api/exportar/documentos', methods=['GET'])
+@login_requerido
+@limiter.limit("10 per minute")
+def api_exportar_documentos():
+    """
+    Exporta documentos em CSV (streaming), com os filtros da busca
+    Parâmetro 'gzip=true' para receber o arquivo compactado
+    """
+    try:
+        filtros = ExportarDocumentosSchema().load(request.args.to_dict())
+    except ValidationError as err:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro de validação',
+            'erros': err.messages
+        }), 400
+
+    compactar = filtros.pop('gzip')
+    registrar_log(
+        session['usuario_id'], session['usuario_nome'], obter_ip_cliente(),
+        'Documentos', 'Exportação CSV', json.dumps(filtros, default=str)
+    )
+
+    return resposta_csv(exportar_documentos(filtros, compactar), 'documentos', compactar)
+
+
+@app.route('/api/exportar/pacientes', methods=['GET'])
+@login_requerido
+@limiter.limit("10 per minute")
+def api_exportar_pacientes():
+    """
+    Exporta os pacientes ativos em CSV (streaming)
+    Parâmetro 'gzip=true' para receber o arquivo compactado
+    """
+    compactar = request.args.get('gzip', 'false').lower() in ('1', 'true')
+    registrar_log(
+        session['usuario_id'], session['usuario_nome'], obter_ip_cliente(),
+        'Pacientes', 'Exportação CSV'
+    )
+
+    return resposta_csv(exportar_pacientes(compactar), 'pacientes', compactar)
+
+
+@app.route('/api/exportar/logs', methods=['GET'])
+@login_requerido
+@nivel_acesso_requerido('auditor', 'administrador')
+@limiter.limit("10 per minute")
+def api_exportar_logs():
+    """
+    Exporta os logs de auditoria em CSV (streaming)
+    Parâmetros: 'data_inicio', 'data_fim' (AAAA-MM-DD) e 'gzip=true'
+    """
+    try:
+        parametros = ExportarLogsSchema().load(request.args.to_dict())
+    except ValidationError as err:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro de validação',
+            'erros': err.messages
+        }), 400
+
+    registrar_log(
+        session['usuario_id'], session['usuario_nome'], obter_ip_cliente(),
+        'Logs', 'Exportação CSV', json.dumps(parametros, default=str)
+    )
+
+    return resposta_csv(
+        exportar_logs(parametros.get('data_inicio'), parametros.get('data_fim'), parametros['gzip']),
+        'logs', parametros['gzip']
+    )
+
+
 # ============================================================================
 # ROTAS - AUDITORIA
 # ============================================================================
@@ -730,6 +1307,153 @@ def auditoria():
                          status_disponiveis=STATUS_AUDITORIA)
 
 
+@app.route('/api/auditoria/fila', methods=['GET'])
+@login_requerido
+@nivel_acesso_requerido('auditor', 'administrador')
+@limiter.limit("100 per minute")
+def api_fila_auditoria():
+    """
+    Fila de auditoria: documentos pendentes do mais antigo ao mais recente
+    Parâmetros: 'tipo_documento', 'limite' (máx. 500) e 'cursor' (next_cursor da página anterior)
+    """
+    try:
+        parametros = FilaAuditoriaSchema().load(request.args.to_dict())
+    except ValidationError as err:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro de validação',
+            'erros': err.messages
+        }), 400
+
+    try:
+        pagina = fila_auditoria(
+            parametros.get('limite', 50), parametros.get('cursor'), parametros.get('tipo_documento')
+        )
+
+        return jsonify({
+            'sucesso': True,
+            'documentos': pagina['documentos'],
+            'next_cursor': pagina['next_cursor']
+        })
+
+    except ValueError:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Cursor de paginação inválido'
+        }), 400
+
+    except Exception as e:
+        logger.error(f"Erro ao listar fila de auditoria: {e}")
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro ao listar fila de auditoria'
+        }), 500
+
+
+@app.route('/api/auditoria/reservar', methods=['POST'])
+@login_requerido
+@nivel_acesso_requerido('auditor', 'administrador')
+@limiter.limit("60 per minute")
+def api_reservar_auditoria():
+    """
+    Reserva para o auditor logado os documentos mais antigos da fila
+    Corpo JSON opcional: {'quantidade': N, 'tipo_documento': ...}
+    Outros auditores não recebem esses documentos até a reserva expirar
+    """
+    try:
+        dados = ReservaAuditoriaSchema().load(request.get_json(silent=True) or {})
+    except ValidationError as err:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro de validação',
+            'erros': err.messages
+        }), 400
+
+    try:
+        reserva = reservar_documentos(
+            session['usuario_id'], dados['quantidade'], dados.get('tipo_documento')
+        )
+
+        return jsonify({
+            'sucesso': True,
+            'documentos': reserva['documentos'],
+            'expira_em': reserva['expira_em']
+        })
+
+    except Exception as e:
+        logger.error(f"Erro ao reservar documentos: {e}")
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro ao reservar documentos'
+        }), 500
+
+
+@app.route('/api/auditoria/liberar', methods=['POST'])
+@login_requerido
+@nivel_acesso_requerido('auditor', 'administrador')
+@limiter.limit("60 per minute")
+def api_liberar_auditoria():
+    """
+    Devolve à fila documentos reservados pelo auditor logado
+    Corpo JSON opcional: {'documento_ids': [...]} (sem ids = todas as reservas)
+    """
+    try:
+        dados = LiberarReservasSchema().load(request.get_json(silent=True) or {})
+    except ValidationError as err:
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro de validação',
+            'erros': err.messages
+        }), 400
+
+    try:
+        liberados = liberar_reservas(session['usuario_id'], dados.get('documento_ids'))
+
+        return jsonify({
+            'sucesso': True,
+            'liberados': liberados
+        })
+
+    except Exception as e:
+        logger.error(f"Erro ao liberar reservas: {e}")
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro ao liberar reservas'
+        }), 500
+
+
+@app.route('/api/auditoria/transicionar', methods=['POST'])
+@login_requerido
+@nivel_acesso_requerido('auditor', 'administrador')
+@limiter.limit("60 per minute")
+@validate_request(TransicaoLoteSchema)
+def api_transicionar_auditoria(validated_data):
+    """
+    Altera o status de vários documentos em uma única transação
+    Corpo JSON: {'itens': [{'documento_id', 'status_novo', 'motivo_glosa', 'comentarios'}]}
+    Itens recusados (reservados por outro auditor, inexistentes...) voltam em 'erros'
+    """
+    try:
+        resultado = transicionar_documentos(
+            session['usuario_id'], validated_data['itens'],
+            usuario_nome=session['usuario_nome'], ip_local=obter_ip_cliente()
+        )
+
+        return jsonify({
+            'sucesso': bool(resultado['processados']),
+            'mensagem': f"{len(resultado['processados'])} documento(s) auditado(s)",
+            'processados': resultado['processados'],
+            'erros': resultado['erros']
+        }), 200 if resultado['processados'] else 409
+
+    except Exception as e:
+        logger.error(f"Erro ao auditar documentos: {e}")
+        return jsonify({
+            'sucesso': False,
+            'mensagem': 'Erro ao auditar documentos'
+        }), 500
+
+
 # ============================================================================
 # ROTAS - PDF FORM BUILDER
 # ============================================================================
@@ -746,11 +1470,11 @@ def pdf_builder_page():
 
 @app.route('/api/pdf-templates', methods=['GET'])
 @login_requerido
+@cache_por_versao('templates_pdf')
 def api_listar_templates():
     """Lista todos os templates PDF"""
     try:
-        templates = pdf_builder.listar_templates()
-        return jsonify({'sucesso': True, 'templates': templates})
+        return resposta_json_stream({'sucesso': True, 'templates': pdf_builder.iterar_templates()})
     except Exception as e:
         logger.error(f"Erro ao listar templates: {e}")
         return jsonify({
@@ -872,22 +1596,38 @@ def api_obter_template(template_id):
 @app.route('/api/pdf-templates/<int:template_id>/pdf', methods=['GET'])
 @login_requerido
 def api_obter_pdf_template(template_id):
-    """Retorna o arquivo PDF de um template"""
+    """
+    Retorna o arquivo PDF de um template, enviado direto do disco
+    (wsgi.file_wrapper/sendfile), com suporte a Range (visualização
+    progressiva) e GET condicional por ETag (SHA-256 do arquivo) e
+    Last-Modified
+    """
     try:
-        pdf_bytes = pdf_builder.obter_pdf_template(template_id)
+        arquivo = pdf_builder.obter_arquivo_template(template_id)
 
-        if not pdf_bytes:
+        if not arquivo:
             return jsonify({
                 'sucesso': False,
                 'mensagem': 'Template ou PDF não encontrado'
             }), 404
 
-        return send_file(
-            BytesIO(pdf_bytes),
+        resposta = send_file(
+            arquivo['caminho'],
             mimetype='application/pdf',
             as_attachment=False,
-            download_name=f'template_{template_id}.pdf'
+            download_name=f'template_{template_id}.pdf',
+            conditional=True,
+            etag=arquivo['hash'],
+            last_modified=arquivo['modificado_em']
         )
+        # Anunciado também na resposta completa: o visualizador (pdf.js) só
+        # passa a pedir faixas do arquivo se o servidor declarar suporte
+        resposta.headers['Accept-Ranges'] = 'bytes'
+        resposta.headers['Cache-Control'] = CACHE_CONTROL_VERSIONADO
+        return resposta
+
+    except RequestedRangeNotSatisfiable as e:
+        return e
 
     except Exception as e:
         logger.error(f"Erro ao obter PDF: {e}")
@@ -1164,10 +1904,11 @@ def health():
     """
     try:
         # Testar conexão com banco
-        with get_db_connection() as conn:
+        with get_db_leitura() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT 1")
 
+        # Público: estatísticas dos pools ficam em /api/metricas (administrador)
         return jsonify({
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
@@ -1182,6 +1923,24 @@ def health():
         }), 503
 
 
+@app.route('/api/metricas', methods=['GET'])
+@login_requerido
+@nivel_acesso_requerido('administrador')
+def api_metricas():
+    """
+    Métricas de desempenho do processo (latência por etapa, pools, fila de logs
+    e executor de hash de senhas)
+    Parâmetro opcional 'prefixo' filtra as métricas pelo nome
+    """
+    return jsonify({
+        'sucesso': True,
+        'metricas': metricas.resumo(request.args.get('prefixo')),
+        'pools': estatisticas_pools(),
+        'logs': estatisticas_logs(),
+        'hash_senhas': estatisticas_hash_senhas()
+    })
+
+
 # ============================================================================
 # TRATAMENTO DE ERROS
 # ============================================================================
@@ -1247,6 +2006,9 @@ if __name__ == '__main__':
     print("=" * 70)
     print()
 
+    print("ℹ️  Servidor de desenvolvimento. Em produção use: python -m hgu serve")
+    print()
+
     if SERVER['debug']:
         print("⚠️  ATENÇÃO: Modo debug está ativado!")
         print("   Desative em produção configurando DEBUG=False no arquivo .env")
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+HGU Digital Core - Linha de Comando
+Executado com `python -m hgu <comando>` a partir da pasta do sistema
+"""
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+HGU Digital Core - Linha de Comando
+
+Uso:
+    python -m hgu serve [--workers 4] [--threads 8] [--port 8080] [--max-requests 2000]
+
+Comandos:
+    serve   Servidor de produção multiprocesso (src/core/servidor.py).
+            SIGHUP recarrega os workers; SIGTERM ou Ctrl+C encerra
+            concluindo as requisições em andamento
+
+O mestre não mantém o .env no ambiente: os workers importam src.config de
+novo a cada recarga e leem o .env atual.
+"""
+
+import argparse
+import os
+import sys
+
+# Adicionar diretório do sistema ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _configuracao_servidor():
+    """
+    Lê SERVER de src.config sem deixar as variáveis do .env no ambiente
+
+    Os workers herdam os.environ, e load_dotenv não sobrescreve variáveis
+    existentes: com o .env carregado no mestre, um .env alterado seria
+    ignorado na recarga (SIGHUP).
+    """
+    ambiente = dict(os.environ)
+    try:
+        from src.config import SERVER
+        return dict(SERVER)
+    finally:
+        os.environ.clear()
+        os.environ.update(ambiente)
+
+
+def serve(args):
+    """Inicia o servidor de produção"""
+    from src.core.servidor import ServidorPrefork
+    from src.utils.helpers import find_free_port, get_local_ip
+
+    print("=" * 70)
+    print("🏛️  HGU DIGITAL CORE - Sistema Offline v2.0 (produção)")
+    print("=" * 70)
+
+    # Detectar porta disponível
+    try:
+        porta = find_free_port(args.port)
+        if porta != args.port:
+            print(f"⚠️  Porta {args.port} em uso. Usando porta {porta}")
+    except Exception as e:
+        print(f"❌ Erro ao detectar porta: {e}")
+        porta = args.port
+
+    servidor = ServidorPrefork(
+        args.host, porta,
+        workers=args.workers,
+        threads=args.threads,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        keepalive=args.keepalive,
+        timeout_graceful=args.graceful_timeout
+    )
+    servidor.abrir_socket()
+
+    print(f"🌐 Servidor iniciando em http://{args.host}:{servidor.porta}")
+    print(f"📡 Acesse de outros computadores usando: http://{get_local_ip()}:{servidor.porta}")
+    print(f"⚙️  Workers: {args.workers} × {args.threads} threads (PID do mestre: {os.getpid()})")
+    if args.max_requests:
+        print(f"♻️  Reciclagem: a cada {args.max_requests}-{args.max_requests + args.max_requests_jitter} requisições")
+    print("🔄 Recarga sem interrupção: kill -HUP <PID do mestre>")
+    print("=" * 70)
+    print()
+
+    return servidor.executar()
+
+
+def main(argv=None):
+    config = _configuracao_servidor()
+
+    parser = argparse.ArgumentParser(prog='python -m hgu', description='HGU Digital Core')
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    parser_serve = comandos.add_parser('serve', help='Servidor de produção multiprocesso')
+    parser_serve.add_argument('--host', default=config['host'])
+    parser_serve.add_argument('--port', type=int, default=config['port'])
+    parser_serve.add_argument('--workers', type=int, default=config['workers'],
+                              help='Processos atendendo requisições')
+    parser_serve.add_argument('--threads', type=int, default=config['threads'],
+                              help='Requisições simultâneas por worker')
+    parser_serve.add_argument('--max-requests', type=int, default=config['max_requests'],
+                              help='Requisições até reciclar um worker (0 = nunca)')
+    parser_serve.add_argument('--max-requests-jitter', type=int, default=config['max_requests_jitter'])
+    parser_serve.add_argument('--keepalive', type=float, default=config['keepalive'])
+    parser_serve.add_argument('--graceful-timeout', type=float, default=config['timeout_graceful'])
+    parser_serve.set_defaults(executar=serve)
+
+    args = parser.parse_args(argv)
+    return args.executar(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Manutenção - Retenção dos Logs de Auditoria
+Move os logs mais antigos que LOGS['retencao_meses'] para arquivos mensais
+compactados (LOGS['arquivamento_dir']/logs_AAAA-MM.db.gz), em lotes curtos
+
+Pode ser executado com o sistema em uso (ex: cron mensal). Para consultar
+os arquivos, use src.core.retencao_logs.consultar_logs_arquivados().
+
+Uso:
+    python scripts/arquivar_logs.py [--retencao-meses N] [--lote N] [--listar]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import LOGS
+from src.core.database import inicializar_db, registrar_log, descarregar_logs
+from src.core.retencao_logs import arquivar_logs, listar_arquivos_logs
+
+
+def listar():
+    """Imprime os arquivos mensais existentes"""
+    arquivos = listar_arquivos_logs()
+    print(f"📁 {LOGS['arquivamento_dir']}: {len(arquivos)} arquivo(s)")
+    for arquivo in arquivos:
+        print(f"   {arquivo['mes']}  {arquivo['tamanho_bytes'] / 1024:,.1f} KB")
+    return True
+
+
+def arquivar(retencao_meses=None, lote=None):
+    """Executa o arquivamento e imprime o resultado"""
+
+    print("=" * 70)
+    print("🗄️  MANUTENÇÃO: Retenção dos Logs de Auditoria")
+    print("=" * 70)
+    print()
+
+    try:
+        inicializar_db()
+
+        print(f"📝 Arquivando logs expirados (retenção: "
+              f"{LOGS['retencao_meses'] if retencao_meses is None else retencao_meses} mes(es))...")
+        resultado = arquivar_logs(retencao_meses, lote)
+
+        if resultado['arquivados']:
+            registrar_log(
+                None, 'Sistema (CLI)', 'local', 'Logs',
+                f"Arquivamento: {resultado['arquivados']} log(s) anteriores a {resultado['limite'][:10]}",
+                ', '.join(resultado['meses'])
+            )
+            descarregar_logs()
+
+        print(f"   ✓ {resultado['arquivados']} linha(s) em {resultado['lotes']} lote(s), "
+              f"mantidos os logs a partir de {resultado['limite'][:10]}")
+        for mes in resultado['meses']:
+            print(f"   ✓ logs_{mes}.db.gz")
+
+        print()
+        print("✅ Arquivamento concluído!")
+        print()
+        return True
+
+    except OSError as e:
+        print(f"\n❌ Erro ao gravar arquivo: {e}")
+        return False
+    except sqlite3.Error as e:
+        print(f"\n❌ Erro de banco de dados: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Erro inesperado: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Arquivamento dos logs de auditoria expirados')
+    parser.add_argument('--retencao-meses', type=int, help='Meses mantidos na tabela logs')
+    parser.add_argument('--lote', type=int, help='Linhas por transação')
+    parser.add_argument('--listar', action='store_true', help='Apenas lista os arquivos existentes')
+    args = parser.parse_args()
+
+    success = listar() if args.listar else arquivar(args.retencao_meses, args.lote)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Backfill - Resumos de Documentos
+Recalcula os resumos diário e mensal (relatórios) a partir de documentos,
+um ano por transação
+"""
+
+import sqlite3
+import sys
+import os
+import time
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.database import inicializar_db, get_db_leitura, backfill_resumos_documentos
+
+
+def backfill():
+    """Cria tabelas e triggers de resumo (se ausentes) e recalcula os resumos"""
+
+    print("=" * 70)
+    print("🔄 BACKFILL: Resumos de Documentos")
+    print("=" * 70)
+    print()
+
+    try:
+        # Cria tabelas e triggers que estiverem faltando (idempotente)
+        print("📝 Verificando tabelas e triggers de resumo...")
+        inicializar_db()
+        print("   ✓ Estrutura pronta")
+
+        print("📝 Recalculando resumos diário e mensal...")
+        inicio = time.perf_counter()
+        anos = backfill_resumos_documentos()
+        print(f"   ✓ {anos} ano(s) processado(s) em {time.perf_counter() - inicio:.1f}s")
+
+        with get_db_leitura() as conn:
+            diario = conn.execute("SELECT COUNT(*) FROM resumo_documentos_diario").fetchone()[0]
+            mensal = conn.execute("SELECT COUNT(*) FROM resumo_documentos_mensal").fetchone()[0]
+        print(f"   ✓ {diario} linha(s) diária(s), {mensal} linha(s) mensal(is)")
+
+        print()
+        print("✅ Backfill concluído com sucesso!")
+        print()
+        return True
+
+    except sqlite3.Error as e:
+        print(f"\n❌ Erro ao recalcular resumos: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Erro inesperado: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    success = backfill()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark - Busca de Pacientes
+Gera um banco temporário com N pacientes sintéticos e mede a latência das
+sugestões (FTS5) e da listagem paginada
+
+Uso:
+    python scripts/benchmark_busca_pacientes.py [--pacientes 500000] [--repeticoes 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import DATABASE
+
+NOMES = ['João', 'José', 'Maria', 'Ana', 'Antônio', 'Francisco', 'Carlos', 'Paulo',
+         'Pedro', 'Lucas', 'Luíz', 'Marcos', 'Gabriel', 'Rafael', 'Márcio', 'Fábio',
+         'Sérgio', 'Letícia', 'Júlia', 'Bárbara', 'Débora', 'Thiago', 'Vinícius', 'André']
+SOBRENOMES = ['Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves',
+              'Pereira', 'Lima', 'Gomes', 'Costa', 'Ribeiro', 'Martins', 'Carvalho',
+              'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Conceição', 'Araújo', 'Gonçalves']
+POSTOS = ['Soldado', 'Cabo', '3º Sargento', '2º Sargento', '1º Sargento', 'Subtenente',
+          '2º Tenente', '1º Tenente', 'Capitão', 'Major']
+OMS = [f'{i}º Batalhão de Infantaria' for i in range(1, 60)] + ['Hospital Geral', 'Base Aérea']
+
+CONSULTAS = ['jo', 'joão', 'joao sil', 'mar san', 'fab', 'silva', 'capitão',
+             'hospital', 'conceicao', '1000', 'sgt', 'ana pereira lima']
+
+
+def popular(total):
+    """Insere pacientes sintéticos em lotes (os triggers alimentam o FTS)"""
+    from src.core.database import get_db_escrita
+
+    random.seed(42)
+    lote = 10000
+    for inicio in range(0, total, lote):
+        linhas = [
+            (
+                f"{random.choice(NOMES)} {random.choice(SOBRENOMES)} {random.choice(SOBRENOMES)}",
+                str(100000000 + i),
+                random.choice(POSTOS),
+                random.choice(OMS)
+            )
+            for i in range(inicio, min(inicio + lote, total))
+        ]
+        with get_db_escrita() as conn:
+            conn.executemany(
+                "INSERT INTO pacientes (nome_completo, prec_cp, posto, om) VALUES (?, ?, ?, ?)",
+                linhas
+            )
+            conn.commit()
+
+
+def medir(funcao, repeticoes):
+    """Executa a função e retorna (p50, p95, max) em milissegundos"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+    return (
+        tempos[len(tempos) // 2],
+        tempos[max(0, int(len(tempos) * 0.95) - 1)],
+        tempos[-1]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da busca de pacientes')
+    parser.add_argument('--pacientes', type=int, default=500000)
+    parser.add_argument('--repeticoes', type=int, default=50)
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(db_fd)
+    DATABASE['name'] = db_path
+
+    try:
+        from src.core.database import inicializar_db, fechar_pool
+        from src.services.pacientes import sugerir_pacientes, listar_pacientes
+
+        inicializar_db()
+
+        print(f"📝 Inserindo {args.pacientes} pacientes...")
+        inicio = time.perf_counter()
+        popular(args.pacientes)
+        print(f"   ✓ {time.perf_counter() - inicio:.1f}s")
+        print()
+
+        print(f"{'consulta':<22}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+        for consulta in CONSULTAS:
+            p50, p95, maximo = medir(lambda: sugerir_pacientes(consulta, 10), args.repeticoes)
+            print(f"{consulta:<22}{p50:>10.2f}{p95:>10.2f}{maximo:>10.2f}")
+
+        pagina = listar_pacientes(50)
+        p50, p95, maximo = medir(
+            lambda: listar_pacientes(50, pagina['next_cursor']), args.repeticoes
+        )
+        print(f"{'listagem (página 2)':<22}{p50:>10.2f}{p95:>10.2f}{maximo:>10.2f}")
+
+        fechar_pool()
+    finally:
+        for sufixo in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + sufixo):
+                os.unlink(db_path + sufixo)
+
+
+if __name__ == '__main__':
+    main()
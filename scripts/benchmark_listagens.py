@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark - Listagens do Banco de Dados
+Gera um banco temporário com documentos (conteúdo clínico de tamanho real) e
+profissionais sintéticos e compara, para listar_documentos(1000) e
+listar_profissionais(), a consulta anterior (SELECT d.*/p.* com
+dict(sqlite3.Row)) com a atual (projeção explícita e linhas em tupla):
+latência e memória alocada por chamada (tracemalloc). Compara também a
+resposta JSON de uma página de 1000 documentos montada inteira (jsonify)
+com a serialização em streaming
+
+Uso:
+    python scripts/benchmark_listagens.py [--documentos 20000] [--profissionais 2000] [--repeticoes 30]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import DATABASE
+
+FUNCOES = ['Médico', 'Enfermeiro', 'Técnico de Enfermagem', 'Fisioterapeuta', 'Farmacêutico']
+POSTOS = ['Soldado', 'Cabo', '3º Sargento', '2º Tenente', '1º Tenente', 'Capitão', 'Major']
+TIPOS = ['Guia de Exame', 'Encaminhamento Médico', 'Guia de Internação', 'Declaração']
+
+# Consultas anteriores à projeção explícita, mantidas como referência
+SQL_DOCUMENTOS_ANTERIOR = """
+    SELECT d.*, p.nome_completo as paciente_nome,
+           prof.nome as profissional_nome,
+           so.nome as setor_origem_nome
+    FROM documentos d
+    LEFT JOIN pacientes p ON d.paciente_id = p.id
+    LEFT JOIN profissionais prof ON d.profissional_id = prof.id
+    LEFT JOIN setores so ON d.setor_origem_id = so.id
+    ORDER BY d.data_emissao DESC, d.id DESC
+    LIMIT ?
+"""
+
+SQL_PROFISSIONAIS_ANTERIOR = """
+    SELECT p.*, s.nome as setor_nome
+    FROM profissionais p
+    LEFT JOIN setores s ON p.setor_id = s.id
+    WHERE p.ativo = 1
+    ORDER BY p.nome
+"""
+
+
+def popular(documentos, profissionais):
+    """Insere pacientes, profissionais e documentos sintéticos em lotes"""
+    from src.core.database import get_db_escrita, listar_setores, criar_setores_padrao
+
+    random.seed(42)
+    criar_setores_padrao()
+    setores = [setor['id'] for setor in listar_setores()]
+
+    with get_db_escrita() as conn:
+        conn.executemany(
+            "INSERT INTO pacientes (nome_completo, prec_cp, posto, om) VALUES (?, ?, ?, 'Hospital Geral')",
+            [(f'Paciente {i}', str(100000000 + i), random.choice(POSTOS)) for i in range(5000)]
+        )
+        conn.executemany(
+            "INSERT INTO profissionais (nome, funcao, crm_coren, posto_graduacao, setor_id) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (f'Profissional {i:05d}', random.choice(FUNCOES), f'CRM-BA {i}',
+                 random.choice(POSTOS), random.choice(setores))
+                for i in range(profissionais)
+            ]
+        )
+        conn.commit()
+
+    # Conteúdo clínico com ~2 KB, como os formulários de guia e encaminhamento
+    conteudo = json.dumps({
+        'exame_solicitado': 'Hemograma completo',
+        'justificativa': 'Acompanhamento clínico. ' * 40,
+        'observacoes': 'Paciente em jejum de 8 horas. ' * 20
+    })
+
+    lote = 5000
+    for inicio in range(0, documentos, lote):
+        linhas = [
+            (
+                f'HGU-BENCH-{i:07d}', random.choice(TIPOS), random.randint(1, 5000),
+                random.randint(1, profissionais), random.choice(setores), random.choice(setores),
+                conteudo, f'{i:064x}', f'2024-{i % 12 + 1:02d}-{i % 28 + 1:02d} 08:00:00'
+            )
+            for i in range(inicio, min(inicio + lote, documentos))
+        ]
+        with get_db_escrita() as conn:
+            conn.executemany("""
+                INSERT INTO documentos (codigo_unico, tipo_documento, paciente_id, profissional_id,
+                    setor_origem_id, setor_destino_id, conteudo_json, hash_documento, data_emissao)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, linhas)
+            conn.commit()
+
+
+def consulta_anterior(sql, *parametros):
+    """Executa a consulta como antes: sqlite3.Row convertido com dict()"""
+    from src.core.database import get_db_leitura
+
+    def executar():
+        with get_db_leitura() as conn:
+            return [dict(linha) for linha in conn.execute(sql, parametros).fetchall()]
+    return executar
+
+
+def resposta_anterior():
+    """Corpo montado inteiro, como jsonify: lista completa + texto + bytes"""
+    from src.core.database import listar_documentos_pagina
+
+    pagina = listar_documentos_pagina(1000)
+    return json.dumps({
+        'sucesso': True,
+        'documentos': pagina['documentos'],
+        'next_cursor': pagina['next_cursor']
+    }).encode('utf-8')
+
+
+def resposta_streaming():
+    """Corpo em pedaços, descartados após o envio (como faz o servidor WSGI)"""
+    from src.core.database import iterar_documentos_pagina
+    from src.utils.helpers import gerar_json_stream
+
+    documentos, pagina = iterar_documentos_pagina(1000)
+    enviados = 0
+    for pedaco in gerar_json_stream({
+        'sucesso': True,
+        'documentos': documentos,
+        'next_cursor': lambda: pagina['next_cursor']
+    }):
+        enviados += len(pedaco.encode('utf-8'))
+    return enviados
+
+
+def medir(funcao, repeticoes):
+    """
+    Executa a função e retorna (p50 ms, p95 ms, KiB alocados no pico)
+
+    A memória é medida em uma execução separada, pois o tracemalloc
+    distorce o tempo.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return tempos[len(tempos) // 2], tempos[max(0, int(len(tempos) * 0.95) - 1)], pico / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark das listagens de documentos e profissionais')
+    parser.add_argument('--documentos', type=int, default=20000)
+    parser.add_argument('--profissionais', type=int, default=2000)
+    parser.add_argument('--repeticoes', type=int, default=30)
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(db_fd)
+    DATABASE['name'] = db_path
+
+    try:
+        from src.core.database import (
+            inicializar_db, fechar_pool, listar_documentos, listar_profissionais
+        )
+
+        inicializar_db()
+
+        print(f"📝 Inserindo {args.documentos} documentos e {args.profissionais} profissionais...")
+        inicio = time.perf_counter()
+        popular(args.documentos, args.profissionais)
+        print(f"   ✓ {time.perf_counter() - inicio:.1f}s")
+        print()
+
+        casos = [
+            ('documentos (anterior)', consulta_anterior(SQL_DOCUMENTOS_ANTERIOR, 1001)),
+            ('documentos (atual)', lambda: listar_documentos(1000)),
+            ('profissionais (anterior)', consulta_anterior(SQL_PROFISSIONAIS_ANTERIOR)),
+            ('profissionais (atual)', listar_profissionais),
+            ('resposta 1000 (jsonify)', resposta_anterior),
+            ('resposta 1000 (streaming)', resposta_streaming)
+        ]
+
+        print(f"{'listagem':<28}{'p50 ms':>10}{'p95 ms':>10}{'pico KiB':>12}")
+        for nome, funcao in casos:
+            funcao()  # Aquecimento (cache de páginas e de statements)
+            p50, p95, pico = medir(funcao, args.repeticoes)
+            print(f"{nome:<28}{p50:>10.2f}{p95:>10.2f}{pico:>12,.0f}")
+
+        fechar_pool()
+    finally:
+        for sufixo in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + sufixo):
+                os.unlink(db_path + sufixo)
+
+
+if __name__ == '__main__':
+    main()
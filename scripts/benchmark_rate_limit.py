@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark - Armazenamento do Rate Limiting
+Compara 'memory://' com o SQLite compartilhado (src/core/limiter_sqlite.py)
+na estratégia de janela fixa do Flask-Limiter: verificações por segundo em
+um processo e em vários processos simultâneos sobre o mesmo arquivo. No
+teste com processos, confere também que nenhum incremento se perdeu (com
+'memory://' cada processo conta apenas as próprias tentativas)
+
+Uso:
+    python scripts/benchmark_rate_limit.py [--verificacoes 50000] [--processos 4] [--chaves 500]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limits import parse, strategies
+from limits.storage import storage_from_string
+
+# Registra o esquema sqlite://
+from src.core import limiter_sqlite  # noqa: F401
+
+LIMITE = parse('1000000 per hour')
+
+
+def ip(indice):
+    """Endereço IP sintético da chave"""
+    return f'10.0.{indice // 256}.{indice % 256}'
+
+
+def verificar(uri, verificacoes, chaves):
+    """
+    Executa `verificacoes` hits distribuídos entre `chaves` IPs
+
+    Returns:
+        float: Segundos gastos
+    """
+    limitador = strategies.FixedWindowRateLimiter(storage_from_string(uri))
+    inicio = time.perf_counter()
+    for i in range(verificacoes):
+        limitador.hit(LIMITE, ip(i % chaves))
+    return time.perf_counter() - inicio
+
+
+def _processo(argumentos):
+    """Worker do teste com vários processos"""
+    return verificar(*argumentos)
+
+
+def contados(uri, chaves):
+    """Soma dos contadores de todas as chaves vistos por este processo"""
+    armazenamento = storage_from_string(uri)
+    return sum(armazenamento.get(LIMITE.key_for(ip(i))) for i in range(chaves))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do armazenamento do rate limiting')
+    parser.add_argument('--verificacoes', type=int, default=50000)
+    parser.add_argument('--processos', type=int, default=4)
+    parser.add_argument('--chaves', type=int, default=500)
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(db_fd)
+    uris = {'memory://': 'memory://', 'sqlite://': f'sqlite://{db_path}'}
+
+    try:
+        print(f"{'armazenamento':<16}{'processos':>10}{'verif./s':>14}{'contadas':>12}{'esperadas':>12}")
+
+        for nome, uri in uris.items():
+            storage_from_string(uri).reset()
+            segundos = verificar(uri, args.verificacoes, args.chaves)
+            print(f"{nome:<16}{1:>10}{args.verificacoes / segundos:>14,.0f}")
+
+        for nome, uri in uris.items():
+            storage_from_string(uri).reset()
+            por_processo = args.verificacoes // args.processos
+            inicio = time.perf_counter()
+            with multiprocessing.Pool(args.processos) as pool:
+                pool.map(_processo, [(uri, por_processo, args.chaves)] * args.processos)
+            segundos = time.perf_counter() - inicio
+
+            total = por_processo * args.processos
+            # memory:// não é visível fora do processo que contou
+            vistos = f"{contados(uri, args.chaves):,}" if nome == 'sqlite://' else '-'
+            print(f"{nome:<16}{args.processos:>10}{total / segundos:>14,.0f}{vistos:>12}{total:>12,}")
+    finally:
+        for sufixo in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + sufixo):
+                os.unlink(db_path + sufixo)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Importação - Pacientes em Lote
+Cadastra pacientes a partir de um arquivo CSV ou NDJSON (um objeto por linha)
+
+Colunas/chaves: nome_completo, prec_cp, posto, om, data_nascimento (AAAA-MM-DD)
+e observacoes. Linhas inválidas ou com PREC-CP já cadastrado são relatadas
+e não interrompem a importação.
+
+Uso:
+    python scripts/importar_pacientes.py arquivo.csv [--formato csv|ndjson] [--simular]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.database import inicializar_db, descarregar_logs
+from src.services.importacao import (
+    FORMATOS_IMPORTACAO, ler_registros, importar_pacientes, registrar_importacao
+)
+
+
+def importar(caminho, formato=None, simular=False, lote=None):
+    """Importa o arquivo e imprime o relatório"""
+
+    print("=" * 70)
+    print(f"📥 IMPORTAÇÃO: Pacientes{' (simulação)' if simular else ''}")
+    print("=" * 70)
+    print()
+
+    formato = formato or ('ndjson' if caminho.lower().endswith(('.ndjson', '.jsonl')) else 'csv')
+
+    try:
+        inicializar_db()
+
+        print(f"📝 Lendo {caminho} ({formato})...")
+        with open(caminho, encoding='utf-8-sig', newline='') as arquivo:
+            relatorio = importar_pacientes(ler_registros(arquivo, formato), simular=simular, lote=lote)
+
+        if not simular:
+            registrar_importacao(
+                'Pacientes', f"Importação em lote: {relatorio['importados']} paciente(s) cadastrado(s)",
+                relatorio, None, 'Sistema (CLI)', 'local', os.path.basename(caminho)
+            )
+            descarregar_logs()
+
+        for erro in relatorio['erros']:
+            mensagens = '; '.join(
+                f"{campo}: {', '.join(textos) if isinstance(textos, list) else textos}"
+                for campo, textos in erro['erros'].items()
+            )
+            print(f"   ⚠️  Linha {erro['linha']} ({erro['prec_cp'] or '-'}): {mensagens}")
+
+        if relatorio['com_erro'] > len(relatorio['erros']):
+            print(f"   ... e mais {relatorio['com_erro'] - len(relatorio['erros'])} erro(s)")
+
+        print(f"   ✓ {relatorio['total']} linha(s) lida(s), "
+              f"{relatorio['importados']} {'válida(s)' if simular else 'importada(s)'}, "
+              f"{relatorio['com_erro']} com erro")
+
+        print()
+        print("✅ Importação concluída!")
+        print()
+        return True
+
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"\n❌ Erro ao ler arquivo: {e}")
+        return False
+    except sqlite3.Error as e:
+        print(f"\n❌ Erro ao gravar pacientes: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Erro inesperado: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Importação de pacientes em lote')
+    parser.add_argument('arquivo')
+    parser.add_argument('--formato', choices=FORMATOS_IMPORTACAO)
+    parser.add_argument('--simular', action='store_true', help='Apenas valida, sem gravar')
+    parser.add_argument('--lote', type=int, help='Linhas por transação')
+    args = parser.parse_args()
+
+    success = importar(args.arquivo, args.formato, args.simular, args.lote)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Importação - Roster de Profissionais
+Sincroniza o cadastro de profissionais com um roster completo (CSV ou NDJSON):
+atualiza por CRM/COREN, cadastra os novos e desativa os ausentes
+
+Colunas/chaves: nome, funcao, crm_coren, posto_graduacao e setor (nome ou
+sigla) ou setor_id.
+
+Uso:
+    python scripts/importar_profissionais.py roster.csv [--formato csv|ndjson]
+        [--simular] [--manter-ausentes]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.database import inicializar_db, descarregar_logs
+from src.services.importacao import (
+    FORMATOS_IMPORTACAO, ler_registros, importar_profissionais, registrar_importacao
+)
+
+
+def importar(caminho, formato=None, simular=False, manter_ausentes=False):
+    """Importa o roster e imprime o relatório"""
+
+    print("=" * 70)
+    print(f"📥 IMPORTAÇÃO: Roster de Profissionais{' (simulação)' if simular else ''}")
+    print("=" * 70)
+    print()
+
+    formato = formato or ('ndjson' if caminho.lower().endswith(('.ndjson', '.jsonl')) else 'csv')
+
+    try:
+        inicializar_db()
+
+        print(f"📝 Lendo {caminho} ({formato})...")
+        with open(caminho, encoding='utf-8-sig', newline='') as arquivo:
+            relatorio = importar_profissionais(
+                ler_registros(arquivo, formato),
+                desativar_ausentes=not manter_ausentes, simular=simular
+            )
+
+        if not simular:
+            registrar_importacao(
+                'Profissionais',
+                f"Roster importado: {relatorio['inseridos']} novo(s), {relatorio['atualizados']} atualizado(s), "
+                f"{relatorio['desativados']} desativado(s)",
+                relatorio, None, 'Sistema (CLI)', 'local', os.path.basename(caminho)
+            )
+            descarregar_logs()
+
+        for erro in relatorio['erros']:
+            mensagens = '; '.join(
+                f"{campo}: {', '.join(textos) if isinstance(textos, list) else textos}"
+                for campo, textos in erro['erros'].items()
+            )
+            print(f"   ⚠️  Linha {erro['linha']} ({erro['crm_coren'] or '-'}): {mensagens}")
+
+        print(f"   ✓ {relatorio['total']} linha(s) lida(s): {relatorio['inseridos']} novo(s), "
+              f"{relatorio['atualizados']} atualizado(s), {relatorio['desativados']} desativado(s), "
+              f"{relatorio['com_erro']} com erro")
+
+        print()
+        print("✅ Importação concluída!")
+        print()
+        return True
+
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"\n❌ Erro ao ler arquivo: {e}")
+        return False
+    except ValueError as e:
+        print(f"\n❌ Roster inválido: {e}")
+        return False
+    except sqlite3.Error as e:
+        print(f"\n❌ Erro ao gravar profissionais: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Erro inesperado: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Importação do roster de profissionais')
+    parser.add_argument('arquivo')
+    parser.add_argument('--formato', choices=FORMATOS_IMPORTACAO)
+    parser.add_argument('--simular', action='store_true', help='Apenas calcula o resultado, sem gravar')
+    parser.add_argument('--manter-ausentes', action='store_true',
+                        help='Não desativa profissionais ausentes do roster')
+    args = parser.parse_args()
+
+    success = importar(args.arquivo, args.formato, args.simular, args.manter_ausentes)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Migration Script - Sequências de Documentos
+Cria a tabela document_sequences e a popula a partir dos códigos já emitidos
+"""
+
+import sqlite3
+import sys
+import os
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.database import get_db_escrita, backfill_sequencias_documentos
+from src.models import SQL_CREATE_DOCUMENT_SEQUENCES
+
+
+def migrate():
+    """Executa a migration das sequências de numeração de documentos"""
+
+    print("=" * 70)
+    print("🔄 MIGRATION: Sequências de Documentos")
+    print("=" * 70)
+    print()
+
+    try:
+        # Criar tabela (se não existir)
+        print("📝 Criando tabela 'document_sequences'...")
+        with get_db_escrita() as conn:
+            conn.execute(SQL_CREATE_DOCUMENT_SEQUENCES)
+            conn.commit()
+        print("   ✓ Tabela pronta")
+
+        # Popular com o maior número já emitido por prefixo/tipo/ano
+        print("📝 Populando sequências a partir dos documentos existentes...")
+        total = backfill_sequencias_documentos()
+        print(f"   ✓ {total} sequência(s) atualizada(s)")
+
+        print()
+        print("✅ Migration concluída com sucesso!")
+        print()
+        return True
+
+    except sqlite3.Error as e:
+        print(f"\n❌ Erro ao executar migration: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Erro inesperado: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Reparo - Contadores do Dashboard
+Recalcula a tabela contadores a partir de documentos, pacientes e profissionais
+e informa as divergências encontradas
+"""
+
+import sqlite3
+import sys
+import os
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.database import inicializar_db, get_db_leitura, recalcular_contadores
+
+
+def reparar():
+    """Recria os triggers (se ausentes) e recalcula os contadores"""
+
+    print("=" * 70)
+    print("🔄 REPARO: Contadores do Dashboard")
+    print("=" * 70)
+    print()
+
+    try:
+        # Cria tabela e triggers que estiverem faltando (idempotente)
+        print("📝 Verificando tabela e triggers de 'contadores'...")
+        inicializar_db()
+        print("   ✓ Estrutura pronta")
+
+        with get_db_leitura() as conn:
+            anteriores = dict(conn.execute("SELECT chave, valor FROM contadores").fetchall())
+
+        print("📝 Recalculando contadores...")
+        atuais = recalcular_contadores()
+
+        divergencias = 0
+        for chave in sorted(set(anteriores) | set(atuais)):
+            antes, depois = anteriores.get(chave, 0), atuais.get(chave, 0)
+            if antes != depois:
+                divergencias += 1
+                print(f"   ⚠️  {chave}: {antes} → {depois}")
+
+        print(f"   ✓ {len(atuais)} contador(es), {divergencias} divergência(s) corrigida(s)")
+
+        print()
+        print("✅ Reparo concluído com sucesso!")
+        print()
+        return True
+
+    except sqlite3.Error as e:
+        print(f"\n❌ Erro ao recalcular contadores: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Erro inesperado: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    success = reparar()
+    sys.exit(0 if success else 1)
@@ -17,14 +17,39 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATABASE = {
     'name': os.path.join(BASE_DIR, os.getenv('DATABASE_NAME', 'hgu_core.db')),
     'timeout': 30.0,  # Timeout para operações do banco
-    'check_same_thread': False  # Permite uso de threads
+    'check_same_thread': False,  # Permite uso de threads
+    # Pool de conexões
+    'pool_tamanho': int(os.getenv('DB_POOL_SIZE', 10)),  # Máximo de conexões abertas
+    'pool_espera': float(os.getenv('DB_POOL_WAIT', 10.0)),  # Segundos aguardando conexão livre
+    # Modo escritor único: mutações em uma conexão dedicada, consultas em conexões mode=ro
+    'escritor_unico': os.getenv('DB_SINGLE_WRITER', 'False').lower() == 'true',
+    'leitores_max': int(os.getenv('DB_MAX_READERS', 16)),  # Conexões somente leitura
+    # Statements preparados mantidos por conexão (filtros combináveis geram muitas variações)
+    'cached_statements': int(os.getenv('DB_CACHED_STATEMENTS', 512)),
+    # Snapshot das configurações: intervalo entre verificações de versão (segundos)
+    'config_cache_segundos': float(os.getenv('CONFIG_CACHE_SECONDS', 5.0)),
+    # PRAGMAs aplicados a cada conexão do pool
+    'journal_mode': 'WAL',  # Leitores não bloqueiam escritores
+    'synchronous': 'NORMAL',  # Seguro com WAL, evita fsync a cada commit
+    'cache_size_kb': int(os.getenv('DB_CACHE_SIZE_KB', 16384)),  # Cache de páginas por conexão (16 MB)
+    'mmap_size': int(os.getenv('DB_MMAP_SIZE', 64 * 1024 * 1024)),  # Leitura via memory-map (64 MB)
+    'temp_store': 'MEMORY',  # Tabelas temporárias e ordenações em memória
+    'foreign_keys': 'ON'  # Garante integridade referencial
 }
 
 # Configurações do Servidor Flask
 SERVER = {
     'host': os.getenv('HOST', '0.0.0.0'),
     'port': int(os.getenv('PORT', 8080)),
-    'debug': os.getenv('DEBUG', 'False').lower() == 'true'
+    'debug': os.getenv('DEBUG', 'False').lower() == 'true',
+    # Servidor de produção (python -m hgu serve): processos pré-forkados com
+    # um pool limitado de threads cada
+    'workers': int(os.getenv('SERVER_WORKERS', os.cpu_count() or 2)),
+    'threads': int(os.getenv('SERVER_THREADS', 8)),  # Requisições simultâneas por worker
+    'max_requests': int(os.getenv('SERVER_MAX_REQUESTS', 2000)),  # Worker reciclado após N requisições (0 = nunca)
+    'max_requests_jitter': int(os.getenv('SERVER_MAX_REQUESTS_JITTER', 200)),  # Evita reciclar todos juntos
+    'keepalive': float(os.getenv('SERVER_KEEPALIVE', 5)),  # Segundos de conexão ociosa antes de fechar
+    'timeout_graceful': float(os.getenv('SERVER_GRACEFUL_TIMEOUT', 30))  # Segundos para concluir requisições ao parar
 }
 
 # Diretórios do Sistema
@@ -50,6 +75,14 @@ SECURITY = {
     'bcrypt_log_rounds': 12,  # Custo do hash (quanto maior, mais seguro e lento)
 }
 
+# Executor de hash de senhas: limita os bcrypt simultâneos em picos de login
+HASH_SENHAS = {
+    'executor': os.getenv('PASSWORD_HASH_EXECUTOR', 'True').lower() == 'true',
+    'workers': int(os.getenv('PASSWORD_HASH_WORKERS', max(1, (os.cpu_count() or 2) // 2))),
+    'fila_max': int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', 32)),  # Verificações aguardando um worker
+    'espera_max': float(os.getenv('PASSWORD_HASH_MAX_WAIT', 3.0))  # Segundos; acima disso, 503
+}
+
 # Configurações do Sistema (valores padrão)
 SYSTEM_CONFIG = {
     'nome_hospital': '',
@@ -93,6 +126,13 @@ STATUS_AUDITORIA = [
     'Revisado'
 ]
 
+# Fila de auditoria (status pendentes definidos em src/models.py)
+AUDITORIA = {
+    'reserva_minutos': int(os.getenv('AUDIT_LEASE_MINUTES', 15)),  # Validade da reserva de documentos
+    'reserva_max': 100,  # Documentos por reserva
+    'lote_max': 500  # Documentos por transição em lote
+}
+
 # Níveis de Acesso (RBAC)
 NIVEIS_ACESSO = {
     'administrador': 'Administrador',
@@ -106,7 +146,11 @@ RATE_LIMITING = {
     'login_attempts': int(os.getenv('RATE_LIMIT_LOGIN', 5)),  # Tentativas de login
     'login_window': int(os.getenv('RATE_LIMIT_WINDOW', 300)),  # Janela em segundos (5 min)
     'default_limits': ['200 per day', '50 per hour'],  # Limites gerais da API
-    'storage_uri': 'memory://',  # Usar memória para rate limiting
+    # Contadores em SQLite compartilhados entre os processos do servidor
+    # (src/core/limiter_sqlite.py); 'memory://' mantém um contador por processo
+    'storage_uri': os.getenv(
+        'RATE_LIMIT_STORAGE_URI', 'sqlite://' + os.path.join(BASE_DIR, 'hgu_ratelimit.db')
+    ),
 }
 
 # Configurações de Backup
@@ -118,12 +162,50 @@ BACKUP = {
 
 # Configurações de Logs
 LOGS = {
-    'retencao_meses': 12,  # Meses para manter logs
+    'retencao_meses': int(os.getenv('AUDIT_LOG_RETENTION_MONTHS', 12)),  # Meses para manter logs
     'arquivo': os.path.join(DIRECTORIES['logs'], 'sistema.log'),
     'nivel': 'INFO',  # DEBUG, INFO, WARNING, ERROR, CRITICAL
     'formato': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     'max_bytes': 10 * 1024 * 1024,  # 10 MB
-    'backup_count': 5  # Manter 5 arquivos de log rotacionados
+    'backup_count': 5,  # Manter 5 arquivos de log rotacionados
+    # Auditoria (tabela logs): gravação em lote por thread de fundo
+    'escrita_assincrona': os.getenv('AUDIT_LOG_ASYNC', 'True').lower() == 'true',
+    'fila_max': int(os.getenv('AUDIT_LOG_QUEUE_SIZE', 10000)),  # Entradas aguardando gravação
+    'lote_max': int(os.getenv('AUDIT_LOG_BATCH_SIZE', 200)),  # Linhas por commit
+    'intervalo_gravacao': float(os.getenv('AUDIT_LOG_FLUSH_INTERVAL', 0.5)),  # Segundos máximos na fila
+    'espera_fila': 0.05,  # Segundos aguardando espaço antes de gravar de forma síncrona
+    # Retenção (tabela logs): linhas expiradas vão para arquivos mensais compactados
+    'arquivamento_dir': os.getenv(
+        'AUDIT_LOG_ARCHIVE_DIR', os.path.join(DIRECTORIES['backups'], 'logs')
+    ),
+    'arquivamento_lote': int(os.getenv('AUDIT_LOG_ARCHIVE_BATCH', 2000)),  # Linhas por transação
+    'arquivamento_pausa': 0.05  # Segundos entre lotes, liberando o escritor
+}
+
+# Exportação CSV (respostas em streaming)
+EXPORTACAO = {
+    'lote': int(os.getenv('EXPORT_BATCH_SIZE', 1000)),  # Linhas por fetchmany
+    'nivel_gzip': 6,  # Compressão quando solicitado .csv.gz (1 = rápido, 9 = menor)
+    'separador': ';'  # Padrão do Excel em português (vírgula é decimal)
+}
+
+# Compressão gzip das respostas HTTP (after_request, ver src/core/compressao.py)
+COMPRESSAO = {
+    'habilitada': os.getenv('HTTP_GZIP', 'True').lower() == 'true',
+    'tamanho_minimo': int(os.getenv('HTTP_GZIP_MIN_BYTES', 1024)),  # Respostas menores seguem sem compressão
+    'nivel': int(os.getenv('HTTP_GZIP_LEVEL', 6)),  # 1 = rápido, 9 = menor
+    # Tipos compactados; PDFs, imagens e arquivos .gz já são comprimidos
+    'tipos': (
+        'application/json', 'text/html', 'text/plain', 'text/csv', 'text/css',
+        'application/javascript', 'text/javascript', 'image/svg+xml'
+    )
+}
+
+# Importação em lote (CSV/NDJSON)
+IMPORTACAO = {
+    'lote': int(os.getenv('IMPORT_BATCH_SIZE', 1000)),  # Linhas validadas e gravadas por transação
+    'max_erros_relatorio': 1000,  # Erros detalhados no relatório (todos são contados)
+    'tamanho_max_mb': 50  # Arquivo máximo aceito pela API
 }
 
 # Cores do Sistema (identidade visual)
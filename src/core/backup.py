@@ -5,13 +5,15 @@ Realiza backups do banco de dados e arquivos importantes
 """
 
 import os
-import shutil
 import hashlib
 import sqlite3
 import logging
 from datetime import datetime, timedelta
 from src.config import DATABASE, DIRECTORIES, BACKUP
-from src.core.database import get_db_connection
+from src.core.database import (
+    get_db_connection, get_db_escrita, obter_versoes_tabelas, avancar_versoes_tabelas
+)
+from src.models import TABELAS_VERSIONADAS
 
 logger = logging.getLogger(__name__)
 
@@ -47,8 +49,9 @@ def realizar_backup(usuario_id=None, tipo='manual'):
         dict: Informações sobre o backup realizado
     """
     try:
-        # Gerar nome do arquivo de backup
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Gerar nome do arquivo de backup (com microssegundos: o backup
+        # pré-restauração no mesmo segundo não pode sobrescrever o restaurado)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         nome_backup = f"backup_{timestamp}.db"
         caminho_backup = os.path.join(DIRECTORIES['backups'], nome_backup)
 
@@ -58,13 +61,13 @@ def realizar_backup(usuario_id=None, tipo='manual'):
         logger.info(f"Iniciando backup: {nome_backup}")
 
         # Fazer cópia do banco de dados usando SQLite backup API
-        origem = sqlite3.connect(DATABASE['name'])
+        # (origem emprestada do pool, inclui páginas ainda no WAL)
         destino = sqlite3.connect(caminho_backup)
 
-        with destino:
-            origem.backup(destino)
+        with get_db_connection() as origem:
+            with destino:
+                origem.backup(destino)
 
-        origem.close()
         destino.close()
 
         # Calcular hash do backup
@@ -242,11 +245,23 @@ def restaurar_backup(backup_id, usuario_id=None):
         info_backup_seguranca = realizar_backup(usuario_id, tipo='pre-restauracao')
         logger.info(f"Backup de segurança criado: {info_backup_seguranca['nome_arquivo']}")
 
-        # Fechar todas as conexões antes de substituir o banco
-        # (Nota: em produção, seria necessário parar o servidor)
-
-        # Substituir banco de dados atual
-        shutil.copy2(backup['caminho_completo'], DATABASE['name'])
+        # Versões atuais das tabelas: o banco restaurado é levado para
+        # versões posteriores, invalidando caches e ETags já emitidos
+        versoes = obter_versoes_tabelas(TABELAS_VERSIONADAS)
+
+        # Copiar as páginas do backup para o banco em uso (API de backup do
+        # SQLite), sem substituir o arquivo: a cópia é feita sob o lock de
+        # escrita e passa pelo WAL, então conexões abertas (deste e dos demais
+        # workers, e o gravador de logs) passam a ler o banco restaurado, sem
+        # -wal/-shm antigos reaplicados sobre ele
+        origem = sqlite3.connect(backup['caminho_completo'])
+        try:
+            with get_db_escrita() as destino:
+                origem.backup(destino)
+        finally:
+            origem.close()
+
+        avancar_versoes_tabelas(versoes)
 
         logger.info(f"Backup {backup['nome_arquivo']} restaurado com sucesso")
 
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Compressão das Respostas HTTP
+Compacta em gzip as respostas JSON/HTML (inclusive as em streaming) e os
+arquivos estáticos CSS/JS quando o cliente aceita, registrando por endpoint
+a razão de compressão e o tempo de CPU gasto (métricas 'compressao.<endpoint>.*')
+"""
+
+import gzip
+import logging
+import time
+import zlib
+
+from flask import request
+
+from src.config import COMPRESSAO
+from src.core import metricas
+
+logger = logging.getLogger(__name__)
+
+
+def _compressivel(response):
+    """
+    Indica se a resposta é candidata à compressão
+
+    Ficam de fora: HEAD, respostas sem corpo ou parciais (204, 206, 304),
+    conteúdo já codificado, arquivos enviados direto do disco (send_file),
+    exceto os estáticos (CSS/JS), e tipos fora de COMPRESSAO['tipos']
+    (PDFs, imagens, .gz).
+    """
+    return (
+        request.method != 'HEAD'
+        and 200 <= response.status_code < 300
+        and response.status_code not in (204, 206)
+        and (not response.direct_passthrough or request.endpoint == 'static')
+        and 'Content-Encoding' not in response.headers
+        and response.mimetype in COMPRESSAO['tipos']
+    )
+
+
+def _registrar(endpoint, original, compactado, cpu):
+    """Registra razão (original ÷ compactado) e CPU (ms) da compressão"""
+    metricas.registrar(f'compressao.{endpoint}.razao', original / max(compactado, 1))
+    metricas.registrar(f'compressao.{endpoint}.cpu_ms', cpu * 1000)
+
+
+def _compactar_fluxo(pedacos, endpoint, nivel):
+    """
+    Compacta uma resposta em streaming pedaço a pedaço
+
+    Fechar o gerador (cliente desconectado) fecha também o iterável
+    original, liberando a conexão do banco que ele estiver usando.
+
+    Yields:
+        bytes: Pedaços do corpo em gzip
+    """
+    compressor = zlib.compressobj(nivel, zlib.DEFLATED, zlib.MAX_WBITS | 16)  # Cabeçalho gzip
+    original = compactado = 0
+    cpu = 0.0
+
+    try:
+        for pedaco in pedacos:
+            if isinstance(pedaco, str):
+                pedaco = pedaco.encode('utf-8')
+            inicio = time.thread_time()
+            dados = compressor.compress(pedaco)
+            cpu += time.thread_time() - inicio
+            original += len(pedaco)
+            if dados:
+                compactado += len(dados)
+                yield dados
+
+        inicio = time.thread_time()
+        dados = compressor.flush()
+        cpu += time.thread_time() - inicio
+        compactado += len(dados)
+        yield dados
+
+        _registrar(endpoint, original, compactado, cpu)
+    finally:
+        if hasattr(pedacos, 'close'):
+            pedacos.close()
+
+
+def compactar_resposta(response):
+    """
+    Compacta a resposta em gzip quando o cliente aceita
+
+    Respostas completas abaixo de COMPRESSAO['tamanho_minimo'] seguem sem
+    compressão, assim como as que não diminuiriam. Respostas em streaming
+    são compactadas à medida que os pedaços são produzidos (sem
+    Content-Length).
+
+    Args:
+        response: Objeto de resposta Flask
+
+    Returns:
+        response, compactada ou não
+    """
+    if not COMPRESSAO['habilitada'] or not _compressivel(response):
+        return response
+
+    # Caches intermediários devem separar as versões com e sem gzip
+    response.vary.add('Accept-Encoding')
+    if not request.accept_encodings['gzip']:
+        return response
+
+    endpoint = request.endpoint or 'desconhecido'
+    nivel = COMPRESSAO['nivel']
+
+    if response.direct_passthrough:
+        # Arquivo estático: lido para a memória e compactado como resposta completa
+        response.direct_passthrough = False
+        response.make_sequence()
+
+    if response.is_streamed:
+        response.response = _compactar_fluxo(response.response, endpoint, nivel)
+        response.headers.pop('Content-Length', None)
+    else:
+        dados = response.get_data()
+        if len(dados) < COMPRESSAO['tamanho_minimo']:
+            return response
+
+        inicio = time.thread_time()
+        compactado = gzip.compress(dados, nivel, mtime=0)
+        cpu = time.thread_time() - inicio
+
+        if len(compactado) >= len(dados):
+            return response
+
+        response.set_data(compactado)
+        _registrar(endpoint, len(dados), len(compactado), cpu)
+
+        # A mesma ETag identifica as versões com e sem gzip: só vale como fraca
+        etag, fraca = response.get_etag()
+        if etag and not fraca:
+            response.set_etag(etag, weak=True)
+
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
@@ -4,15 +4,27 @@ Funções do Banco de Dados
 Contém todas as funções para interagir com o SQLite
 """
 
+import os
 import sqlite3
 import json
 import logging
 import hashlib
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timezone
 from contextlib import contextmanager
 from flask_bcrypt import Bcrypt
-from src.config import DATABASE, SETORES_PADRAO, SECURITY
-from src.models import ALL_TABLES
+from src.config import DATABASE, SETORES_PADRAO, SECURITY, LOGS, HASH_SENHAS
+from src.models import (
+    ALL_TABLES, INDICES_FTS, SQL_RECALCULAR_CONTADORES, PERIODOS_RESUMO,
+    SQL_CREATE_VERSOES_TABELAS, COLUNAS_ADICIONADAS, VERSAO_ESQUEMA,
+    gerar_sql_recalcular_resumo
+)
+from src.core.pool import ConnectionPool
+from src.core import metricas
+from src.core import log_writer
+from src.core import hash_senhas
+from src.utils.helpers import codificar_cursor, decodificar_cursor
 
 # Configurar logging
 logger = logging.getLogger(__name__)
@@ -20,6 +32,49 @@ logger = logging.getLogger(__name__)
 # Instância do Bcrypt (será inicializada pela aplicação Flask)
 bcrypt = None
 
+# Siglas dos tipos de documento usadas no código único
+SIGLAS_DOCUMENTOS = {
+    'Guia de Exame': 'EXAM',
+    'Encaminhamento Médico': 'ENCAM',
+    'Guia de Internação': 'INTER',
+    'Declaração': 'DECL',
+    'Atestado Administrativo': 'ATEST'
+}
+
+# Projeções das listagens: apenas as colunas exibidas ou usadas como filtro.
+# O conteúdo clínico (conteudo_json) fica fora das listagens de documentos
+COLUNAS_RESUMO_DOCUMENTO = """
+    d.id, d.codigo_unico, d.tipo_documento, d.status, d.data_emissao,
+    d.paciente_id, d.profissional_id, d.setor_origem_id, d.setor_destino_id,
+    d.caminho_pdf
+"""
+
+SQL_LISTAGEM_SETORES = """
+    SELECT id, nome, sigla, descricao
+    FROM setores
+    WHERE ativo = 1
+    ORDER BY nome
+"""
+
+SQL_LISTAGEM_PROFISSIONAIS = """
+    SELECT p.id, p.nome, p.funcao, p.crm_coren, p.posto_graduacao, p.setor_id,
+           s.nome as setor_nome
+    FROM profissionais p
+    LEFT JOIN setores s ON p.setor_id = s.id
+    WHERE p.ativo = 1
+    ORDER BY p.nome
+"""
+
+# Snapshot das configurações do sistema (ver _configuracoes)
+_config_cache = {'database': None, 'versao': None, 'valores': {}, 'verificado_em': 0.0}
+_config_lock = threading.Lock()
+
+# Pools de conexões do processo (criados sob demanda)
+# 'geral': leitura e escrita; 'leitura'/'escrita': modo escritor único
+_pools = {}
+_pools_pid = os.getpid()
+_pool_lock = threading.Lock()
+
 
 def init_bcrypt(app):
     """
@@ -33,11 +88,172 @@ def init_bcrypt(app):
     return bcrypt
 
 
+def _pragmas_conexao():
+    """
+    Monta a lista de PRAGMAs aplicados a cada conexão a partir de DATABASE
+
+    Returns:
+        list: Tuplas (pragma, valor)
+    """
+    return [
+        ('journal_mode', DATABASE.get('journal_mode', 'WAL')),
+        ('synchronous', DATABASE.get('synchronous', 'NORMAL')),
+        # Valor negativo indica tamanho em KiB em vez de número de páginas
+        ('cache_size', -int(DATABASE.get('cache_size_kb', 16384))),
+        ('mmap_size', int(DATABASE.get('mmap_size', 0))),
+        ('temp_store', DATABASE.get('temp_store', 'MEMORY')),
+        ('foreign_keys', DATABASE.get('foreign_keys', 'ON')),
+    ]
+
+
+def _escritor_unico():
+    """Indica se o modo escritor único / múltiplos leitores está ativo"""
+    return bool(DATABASE.get('escritor_unico', False))
+
+
+def obter_pool(tipo='geral'):
+    """
+    Retorna um pool de conexões do processo, criando-o se necessário
+
+    Se DATABASE['name'] mudar (ex.: testes), os pools antigos são fechados e
+    novos são criados para o arquivo atual.
+
+    Args:
+        tipo: 'geral' (leitura e escrita), 'leitura' (conexões mode=ro) ou
+              'escrita' (conexão única dedicada às mutações)
+
+    Returns:
+        ConnectionPool: Pool de conexões configurado
+    """
+    global _pools_pid
+
+    with _pool_lock:
+        if _pools_pid != os.getpid():
+            # Processo filho (fork): as conexões herdadas pertencem ao pai e
+            # não podem ser usadas nem fechadas aqui
+            _pools.clear()
+            _pools_pid = os.getpid()
+
+        pool = _pools.get(tipo)
+        if pool is not None and pool.database == DATABASE['name']:
+            return pool
+
+        if pool is not None:
+            # Arquivo do banco mudou: descartar todos os pools antigos
+            for antigo in _pools.values():
+                antigo.fechar()
+            _pools.clear()
+
+        if tipo == 'leitura':
+            tamanho = DATABASE.get('leitores_max', DATABASE.get('pool_tamanho', 10))
+        elif tipo == 'escrita':
+            tamanho = 1
+        else:
+            tamanho = DATABASE.get('pool_tamanho', 10)
+
+        pool = ConnectionPool(
+            DATABASE['name'],
+            tamanho=tamanho,
+            tempo_espera=DATABASE.get('pool_espera', 10.0),
+            timeout=DATABASE.get('timeout', 30.0),
+            pragmas=_pragmas_conexao(),
+            somente_leitura=(tipo == 'leitura'),
+            cached_statements=DATABASE.get('cached_statements', 512)
+        )
+        _pools[tipo] = pool
+
+        return pool
+
+
+def iniciar_pools():
+    """
+    Cria os pools do processo atual e abre a primeira conexão de cada um
+
+    Chamada pelos workers do servidor (src/core/servidor.py) logo após o
+    fork, para que a primeira requisição não pague a abertura da conexão.
+
+    Returns:
+        list: Tipos dos pools iniciados
+    """
+    tipos = ['leitura', 'escrita'] if _escritor_unico() else ['geral']
+    for tipo in tipos:
+        pool = obter_pool(tipo)
+        pool.devolver(pool.obter())
+    return tipos
+
+
+def fechar_pool():
+    """
+    Fecha todas as conexões livres de todos os pools
+
+    Necessário antes de substituir o arquivo do banco (restauração de backup).
+    O próximo acesso cria pools novos. Os logs enfileirados são gravados
+    antes, para que nenhum lote fique em andamento durante a troca do arquivo.
+    """
+    descarregar_logs()
+
+    with _pool_lock:
+        for pool in _pools.values():
+            pool.fechar()
+        _pools.clear()
+
+
+def estatisticas_pool(tipo='geral'):
+    """
+    Retorna as estatísticas de uso de um pool de conexões
+
+    Args:
+        tipo: Tipo do pool ('geral', 'leitura' ou 'escrita')
+
+    Returns:
+        dict: Contadores de empréstimos, esperas e conexões abertas
+    """
+    return obter_pool(tipo).estatisticas()
+
+
+def estatisticas_pools():
+    """
+    Retorna as estatísticas de todos os pools já criados no processo
+
+    Returns:
+        dict: Estatísticas indexadas pelo tipo do pool
+    """
+    with _pool_lock:
+        pools = dict(_pools)
+
+    return {tipo: pool.estatisticas() for tipo, pool in pools.items()}
+
+
 @contextmanager
+def _emprestar_conexao(tipo):
+    """
+    Empresta uma conexão do pool indicado e a devolve ao final
+
+    Args:
+        tipo: Tipo do pool ('geral', 'leitura' ou 'escrita')
+
+    Yields:
+        sqlite3.Connection: Conexão com o banco de dados
+    """
+    pool = obter_pool(tipo)
+    conn = pool.obter()
+    try:
+        yield conn
+    except sqlite3.Error as e:
+        logger.error(f"Erro de banco de dados: {e}")
+        raise
+    finally:
+        pool.devolver(conn)
+
+
 def get_db_connection():
     """
     Context manager para conexão com banco de dados
-    Garante que a conexão seja sempre fechada, mesmo em caso de erro
+    Empresta uma conexão do pool e a devolve ao final, mesmo em caso de erro.
+    Transações não confirmadas são desfeitas na devolução.
+
+    No modo escritor único a conexão vem do escritor dedicado, pois o
+    chamador pode alterar dados. Prefira get_db_leitura()/get_db_escrita().
 
     Usage:
         with get_db_connection() as conn:
@@ -47,23 +263,160 @@ def get_db_connection():
     Yields:
         sqlite3.Connection: Conexão com o banco de dados
     """
-    conn = None
+    return _emprestar_conexao('escrita' if _escritor_unico() else 'geral')
+
+
+def get_db_leitura():
+    """
+    Context manager para consultas (somente leitura)
+
+    No modo escritor único usa conexões URI mode=ro que, sob WAL, nunca
+    aguardam o escritor. Fora desse modo equivale a get_db_connection().
+
+    Yields:
+        sqlite3.Connection: Conexão para consultas
+    """
+    return _emprestar_conexao('leitura' if _escritor_unico() else 'geral')
+
+
+def get_db_escrita():
+    """
+    Context manager para mutações (INSERT/UPDATE/DELETE)
+
+    No modo escritor único todas as escritas do processo são serializadas
+    em uma única conexão dedicada, evitando 'database is locked' entre
+    threads. Fora desse modo equivale a get_db_connection().
+
+    Yields:
+        sqlite3.Connection: Conexão para escrita
+    """
+    return _emprestar_conexao('escrita' if _escritor_unico() else 'geral')
+
+
+def consultar_registros(conn, sql, parametros=()):
+    """
+    Executa uma consulta e retorna as linhas como dicionários
+
+    As linhas são lidas como tuplas simples (sem sqlite3.Row) e combinadas
+    com os nomes das colunas da projeção, lidos uma única vez do cursor:
+    evita um objeto intermediário por linha nas listagens grandes.
+
+    Args:
+        conn: Conexão obtida de get_db_leitura()/get_db_escrita()
+        sql: Consulta com projeção explícita (nomes/aliases viram as chaves)
+        parametros: Parâmetros da consulta
+
+    Returns:
+        list: Dicionários {coluna: valor}, na ordem da consulta
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, parametros)
+    colunas = [coluna[0] for coluna in cursor.description]
+    return [dict(zip(colunas, linha)) for linha in cursor.fetchall()]
+
+
+def iterar_registros(sql, parametros=(), lote=200):
+    """
+    Gerador de registros (dicionários) lidos do cursor em lotes
+
+    Versão em streaming de consultar_registros, para respostas que
+    serializam cada registro assim que é lido. A conexão de leitura fica
+    reservada até o fim do gerador (ou até ele ser fechado, quando o
+    cliente desconecta); nada é consultado antes da primeira iteração.
+
+    Args:
+        sql: Consulta com projeção explícita (nomes/aliases viram as chaves)
+        parametros: Parâmetros da consulta
+        lote: Linhas por fetchmany
+
+    Yields:
+        dict: {coluna: valor}, na ordem da consulta
+    """
+    with get_db_leitura() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(sql, parametros)
+        colunas = [coluna[0] for coluna in cursor.description]
+        while True:
+            linhas = cursor.fetchmany(lote)
+            if not linhas:
+                break
+            for linha in linhas:
+                yield dict(zip(colunas, linha))
+
+
+def limitar_pagina(registros, limite, chave_cursor, pagina):
+    """
+    Repassa até `limite` registros de uma consulta feita com LIMIT limite + 1
+
+    Se o registro extra existir, pagina['next_cursor'] recebe o cursor da
+    chave do último registro repassado. O valor só é definitivo depois que
+    o gerador se esgota.
+
+    Args:
+        registros: Gerador de registros (iterar_registros)
+        limite: Quantidade máxima de registros na página
+        chave_cursor: Colunas da chave de ordenação (ex: ('data_emissao', 'id'))
+        pagina: Dicionário que recebe 'next_cursor'
+
+    Yields:
+        dict: Registros da página
+    """
+    pagina['next_cursor'] = None
+    ultimo = None
     try:
-        conn = sqlite3.connect(
-            DATABASE['name'],
-            timeout=DATABASE.get('timeout', 30.0),
-            check_same_thread=DATABASE.get('check_same_thread', False)
-        )
-        conn.row_factory = sqlite3.Row  # Permite acessar colunas por nome
-        yield conn
-    except sqlite3.Error as e:
-        logger.error(f"Erro de banco de dados: {e}")
-        if conn:
-            conn.rollback()
-        raise
+        for indice, registro in enumerate(registros):
+            if indice == limite:
+                pagina['next_cursor'] = codificar_cursor([ultimo[coluna] for coluna in chave_cursor])
+                break
+            ultimo = registro
+            yield registro
     finally:
-        if conn:
-            conn.close()
+        registros.close()
+
+
+def obter_versoes_tabelas(tabelas):
+    """
+    Lê as versões atuais das tabelas em versoes_tabelas em uma consulta
+
+    Args:
+        tabelas: Nomes das tabelas (constantes de TABELAS_VERSIONADAS)
+
+    Returns:
+        dict: tabela -> versão (0 se ausente)
+    """
+    with get_db_leitura() as conn:
+        versoes = dict(conn.execute(
+            f"SELECT tabela, versao FROM versoes_tabelas WHERE tabela IN ({', '.join('?' * len(tabelas))})",
+            tuple(tabelas)
+        ).fetchall())
+    return {tabela: versoes.get(tabela, 0) for tabela in tabelas}
+
+
+def avancar_versoes_tabelas(versoes_anteriores):
+    """
+    Leva cada versão para acima da registrada antes de o arquivo do banco
+    ser substituído (restauração de backup)
+
+    O banco restaurado traz as versões da época do backup, que podem
+    coincidir com versões já vistas por caches e ETags emitidos depois.
+    Um backup anterior à tabela versoes_tabelas a recebe aqui.
+
+    Args:
+        versoes_anteriores: dict tabela -> versão lida antes da substituição
+    """
+    with get_db_escrita() as conn:
+        try:
+            conn.execute(SQL_CREATE_VERSOES_TABELAS)
+            conn.executemany("""
+                INSERT INTO versoes_tabelas (tabela, versao) VALUES (?, ?)
+                ON CONFLICT(tabela) DO UPDATE SET versao = MAX(versao, excluded.versao)
+            """, [(tabela, versao + 1) for tabela, versao in versoes_anteriores.items()])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
 
 
 def conectar_db():
@@ -71,33 +424,252 @@ def conectar_db():
     Cria uma conexão com o banco de dados SQLite
     DEPRECATED: Use get_db_connection() context manager
 
-    Retorna: objeto de conexão
+    Retorna: objeto de conexão (fora do pool, deve ser fechado pelo chamador)
     """
     logger.warning("conectar_db() está deprecated. Use get_db_connection() context manager")
-    conn = sqlite3.connect(
-        DATABASE['name'],
-        timeout=DATABASE.get('timeout', 30.0),
-        check_same_thread=DATABASE.get('check_same_thread', False)
-    )
-    conn.row_factory = sqlite3.Row
-    return conn
+    return obter_pool('escrita' if _escritor_unico() else 'geral').criar_conexao()
 
 
-def inicializar_db():
+def inicializar_db(forcar=False):
     """
     Cria todas as tabelas do banco de dados se não existirem
-    Deve ser executado na primeira vez que o sistema é iniciado
+    Seguro para executar a cada inicialização (cria apenas o que faltar)
+
+    Bancos já em VERSAO_ESQUEMA (PRAGMA user_version) são apenas consultados:
+    DDL, migrações e backfills só rodam em bancos novos ou de versões
+    anteriores, sem tomar o lock de escrita a cada worker iniciado.
+
+    Args:
+        forcar: Executar as migrações mesmo com o esquema já atualizado
+
+    Returns:
+        bool: True se o esquema foi criado/atualizado, False se já estava em dia
     """
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    # Criar todas as tabelas
-    for sql_create in ALL_TABLES:
-        cursor.execute(sql_create)
-    
-    conn.commit()
-    conn.close()
+    versao = 0
+    if os.path.exists(DATABASE['name']):
+        with get_db_leitura() as conn:
+            versao = conn.execute("PRAGMA user_version").fetchone()[0]
+
+    if versao >= VERSAO_ESQUEMA and not forcar:
+        logger.debug(f"Esquema do banco já na versão {versao}")
+        return False
+
+    with get_db_escrita() as conn:
+        cursor = conn.cursor()
+
+        # Estruturas derivadas que precisam ser populadas se criadas agora
+        derivadas = [*INDICES_FTS, 'contadores', 'resumo_documentos_mensal']
+        cursor.execute(
+            f"SELECT name FROM sqlite_master WHERE name IN ({','.join('?' * len(derivadas))})",
+            derivadas
+        )
+        existentes = {linha[0] for linha in cursor.fetchall()}
+
+        # Criar todas as tabelas
+        for sql_create in ALL_TABLES:
+            cursor.execute(sql_create)
+
+        # Colunas novas em tabelas criadas por versões anteriores
+        for tabela, coluna, definicao in COLUNAS_ADICIONADAS:
+            colunas = {linha[1] for linha in cursor.execute(f"PRAGMA table_info({tabela})")}
+            if coluna not in colunas:
+                cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {definicao}")
+
+        # Índices textuais criados agora sobre dados já cadastrados
+        for indice, sql_rebuild in INDICES_FTS.items():
+            if indice not in existentes:
+                cursor.execute(sql_rebuild)
+
+        conn.commit()
+
+        # Contadores do dashboard e resumos criados agora: calcular a partir das tabelas
+        if 'contadores' not in existentes:
+            recalcular_contadores(conn)
+        if 'resumo_documentos_mensal' not in existentes:
+            backfill_resumos_documentos(conn)
+
+        # Bancos anteriores à tabela de sequências: popular a partir dos códigos
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM document_sequences)")
+        sequencias_vazias = not cursor.fetchone()[0]
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM documentos)")
+        possui_documentos = cursor.fetchone()[0]
+
+    if sequencias_vazias and possui_documentos:
+        backfill_sequencias_documentos()
+
+    # Gravada só ao final: migração interrompida é refeita na próxima inicialização
+    with get_db_escrita() as conn:
+        conn.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+
+    logger.info(f"Esquema do banco atualizado da versão {versao} para {VERSAO_ESQUEMA}")
     print("✓ Banco de dados inicializado com sucesso!")
+    return True
+
+
+def recalcular_contadores(conn=None):
+    """
+    Recalcula a tabela contadores a partir de documentos, pacientes e profissionais
+
+    Reparo para o caso de divergência (ex: alterações feitas com os triggers
+    removidos). Executa em uma transação de escrita, bloqueando emissões
+    apenas durante as contagens.
+
+    Args:
+        conn: Conexão de escrita do chamador (opcional); sem ela usa o escritor
+
+    Returns:
+        dict: Contadores recalculados
+    """
+    if conn is None:
+        with get_db_escrita() as conn_escrita:
+            return recalcular_contadores(conn_escrita)
+
+    iniciar_transacao_escrita(conn)
+    try:
+        for comando in SQL_RECALCULAR_CONTADORES:
+            conn.execute(comando)
+        contadores = dict(conn.execute("SELECT chave, valor FROM contadores").fetchall())
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+    logger.info(f"Contadores recalculados: {contadores}")
+    return contadores
+
+
+def backfill_resumos_documentos(conn=None):
+    """
+    Recalcula os resumos diário e mensal a partir de documentos
+
+    Processa um ano por transação, liberando o escritor entre os anos para
+    que emissões não fiquem bloqueadas durante todo o backfill de bases
+    grandes. Idempotente: cada ano é apagado e recontado.
+
+    Args:
+        conn: Conexão de escrita do chamador (opcional); sem ela usa o escritor
+
+    Returns:
+        int: Quantidade de anos processados
+    """
+    if conn is None:
+        with get_db_escrita() as conn_escrita:
+            return backfill_resumos_documentos(conn_escrita)
+
+    anos = conn.execute("""
+        SELECT CAST(strftime('%Y', MIN(data_emissao)) AS INTEGER),
+               CAST(strftime('%Y', MAX(data_emissao)) AS INTEGER)
+        FROM documentos
+    """).fetchone()
+
+    if anos[0] is None:
+        return 0
+
+    for ano in range(anos[0], anos[1] + 1):
+        intervalo = {'inicio': f'{ano}-01-01', 'fim': f'{ano + 1}-01-01'}
+
+        iniciar_transacao_escrita(conn)
+        try:
+            for tabela in PERIODOS_RESUMO:
+                for comando in gerar_sql_recalcular_resumo(tabela):
+                    conn.execute(comando, intervalo)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+    total_anos = anos[1] - anos[0] + 1
+    logger.info(f"Resumos de documentos recalculados ({total_anos} ano(s))")
+    return total_anos
+
+
+def obter_contadores():
+    """
+    Lê os contadores do dashboard em uma única consulta
+
+    Returns:
+        dict: total_documentos, total_pacientes, total_profissionais e
+              documentos_por_status (lista de {'status', 'total'})
+    """
+    with get_db_leitura() as conn:
+        contadores = dict(conn.execute("SELECT chave, valor FROM contadores").fetchall())
+
+    prefixo_status = 'documentos.status:'
+    por_status = [
+        {'status': chave[len(prefixo_status):], 'total': valor}
+        for chave, valor in sorted(contadores.items())
+        if chave.startswith(prefixo_status) and valor
+    ]
+
+    return {
+        'total_documentos': contadores.get('documentos', 0),
+        'total_pacientes': contadores.get('pacientes.ativos', 0),
+        'total_profissionais': contadores.get('profissionais.ativos', 0),
+        'documentos_por_status': por_status
+    }
+
+
+def _versao_tabela(conn, tabela):
+    """Lê a versão atual da tabela em versoes_tabelas (0 se ausente)"""
+    resultado = conn.execute(
+        "SELECT versao FROM versoes_tabelas WHERE tabela = ?", (tabela,)
+    ).fetchone()
+    return resultado[0] if resultado else 0
+
+
+def _configuracoes():
+    """
+    Retorna o snapshot em memória da tabela configuracoes
+
+    O snapshot é carregado uma vez por processo. Após
+    DATABASE['config_cache_segundos'] sem verificação, a versão da tabela
+    (mantida por triggers em versoes_tabelas) é consultada; o snapshot só é
+    recarregado se outro processo tiver alterado as configurações.
+
+    Returns:
+        dict: chave -> valor (não modificar; é compartilhado entre threads)
+    """
+    cache = _config_cache
+    intervalo = DATABASE.get('config_cache_segundos', 5.0)
+
+    if (cache['database'] == DATABASE['name']
+            and time.monotonic() - cache['verificado_em'] < intervalo):
+        return cache['valores']
+
+    with _config_lock:
+        agora = time.monotonic()
+        if (cache['database'] == DATABASE['name']
+                and agora - cache['verificado_em'] < intervalo):
+            return cache['valores']
+
+        with get_db_leitura() as conn:
+            versao = _versao_tabela(conn, 'configuracoes')
+
+            if cache['database'] != DATABASE['name'] or cache['versao'] != versao:
+                rows = conn.execute("SELECT chave, valor FROM configuracoes").fetchall()
+                cache['valores'] = {row['chave']: row['valor'] for row in rows}
+                cache['versao'] = versao
+                cache['database'] = DATABASE['name']
+
+        cache['verificado_em'] = agora
+        return cache['valores']
+
+
+def invalidar_cache_configuracoes():
+    """Força o recarregamento do snapshot de configurações no próximo acesso"""
+    with _config_lock:
+        _config_cache['database'] = None
+        _config_cache['verificado_em'] = 0.0
+
+
+def obter_configuracoes():
+    """
+    Retorna todas as configurações do sistema (a partir do snapshot em memória)
+
+    Returns:
+        dict: Cópia de chave -> valor
+    """
+    return dict(_configuracoes())
 
 
 def verificar_setup_inicial():
@@ -105,71 +677,63 @@ def verificar_setup_inicial():
     Verifica se o setup inicial do sistema foi concluído
     Retorna: True se configurado, False caso contrário
     """
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT valor FROM configuracoes WHERE chave = 'configurado'")
-    resultado = cursor.fetchone()
-    
-    conn.close()
-    
-    if resultado and resultado['valor'] == '1':
-        return True
-    return False
+    return _configuracoes().get('configurado') == '1'
 
 
 def salvar_configuracao(chave, valor, descricao=''):
     """
     Salva ou atualiza uma configuração no banco de dados
+    O snapshot em memória é atualizado na mesma operação (write-through)
     """
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO configuracoes (chave, valor, descricao, data_atualizacao)
-        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-        ON CONFLICT(chave) DO UPDATE SET 
-            valor = excluded.valor,
-            data_atualizacao = CURRENT_TIMESTAMP
-    """, (chave, str(valor), descricao))
-    
-    conn.commit()
-    conn.close()
+    with get_db_escrita() as conn:
+        iniciar_transacao_escrita(conn)
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO configuracoes (chave, valor, descricao, data_atualizacao)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(chave) DO UPDATE SET
+                valor = excluded.valor,
+                data_atualizacao = CURRENT_TIMESTAMP
+        """, (chave, str(valor), descricao))
+        versao = _versao_tabela(conn, 'configuracoes')
+        conn.commit()
+
+    with _config_lock:
+        cache = _config_cache
+        if cache['database'] == DATABASE['name'] and cache['versao'] == versao - 1:
+            # Nenhuma alteração externa desde o último carregamento
+            valores = dict(cache['valores'])
+            valores[chave] = str(valor)
+            cache['valores'] = valores
+            cache['versao'] = versao
+        else:
+            cache['database'] = None
+            cache['verificado_em'] = 0.0
 
 
 def obter_configuracao(chave, padrao=None):
     """
-    Obtém o valor de uma configuração
+    Obtém o valor de uma configuração (a partir do snapshot em memória)
     Retorna o valor padrão se não encontrar
     """
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT valor FROM configuracoes WHERE chave = ?", (chave,))
-    resultado = cursor.fetchone()
-    
-    conn.close()
-    
-    if resultado:
-        return resultado['valor']
-    return padrao
+    return _configuracoes().get(chave, padrao)
 
 
 def criar_setores_padrao():
     """
     Cria os setores padrão do hospital
     """
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    for setor in SETORES_PADRAO:
-        cursor.execute("""
-            INSERT OR IGNORE INTO setores (nome, sigla, ativo)
-            VALUES (?, ?, 1)
-        """, (setor, setor))
-    
-    conn.commit()
-    conn.close()
+    with get_db_escrita() as conn:
+        cursor = conn.cursor()
+
+        for setor in SETORES_PADRAO:
+            cursor.execute("""
+                INSERT OR IGNORE INTO setores (nome, sigla, ativo)
+                VALUES (?, ?, 1)
+            """, (setor, setor))
+
+        conn.commit()
+
     print("✓ Setores padrão criados!")
 
 
@@ -188,7 +752,7 @@ def criar_usuario_admin(login, senha, nome):
     # Gerar hash seguro da senha com bcrypt
     senha_hash = bcrypt.generate_password_hash(senha).decode('utf-8')
 
-    with get_db_connection() as conn:
+    with get_db_escrita() as conn:
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -206,18 +770,30 @@ def verificar_senha(senha_plana, senha_hash):
     """
     Verifica se a senha corresponde ao hash armazenado
 
+    Com HASH_SENHAS['executor'] o bcrypt roda no executor limitado de
+    src/core/hash_senhas.py, e não na thread da requisição.
+
     Args:
         senha_plana: Senha em texto plano
         senha_hash: Hash bcrypt armazenado
 
     Returns:
         bool: True se a senha está correta, False caso contrário
+
+    Raises:
+        HashSobrecarregadoError: Se a fila de hash estiver saturada
     """
     if not bcrypt:
         raise RuntimeError("Bcrypt não foi inicializado")
 
     try:
+        if HASH_SENHAS.get('executor'):
+            return hash_senhas.obter_executor(HASH_SENHAS).executar(
+                bcrypt.check_password_hash, senha_hash, senha_plana
+            )
         return bcrypt.check_password_hash(senha_hash, senha_plana)
+    except hash_senhas.HashSobrecarregadoError:
+        raise
     except Exception as e:
         logger.error(f"Erro ao verificar senha: {e}")
         return False
@@ -245,7 +821,7 @@ def criar_usuario(nome, login, senha, nivel_acesso='visualizador'):
     # Gerar hash seguro da senha
     senha_hash = bcrypt.generate_password_hash(senha).decode('utf-8')
 
-    with get_db_connection() as conn:
+    with get_db_escrita() as conn:
         cursor = conn.cursor()
 
         # Verificar se login já existe
@@ -268,17 +844,60 @@ def criar_usuario(nome, login, senha, nivel_acesso='visualizador'):
 def registrar_log(usuario_id, usuario_nome, ip_local, modulo, operacao, detalhes=''):
     """
     Registra uma ação no log do sistema
+
+    Com LOGS['escrita_assincrona'] a entrada é apenas enfileirada e gravada
+    em lote pela thread de auditoria; data_hora é fixada aqui para refletir
+    o momento da ação e não o da gravação.
     """
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO logs (usuario_id, usuario_nome, ip_local, modulo, operacao, detalhes)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (usuario_id, usuario_nome, ip_local, modulo, operacao, detalhes))
-    
-    conn.commit()
-    conn.close()
+    # Mesmo formato (UTC) do DEFAULT CURRENT_TIMESTAMP da tabela
+    data_hora = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    entrada = (usuario_id, usuario_nome, ip_local, modulo, operacao, detalhes, data_hora)
+
+    if LOGS.get('escrita_assincrona'):
+        log_writer.obter_gravador(get_db_escrita, LOGS).enfileirar(entrada)
+        return
+
+    with get_db_escrita() as conn:
+        conn.execute(log_writer.SQL_INSERIR_LOG, entrada)
+        conn.commit()
+
+
+def descarregar_logs(timeout=10.0):
+    """
+    Aguarda a gravação dos logs enfileirados
+
+    Args:
+        timeout: Segundos máximos de espera
+
+    Returns:
+        bool: True se não restaram logs pendentes
+    """
+    gravador = log_writer.gravador_ativo()
+    if gravador is None:
+        return True
+    return gravador.descarregar(timeout)
+
+
+def estatisticas_logs():
+    """
+    Retorna profundidade da fila e contadores do gravador de logs
+
+    Returns:
+        dict: Estatísticas do gravador ou None se não houver gravador ativo
+    """
+    gravador = log_writer.gravador_ativo()
+    return gravador.estatisticas() if gravador is not None else None
+
+
+def estatisticas_hash_senhas():
+    """
+    Retorna ocupação, fila e contadores do executor de hash de senhas
+
+    Returns:
+        dict: Estatísticas do executor ou None se não houver executor ativo
+    """
+    executor = hash_senhas.executor_ativo()
+    return executor.estatisticas() if executor is not None else None
 
 
 def listar_setores():
@@ -286,15 +905,18 @@ def listar_setores():
     Lista todos os setores ativos
     Retorna: lista de dicionários com dados dos setores
     """
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM setores WHERE ativo = 1 ORDER BY nome")
-    setores = cursor.fetchall()
-    
-    conn.close()
-    
-    return [dict(setor) for setor in setores]
+    with get_db_leitura() as conn:
+        return consultar_registros(conn, SQL_LISTAGEM_SETORES)
+
+
+def iterar_setores():
+    """
+    Versão em streaming de listar_setores
+
+    Yields:
+        dict: Setores ativos em ordem alfabética
+    """
+    return iterar_registros(SQL_LISTAGEM_SETORES)
 
 
 def cadastrar_paciente(nome_completo, prec_cp, posto='', om='', data_nascimento='', observacoes=''):
@@ -302,18 +924,16 @@ def cadastrar_paciente(nome_completo, prec_cp, posto='', om='', data_nascimento=
     Cadastra um novo paciente no sistema
     Retorna: ID do paciente criado
     """
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO pacientes (nome_completo, prec_cp, posto, om, data_nascimento, observacoes)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (nome_completo, prec_cp, posto, om, data_nascimento, observacoes))
-    
-    paciente_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    
+    with get_db_escrita() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO pacientes (nome_completo, prec_cp, posto, om, data_nascimento, observacoes)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (nome_completo, prec_cp, posto, om, data_nascimento, observacoes))
+
+        paciente_id = cursor.lastrowid
+        conn.commit()
+
     return paciente_id
 
 
@@ -322,136 +942,394 @@ def cadastrar_profissional(nome, funcao, crm_coren='', posto_graduacao='', setor
     Cadastra um novo profissional no sistema
     Retorna: ID do profissional criado
     """
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO profissionais (nome, funcao, crm_coren, posto_graduacao, setor_id)
-        VALUES (?, ?, ?, ?, ?)
-    """, (nome, funcao, crm_coren, posto_graduacao, setor_id))
-    
-    profissional_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    
+    with get_db_escrita() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO profissionais (nome, funcao, crm_coren, posto_graduacao, setor_id)
+            VALUES (?, ?, ?, ?, ?)
+        """, (nome, funcao, crm_coren, posto_graduacao, setor_id))
+
+        profissional_id = cursor.lastrowid
+        conn.commit()
+
     return profissional_id
 
 
-def gerar_codigo_documento(tipo_documento, prefixo):
+def _sigla_documento(tipo_documento):
+    """Retorna a sigla usada no código do tipo de documento"""
+    return SIGLAS_DOCUMENTOS.get(tipo_documento, 'DOC')
+
+
+def _formatar_codigo_documento(prefixo, sigla, ano, numero):
+    """Formata o código com zeros à esquerda: PREFIXO-SIGLA-ANO-NNNN"""
+    return f"{prefixo}-{sigla}-{ano}-{numero:04d}"
+
+
+def iniciar_transacao_escrita(conn):
+    """
+    Abre uma transação BEGIN IMMEDIATE na conexão, se ainda não houver uma
+
+    O lock de escrita é obtido já no início, de modo que leituras seguidas
+    de escrita na mesma transação não sofrem conflito com outros escritores.
+
+    Args:
+        conn: Conexão de escrita
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+
+def reservar_numeros_documento(conn, prefixo, sigla, ano, quantidade=1):
+    """
+    Reserva números consecutivos na sequência (prefixo, sigla, ano)
+
+    Deve ser chamada dentro de uma transação de escrita (ver
+    iniciar_transacao_escrita); o incremento só é confirmado junto com o
+    commit do chamador, portanto números de transações desfeitas voltam a
+    ficar disponíveis.
+
+    Args:
+        conn: Conexão de escrita com transação aberta
+        prefixo: Prefixo dos documentos (ex: HGUMBA)
+        sigla: Sigla do tipo de documento (ex: EXAM)
+        ano: Ano da sequência
+        quantidade: Quantidade de números a reservar
+
+    Returns:
+        int: Primeiro número reservado
+    """
+    if quantidade < 1:
+        raise ValueError("Quantidade deve ser no mínimo 1")
+
+    conn.execute("""
+        INSERT INTO document_sequences (prefixo, sigla, ano, ultimo_numero)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(prefixo, sigla, ano) DO UPDATE SET
+            ultimo_numero = ultimo_numero + excluded.ultimo_numero
+    """, (prefixo, sigla, ano, quantidade))
+
+    ultimo_numero = conn.execute("""
+        SELECT ultimo_numero FROM document_sequences
+        WHERE prefixo = ? AND sigla = ? AND ano = ?
+    """, (prefixo, sigla, ano)).fetchone()[0]
+
+    return ultimo_numero - quantidade + 1
+
+
+def gerar_codigo_documento(tipo_documento, prefixo, conn=None):
     """
     Gera um código único para o documento
     Formato: PREFIXO-TIPO-ANO-NUMERO
     Exemplo: HGUMBA-EXAM-2025-0001
+
+    O número vem da tabela document_sequences (O(1), sem varrer documentos).
+    Com `conn`, a reserva participa da transação do chamador; sem ela, o
+    número é reservado e confirmado em transação própria.
     """
     ano_atual = datetime.now().year
-    
-    # Mapear tipo de documento para sigla
-    siglas = {
-        'Guia de Exame': 'EXAM',
-        'Encaminhamento Médico': 'ENCAM',
-        'Guia de Internação': 'INTER',
-        'Declaração': 'DECL',
-        'Atestado Administrativo': 'ATEST'
-    }
-    
-    sigla = siglas.get(tipo_documento, 'DOC')
-    
-    # Buscar último número do ano
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT codigo_unico FROM documentos 
-        WHERE codigo_unico LIKE ? 
-        ORDER BY id DESC LIMIT 1
-    """, (f"{prefixo}-{sigla}-{ano_atual}-%",))
-    
-    resultado = cursor.fetchone()
-    conn.close()
-    
-    if resultado:
-        # Extrair número do último código
-        ultimo_codigo = resultado['codigo_unico']
-        ultimo_numero = int(ultimo_codigo.split('-')[-1])
-        novo_numero = ultimo_numero + 1
+    sigla = _sigla_documento(tipo_documento)
+
+    if conn is not None:
+        iniciar_transacao_escrita(conn)
+        numero = reservar_numeros_documento(conn, prefixo, sigla, ano_atual)
     else:
-        novo_numero = 1
-    
-    # Formatar código com zeros à esquerda
-    codigo = f"{prefixo}-{sigla}-{ano_atual}-{novo_numero:04d}"
-    return codigo
+        with get_db_escrita() as conn_escrita:
+            iniciar_transacao_escrita(conn_escrita)
+            numero = reservar_numeros_documento(conn_escrita, prefixo, sigla, ano_atual)
+            conn_escrita.commit()
+
+    return _formatar_codigo_documento(prefixo, sigla, ano_atual, numero)
+
+
+def reservar_codigos_documento(tipo_documento, quantidade, prefixo=None):
+    """
+    Reserva um bloco de códigos consecutivos para emissão em lote
+
+    Args:
+        tipo_documento: Tipo do documento
+        quantidade: Quantidade de códigos
+        prefixo: Prefixo dos documentos (padrão: configuração do sistema)
+
+    Returns:
+        list: Códigos reservados, em ordem
+    """
+    if prefixo is None:
+        prefixo = obter_configuracao('prefixo_documentos', 'HGU')
+
+    ano_atual = datetime.now().year
+    sigla = _sigla_documento(tipo_documento)
+
+    with get_db_escrita() as conn:
+        iniciar_transacao_escrita(conn)
+        primeiro = reservar_numeros_documento(conn, prefixo, sigla, ano_atual, quantidade)
+        conn.commit()
+
+    return [
+        _formatar_codigo_documento(prefixo, sigla, ano_atual, numero)
+        for numero in range(primeiro, primeiro + quantidade)
+    ]
+
+
+def backfill_sequencias_documentos():
+    """
+    Popula document_sequences a partir dos códigos já emitidos
+
+    Para cada (prefixo, sigla, ano) grava o maior número encontrado em
+    documentos, sem nunca diminuir um contador existente. Pode ser
+    executada mais de uma vez.
+
+    Returns:
+        int: Quantidade de sequências gravadas
+    """
+    maiores = {}
+
+    with get_db_escrita() as conn:
+        iniciar_transacao_escrita(conn)
+
+        for (codigo,) in conn.execute("SELECT codigo_unico FROM documentos"):
+            partes = codigo.rsplit('-', 3) if codigo else []
+            if len(partes) != 4 or not partes[2].isdigit() or not partes[3].isdigit():
+                logger.warning(f"Código de documento fora do padrão ignorado: {codigo}")
+                continue
+
+            prefixo, sigla, ano, numero = partes[0], partes[1], int(partes[2]), int(partes[3])
+            chave = (prefixo, sigla, ano)
+            if numero > maiores.get(chave, 0):
+                maiores[chave] = numero
+
+        conn.executemany("""
+            INSERT INTO document_sequences (prefixo, sigla, ano, ultimo_numero)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(prefixo, sigla, ano) DO UPDATE SET
+                ultimo_numero = MAX(ultimo_numero, excluded.ultimo_numero)
+        """, [(p, s, a, n) for (p, s, a), n in maiores.items()])
+
+        conn.commit()
+
+    logger.info(f"Sequências de documentos atualizadas: {len(maiores)}")
+    return len(maiores)
+
 
+def emitir_documento(tipo_documento, paciente_id, profissional_id, setor_origem_id,
+                     setor_destino_id, conteudo_json, usuario_criador_id,
+                     usuario_nome=None, ip_local=None):
+    """
+    Emite um documento em uma única conexão e um único commit
+
+    Reserva do número, hash, INSERT do documento e a linha de log de
+    auditoria ocorrem na mesma transação BEGIN IMMEDIATE.
+    O prefixo vem do snapshot de configurações, sem consulta ao banco.
+    O tempo de cada etapa é registrado em src.core.metricas sob
+    'emissao_documento.<etapa>'.
+
+    Args:
+        tipo_documento: Tipo do documento
+        paciente_id: ID do paciente
+        profissional_id: ID do profissional
+        setor_origem_id: ID do setor de origem
+        setor_destino_id: ID do setor de destino (opcional)
+        conteudo_json: Dict com o conteúdo do documento
+        usuario_criador_id: ID do usuário emissor
+        usuario_nome: Nome do usuário para o log (se None, não grava log)
+        ip_local: IP do cliente para o log
+
+    Returns:
+        dict: {'codigo': código único, 'tempos_ms': duração de cada etapa}
+    """
+    tempos = {}
+    inicio = marca = time.perf_counter()
+
+    def etapa(nome):
+        nonlocal marca
+        agora = time.perf_counter()
+        tempos[nome] = round((agora - marca) * 1000, 3)
+        marca = agora
+
+    prefixo = obter_configuracao('prefixo_documentos', 'HGU')
+    etapa('prefixo')
+
+    with get_db_escrita() as conn:
+        iniciar_transacao_escrita(conn)
+        etapa('lock')
+
+        cursor = conn.cursor()
 
-def criar_documento(tipo_documento, paciente_id, profissional_id, setor_origem_id, 
+        codigo_unico = gerar_codigo_documento(tipo_documento, prefixo, conn=conn)
+        etapa('codigo')
+
+        conteudo_serializado = json.dumps(conteudo_json)
+        hash_documento = hashlib.sha256(
+            (codigo_unico + conteudo_serializado).encode()
+        ).hexdigest()
+        etapa('hash')
+
+        cursor.execute("""
+            INSERT INTO documentos (
+                codigo_unico, tipo_documento, paciente_id, profissional_id,
+                setor_origem_id, setor_destino_id, conteudo_json, hash_documento,
+                status, usuario_criador_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'Emitido', ?)
+        """, (codigo_unico, tipo_documento, paciente_id, profissional_id,
+              setor_origem_id, setor_destino_id, conteudo_serializado,
+              hash_documento, usuario_criador_id))
+        etapa('insert')
+
+        if usuario_nome is not None:
+            cursor.execute("""
+                INSERT INTO logs (usuario_id, usuario_nome, ip_local, modulo, operacao, detalhes)
+                VALUES (?, ?, ?, 'Documentos', ?, '')
+            """, (usuario_criador_id, usuario_nome, ip_local,
+                  f'Documento criado: {codigo_unico}'))
+            etapa('log')
+
+        conn.commit()
+        etapa('commit')
+
+    tempos['total'] = round((time.perf_counter() - inicio) * 1000, 3)
+
+    for nome, duracao in tempos.items():
+        metricas.registrar(f'emissao_documento.{nome}', duracao)
+
+    return {'codigo': codigo_unico, 'tempos_ms': tempos}
+
+
+def criar_documento(tipo_documento, paciente_id, profissional_id, setor_origem_id,
                    setor_destino_id, conteudo_json, usuario_criador_id):
     """
     Cria um novo documento no sistema
+    A reserva do número e o INSERT ocorrem na mesma transação BEGIN IMMEDIATE,
+    evitando códigos duplicados entre requisições concorrentes.
     Retorna: código único do documento
     """
-    prefixo = obter_configuracao('prefixo_documentos', 'HGU')
-    codigo_unico = gerar_codigo_documento(tipo_documento, prefixo)
-    
-    # Gerar hash do documento
-    hash_documento = hashlib.sha256(
-        (codigo_unico + json.dumps(conteudo_json)).encode()
-    ).hexdigest()
-    
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO documentos (
-            codigo_unico, tipo_documento, paciente_id, profissional_id,
-            setor_origem_id, setor_destino_id, conteudo_json, hash_documento,
-            status, usuario_criador_id
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'Emitido', ?)
-    """, (codigo_unico, tipo_documento, paciente_id, profissional_id,
-          setor_origem_id, setor_destino_id, json.dumps(conteudo_json),
-          hash_documento, usuario_criador_id))
-    
-    conn.commit()
-    conn.close()
-    
-    return codigo_unico
+    resultado = emitir_documento(
+        tipo_documento, paciente_id, profissional_id, setor_origem_id,
+        setor_destino_id, conteudo_json, usuario_criador_id
+    )
+    return resultado['codigo']
 
 
 def listar_documentos(limite=100):
     """
     Lista os documentos mais recentes
     """
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT d.*, p.nome_completo as paciente_nome, 
+    return listar_documentos_pagina(limite)['documentos']
+
+
+def _sql_listagem_documentos(condicoes):
+    """Monta o SELECT da listagem de documentos com as condições informadas"""
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ''
+    return f"""
+        SELECT {COLUNAS_RESUMO_DOCUMENTO},
+               p.nome_completo as paciente_nome,
                prof.nome as profissional_nome,
                so.nome as setor_origem_nome
         FROM documentos d
         LEFT JOIN pacientes p ON d.paciente_id = p.id
         LEFT JOIN profissionais prof ON d.profissional_id = prof.id
         LEFT JOIN setores so ON d.setor_origem_id = so.id
-        ORDER BY d.data_emissao DESC
+        {where}
+        ORDER BY d.data_emissao DESC, d.id DESC
         LIMIT ?
-    """, (limite,))
-    
-    documentos = cursor.fetchall()
-    conn.close()
-    
-    return [dict(doc) for doc in documentos]
+    """
+
+
+def _condicoes_cursor(cursor, condicoes, parametros):
+    """Acrescenta a condição de continuação do cursor (keyset)"""
+    condicoes = list(condicoes or [])
+    parametros = list(parametros or [])
+
+    if cursor:
+        data_emissao, doc_id = decodificar_cursor(cursor, 2)
+        condicoes.append('(d.data_emissao, d.id) < (?, ?)')
+        parametros.extend([data_emissao, doc_id])
+
+    return condicoes, parametros
+
+
+def listar_documentos_pagina(limite=100, cursor=None, condicoes=None, parametros=None):
+    """
+    Lista uma página de documentos, do mais recente para o mais antigo
+
+    Paginação por chave (data_emissao, id) usando idx_documentos_data_id:
+    cada página custa o mesmo, independentemente da profundidade. Cada
+    documento traz apenas o resumo (COLUNAS_RESUMO_DOCUMENTO), sem o
+    conteúdo clínico.
+
+    Args:
+        limite: Quantidade máxima de documentos na página
+        cursor: Cursor opaco retornado na página anterior (None = primeira)
+        condicoes: Lista de condições SQL (alias 'd' para documentos) unidas por AND
+        parametros: Parâmetros das condições, na mesma ordem
+
+    Returns:
+        dict: {'documentos': [...], 'next_cursor': str ou None}
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    documentos, pagina = iterar_documentos_pagina(limite, cursor, condicoes, parametros)
+    return {'documentos': list(documentos), 'next_cursor': pagina['next_cursor']}
+
+
+def iterar_documentos_pagina(limite=100, cursor=None, condicoes=None, parametros=None):
+    """
+    Versão em streaming de listar_documentos_pagina
+
+    O cursor é validado imediatamente; a consulta só é feita ao iterar.
+
+    Args:
+        limite: Quantidade máxima de documentos na página
+        cursor: Cursor opaco retornado na página anterior (None = primeira)
+        condicoes: Lista de condições SQL (alias 'd' para documentos) unidas por AND
+        parametros: Parâmetros das condições, na mesma ordem
+
+    Returns:
+        tuple: (gerador de documentos, dict cujo 'next_cursor' fica
+                definido quando o gerador se esgota)
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    condicoes, parametros = _condicoes_cursor(cursor, condicoes, parametros)
+
+    # Uma linha extra indica se existe próxima página
+    registros = iterar_registros(_sql_listagem_documentos(condicoes), (*parametros, limite + 1))
+    pagina = {'next_cursor': None}
+    return limitar_pagina(registros, limite, ('data_emissao', 'id'), pagina), pagina
+
+
+def plano_listagem_documentos(cursor=None, condicoes=None, parametros=None):
+    """
+    Retorna o plano de execução (EXPLAIN QUERY PLAN) da listagem de documentos
+
+    Args:
+        cursor: Cursor de continuação (afeta a condição de faixa)
+        condicoes: Lista de condições SQL, como em listar_documentos_pagina
+        parametros: Parâmetros das condições
+
+    Returns:
+        list: Linhas 'detail' do plano (ex: 'SEARCH d USING INDEX ...')
+    """
+    condicoes, parametros = _condicoes_cursor(cursor, condicoes, parametros)
+
+    with get_db_leitura() as conn:
+        linhas = conn.execute(
+            'EXPLAIN QUERY PLAN ' + _sql_listagem_documentos(condicoes),
+            (*parametros, 1)
+        ).fetchall()
+
+    return [linha[3] for linha in linhas]
 
 
 def buscar_paciente_por_prec(prec_cp):
     """
     Busca um paciente pelo PREC-CP
     """
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM pacientes WHERE prec_cp = ? AND ativo = 1", (prec_cp,))
-    paciente = cursor.fetchone()
-    
-    conn.close()
-    
+    with get_db_leitura() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM pacientes WHERE prec_cp = ? AND ativo = 1", (prec_cp,))
+        paciente = cursor.fetchone()
+
     if paciente:
         return dict(paciente)
     return None
@@ -461,19 +1339,16 @@ def listar_profissionais():
     """
     Lista todos os profissionais ativos
     """
-    conn = conectar_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT p.*, s.nome as setor_nome
-        FROM profissionais p
-        LEFT JOIN setores s ON p.setor_id = s.id
-        WHERE p.ativo = 1
-        ORDER BY p.nome
-    """)
-    
-    profissionais = cursor.fetchall()
-    conn.close()
-    
-    return [dict(prof) for prof in profissionais]
+    with get_db_leitura() as conn:
+        return consultar_registros(conn, SQL_LISTAGEM_PROFISSIONAIS)
+
+
+def iterar_profissionais():
+    """
+    Versão em streaming de listar_profissionais
+
+    Yields:
+        dict: Profissionais ativos em ordem alfabética, com o nome do setor
+    """
+    return iterar_registros(SQL_LISTAGEM_PROFISSIONAIS)
 
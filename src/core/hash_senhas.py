@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Executor Limitado de Hash de Senhas
+Executa as verificações bcrypt em um número fixo de threads com fila
+limitada. Em picos de login (troca de turno) as requisições deixam de
+disputar a CPU entre si: quem esperaria além do limite recebe 503 com
+Retry-After na hora, e as demais rotas (inclusive /health) seguem atendidas
+"""
+
+import concurrent.futures
+import math
+import os
+import queue
+import threading
+import time
+import logging
+
+from src.core import metricas
+
+logger = logging.getLogger(__name__)
+
+
+class HashSobrecarregadoError(RuntimeError):
+    """A fila de hash está cheia ou a espera estimada excede o limite"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Fila de hash de senhas saturada (tente em {retry_after}s)")
+        self.retry_after = retry_after
+
+
+class ExecutorHash:
+    """
+    Executor de hash de senhas com admissão controlada
+
+    Uma tarefa é recusada (HashSobrecarregadoError) quando a fila está cheia
+    ou quando a espera estimada (posição na fila × tempo médio de hash ÷
+    workers) passa de `espera_max` segundos. Tarefas que mesmo assim ficarem
+    na fila além do prazo são descartadas pelo worker sem calcular o hash.
+
+    Métricas: 'hash_senha.espera_ms' (tempo na fila) e 'hash_senha.hash_ms'.
+
+    Usage:
+        executor = ExecutorHash(workers=2, fila_max=32, espera_max=3.0)
+        correta = executor.executar(bcrypt.check_password_hash, senha_hash, senha)
+    """
+
+    def __init__(self, workers=2, fila_max=32, espera_max=3.0, tempo_inicial=0.25):
+        """
+        Args:
+            workers: Threads calculando hashes simultaneamente
+            fila_max: Máximo de tarefas aguardando um worker
+            espera_max: Segundos máximos de espera na fila
+            tempo_inicial: Estimativa (segundos) de um hash antes da primeira medição
+        """
+        if workers < 1:
+            raise ValueError("O executor de hash precisa de pelo menos 1 worker")
+
+        self.workers = workers
+        self.espera_max = espera_max
+        self._fila = queue.Queue(maxsize=fila_max)
+        self._tempo_medio = tempo_inicial
+        self._ocupados = 0
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+        # Estatísticas
+        self._executadas = 0
+        self._recusadas = 0
+        self._expiradas = 0
+
+        self._threads = [
+            threading.Thread(target=self._executar, name=f'hash-senhas-{i}', daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def pid(self):
+        """PID do processo que criou o executor (as threads não sobrevivem a fork)"""
+        return self._pid
+
+    def _espera_estimada(self):
+        """Segundos estimados até um worker atender uma nova tarefa"""
+        with self._lock:
+            a_frente = self._fila.qsize() + self._ocupados + 1 - self.workers
+            return max(0, a_frente) / self.workers * self._tempo_medio
+
+    def _recusar(self, espera):
+        """Contabiliza a recusa e retorna o erro com o Retry-After sugerido"""
+        with self._lock:
+            self._recusadas += 1
+        return HashSobrecarregadoError(max(1, math.ceil(espera)))
+
+    def executar(self, funcao, *args):
+        """
+        Executa funcao(*args) em um worker e retorna o resultado
+
+        Raises:
+            HashSobrecarregadoError: Se a tarefa não puder ser atendida a tempo
+        """
+        espera = self._espera_estimada()
+        if espera > self.espera_max:
+            raise self._recusar(espera)
+
+        futuro = concurrent.futures.Future()
+        try:
+            self._fila.put_nowait((funcao, args, time.monotonic(), futuro))
+        except queue.Full:
+            raise self._recusar(self.espera_max)
+
+        return futuro.result()
+
+    def _executar(self):
+        """Loop de cada worker"""
+        while True:
+            funcao, args, enfileirada_em, futuro = self._fila.get()
+            espera = time.monotonic() - enfileirada_em
+
+            if espera > self.espera_max:
+                with self._lock:
+                    self._expiradas += 1
+                futuro.set_exception(HashSobrecarregadoError(max(1, math.ceil(self._tempo_medio))))
+                continue
+
+            with self._lock:
+                self._ocupados += 1
+            metricas.registrar('hash_senha.espera_ms', espera * 1000)
+
+            inicio = time.perf_counter()
+            try:
+                futuro.set_result(funcao(*args))
+            except Exception as e:
+                futuro.set_exception(e)
+            finally:
+                duracao = time.perf_counter() - inicio
+                metricas.registrar('hash_senha.hash_ms', duracao * 1000)
+                with self._lock:
+                    self._ocupados -= 1
+                    self._executadas += 1
+                    # Média móvel: acompanha mudanças de custo (bcrypt_log_rounds, carga)
+                    self._tempo_medio = 0.8 * self._tempo_medio + 0.2 * duracao
+
+    def estatisticas(self):
+        """
+        Retorna as estatísticas do executor
+
+        Returns:
+            dict: Ocupação, fila, tempo médio de hash e contadores
+        """
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'ocupados': self._ocupados,
+                'fila': self._fila.qsize(),
+                'fila_max': self._fila.maxsize,
+                'tempo_medio_ms': round(self._tempo_medio * 1000, 3),
+                'executadas': self._executadas,
+                'recusadas': self._recusadas,
+                'expiradas': self._expiradas
+            }
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def obter_executor(config):
+    """
+    Retorna o executor de hash do processo, criando-o se necessário
+
+    Um novo executor é criado após fork (as threads do processo pai não
+    existem no filho).
+
+    Args:
+        config: Dicionário HASH_SENHAS com os parâmetros do executor
+
+    Returns:
+        ExecutorHash: Executor ativo
+    """
+    global _executor
+
+    executor = _executor
+    if executor is not None and executor.pid == os.getpid():
+        return executor
+
+    with _executor_lock:
+        if _executor is None or _executor.pid != os.getpid():
+            _executor = ExecutorHash(
+                workers=config.get('workers', 2),
+                fila_max=config.get('fila_max', 32),
+                espera_max=config.get('espera_max', 3.0)
+            )
+        return _executor
+
+
+def executor_ativo():
+    """Retorna o executor do processo atual, se existir"""
+    executor = _executor
+    if executor is not None and executor.pid == os.getpid():
+        return executor
+    return None
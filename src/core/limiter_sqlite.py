@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Armazenamento do Rate Limiting em SQLite
+Backend do Flask-Limiter (biblioteca limits) que guarda os contadores em um
+arquivo SQLite compartilhado por todos os processos do servidor: com N
+workers o limite de tentativas de login continua sendo um só, e os
+contadores sobrevivem a reinícios
+
+Registra o esquema 'sqlite://' ao ser importado:
+    sqlite:///caminho/absoluto/hgu_ratelimit.db
+    sqlite:///C:/HGU/hgu_ratelimit.db
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import logging
+
+from limits.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+SQL_CREATE_CONTADORES = """
+    CREATE TABLE IF NOT EXISTS contadores (
+        chave TEXT PRIMARY KEY,
+        valor INTEGER NOT NULL,
+        expira_em REAL NOT NULL
+    ) WITHOUT ROWID
+"""
+
+SQL_INDICE_EXPIRACAO = "CREATE INDEX IF NOT EXISTS idx_contadores_expira_em ON contadores(expira_em)"
+
+# Incremento atômico entre processos em um único statement: uma janela
+# vencida recomeça do valor incrementado, com nova expiração
+SQL_INCREMENTAR = """
+    INSERT INTO contadores (chave, valor, expira_em) VALUES (?, ?, ?)
+    ON CONFLICT(chave) DO UPDATE SET
+        valor = CASE WHEN expira_em <= ? THEN excluded.valor ELSE valor + excluded.valor END,
+        expira_em = CASE WHEN expira_em <= ? THEN excluded.expira_em ELSE expira_em END
+    RETURNING valor
+"""
+
+PRAGMAS_LIMITER = [
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),  # Sem fsync por incremento; o WAL preserva os contadores em falha do processo
+    ('busy_timeout', 5000)
+]
+
+
+def _caminho_da_uri(uri):
+    """Extrai o caminho do arquivo de 'sqlite:///caminho' (aceita 'sqlite:///C:/...')"""
+    caminho = uri.split('://', 1)[1]
+    if re.match(r'^/[A-Za-z]:', caminho):
+        caminho = caminho[1:]
+    if not caminho:
+        raise ValueError(f"URI de rate limiting sem caminho do arquivo: {uri}")
+    return caminho
+
+
+class SQLiteLimiterStorage(Storage):
+    """
+    Contadores de janela fixa (estratégia padrão do Flask-Limiter) em SQLite
+
+    Cada processo abre a própria conexão (recriada após fork) e a serializa
+    entre suas threads; entre processos, a atomicidade vem do UPSERT em
+    modo autocommit. Janelas vencidas são ignoradas na leitura e removidas
+    em lote a cada `intervalo_limpeza` segundos, e não a cada consulta.
+
+    Usage:
+        limiter = Limiter(app=app, key_func=..., storage_uri='sqlite:///hgu_ratelimit.db')
+    """
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri, wrap_exceptions=False, intervalo_limpeza=60.0, **options):
+        """
+        Args:
+            uri: 'sqlite:///caminho/do/arquivo.db'
+            wrap_exceptions: Converte erros do SQLite em limits.errors.StorageError
+            intervalo_limpeza: Segundos entre remoções em lote das janelas vencidas
+        """
+        self.caminho = _caminho_da_uri(uri)
+        self.intervalo_limpeza = float(intervalo_limpeza)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._proxima_limpeza = 0.0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _conexao(self):
+        """Conexão do processo atual (chamar com self._lock adquirido)"""
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.caminho, isolation_level=None, check_same_thread=False)
+            for pragma, valor in PRAGMAS_LIMITER:
+                conn.execute(f"PRAGMA {pragma} = {valor}")
+            conn.execute(SQL_CREATE_CONTADORES)
+            conn.execute(SQL_INDICE_EXPIRACAO)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _limpar_vencidos(self, conn, agora):
+        """Remove em lote as janelas vencidas (no máximo uma vez por intervalo)"""
+        if agora < self._proxima_limpeza:
+            return
+        self._proxima_limpeza = agora + self.intervalo_limpeza
+        removidos = conn.execute("DELETE FROM contadores WHERE expira_em <= ?", (agora,)).rowcount
+        if removidos:
+            logger.debug(f"Rate limiting: {removidos} janela(s) vencida(s) removida(s)")
+
+    def incr(self, key, expiry, amount=1):
+        """
+        Incrementa o contador da chave, abrindo nova janela se a anterior venceu
+
+        Returns:
+            int: Valor do contador após o incremento
+        """
+        agora = time.time()
+        with self._lock:
+            conn = self._conexao()
+            self._limpar_vencidos(conn, agora)
+            return conn.execute(
+                SQL_INCREMENTAR, (key, amount, agora + expiry, agora, agora)
+            ).fetchall()[0][0]
+
+    def get(self, key):
+        """Valor do contador na janela atual (0 se não houver)"""
+        with self._lock:
+            linha = self._conexao().execute(
+                "SELECT valor FROM contadores WHERE chave = ? AND expira_em > ?", (key, time.time())
+            ).fetchone()
+        return linha[0] if linha else 0
+
+    def get_expiry(self, key):
+        """Instante (epoch) em que a janela atual vence"""
+        agora = time.time()
+        with self._lock:
+            linha = self._conexao().execute(
+                "SELECT expira_em FROM contadores WHERE chave = ? AND expira_em > ?", (key, agora)
+            ).fetchone()
+        return linha[0] if linha else agora
+
+    def check(self):
+        """Indica se o arquivo de contadores está acessível"""
+        try:
+            with self._lock:
+                self._conexao().execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        """Remove todos os contadores e retorna quantos foram removidos"""
+        with self._lock:
+            return self._conexao().execute("DELETE FROM contadores").rowcount
+
+    def clear(self, key):
+        """Remove o contador da chave"""
+        with self._lock:
+            self._conexao().execute("DELETE FROM contadores WHERE chave = ?", (key,))
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+Gravação Assíncrona dos Logs de Auditoria
+Enfileira as linhas da tabela logs em memória e as grava em lote (group
+commit) em uma thread de fundo, tirando o INSERT + commit do caminho da
+requisição
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from src.core import metricas
+
+logger = logging.getLogger(__name__)
+
+SQL_INSERIR_LOG = """
+    INSERT INTO logs (usuario_id, usuario_nome, ip_local, modulo, operacao, detalhes, data_hora)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Espera máxima entre tentativas de gravar um lote com o banco indisponível (segundos)
+ESPERA_MAX_TENTATIVAS = 5.0
+
+# Erros em que o banco recusa os dados: repetir não adianta
+ERROS_DADOS_RECUSADOS = (
+    sqlite3.IntegrityError, sqlite3.DataError, sqlite3.ProgrammingError, sqlite3.InterfaceError
+)
+
+
+class AuditLogWriter:
+    """
+    Gravador de logs em lote com fila limitada
+
+    As entradas são gravadas quando o lote atinge `lote_max` linhas ou
+    quando `intervalo` segundos se passam desde a primeira entrada do lote.
+    Com a fila cheia, enfileirar() aguarda até `espera_fila` segundos
+    (backpressure) e, se ainda não houver espaço, grava a entrada de forma
+    síncrona para não perder registros de auditoria. Pelo mesmo motivo, um
+    lote que falha continua sendo tentado enquanto o banco estiver
+    indisponível (a fila enche e as gravações passam a ser síncronas).
+
+    Usage:
+        gravador = AuditLogWriter(get_db_escrita)
+        gravador.enfileirar((usuario_id, nome, ip, modulo, operacao, detalhes, data_hora))
+        gravador.descarregar()
+    """
+
+    def __init__(self, obter_conexao, fila_max=10000, lote_max=200,
+                 intervalo=0.5, espera_fila=0.05, tentativas=3):
+        """
+        Args:
+            obter_conexao: Callable que retorna um context manager de conexão de escrita
+            fila_max: Máximo de entradas aguardando gravação
+            lote_max: Máximo de linhas por commit
+            intervalo: Segundos máximos que uma entrada aguarda o lote completar
+            espera_fila: Segundos aguardando espaço na fila antes de gravar síncrono
+            tentativas: Tentativas de gravação de um lote antes de alertar (log
+                        critical); após isso a gravação segue sendo tentada
+        """
+        self._obter_conexao = obter_conexao
+        self._fila = queue.Queue(maxsize=fila_max)
+        self.lote_max = lote_max
+        self.intervalo = intervalo
+        self.espera_fila = espera_fila
+        self.tentativas = tentativas
+
+        self._pid = os.getpid()
+        self._parar = threading.Event()
+        self._pendentes = 0
+        self._condicao = threading.Condition()
+
+        # Estatísticas
+        self._gravadas = 0
+        self._lotes = 0
+        self._sincronas = 0
+        self._perdidas = 0
+
+        self._thread = threading.Thread(
+            target=self._executar, name='audit-log-writer', daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def pid(self):
+        """PID do processo que criou o gravador (a thread não sobrevive a fork)"""
+        return self._pid
+
+    def enfileirar(self, entrada):
+        """
+        Enfileira uma linha de log para gravação em lote
+
+        Args:
+            entrada: Tupla na ordem de SQL_INSERIR_LOG
+        """
+        with self._condicao:
+            self._pendentes += 1
+
+        try:
+            self._fila.put(entrada, timeout=self.espera_fila)
+        except queue.Full:
+            # Fila saturada: gravar no caminho da requisição
+            try:
+                self._gravar([entrada])
+                with self._condicao:
+                    self._sincronas += 1
+            finally:
+                self._concluir(1)
+
+    def _concluir(self, quantidade):
+        """Desconta entradas gravadas (ou descartadas) das pendentes"""
+        with self._condicao:
+            self._pendentes -= quantidade
+            if self._pendentes <= 0:
+                self._condicao.notify_all()
+
+    def _gravar(self, lote):
+        """Grava o lote em uma única transação"""
+        inicio = time.perf_counter()
+
+        with self._obter_conexao() as conn:
+            conn.executemany(SQL_INSERIR_LOG, lote)
+            conn.commit()
+
+        metricas.registrar('logs.flush_ms', (time.perf_counter() - inicio) * 1000)
+        metricas.registrar('logs.lote', len(lote))
+
+    def _gravar_com_tentativas(self, lote):
+        """
+        Grava o lote, repetindo até conseguir enquanto o erro for transitório
+
+        Com o banco indisponível (lock, disco, pool esgotado) o lote não é
+        descartado: a thread espera cada vez mais (até ESPERA_MAX_TENTATIVAS)
+        e tenta de novo. Só são descartadas as linhas que o banco recusa
+        (isoladas gravando o lote linha a linha) e, ao encerrar o processo,
+        o lote que ainda não pôde ser gravado.
+        """
+        tentativa = 0
+        while True:
+            tentativa += 1
+            try:
+                self._gravar(lote)
+            except ERROS_DADOS_RECUSADOS as e:
+                if len(lote) > 1:
+                    for entrada in lote:
+                        self._gravar_com_tentativas([entrada])
+                    return
+                self._descartar(lote, f"recusado pelo banco: {e}")
+                return
+            except Exception as e:
+                if self._parar.is_set() and tentativa >= self.tentativas:
+                    self._descartar(lote, f"banco indisponível ao encerrar: {e}")
+                    return
+                if tentativa < self.tentativas:
+                    logger.error(f"Erro ao gravar lote de logs (tentativa {tentativa}): {e}")
+                elif tentativa == self.tentativas:
+                    logger.critical(
+                        f"Banco indisponível para os logs após {tentativa} tentativas: "
+                        f"{len(lote)} registro(s) retido(s) até a gravação ser possível ({e})"
+                    )
+                time.sleep(min(0.1 * tentativa, ESPERA_MAX_TENTATIVAS))
+                continue
+
+            with self._condicao:
+                self._gravadas += len(lote)
+                self._lotes += 1
+            if tentativa > self.tentativas:
+                logger.warning(f"Lote de {len(lote)} registro(s) de log gravado após {tentativa} tentativas")
+            return
+
+    def _descartar(self, lote, motivo):
+        """Contabiliza linhas de log que não puderam ser gravadas"""
+        with self._condicao:
+            self._perdidas += len(lote)
+        logger.critical(f"{len(lote)} registro(s) de log descartado(s): {motivo}")
+
+    def _executar(self):
+        """Loop da thread de gravação"""
+        while True:
+            try:
+                primeira = self._fila.get(timeout=self.intervalo)
+            except queue.Empty:
+                if self._parar.is_set():
+                    return
+                continue
+
+            lote = [primeira]
+            prazo = time.monotonic() + self.intervalo
+
+            while len(lote) < self.lote_max:
+                restante = prazo - time.monotonic()
+                try:
+                    if restante <= 0 or self._parar.is_set():
+                        lote.append(self._fila.get_nowait())
+                    else:
+                        lote.append(self._fila.get(timeout=restante))
+                except queue.Empty:
+                    break
+
+            try:
+                self._gravar_com_tentativas(lote)
+            finally:
+                self._concluir(len(lote))
+
+    def descarregar(self, timeout=10.0):
+        """
+        Aguarda até que todas as entradas enfileiradas sejam gravadas
+
+        Args:
+            timeout: Segundos máximos de espera
+
+        Returns:
+            bool: True se a fila foi esvaziada
+        """
+        with self._condicao:
+            return self._condicao.wait_for(lambda: self._pendentes <= 0, timeout)
+
+    def parar(self, timeout=10.0):
+        """Grava o que estiver pendente e encerra a thread"""
+        self.descarregar(timeout)
+        self._parar.set()
+        self._thread.join(timeout)
+
+    def estatisticas(self):
+        """
+        Retorna as estatísticas do gravador
+
+        Returns:
+            dict: Profundidade da fila e contadores de gravação
+        """
+        with self._condicao:
+            return {
+                'fila': self._fila.qsize(),
+                'fila_max': self._fila.maxsize,
+                'pendentes': self._pendentes,
+                'gravadas': self._gravadas,
+                'lotes': self._lotes,
+                'sincronas': self._sincronas,
+                'perdidas': self._perdidas,
+                'ativo': self._thread.is_alive()
+            }
+
+
+_gravador = None
+_gravador_lock = threading.Lock()
+
+
+def obter_gravador(obter_conexao, config):
+    """
+    Retorna o gravador de logs do processo, criando-o se necessário
+
+    Um novo gravador é criado após fork (a thread do processo pai não existe
+    no filho).
+
+    Args:
+        obter_conexao: Callable que retorna um context manager de conexão de escrita
+        config: Dicionário LOGS com os parâmetros da fila
+
+    Returns:
+        AuditLogWriter: Gravador ativo
+    """
+    global _gravador
+
+    gravador = _gravador
+    if gravador is not None and gravador.pid == os.getpid():
+        return gravador
+
+    with _gravador_lock:
+        if _gravador is None or _gravador.pid != os.getpid():
+            _gravador = AuditLogWriter(
+                obter_conexao,
+                fila_max=config.get('fila_max', 10000),
+                lote_max=config.get('lote_max', 200),
+                intervalo=config.get('intervalo_gravacao', 0.5),
+                espera_fila=config.get('espera_fila', 0.05)
+            )
+        return _gravador
+
+
+def gravador_ativo():
+    """Retorna o gravador do processo atual, se existir"""
+    gravador = _gravador
+    if gravador is not None and gravador.pid == os.getpid():
+        return gravador
+    return None
+
+
+@atexit.register
+def _encerrar_gravador():
+    """Grava os logs pendentes ao encerrar o processo"""
+    gravador = gravador_ativo()
+    if gravador is not None:
+        gravador.parar()
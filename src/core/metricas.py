@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Métricas de Desempenho
+Registro em memória de amostras de tempo (latência por etapa, filas, etc.)
+com cálculo de percentis para acompanhamento operacional
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Quantidade máxima de amostras mantidas por métrica (janela deslizante)
+MAX_AMOSTRAS = 2048
+
+_amostras = {}
+_contagens = {}
+_lock = threading.Lock()
+
+
+def registrar(nome, valor):
+    """
+    Registra uma amostra para a métrica
+
+    Args:
+        nome: Nome da métrica (ex: 'emissao_documento.insert')
+        valor: Valor numérico da amostra (tempos em milissegundos)
+    """
+    with _lock:
+        serie = _amostras.get(nome)
+        if serie is None:
+            serie = _amostras[nome] = deque(maxlen=MAX_AMOSTRAS)
+            _contagens[nome] = 0
+        serie.append(valor)
+        _contagens[nome] += 1
+
+
+@contextmanager
+def medir(nome):
+    """
+    Context manager que registra a duração do bloco em milissegundos
+
+    Usage:
+        with medir('backup.total'):
+            realizar_backup()
+    """
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar(nome, (time.perf_counter() - inicio) * 1000)
+
+
+def _percentil(valores_ordenados, p):
+    """Percentil por posição mais próxima (valores já ordenados)"""
+    if not valores_ordenados:
+        return 0.0
+    indice = max(0, math.ceil(p / 100.0 * len(valores_ordenados)) - 1)
+    return valores_ordenados[indice]
+
+
+def resumo(prefixo=None):
+    """
+    Resume as métricas registradas
+
+    Args:
+        prefixo: Se informado, retorna apenas métricas que começam com ele
+
+    Returns:
+        dict: Por métrica, total de amostras e média/p50/p95/p99/máximo
+              calculados sobre a janela das últimas MAX_AMOSTRAS
+    """
+    with _lock:
+        copia = {
+            nome: (list(serie), _contagens[nome])
+            for nome, serie in _amostras.items()
+            if prefixo is None or nome.startswith(prefixo)
+        }
+
+    resultado = {}
+    for nome, (valores, total) in sorted(copia.items()):
+        valores.sort()
+        resultado[nome] = {
+            'total': total,
+            'media': round(sum(valores) / len(valores), 3) if valores else 0.0,
+            'p50': round(_percentil(valores, 50), 3),
+            'p95': round(_percentil(valores, 95), 3),
+            'p99': round(_percentil(valores, 99), 3),
+            'max': round(valores[-1], 3) if valores else 0.0
+        }
+
+    return resultado
+
+
+def limpar():
+    """Descarta todas as amostras registradas"""
+    with _lock:
+        _amostras.clear()
+        _contagens.clear()
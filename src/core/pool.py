@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Pool de Conexões SQLite
+Mantém um conjunto limitado de conexões pré-configuradas (PRAGMAs de
+desempenho) reutilizadas entre requisições, evitando abrir uma conexão nova
+a cada chamada das funções de banco de dados
+"""
+
+import sqlite3
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PoolEsgotadoError(sqlite3.OperationalError):
+    """Nenhuma conexão ficou disponível dentro do tempo de espera do pool"""
+
+
+class ConnectionPool:
+    """
+    Pool de conexões SQLite limitado e thread-safe
+
+    As conexões são criadas sob demanda até o limite `tamanho` e devolvidas
+    ao pool após o uso. Quando todas estão em uso, a requisição aguarda até
+    `tempo_espera` segundos antes de falhar com PoolEsgotadoError.
+
+    Usage:
+        pool = ConnectionPool('hgu_core.db', tamanho=10)
+        conn = pool.obter()
+        try:
+            conn.execute(...)
+        finally:
+            pool.devolver(conn)
+    """
+
+    def __init__(self, database, tamanho=10, tempo_espera=10.0, timeout=30.0,
+                 pragmas=None, somente_leitura=False, cached_statements=128):
+        """
+        Args:
+            database: Caminho do arquivo do banco de dados
+            tamanho: Número máximo de conexões abertas simultaneamente
+            tempo_espera: Segundos aguardando uma conexão livre
+            timeout: Timeout de lock do SQLite (busy timeout) em segundos
+            pragmas: Lista de tuplas (pragma, valor) aplicadas a cada conexão
+            somente_leitura: Abre as conexões com URI mode=ro
+            cached_statements: Statements preparados mantidos em cache por conexão
+        """
+        if tamanho < 1:
+            raise ValueError("Tamanho do pool deve ser no mínimo 1")
+
+        self.database = database
+        self.tamanho = tamanho
+        self.tempo_espera = tempo_espera
+        self.timeout = timeout
+        self.pragmas = list(pragmas or [])
+        self.somente_leitura = somente_leitura
+        self.cached_statements = cached_statements
+
+        self._livres = []
+        self._abertas = 0
+        self._fechado = False
+        self._condicao = threading.Condition(threading.Lock())
+
+        # Estatísticas de uso
+        self._checkouts = 0
+        self._esperas = 0
+        self._timeouts = 0
+        self._criadas = 0
+        self._descartadas = 0
+        self._tempo_espera_total = 0.0
+        self._tempo_espera_max = 0.0
+
+    def criar_conexao(self):
+        """
+        Abre uma nova conexão com os PRAGMAs configurados
+
+        A conexão não é contabilizada pelo pool; use obter()/devolver() para
+        conexões reutilizáveis.
+        """
+        if self.somente_leitura:
+            conn = sqlite3.connect(
+                f"file:{self.database}?mode=ro",
+                uri=True,
+                timeout=self.timeout,
+                check_same_thread=False,
+                cached_statements=self.cached_statements
+            )
+        else:
+            conn = sqlite3.connect(
+                self.database,
+                timeout=self.timeout,
+                check_same_thread=False,
+                cached_statements=self.cached_statements
+            )
+
+        for pragma, valor in self.pragmas:
+            if self.somente_leitura and pragma == 'journal_mode':
+                # Modo de journal é persistente no arquivo e exige escrita
+                continue
+            conn.execute(f"PRAGMA {pragma} = {valor}")
+
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def obter(self):
+        """
+        Retira uma conexão do pool
+
+        Returns:
+            sqlite3.Connection: Conexão pronta para uso
+
+        Raises:
+            PoolEsgotadoError: Se nenhuma conexão ficar livre a tempo
+        """
+        inicio = time.perf_counter()
+        esperou = False
+
+        with self._condicao:
+            if self._fechado:
+                raise sqlite3.ProgrammingError("Pool de conexões está fechado")
+
+            while not self._livres and self._abertas >= self.tamanho:
+                esperou = True
+                restante = self.tempo_espera - (time.perf_counter() - inicio)
+                if restante <= 0 or not self._condicao.wait(restante):
+                    if not self._livres and self._abertas >= self.tamanho:
+                        self._timeouts += 1
+                        raise PoolEsgotadoError(
+                            f"Nenhuma conexão disponível após {self.tempo_espera}s "
+                            f"(pool com {self.tamanho} conexões)"
+                        )
+
+            if self._livres:
+                conn = self._livres.pop()
+            else:
+                # Reservar a vaga antes de sair do lock
+                self._abertas += 1
+                conn = None
+
+            espera = time.perf_counter() - inicio
+            self._checkouts += 1
+            if esperou:
+                self._esperas += 1
+                self._tempo_espera_total += espera
+                self._tempo_espera_max = max(self._tempo_espera_max, espera)
+
+        if conn is None:
+            try:
+                conn = self.criar_conexao()
+            except Exception:
+                with self._condicao:
+                    self._abertas -= 1
+                    self._condicao.notify()
+                raise
+            with self._condicao:
+                self._criadas += 1
+
+        return conn
+
+    def devolver(self, conn):
+        """
+        Devolve uma conexão ao pool
+
+        Transações pendentes são desfeitas. Conexões em estado inválido são
+        descartadas e a vaga é liberada para uma nova conexão.
+
+        Args:
+            conn: Conexão obtida via obter()
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+            valida = True
+        except sqlite3.Error as e:
+            logger.warning(f"Conexão descartada do pool: {e}")
+            valida = False
+
+        with self._condicao:
+            if valida and not self._fechado:
+                self._livres.append(conn)
+            else:
+                self._abertas -= 1
+                self._descartadas += 1
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._condicao.notify()
+
+    def fechar(self):
+        """Fecha todas as conexões livres e impede novos empréstimos"""
+        with self._condicao:
+            self._fechado = True
+            while self._livres:
+                conn = self._livres.pop()
+                self._abertas -= 1
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._condicao.notify_all()
+
+    def estatisticas(self):
+        """
+        Retorna as estatísticas de uso do pool
+
+        Returns:
+            dict: Contadores de empréstimos, esperas e conexões
+        """
+        with self._condicao:
+            return {
+                'somente_leitura': self.somente_leitura,
+                'tamanho': self.tamanho,
+                'abertas': self._abertas,
+                'livres': len(self._livres),
+                'em_uso': self._abertas - len(self._livres),
+                'checkouts': self._checkouts,
+                'esperas': self._esperas,
+                'timeouts': self._timeouts,
+                'criadas': self._criadas,
+                'descartadas': self._descartadas,
+                'espera_media_ms': round(
+                    self._tempo_espera_total / self._esperas * 1000, 3
+                ) if self._esperas else 0.0,
+                'espera_max_ms': round(self._tempo_espera_max * 1000, 3)
+            }
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Retenção dos Logs de Auditoria
+Move as linhas da tabela logs mais antigas que LOGS['retencao_meses'] para
+arquivos SQLite mensais (logs_AAAA-MM.db), compactados com gzip ao final.
+Os arquivos voltam a ser consultáveis sob demanda via ATTACH.
+"""
+
+import glob
+import gzip
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from src.config import DATABASE, LOGS, EXPORTACAO
+from src.core.database import get_db_leitura, get_db_escrita, iniciar_transacao_escrita
+
+logger = logging.getLogger(__name__)
+
+COLUNAS_LOGS = (
+    'id', 'usuario_id', 'usuario_nome', 'ip_local', 'modulo', 'operacao', 'detalhes', 'data_hora'
+)
+
+# Mesmas colunas da tabela logs; id preservado (sem AUTOINCREMENT nem FKs)
+SQL_CREATE_LOGS_ARQUIVO = """
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY,
+    usuario_id INTEGER,
+    usuario_nome TEXT,
+    ip_local TEXT,
+    modulo TEXT,
+    operacao TEXT,
+    detalhes TEXT,
+    data_hora TIMESTAMP
+);
+"""
+
+# OR IGNORE: um lote repetido após interrupção (arquivado e não excluído) não duplica
+SQL_INSERIR_LOG_ARQUIVO = (
+    f"INSERT OR IGNORE INTO logs ({', '.join(COLUNAS_LOGS)}) "
+    f"VALUES ({', '.join('?' * len(COLUNAS_LOGS))})"
+)
+
+# Linhas expiradas, das mais antigas para as mais recentes: faixa de
+# idx_logs_data_id percorrida em ordem inversa, lendo só as linhas do lote
+SQL_LOTE_EXPIRADO = f"""
+    SELECT {', '.join(COLUNAS_LOGS)}, strftime('%Y-%m', data_hora) AS mes
+    FROM logs
+    WHERE data_hora < ?
+    ORDER BY data_hora, id
+    LIMIT ?
+"""
+
+_trava_arquivamento = threading.Lock()
+
+
+def limite_retencao(retencao_meses=None, agora=None):
+    """
+    Data a partir da qual os logs são mantidos na tabela
+
+    O limite é sempre o primeiro dia de um mês, de modo que cada arquivo
+    mensal recebe o mês inteiro.
+
+    Args:
+        retencao_meses: Meses mantidos além do mês atual (padrão: LOGS['retencao_meses'])
+        agora: datetime de referência em UTC (padrão: agora)
+
+    Returns:
+        str: 'AAAA-MM-01 00:00:00' (UTC, formato de CURRENT_TIMESTAMP)
+    """
+    if retencao_meses is None:
+        retencao_meses = LOGS['retencao_meses']
+    agora = agora or datetime.now(timezone.utc)
+
+    meses = agora.year * 12 + (agora.month - 1) - retencao_meses
+    return f'{meses // 12:04d}-{meses % 12 + 1:02d}-01 00:00:00'
+
+
+def _caminho_arquivo(mes):
+    """Caminho do arquivo SQLite do mês (sem a extensão .gz)"""
+    return os.path.join(LOGS['arquivamento_dir'], f'logs_{mes}.db')
+
+
+def _descompactar(origem, destino):
+    """Descompacta um .gz em destino, de forma atômica"""
+    temporario = destino + '.tmp'
+    with gzip.open(origem, 'rb') as entrada, open(temporario, 'wb') as saida:
+        shutil.copyfileobj(entrada, saida, 1024 * 1024)
+    os.replace(temporario, destino)
+
+
+def _compactar(caminho):
+    """Compacta o arquivo do mês em .gz e remove o original"""
+    temporario = caminho + '.gz.tmp'
+    with open(caminho, 'rb') as entrada, \
+            gzip.open(temporario, 'wb', compresslevel=EXPORTACAO['nivel_gzip']) as saida:
+        shutil.copyfileobj(entrada, saida, 1024 * 1024)
+    os.replace(temporario, caminho + '.gz')
+    os.remove(caminho)
+
+
+def _abrir_arquivo_mes(mes):
+    """
+    Abre (ou cria) o arquivo do mês para gravação
+
+    Um mês já compactado é descompactado antes, para receber as linhas
+    que expiraram depois do último arquivamento.
+    """
+    caminho = _caminho_arquivo(mes)
+    if not os.path.exists(caminho) and os.path.exists(caminho + '.gz'):
+        _descompactar(caminho + '.gz', caminho)
+
+    conn = sqlite3.connect(caminho)
+    conn.execute(SQL_CREATE_LOGS_ARQUIVO)
+    return conn
+
+
+def arquivar_logs(retencao_meses=None, lote=None, pausa=None):
+    """
+    Move os logs expirados para os arquivos mensais, em lotes
+
+    Cada lote é gravado (commit) no arquivo do mês antes de ser excluído da
+    tabela logs em uma transação curta; entre os lotes o escritor fica livre
+    por LOGS['arquivamento_pausa'] segundos, então requisições que gravam
+    logs nunca aguardam o arquivamento inteiro. Uma interrupção entre as
+    duas etapas apenas repete o lote na próxima execução. Ao final, cada
+    mês alterado é compactado (logs_AAAA-MM.db.gz).
+
+    Args:
+        retencao_meses: Meses mantidos além do mês atual (padrão: LOGS['retencao_meses'])
+        lote: Linhas por transação (padrão: LOGS['arquivamento_lote'])
+        pausa: Segundos entre lotes (padrão: LOGS['arquivamento_pausa'])
+
+    Returns:
+        dict: {'limite', 'arquivados', 'lotes', 'meses': [...]}
+    """
+    limite = limite_retencao(retencao_meses)
+    lote = lote or LOGS['arquivamento_lote']
+    pausa = LOGS['arquivamento_pausa'] if pausa is None else pausa
+
+    arquivados = lotes = 0
+    arquivos = {}
+
+    with _trava_arquivamento:
+        os.makedirs(LOGS['arquivamento_dir'], exist_ok=True)
+
+        try:
+            while True:
+                with get_db_leitura() as conn:
+                    linhas = conn.execute(SQL_LOTE_EXPIRADO, (limite, lote)).fetchall()
+                if not linhas:
+                    break
+
+                por_mes = {}
+                for linha in linhas:
+                    por_mes.setdefault(linha['mes'], []).append(tuple(linha)[:len(COLUNAS_LOGS)])
+
+                for mes, registros in por_mes.items():
+                    if mes not in arquivos:
+                        arquivos[mes] = _abrir_arquivo_mes(mes)
+                    with arquivos[mes]:
+                        arquivos[mes].executemany(SQL_INSERIR_LOG_ARQUIVO, registros)
+
+                with get_db_escrita() as conn:
+                    iniciar_transacao_escrita(conn)
+                    try:
+                        conn.execute(
+                            "DELETE FROM logs WHERE id IN (SELECT value FROM json_each(?))",
+                            (json.dumps([linha['id'] for linha in linhas]),)
+                        )
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+
+                arquivados += len(linhas)
+                lotes += 1
+
+                if len(linhas) < lote:
+                    break
+                time.sleep(pausa)
+        finally:
+            for conn in arquivos.values():
+                conn.close()
+
+        for mes in arquivos:
+            _compactar(_caminho_arquivo(mes))
+
+    if arquivados:
+        logger.info(f"Logs arquivados: {arquivados} linha(s) anteriores a {limite} "
+                    f"em {len(arquivos)} arquivo(s) mensal(is)")
+
+    return {'limite': limite, 'arquivados': arquivados, 'lotes': lotes, 'meses': sorted(arquivos)}
+
+
+def listar_arquivos_logs():
+    """
+    Lista os arquivos mensais de logs
+
+    Returns:
+        list: Dicts {'mes', 'caminho', 'tamanho_bytes'}, do mês mais antigo ao mais recente
+    """
+    arquivos = []
+    for caminho in sorted(glob.glob(os.path.join(LOGS['arquivamento_dir'], 'logs_*.db.gz'))):
+        nome = os.path.basename(caminho)
+        arquivos.append({
+            'mes': nome[len('logs_'):-len('.db.gz')],
+            'caminho': caminho,
+            'tamanho_bytes': os.path.getsize(caminho)
+        })
+    return arquivos
+
+
+def _copia_consulta(arquivo):
+    """
+    Cópia descompactada do arquivo do mês para consulta (reaproveitada
+    enquanto o .gz não mudar)
+    """
+    pasta = os.path.join(LOGS['arquivamento_dir'], 'consulta')
+    os.makedirs(pasta, exist_ok=True)
+
+    copia = os.path.join(pasta, f"logs_{arquivo['mes']}.db")
+    if not os.path.exists(copia) or os.path.getmtime(copia) < os.path.getmtime(arquivo['caminho']):
+        _descompactar(arquivo['caminho'], copia)
+    return copia
+
+
+@contextmanager
+def consultar_logs_arquivados(mes_inicio=None, mes_fim=None):
+    """
+    Conexão somente leitura com os meses arquivados anexados (ATTACH)
+
+    Abre uma conexão própria (fora do pool, pois ATTACH altera a conexão)
+    sobre o banco principal, anexa cada mês do período como
+    'arquivo_AAAA_MM' e cria a view temporária logs_historico, que une a
+    tabela logs atual e os arquivos.
+
+    Usage:
+        with consultar_logs_arquivados('2024-01', '2024-06') as conn:
+            conn.execute("SELECT * FROM logs_historico WHERE usuario_id = ?", (1,))
+
+    Args:
+        mes_inicio: Primeiro mês 'AAAA-MM' (None = desde o mais antigo)
+        mes_fim: Último mês 'AAAA-MM' (None = até o mais recente)
+
+    Yields:
+        sqlite3.Connection: Conexão com logs_historico disponível
+
+    Raises:
+        ValueError: Se o período abranger mais meses do que o SQLite permite anexar
+    """
+    arquivos = [
+        arquivo for arquivo in listar_arquivos_logs()
+        if (mes_inicio is None or arquivo['mes'] >= mes_inicio)
+        and (mes_fim is None or arquivo['mes'] <= mes_fim)
+    ]
+
+    conn = sqlite3.connect(
+        f"file:{DATABASE['name']}?mode=ro", uri=True, timeout=DATABASE.get('timeout', 30.0)
+    )
+    conn.row_factory = sqlite3.Row
+    try:
+        maximo = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        if len(arquivos) > maximo:
+            raise ValueError(
+                f"Período abrange {len(arquivos)} meses arquivados; o máximo por consulta é {maximo}"
+            )
+
+        colunas = ', '.join(COLUNAS_LOGS)
+        consultas = [f'SELECT {colunas} FROM main.logs']
+        for arquivo in arquivos:
+            esquema = f"arquivo_{arquivo['mes'].replace('-', '_')}"
+            conn.execute(f"ATTACH DATABASE ? AS {esquema}", (f"file:{_copia_consulta(arquivo)}?mode=ro",))
+            consultas.append(f'SELECT {colunas} FROM {esquema}.logs')
+
+        conn.execute(f"CREATE TEMP VIEW logs_historico AS {' UNION ALL '.join(consultas)}")
+        yield conn
+    finally:
+        conn.close()
@@ -0,0 +1,520 @@
+# -*- coding: utf-8 -*-
+"""
+Servidor de Produção Multiprocesso
+Substitui o servidor de desenvolvimento do Werkzeug (app.run): um processo
+mestre abre o socket e mantém N workers pré-forkados. Cada worker importa a
+aplicação após o fork, inicia os próprios pools de conexões e atende as
+requisições em um pool limitado de threads, de modo que geração de PDFs e
+bcrypt de um worker não disputam o GIL com os demais
+
+Sinais do mestre:
+    SIGTERM / SIGINT: parada graciosa (requisições em andamento são concluídas)
+    SIGHUP: recarga graciosa (workers novos, com o código da aplicação
+            importado de novo, substituem os atuais)
+
+Usage:
+    python -m hgu serve --workers 4
+"""
+
+import importlib
+import os
+import random
+import selectors
+import signal
+import socket
+import sys
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+logger = logging.getLogger(__name__)
+
+# Intervalo dos laços de supervisão do mestre e dos workers (segundos)
+INTERVALO_SUPERVISAO = 0.2
+
+# Worker que termina antes disso é tratado como falha de inicialização: o
+# mestre espera ATRASO_RECRIACAO antes de recriá-lo, evitando um laço de forks
+VIDA_MINIMA_WORKER = 5.0
+ATRASO_RECRIACAO = 1.0
+
+# Pacotes da aplicação importados de novo em cada processo filho: o que o
+# mestre tiver importado (configuração, helpers) não pode chegar à recarga
+MODULOS_APLICACAO = ('app', 'src')
+
+
+def carregar_aplicacao():
+    """
+    Importa a aplicação Flask e inicia os pools de conexões do processo
+
+    Executada em cada worker, após o fork.
+
+    Returns:
+        Flask: Aplicação WSGI
+    """
+    from app import app
+    from src.core.database import iniciar_pools
+
+    iniciar_pools()
+    return app
+
+
+def _descartar_modulos(prefixos):
+    """
+    Remove de sys.modules os módulos herdados do mestre com esses prefixos
+
+    Chamada no processo filho, antes de carregar a aplicação, para que o
+    código e o .env atuais sejam lidos do disco.
+    """
+    for nome in list(sys.modules):
+        if any(nome == prefixo or nome.startswith(prefixo + '.') for prefixo in prefixos):
+            del sys.modules[nome]
+    importlib.invalidate_caches()
+
+
+def finalizar_aplicacao():
+    """Grava os logs de auditoria enfileirados antes de o worker terminar"""
+    from src.core.database import descarregar_logs
+
+    descarregar_logs()
+
+
+class _HandlerWorker(WSGIRequestHandler):
+    """Handler que limita a ociosidade das conexões e conta as requisições"""
+
+    def setup(self):
+        # Conexão keep-alive ociosa não pode prender uma thread do pool
+        self.timeout = self.server.keepalive
+        super().setup()
+
+    def run_wsgi(self):
+        if self.server.encerrando.is_set():
+            self.close_connection = True
+        try:
+            super().run_wsgi()
+        finally:
+            self.server.contar_requisicao()
+
+    def log_error(self, format, *args):
+        # O fechamento da conexão ociosa pelo timeout não é erro
+        if format.startswith('Request timed out'):
+            return
+        super().log_error(format, *args)
+
+
+class ServidorWorker(BaseWSGIServer):
+    """
+    Servidor WSGI de um worker sobre o socket aberto pelo mestre
+
+    Cada conexão é atendida por uma de `threads` threads. Com todas ocupadas
+    o worker deixa de aceitar conexões, que aguardam na fila do socket e são
+    aceitas pelos demais workers. Após `max_requests` requisições o evento
+    `encerrando` é sinalizado: o worker para de aceitar conexões na hora e
+    é reciclado.
+    """
+
+    multithread = True
+    multiprocess = True
+
+    def __init__(self, app, host, porta, fd, threads=8, max_requests=0, keepalive=5.0):
+        """
+        Args:
+            app: Aplicação WSGI
+            host, porta: Endereço do socket (usado na detecção da família e nos logs)
+            fd: Descritor do socket de escuta
+            threads: Conexões atendidas simultaneamente
+            max_requests: Requisições antes de pedir a reciclagem (0 = nunca)
+            keepalive: Segundos de ociosidade antes de fechar a conexão
+        """
+        super().__init__(host, porta, app, handler=_HandlerWorker, fd=fd)
+        # Vários workers aguardam no mesmo socket: quem não obtiver a conexão
+        # não pode ficar bloqueado em accept()
+        self.socket.setblocking(False)
+
+        self.threads = threads
+        self.max_requests = max_requests
+        self.keepalive = keepalive
+        self.encerrando = threading.Event()
+        self.atendidas = 0
+
+        self._contagem_lock = threading.Lock()
+        self._vagas = threading.BoundedSemaphore(threads)
+        self._executor = ThreadPoolExecutor(threads, thread_name_prefix='hgu-http')
+
+    def serve_forever(self, poll_interval=INTERVALO_SUPERVISAO):
+        """Aceita conexões até `encerrando` ser sinalizado (pendentes ficam para os outros workers)"""
+        with selectors.DefaultSelector() as seletor:
+            seletor.register(self, selectors.EVENT_READ)
+            while not self.encerrando.is_set():
+                if seletor.select(poll_interval):
+                    self._handle_request_noblock()
+
+    def process_request(self, request, client_address):
+        """Entrega a conexão a uma thread livre (aguarda se todas estiverem ocupadas)"""
+        self._vagas.acquire()
+        try:
+            self._executor.submit(self._atender, request, client_address)
+        except Exception:
+            self._vagas.release()
+            self.shutdown_request(request)
+            raise
+
+    def _atender(self, request, client_address):
+        """Atende a conexão (uma ou mais requisições keep-alive) em uma thread do pool"""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._vagas.release()
+
+    def contar_requisicao(self):
+        """Conta uma requisição atendida e sinaliza a reciclagem ao atingir o limite"""
+        with self._contagem_lock:
+            self.atendidas += 1
+            if self.max_requests and self.atendidas >= self.max_requests:
+                self.encerrando.set()
+
+    def aguardar_conclusao(self, timeout):
+        """
+        Aguarda o fim das conexões em andamento
+
+        Returns:
+            bool: True se todas terminaram dentro do timeout
+        """
+        prazo = time.monotonic() + timeout
+        adquiridas = 0
+        try:
+            while adquiridas < self.threads:
+                if not self._vagas.acquire(timeout=max(0.0, prazo - time.monotonic())):
+                    return False
+                adquiridas += 1
+            return True
+        finally:
+            for _ in range(adquiridas):
+                self._vagas.release()
+
+    def encerrar(self):
+        """Fecha o socket do worker e libera as threads do pool"""
+        self.server_close()
+        self._executor.shutdown(wait=False)
+
+
+def executar_worker(sock, host, porta, carregar_app, finalizar_app=None, threads=8,
+                    max_requests=0, keepalive=5.0, timeout_graceful=30.0, processo_filho=True):
+    """
+    Atende requisições no socket até receber SIGTERM, atingir max_requests
+    ou (processo filho) o mestre terminar
+
+    Args:
+        sock: Socket de escuta aberto pelo mestre
+        carregar_app: Callable que retorna a aplicação WSGI (chamado aqui, após o fork)
+        finalizar_app: Callable executado antes de o worker terminar
+        processo_filho: False quando o worker roda no próprio processo do mestre
+
+    Returns:
+        int: Código de saída do worker
+    """
+    parar = []
+    signal.signal(signal.SIGTERM, lambda *_: parar.append(True))
+    if processo_filho:
+        # Ctrl+C chega a todo o grupo de processos: a parada é coordenada pelo mestre
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    else:
+        signal.signal(signal.SIGINT, lambda *_: parar.append(True))
+
+    mestre = os.getppid()
+    servidor = None
+    try:
+        app = carregar_app()
+        servidor = ServidorWorker(
+            app, host, porta, sock.fileno(),
+            threads=threads, max_requests=max_requests, keepalive=keepalive
+        )
+        aceite = threading.Thread(
+            target=servidor.serve_forever, name='hgu-accept', daemon=True
+        )
+        aceite.start()
+
+        while not parar and not servidor.encerrando.is_set():
+            if processo_filho and os.getppid() != mestre:
+                logger.warning("Processo mestre terminou; encerrando worker")
+                break
+            time.sleep(INTERVALO_SUPERVISAO)
+
+        servidor.encerrando.set()
+        aceite.join()
+        if not servidor.aguardar_conclusao(timeout_graceful):
+            logger.warning(f"Worker {os.getpid()} encerrado com requisições em andamento")
+        return 0
+    except Exception as e:
+        logger.exception(f"Erro no worker {os.getpid()}: {e}")
+        return 1
+    finally:
+        if servidor is not None:
+            servidor.encerrar()
+        if finalizar_app is not None:
+            try:
+                finalizar_app()
+            except Exception as e:
+                logger.error(f"Erro ao finalizar worker {os.getpid()}: {e}")
+
+
+class ServidorPrefork:
+    """
+    Processo mestre: abre o socket, cria e supervisiona os workers
+
+    Workers que terminam (reciclagem por max_requests ou falha) são
+    recriados. Na recarga (SIGHUP) os workers novos são criados antes de os
+    antigos pararem de aceitar conexões; o socket permanece aberto no
+    mestre, então nenhuma conexão é recusada durante a troca.
+
+    Em sistemas sem fork (Windows) um único worker atende no próprio
+    processo, com o pool de threads.
+
+    Usage:
+        ServidorPrefork('0.0.0.0', 8080, workers=4).executar()
+    """
+
+    def __init__(self, host, porta, workers=2, threads=8, max_requests=0, max_requests_jitter=0,
+                 keepalive=5.0, timeout_graceful=30.0,
+                 carregar_app=carregar_aplicacao, finalizar_app=finalizar_aplicacao,
+                 modulos_aplicacao=MODULOS_APLICACAO):
+        """
+        Args:
+            host, porta: Endereço de escuta
+            workers: Processos atendendo requisições
+            threads: Threads por worker
+            max_requests: Requisições até reciclar um worker (0 = nunca)
+            max_requests_jitter: Acréscimo aleatório (0..jitter) ao limite de cada worker
+            keepalive: Segundos de ociosidade antes de fechar uma conexão
+            timeout_graceful: Segundos para um worker concluir as requisições ao parar
+            carregar_app: Callable executado em cada worker que retorna a aplicação WSGI
+            finalizar_app: Callable executado em cada worker antes de terminar
+            modulos_aplicacao: Pacotes descartados de sys.modules nos filhos, antes de carregar_app
+        """
+        if workers < 1 or threads < 1:
+            raise ValueError("O servidor precisa de pelo menos 1 worker e 1 thread")
+
+        self.host = host
+        self.porta = porta
+        self.workers = workers
+        self.threads = threads
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.keepalive = keepalive
+        self.timeout_graceful = timeout_graceful
+        self.carregar_app = carregar_app
+        self.finalizar_app = finalizar_app
+        self.modulos_aplicacao = modulos_aplicacao
+
+        self.socket = None
+        self._workers = {}  # pid -> instante de criação (geração atual)
+        self._encerrando = {}  # pid -> prazo para SIGKILL
+        self._sinais = []
+        self._proxima_criacao = 0.0
+
+    def abrir_socket(self):
+        """Cria o socket de escuta compartilhado pelos workers"""
+        familia = socket.AF_INET6 if ':' in self.host else socket.AF_INET
+        self.socket = socket.create_server(
+            (self.host, self.porta), family=familia, backlog=socket.SOMAXCONN
+        )
+        self.porta = self.socket.getsockname()[1]
+        return self.socket
+
+    def _opcoes_worker(self):
+        """Parâmetros de executar_worker para um novo worker"""
+        max_requests = self.max_requests
+        if max_requests and self.max_requests_jitter:
+            max_requests += random.randint(0, self.max_requests_jitter)
+
+        return {
+            'carregar_app': self.carregar_app,
+            'finalizar_app': self.finalizar_app,
+            'threads': self.threads,
+            'max_requests': max_requests,
+            'keepalive': self.keepalive,
+            'timeout_graceful': self.timeout_graceful
+        }
+
+    def executar(self):
+        """Executa o mestre até SIGTERM/SIGINT"""
+        if self.socket is None:
+            self.abrir_socket()
+
+        if not hasattr(os, 'fork'):
+            logger.warning("fork indisponível neste sistema: atendendo com um único processo")
+            opcoes = self._opcoes_worker()
+            opcoes['max_requests'] = 0
+            try:
+                return executar_worker(
+                    self.socket, self.host, self.porta, processo_filho=False, **opcoes
+                )
+            finally:
+                self.socket.close()
+
+        if not self.preparar():
+            self.socket.close()
+            raise RuntimeError("A aplicação não pôde ser carregada; servidor não iniciado")
+
+        for sinal in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sinal, self._registrar_sinal)
+
+        try:
+            while True:
+                while self._sinais:
+                    sinal = self._sinais.pop(0)
+                    if sinal == signal.SIGHUP:
+                        self.recarregar()
+                    else:
+                        print(f"🛑 Encerrando {len(self._workers)} worker(s)...")
+                        return 0
+
+                self._recolher()
+                self._completar()
+                time.sleep(INTERVALO_SUPERVISAO)
+        finally:
+            self._parar_todos()
+            self.socket.close()
+
+    def preparar(self):
+        """
+        Carrega a aplicação em um processo descartável antes de criar workers
+
+        Cria ou atualiza o esquema do banco uma única vez (e não em todos os
+        workers ao mesmo tempo) e confirma que o código importa sem erros.
+
+        Returns:
+            bool: True se a aplicação carregou
+        """
+        pid = os.fork()
+
+        if pid == 0:
+            codigo = 1
+            try:
+                _descartar_modulos(self.modulos_aplicacao)
+                self.carregar_app()
+                if self.finalizar_app is not None:
+                    self.finalizar_app()
+                codigo = 0
+            except Exception as e:
+                logger.exception(f"Erro ao carregar a aplicação: {e}")
+            finally:
+                os._exit(codigo)
+
+        _, status = os.waitpid(pid, 0)
+        return os.waitstatus_to_exitcode(status) == 0
+
+    def _registrar_sinal(self, sinal, _frame):
+        """Handler de sinais do mestre: apenas enfileira (tratado no laço)"""
+        self._sinais.append(sinal)
+
+    def _criar_worker(self):
+        """Cria um worker (fork); o filho nunca retorna desta função"""
+        opcoes = self._opcoes_worker()
+        pid = os.fork()
+
+        if pid == 0:
+            codigo = 1
+            try:
+                _descartar_modulos(self.modulos_aplicacao)
+                codigo = executar_worker(self.socket, self.host, self.porta, **opcoes)
+            finally:
+                os._exit(codigo)
+
+        self._workers[pid] = time.monotonic()
+        return pid
+
+    def _completar(self):
+        """Recria workers até a quantidade configurada"""
+        if time.monotonic() < self._proxima_criacao:
+            return
+        while len(self._workers) < self.workers:
+            self._criar_worker()
+
+    def _recolher(self):
+        """Recolhe workers encerrados e força a parada dos que excederam o prazo"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+
+            criado_em = self._workers.pop(pid, None)
+            self._encerrando.pop(pid, None)
+            if criado_em is None:
+                continue
+
+            codigo = os.waitstatus_to_exitcode(status)
+            if codigo != 0:
+                logger.warning(f"Worker {pid} terminou com código {codigo}")
+            if time.monotonic() - criado_em < VIDA_MINIMA_WORKER and codigo != 0:
+                self._proxima_criacao = time.monotonic() + ATRASO_RECRIACAO
+
+        agora = time.monotonic()
+        for pid, prazo in list(self._encerrando.items()):
+            if agora > prazo:
+                logger.warning(f"Worker {pid} não terminou a tempo; enviando SIGKILL")
+                self._sinalizar(pid, signal.SIGKILL)
+                self._encerrando[pid] = float('inf')
+
+    def _sinalizar(self, pid, sinal):
+        """Envia o sinal ao worker, ignorando processos que já terminaram"""
+        try:
+            os.kill(pid, sinal)
+        except ProcessLookupError:
+            pass
+
+    def _parar(self, pid):
+        """Pede a parada graciosa do worker"""
+        self._sinalizar(pid, signal.SIGTERM)
+        self._encerrando[pid] = time.monotonic() + self.timeout_graceful + 5
+
+    def recarregar(self):
+        """
+        Substitui todos os workers por novos, sem fechar o socket
+
+        Se a aplicação não carregar (ex: erro no código novo), os workers
+        atuais continuam atendendo.
+        """
+        if not self.preparar():
+            print("❌ Recarga cancelada: a aplicação não pôde ser carregada")
+            return
+
+        antigos = list(self._workers)
+        self._workers = {}
+        self._proxima_criacao = 0.0
+        self._completar()
+        for pid in antigos:
+            self._parar(pid)
+        print(f"🔄 Recarga: {len(antigos)} worker(s) substituído(s)")
+
+    def _parar_todos(self):
+        """Para todos os workers e aguarda o término (SIGKILL após o prazo)"""
+        for pid in list(self._workers):
+            self._parar(pid)
+        self._workers = {}
+
+        while self._encerrando:
+            self._recolher()
+            time.sleep(INTERVALO_SUPERVISAO)
+
+    def estatisticas(self):
+        """
+        Retorna os workers do mestre
+
+        Returns:
+            dict: PIDs ativos e em encerramento
+        """
+        return {
+            'workers': sorted(self._workers),
+            'encerrando': sorted(self._encerrando)
+        }
@@ -97,6 +97,18 @@ CREATE TABLE IF NOT EXISTS documentos (
 );
 """
 
+# Sequência de numeração dos documentos por (prefixo, sigla, ano)
+# Incrementada na mesma transação do INSERT em documentos
+SQL_CREATE_DOCUMENT_SEQUENCES = """
+CREATE TABLE IF NOT EXISTS document_sequences (
+    prefixo TEXT NOT NULL,
+    sigla TEXT NOT NULL,
+    ano INTEGER NOT NULL,
+    ultimo_numero INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (prefixo, sigla, ano)
+) WITHOUT ROWID;
+"""
+
 # Tabela de Auditoria
 SQL_CREATE_AUDITORIA = """
 CREATE TABLE IF NOT EXISTS auditoria (
@@ -122,7 +134,8 @@ CREATE TABLE IF NOT EXISTS templates_pdf (
     caminho_arquivo TEXT NOT NULL,
     mapeamento_campos TEXT,
     ativo INTEGER DEFAULT 1,
-    data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    hash_arquivo TEXT  -- SHA-256 do PDF (ETag do arquivo)
 );
 """
 
@@ -191,14 +204,57 @@ CREATE INDEX IF NOT EXISTS idx_documentos_codigo
 ON documentos(codigo_unico);
 """
 
+# Índices da busca de documentos: cada filtro de igualdade seguido da chave
+# de ordenação (data_emissao, id), servindo filtro + período + ORDER BY.
+# Colunas opcionais usam índice parcial (linhas NULL nunca são buscadas).
 SQL_CREATE_INDEX_DOCUMENTOS_PACIENTE = """
-CREATE INDEX IF NOT EXISTS idx_documentos_paciente
-ON documentos(paciente_id);
+CREATE INDEX IF NOT EXISTS idx_documentos_paciente_data
+ON documentos(paciente_id, data_emissao DESC, id DESC)
+WHERE paciente_id IS NOT NULL;
+"""
+
+# Substituído por idx_documentos_paciente_data
+SQL_DROP_INDEX_DOCUMENTOS_PACIENTE_ANTIGO = """
+DROP INDEX IF EXISTS idx_documentos_paciente;
+"""
+
+SQL_CREATE_INDEX_DOCUMENTOS_TIPO = """
+CREATE INDEX IF NOT EXISTS idx_documentos_tipo_data
+ON documentos(tipo_documento, data_emissao DESC, id DESC);
+"""
+
+SQL_CREATE_INDEX_DOCUMENTOS_STATUS = """
+CREATE INDEX IF NOT EXISTS idx_documentos_status_data
+ON documentos(status, data_emissao DESC, id DESC);
+"""
+
+SQL_CREATE_INDEX_DOCUMENTOS_PROFISSIONAL = """
+CREATE INDEX IF NOT EXISTS idx_documentos_profissional_data
+ON documentos(profissional_id, data_emissao DESC, id DESC)
+WHERE profissional_id IS NOT NULL;
+"""
+
+SQL_CREATE_INDEX_DOCUMENTOS_SETOR_ORIGEM = """
+CREATE INDEX IF NOT EXISTS idx_documentos_origem_data
+ON documentos(setor_origem_id, data_emissao DESC, id DESC)
+WHERE setor_origem_id IS NOT NULL;
+"""
+
+SQL_CREATE_INDEX_DOCUMENTOS_SETOR_DESTINO = """
+CREATE INDEX IF NOT EXISTS idx_documentos_destino_data
+ON documentos(setor_destino_id, data_emissao DESC, id DESC)
+WHERE setor_destino_id IS NOT NULL;
 """
 
+# Chave da paginação por cursor: (data_emissao, id) na ordem da listagem
 SQL_CREATE_INDEX_DOCUMENTOS_DATA = """
-CREATE INDEX IF NOT EXISTS idx_documentos_data
-ON documentos(data_emissao DESC);
+CREATE INDEX IF NOT EXISTS idx_documentos_data_id
+ON documentos(data_emissao DESC, id DESC);
+"""
+
+# Substituído por idx_documentos_data_id
+SQL_DROP_INDEX_DOCUMENTOS_DATA_ANTIGO = """
+DROP INDEX IF EXISTS idx_documentos_data;
 """
 
 SQL_CREATE_INDEX_PACIENTES_PREC = """
@@ -211,9 +267,27 @@ CREATE UNIQUE INDEX IF NOT EXISTS idx_usuarios_login
 ON usuarios(login);
 """
 
+# Índices da consulta de logs (/api/logs): filtro seguido da chave de
+# paginação (data_hora, id) na ordem da listagem
 SQL_CREATE_INDEX_LOGS_USUARIO = """
-CREATE INDEX IF NOT EXISTS idx_logs_usuario
-ON logs(usuario_id, data_hora DESC);
+CREATE INDEX IF NOT EXISTS idx_logs_usuario_data
+ON logs(usuario_id, data_hora DESC, id DESC)
+WHERE usuario_id IS NOT NULL;
+"""
+
+# Substituído por idx_logs_usuario_data
+SQL_DROP_INDEX_LOGS_USUARIO_ANTIGO = """
+DROP INDEX IF EXISTS idx_logs_usuario;
+"""
+
+SQL_CREATE_INDEX_LOGS_MODULO = """
+CREATE INDEX IF NOT EXISTS idx_logs_modulo_data
+ON logs(modulo, data_hora DESC, id DESC);
+"""
+
+SQL_CREATE_INDEX_LOGS_DATA = """
+CREATE INDEX IF NOT EXISTS idx_logs_data_id
+ON logs(data_hora DESC, id DESC);
 """
 
 SQL_CREATE_INDEX_AUDITORIA_DOCUMENTO = """
@@ -221,11 +295,484 @@ CREATE INDEX IF NOT EXISTS idx_auditoria_documento
 ON auditoria(documento_id, data_auditoria DESC);
 """
 
+# Fila de auditoria: documentos aguardando auditor, dos mais antigos para os
+# mais recentes. Índice parcial: só contém os pendentes, então a fila não
+# cresce com o histórico já auditado. As consultas devem repetir
+# SQL_CONDICAO_PENDENTES literalmente para o planejador usar o índice.
+STATUS_PENDENTES_AUDITORIA = ('Emitido', 'Revisado')
+SQL_CONDICAO_PENDENTES = (
+    f"status IN ({', '.join(repr(status) for status in STATUS_PENDENTES_AUDITORIA)})"
+)
+
+# Transições de status permitidas na auditoria (status atual -> novos).
+# Aprovado é final; um indeferido só volta à fila como Revisado (corrigido)
+TRANSICOES_AUDITORIA = {
+    'Emitido': ('Aprovado', 'Indeferido', 'Revisado'),
+    'Revisado': ('Aprovado', 'Indeferido'),
+    'Indeferido': ('Revisado',),
+    'Aprovado': ()
+}
+
+SQL_CREATE_INDEX_DOCUMENTOS_PENDENTES = f"""
+CREATE INDEX IF NOT EXISTS idx_documentos_pendentes
+ON documentos(data_emissao, id)
+WHERE {SQL_CONDICAO_PENDENTES};
+"""
+
+# Reservas (leases) de documentos por auditor: um documento reservado não é
+# entregue a outro auditor até a reserva expirar (expira_em em UTC)
+SQL_CREATE_AUDITORIA_RESERVAS = """
+CREATE TABLE IF NOT EXISTS auditoria_reservas (
+    documento_id INTEGER PRIMARY KEY,
+    auditor_id INTEGER NOT NULL,
+    expira_em TIMESTAMP NOT NULL,
+    FOREIGN KEY (documento_id) REFERENCES documentos(id),
+    FOREIGN KEY (auditor_id) REFERENCES usuarios(id)
+);
+"""
+
+SQL_CREATE_INDEX_AUDITORIA_RESERVAS = """
+CREATE INDEX IF NOT EXISTS idx_auditoria_reservas_auditor
+ON auditoria_reservas(auditor_id, expira_em);
+"""
+
 SQL_CREATE_INDEX_BACKUPS_DATA = """
 CREATE INDEX IF NOT EXISTS idx_backups_data
 ON backups(data_criacao DESC);
 """
 
+# Listagem de pacientes ativos em ordem alfabética (paginação por cursor)
+SQL_CREATE_INDEX_PACIENTES_NOME = """
+CREATE INDEX IF NOT EXISTS idx_pacientes_nome
+ON pacientes(nome_completo, id)
+WHERE ativo = 1;
+"""
+
+# Busca textual de pacientes (FTS5, conteúdo externo = tabela pacientes)
+# remove_diacritics: 'joao' encontra 'João'; prefix: índices para buscas
+# de 2 a 4 caracteres enquanto o usuário digita
+SQL_CREATE_PACIENTES_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS pacientes_fts USING fts5(
+    nome_completo,
+    prec_cp,
+    posto,
+    om,
+    content='pacientes',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3 4'
+);
+"""
+
+# Triggers que mantêm pacientes_fts sincronizada com pacientes
+SQL_TRIGGERS_PACIENTES_FTS = [
+    """
+CREATE TRIGGER IF NOT EXISTS trg_pacientes_fts_insert
+AFTER INSERT ON pacientes
+BEGIN
+    INSERT INTO pacientes_fts (rowid, nome_completo, prec_cp, posto, om)
+    VALUES (new.id, new.nome_completo, new.prec_cp, new.posto, new.om);
+END;
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS trg_pacientes_fts_delete
+AFTER DELETE ON pacientes
+BEGIN
+    INSERT INTO pacientes_fts (pacientes_fts, rowid, nome_completo, prec_cp, posto, om)
+    VALUES ('delete', old.id, old.nome_completo, old.prec_cp, old.posto, old.om);
+END;
+""",
+    """
+CREATE TRIGGER IF NOT EXISTS trg_pacientes_fts_update
+AFTER UPDATE OF nome_completo, prec_cp, posto, om ON pacientes
+BEGIN
+    INSERT INTO pacientes_fts (pacientes_fts, rowid, nome_completo, prec_cp, posto, om)
+    VALUES ('delete', old.id, old.nome_completo, old.prec_cp, old.posto, old.om);
+    INSERT INTO pacientes_fts (rowid, nome_completo, prec_cp, posto, om)
+    VALUES (new.id, new.nome_completo, new.prec_cp, new.posto, new.om);
+END;
+"""
+]
+
+# Reconstrói o índice a partir da tabela pacientes (bancos anteriores ao FTS)
+SQL_REBUILD_PACIENTES_FTS = """
+INSERT INTO pacientes_fts (pacientes_fts) VALUES ('rebuild');
+"""
+
+# Busca textual no conteúdo clínico dos documentos (FTS5)
+# O texto fica apenas em documentos.conteudo_json: a view documentos_texto
+# extrai os campos e serve de conteúdo externo, então o índice não guarda
+# uma segunda cópia (snippet/highlight leem o texto pela view)
+COLUNAS_FTS_DOCUMENTOS = [
+    'diagnostico',
+    'motivo',
+    'exame_solicitado',
+    'texto_declaracao',
+    'observacoes'
+]
+
+SQL_CREATE_VIEW_DOCUMENTOS_TEXTO = """
+CREATE VIEW IF NOT EXISTS documentos_texto AS
+SELECT id,
+       json_extract(conteudo, '$.diagnostico') AS diagnostico,
+       COALESCE(json_extract(conteudo, '$.motivo'),
+                json_extract(conteudo, '$.motivo_atestado')) AS motivo,
+       json_extract(conteudo, '$.exame_solicitado') AS exame_solicitado,
+       json_extract(conteudo, '$.texto_declaracao') AS texto_declaracao,
+       json_extract(conteudo, '$.observacoes') AS observacoes
+FROM (
+    SELECT id, CASE WHEN json_valid(conteudo_json) THEN conteudo_json END AS conteudo
+    FROM documentos
+);
+"""
+
+SQL_CREATE_DOCUMENTOS_FTS = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS documentos_fts USING fts5(
+    {', '.join(COLUNAS_FTS_DOCUMENTOS)},
+    content='documentos_texto',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+
+def gerar_sql_triggers_documentos_fts():
+    """
+    Gera os triggers que mantêm documentos_fts sincronizada
+
+    Os valores vêm sempre da view documentos_texto, garantindo que a remoção
+    ('delete') receba exatamente o texto que foi indexado. Remoções rodam
+    BEFORE (a linha antiga ainda existe) e inserções AFTER.
+
+    Returns:
+        list: Comandos SQL
+    """
+    colunas = ', '.join(COLUNAS_FTS_DOCUMENTOS)
+    inserir = (
+        f"INSERT INTO documentos_fts (rowid, {colunas}) "
+        f"SELECT id, {colunas} FROM documentos_texto WHERE id = new.id;"
+    )
+    remover = (
+        f"INSERT INTO documentos_fts (documentos_fts, rowid, {colunas}) "
+        f"SELECT 'delete', id, {colunas} FROM documentos_texto WHERE id = old.id;"
+    )
+
+    gatilhos = [
+        ('insert', 'AFTER INSERT', inserir),
+        ('delete', 'BEFORE DELETE', remover),
+        ('update_antes', 'BEFORE UPDATE OF conteudo_json', remover),
+        ('update_depois', 'AFTER UPDATE OF conteudo_json', inserir)
+    ]
+
+    return [
+        f"""
+CREATE TRIGGER IF NOT EXISTS trg_documentos_fts_{nome}
+{evento} ON documentos
+BEGIN
+    {corpo}
+END;
+"""
+        for nome, evento, corpo in gatilhos
+    ]
+
+
+SQL_TRIGGERS_DOCUMENTOS_FTS = gerar_sql_triggers_documentos_fts()
+
+SQL_REBUILD_DOCUMENTOS_FTS = """
+INSERT INTO documentos_fts (documentos_fts) VALUES ('rebuild');
+"""
+
+# Índices textuais e o comando que os reconstrói a partir da tabela de origem
+# (executado por inicializar_db quando o índice é criado em banco existente)
+INDICES_FTS = {
+    'pacientes_fts': SQL_REBUILD_PACIENTES_FTS,
+    'documentos_fts': SQL_REBUILD_DOCUMENTOS_FTS
+}
+
+# Contadores do dashboard mantidos por triggers (evita COUNT(*) por acesso)
+# Chaves: 'documentos', 'documentos.status:<status>', 'pacientes.ativos' e
+# 'profissionais.ativos'. Recalculáveis por recalcular_contadores()
+SQL_CREATE_CONTADORES = """
+CREATE TABLE IF NOT EXISTS contadores (
+    chave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+
+def _sql_somar_contador(chave, delta):
+    """Comando (dentro de trigger) que soma delta ao contador, criando-o se preciso"""
+    return (
+        f"INSERT INTO contadores (chave, valor) VALUES ({chave}, {delta}) "
+        f"ON CONFLICT(chave) DO UPDATE SET valor = valor + excluded.valor;"
+    )
+
+
+def gerar_sql_triggers_contadores():
+    """
+    Gera os triggers que mantêm a tabela contadores exata
+
+    Returns:
+        list: Comandos SQL
+    """
+    status_novo = "'documentos.status:' || COALESCE(new.status, '')"
+    status_antigo = "'documentos.status:' || COALESCE(old.status, '')"
+
+    gatilhos = [
+        ('documentos_insert', 'AFTER INSERT ON documentos', '',
+         [_sql_somar_contador("'documentos'", 1), _sql_somar_contador(status_novo, 1)]),
+        ('documentos_delete', 'AFTER DELETE ON documentos', '',
+         [_sql_somar_contador("'documentos'", -1), _sql_somar_contador(status_antigo, -1)]),
+        ('documentos_status', 'AFTER UPDATE OF status ON documentos',
+         'WHEN old.status IS NOT new.status',
+         [_sql_somar_contador(status_antigo, -1), _sql_somar_contador(status_novo, 1)])
+    ]
+
+    # Cadastros contados apenas quando ativos
+    for tabela in ('pacientes', 'profissionais'):
+        chave = f"'{tabela}.ativos'"
+        gatilhos += [
+            (f'{tabela}_insert', f'AFTER INSERT ON {tabela}', 'WHEN new.ativo = 1',
+             [_sql_somar_contador(chave, 1)]),
+            (f'{tabela}_delete', f'AFTER DELETE ON {tabela}', 'WHEN old.ativo = 1',
+             [_sql_somar_contador(chave, -1)]),
+            (f'{tabela}_ativo', f'AFTER UPDATE OF ativo ON {tabela}',
+             'WHEN (old.ativo = 1) IS NOT (new.ativo = 1)',
+             [_sql_somar_contador(chave, '(new.ativo = 1) - (old.ativo = 1)')])
+        ]
+
+    comandos = []
+    for nome, evento, condicao, corpo in gatilhos:
+        cabecalho = f"{evento} {condicao}".strip()
+        instrucoes = '\n    '.join(corpo)
+        comandos.append(f"""
+CREATE TRIGGER IF NOT EXISTS trg_contadores_{nome}
+{cabecalho}
+BEGIN
+    {instrucoes}
+END;
+""")
+
+    return comandos
+
+
+SQL_TRIGGERS_CONTADORES = gerar_sql_triggers_contadores()
+
+# Recalcula todos os contadores a partir das tabelas (reparo)
+SQL_RECALCULAR_CONTADORES = [
+    "DELETE FROM contadores;",
+    "INSERT INTO contadores (chave, valor) SELECT 'documentos', COUNT(*) FROM documentos;",
+    """
+INSERT INTO contadores (chave, valor)
+SELECT 'documentos.status:' || COALESCE(status, ''), COUNT(*)
+FROM documentos
+GROUP BY status;
+""",
+    "INSERT INTO contadores (chave, valor) SELECT 'pacientes.ativos', COUNT(*) FROM pacientes WHERE ativo = 1;",
+    "INSERT INTO contadores (chave, valor) SELECT 'profissionais.ativos', COUNT(*) FROM profissionais WHERE ativo = 1;"
+]
+
+# Resumos (rollups) de documentos por período, mantidos por triggers
+# Uma linha por (período, dimensão, valor): cada documento conta uma vez em
+# cada dimensão, o que mantém o resumo mensal com poucas linhas mesmo após
+# anos de emissões. Valores nulos são gravados como 0 (ids) ou '' (status),
+# pois colunas de PRIMARY KEY em tabelas WITHOUT ROWID não aceitam NULL.
+DIMENSOES_RESUMO = {
+    'tipo_documento': ('tipo_documento', None),
+    'setor_origem': ('setor_origem_id', '0'),
+    'setor_destino': ('setor_destino_id', '0'),
+    'profissional': ('profissional_id', '0'),
+    'status': ('status', "''")
+}
+
+# Tabela de resumo -> (coluna do período, expressão SQLite do período)
+PERIODOS_RESUMO = {
+    'resumo_documentos_diario': ('dia', "date({data})"),
+    'resumo_documentos_mensal': ('mes', "strftime('%Y-%m', {data})")
+}
+
+
+def gerar_sql_tabelas_resumo():
+    """
+    Gera o CREATE TABLE das tabelas de resumo diário e mensal
+
+    Returns:
+        list: Comandos SQL
+    """
+    return [
+        f"""
+CREATE TABLE IF NOT EXISTS {tabela} (
+    {periodo} TEXT NOT NULL,
+    dimensao TEXT NOT NULL,
+    valor NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimensao, {periodo}, valor)
+) WITHOUT ROWID;
+"""
+        for tabela, (periodo, _) in PERIODOS_RESUMO.items()
+    ]
+
+
+def _sql_valor_dimensao(dimensao, linha=''):
+    """Expressão do valor da dimensão para o documento (linha: 'new', 'old' ou '')"""
+    coluna, valor_nulo = DIMENSOES_RESUMO[dimensao]
+    if linha:
+        coluna = f'{linha}.{coluna}'
+    return coluna if valor_nulo is None else f'COALESCE({coluna}, {valor_nulo})'
+
+
+def _sql_somar_resumo(tabela, dimensao, linha, delta):
+    """Comando (dentro de trigger) que soma delta ao resumo do documento new/old"""
+    periodo, expressao = PERIODOS_RESUMO[tabela]
+    data = expressao.format(data=f"COALESCE({linha}.data_emissao, CURRENT_TIMESTAMP)")
+    return (
+        f"INSERT INTO {tabela} ({periodo}, dimensao, valor, total) "
+        f"VALUES ({data}, '{dimensao}', {_sql_valor_dimensao(dimensao, linha)}, {delta}) "
+        f"ON CONFLICT(dimensao, {periodo}, valor) DO UPDATE SET total = total + excluded.total;"
+    )
+
+
+def gerar_sql_triggers_resumo():
+    """
+    Gera os triggers que mantêm os resumos diário e mensal
+
+    Emissão soma 1 e exclusão subtrai 1 em todas as dimensões. Alterações
+    têm um trigger por dimensão, que só move a linha da dimensão alterada
+    (ex: mudança de status na auditoria não toca tipo, setores e profissional)
+    ou de todas, se a data de emissão mudar.
+
+    Returns:
+        list: Comandos SQL
+    """
+    def movimentos(dimensoes, linhas):
+        return [
+            _sql_somar_resumo(tabela, dimensao, linha, delta)
+            for linha, delta in linhas
+            for dimensao in dimensoes
+            for tabela in PERIODOS_RESUMO
+        ]
+
+    gatilhos = [
+        ('insert', 'AFTER INSERT ON documentos', movimentos(DIMENSOES_RESUMO, [('new', 1)])),
+        ('delete', 'AFTER DELETE ON documentos', movimentos(DIMENSOES_RESUMO, [('old', -1)]))
+    ]
+
+    for dimensao, (coluna, _) in DIMENSOES_RESUMO.items():
+        evento = (
+            f"AFTER UPDATE OF {coluna}, data_emissao ON documentos "
+            f"WHEN old.{coluna} IS NOT new.{coluna} OR old.data_emissao IS NOT new.data_emissao"
+        )
+        gatilhos.append((dimensao, evento, movimentos([dimensao], [('old', -1), ('new', 1)])))
+
+    comandos = []
+    for nome, evento, instrucoes in gatilhos:
+        corpo = '\n    '.join(instrucoes)
+        comandos.append(f"""
+CREATE TRIGGER IF NOT EXISTS trg_resumo_documentos_{nome}
+{evento}
+BEGIN
+    {corpo}
+END;
+""")
+
+    return comandos
+
+
+SQL_TABELAS_RESUMO = gerar_sql_tabelas_resumo()
+SQL_TRIGGERS_RESUMO = gerar_sql_triggers_resumo()
+
+
+def gerar_sql_recalcular_resumo(tabela):
+    """
+    Gera os comandos que recalculam um resumo para um intervalo de datas
+
+    Parâmetros nomeados: :inicio e :fim (datas 'AAAA-MM-DD', fim exclusivo).
+    Para o resumo mensal o intervalo deve cobrir meses inteiros.
+
+    Returns:
+        list: Comandos SQL (DELETE do intervalo + um INSERT agrupado por dimensão)
+    """
+    periodo, expressao = PERIODOS_RESUMO[tabela]
+    data = expressao.format(data="COALESCE(data_emissao, CURRENT_TIMESTAMP)")
+    comandos = [
+        f"DELETE FROM {tabela} WHERE {periodo} >= {expressao.format(data=':inicio')} "
+        f"AND {periodo} < {expressao.format(data=':fim')};"
+    ]
+    for dimensao in DIMENSOES_RESUMO:
+        comandos.append(f"""
+INSERT INTO {tabela} ({periodo}, dimensao, valor, total)
+SELECT {data}, '{dimensao}', {_sql_valor_dimensao(dimensao)}, COUNT(*)
+FROM documentos
+WHERE data_emissao >= :inicio AND data_emissao < :fim
+GROUP BY 1, 3;
+""")
+    return comandos
+
+
+# Versão por tabela, incrementada por triggers a cada alteração
+# Permite que caches em memória (de qualquer processo) detectem mudanças
+# consultando uma única linha pela chave primária
+SQL_CREATE_VERSOES_TABELAS = """
+CREATE TABLE IF NOT EXISTS versoes_tabelas (
+    tabela TEXT PRIMARY KEY,
+    versao INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+# Tabelas cuja versão é mantida em versoes_tabelas: configurações (snapshot
+# em memória) e cadastros de pouca alteração servidos com ETag pela API.
+# Tabelas de alto volume de escrita (documentos, pacientes, logs) ficam de fora
+TABELAS_VERSIONADAS = [
+    'configuracoes',
+    'setores',
+    'profissionais',
+    'templates_pdf'
+]
+
+
+def gerar_sql_versao_tabela(tabela):
+    """
+    Gera os comandos que registram a tabela em versoes_tabelas e criam os
+    triggers de INSERT, UPDATE e DELETE que incrementam sua versão
+
+    Args:
+        tabela: Nome da tabela (deve constar em TABELAS_VERSIONADAS)
+
+    Returns:
+        list: Comandos SQL
+    """
+    comandos = [
+        f"INSERT OR IGNORE INTO versoes_tabelas (tabela, versao) VALUES ('{tabela}', 0);"
+    ]
+
+    for evento in ('INSERT', 'UPDATE', 'DELETE'):
+        comandos.append(f"""
+CREATE TRIGGER IF NOT EXISTS trg_versao_{tabela}_{evento.lower()}
+AFTER {evento} ON {tabela}
+BEGIN
+    UPDATE versoes_tabelas SET versao = versao + 1 WHERE tabela = '{tabela}';
+END;
+""")
+
+    return comandos
+
+
+SQL_VERSOES_TABELAS = [
+    comando
+    for tabela in TABELAS_VERSIONADAS
+    for comando in gerar_sql_versao_tabela(tabela)
+]
+
+# Colunas acrescentadas a tabelas já existentes: (tabela, coluna, definição)
+# Bancos criados antes recebem ALTER TABLE ADD COLUMN em inicializar_db
+COLUNAS_ADICIONADAS = [
+    ('templates_pdf', 'hash_arquivo', 'TEXT')
+]
+
+# Versão do esquema gravada em PRAGMA user_version ao final de inicializar_db
+# Incrementar ao alterar tabelas, índices, COLUNAS_ADICIONADAS ou backfills
+VERSAO_ESQUEMA = 1
+
 # Lista de todos os comandos SQL para criar tabelas e índices
 ALL_TABLES = [
     SQL_CREATE_CONFIG,
@@ -234,6 +781,7 @@ ALL_TABLES = [
     SQL_CREATE_PACIENTES,
     SQL_CREATE_PROFISSIONAIS,
     SQL_CREATE_DOCUMENTOS,
+    SQL_CREATE_DOCUMENT_SEQUENCES,
     SQL_CREATE_AUDITORIA,
     SQL_CREATE_TEMPLATES,
     SQL_CREATE_TEMPLATE_FIELDS,
@@ -242,11 +790,36 @@ ALL_TABLES = [
     SQL_CREATE_INDEX_TEMPLATE_FIELDS,
     SQL_CREATE_INDEX_DOCUMENTOS_CODIGO,
     SQL_CREATE_INDEX_DOCUMENTOS_PACIENTE,
+    SQL_DROP_INDEX_DOCUMENTOS_PACIENTE_ANTIGO,
+    SQL_CREATE_INDEX_DOCUMENTOS_TIPO,
+    SQL_CREATE_INDEX_DOCUMENTOS_STATUS,
+    SQL_CREATE_INDEX_DOCUMENTOS_PROFISSIONAL,
+    SQL_CREATE_INDEX_DOCUMENTOS_SETOR_ORIGEM,
+    SQL_CREATE_INDEX_DOCUMENTOS_SETOR_DESTINO,
     SQL_CREATE_INDEX_DOCUMENTOS_DATA,
+    SQL_DROP_INDEX_DOCUMENTOS_DATA_ANTIGO,
     SQL_CREATE_INDEX_PACIENTES_PREC,
+    SQL_CREATE_INDEX_PACIENTES_NOME,
+    SQL_CREATE_PACIENTES_FTS,
+    *SQL_TRIGGERS_PACIENTES_FTS,
+    SQL_CREATE_VIEW_DOCUMENTOS_TEXTO,
+    SQL_CREATE_DOCUMENTOS_FTS,
+    *SQL_TRIGGERS_DOCUMENTOS_FTS,
     SQL_CREATE_INDEX_USUARIOS_LOGIN,
     SQL_CREATE_INDEX_LOGS_USUARIO,
+    SQL_DROP_INDEX_LOGS_USUARIO_ANTIGO,
+    SQL_CREATE_INDEX_LOGS_MODULO,
+    SQL_CREATE_INDEX_LOGS_DATA,
     SQL_CREATE_INDEX_AUDITORIA_DOCUMENTO,
-    SQL_CREATE_INDEX_BACKUPS_DATA
+    SQL_CREATE_INDEX_DOCUMENTOS_PENDENTES,
+    SQL_CREATE_AUDITORIA_RESERVAS,
+    SQL_CREATE_INDEX_AUDITORIA_RESERVAS,
+    SQL_CREATE_INDEX_BACKUPS_DATA,
+    SQL_CREATE_CONTADORES,
+    *SQL_TRIGGERS_CONTADORES,
+    *SQL_TABELAS_RESUMO,
+    *SQL_TRIGGERS_RESUMO,
+    SQL_CREATE_VERSOES_TABELAS,
+    *SQL_VERSOES_TABELAS
 ]
 
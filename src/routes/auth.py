@@ -12,10 +12,11 @@ from datetime import datetime
 
 from src.core.database import (
     verificar_setup_inicial, salvar_configuracao, criar_setores_padrao,
-    criar_usuario_admin, verificar_senha, registrar_log, get_db_connection
+    criar_usuario_admin, verificar_senha, registrar_log, get_db_leitura, get_db_escrita
 )
 from src.schemas import LoginSchema, SetupSchema
 from src.core.security import log_security_event
+from src.core.hash_senhas import HashSobrecarregadoError
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +46,7 @@ def login():
             senha = dados['senha']
 
             # Buscar usuário
-            with get_db_connection() as conn:
+            with get_db_leitura() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, nome, senha_hash, nivel_acesso, ativo
@@ -72,7 +73,7 @@ def login():
                     logger.info(f"Sessão regenerada para usuário ID: {usuario['id']}")
 
                 # Atualizar último acesso
-                with get_db_connection() as conn:
+                with get_db_escrita() as conn:
                     cursor = conn.cursor()
                     cursor.execute("""
                         UPDATE usuarios
@@ -116,6 +117,15 @@ def login():
                     'mensagem': 'Login ou senha incorretos'
                 }), 401
 
+        except HashSobrecarregadoError as e:
+            logger.warning(f"Login recusado por sobrecarga do hash de senhas: {e}")
+            resposta = jsonify({
+                'sucesso': False,
+                'mensagem': 'Servidor ocupado. Tente novamente em instantes.'
+            })
+            resposta.headers['Retry-After'] = str(e.retry_after)
+            return resposta, 503
+
         except Exception as e:
             logger.error(f"Erro no login: {e}")
             return jsonify({
@@ -4,7 +4,8 @@ Schemas de Validação de Dados
 Usa Marshmallow para validar dados de entrada da API
 """
 
-from marshmallow import Schema, fields, validates, ValidationError, validate
+from marshmallow import Schema, fields, validates, validates_schema, ValidationError, validate
+from src.config import AUDITORIA, TIPOS_DOCUMENTOS, STATUS_AUDITORIA
 from src.utils.helpers import validate_prec_cp
 
 
@@ -72,17 +73,17 @@ class ProfissionalSchema(Schema):
     setor_id = fields.Int(required=False, allow_none=True)
 
 
+class ProfissionalRosterSchema(ProfissionalSchema):
+    """Schema para uma linha do roster de profissionais (importação em lote)"""
+    crm_coren = fields.Str(required=True, validate=validate.Length(min=3, max=50))
+    setor = fields.Str(required=False, validate=validate.Length(max=100))  # Nome ou sigla
+
+
 class DocumentoSchema(Schema):
     """Schema para criação de documento"""
     tipo_documento = fields.Str(
         required=True,
-        validate=validate.OneOf([
-            'Guia de Exame',
-            'Encaminhamento Médico',
-            'Guia de Internação',
-            'Declaração',
-            'Atestado Administrativo'
-        ])
+        validate=validate.OneOf(TIPOS_DOCUMENTOS)
     )
     paciente_id = fields.Int(required=True)
     profissional_id = fields.Int(required=True)
@@ -91,6 +92,65 @@ class DocumentoSchema(Schema):
     conteudo = fields.Dict(required=True)
 
 
+class PeriodoSchema(Schema):
+    """Base dos filtros por período: data_inicio não pode ser posterior a data_fim"""
+    data_inicio = fields.Date(required=False)
+    data_fim = fields.Date(required=False)
+
+    @validates_schema
+    def validate_periodo(self, data, **kwargs):
+        """Data inicial não pode ser posterior à final"""
+        if data.get('data_inicio') and data.get('data_fim') and data['data_inicio'] > data['data_fim']:
+            raise ValidationError("Data inicial posterior à data final", 'data_inicio')
+
+
+class BuscaDocumentosSchema(PeriodoSchema):
+    """Schema para filtros da busca de documentos (query string)"""
+    tipo_documento = fields.Str(
+        required=False,
+        validate=validate.OneOf(TIPOS_DOCUMENTOS)
+    )
+    status = fields.Str(
+        required=False,
+        validate=validate.OneOf(STATUS_AUDITORIA)
+    )
+    setor_origem_id = fields.Int(required=False)
+    setor_destino_id = fields.Int(required=False)
+    profissional_id = fields.Int(required=False)
+    paciente_id = fields.Int(required=False)
+    prec_cp = fields.Str(required=False, validate=validate.Length(min=6, max=20))
+    limite = fields.Int(required=False, validate=validate.Range(min=1, max=1000))
+    cursor = fields.Str(required=False, validate=validate.Length(max=500))
+
+
+class ExportarDocumentosSchema(BuscaDocumentosSchema):
+    """Schema para exportação CSV de documentos (filtros da busca, sem paginação)"""
+    gzip = fields.Bool(required=False, load_default=False)
+
+    class Meta:
+        exclude = ('limite', 'cursor')
+
+
+class ExportarLogsSchema(PeriodoSchema):
+    """Schema para exportação CSV dos logs de auditoria"""
+    gzip = fields.Bool(required=False, load_default=False)
+
+
+class BuscaLogsSchema(PeriodoSchema):
+    """Schema para filtros da consulta de logs de auditoria (query string)"""
+    usuario_id = fields.Int(required=False)
+    modulo = fields.Str(required=False, validate=validate.Length(min=1, max=50))
+    operacao = fields.Str(required=False, validate=validate.Length(min=2, max=100))
+    ip_local = fields.Str(required=False, validate=validate.Length(min=1, max=45))
+    limite = fields.Int(required=False, validate=validate.Range(min=1, max=200))
+    cursor = fields.Str(required=False, validate=validate.Length(max=500))
+
+
+class RelatorioDocumentosSchema(PeriodoSchema):
+    """Schema para os relatórios de documentos (query string)"""
+    agrupar = fields.Str(required=True, validate=validate.Length(min=1, max=50))
+
+
 class UsuarioSchema(Schema):
     """Schema para criação de usuário"""
     nome = fields.Str(required=True, validate=validate.Length(min=3, max=200))
@@ -123,11 +183,54 @@ class AuditoriaSchema(Schema):
     documento_id = fields.Int(required=True)
     status_novo = fields.Str(
         required=True,
-        validate=validate.OneOf(['Emitido', 'Aprovado', 'Indeferido', 'Revisado'])
+        validate=validate.OneOf(STATUS_AUDITORIA)
     )
     motivo_glosa = fields.Str(required=False, validate=validate.Length(max=1000))
     comentarios = fields.Str(required=False, validate=validate.Length(max=2000))
 
+    @validates_schema
+    def validate_glosa(self, data, **kwargs):
+        """Indeferimento exige o motivo da glosa"""
+        if data.get('status_novo') == 'Indeferido' and not (data.get('motivo_glosa') or '').strip():
+            raise ValidationError("Motivo da glosa é obrigatório para indeferir", 'motivo_glosa')
+
+
+class FilaAuditoriaSchema(Schema):
+    """Schema para a fila de auditoria (query string)"""
+    tipo_documento = fields.Str(
+        required=False,
+        validate=validate.OneOf(TIPOS_DOCUMENTOS)
+    )
+    limite = fields.Int(required=False, validate=validate.Range(min=1, max=500))
+    cursor = fields.Str(required=False, validate=validate.Length(max=500))
+
+
+class ReservaAuditoriaSchema(Schema):
+    """Schema para reserva de documentos da fila de auditoria"""
+    quantidade = fields.Int(
+        required=False, load_default=20,
+        validate=validate.Range(min=1, max=AUDITORIA['reserva_max'])
+    )
+    tipo_documento = fields.Str(
+        required=False,
+        validate=validate.OneOf(TIPOS_DOCUMENTOS)
+    )
+
+
+class LiberarReservasSchema(Schema):
+    """Schema para devolução de reservas à fila (sem ids = todas do auditor)"""
+    documento_ids = fields.List(
+        fields.Int(), required=False, validate=validate.Length(max=AUDITORIA['reserva_max'])
+    )
+
+
+class TransicaoLoteSchema(Schema):
+    """Schema para transição de status de documentos em lote"""
+    itens = fields.List(
+        fields.Nested(AuditoriaSchema), required=True,
+        validate=validate.Length(min=1, max=AUDITORIA['lote_max'])
+    )
+
 
 # ============================================================================
 # SCHEMAS PDF BUILDER
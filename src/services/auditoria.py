@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""
+Fila de Auditoria
+Fila FIFO dos documentos pendentes (idx_documentos_pendentes, índice parcial),
+reservas com prazo por auditor (auditoria_reservas) para que auditores
+concorrentes nunca recebam o mesmo documento e transição de status em lote:
+UPDATE em documentos, INSERT em auditoria e o log em uma única transação
+"""
+
+import json
+import logging
+
+from src.config import AUDITORIA
+from src.core.database import get_db_leitura, get_db_escrita, iniciar_transacao_escrita
+from src.models import SQL_CONDICAO_PENDENTES, TRANSICOES_AUDITORIA
+from src.utils.helpers import codificar_cursor, decodificar_cursor
+
+logger = logging.getLogger(__name__)
+
+# Reserva vigente do documento (expiradas são ignoradas e limpas na próxima reserva)
+SQL_JOIN_RESERVA = """
+    LEFT JOIN auditoria_reservas r
+        ON r.documento_id = d.id AND r.expira_em > datetime('now')
+"""
+
+SQL_RESERVAR = """
+    INSERT INTO auditoria_reservas (documento_id, auditor_id, expira_em)
+    VALUES (?, ?, datetime('now', ?))
+    ON CONFLICT(documento_id) DO UPDATE SET
+        auditor_id = excluded.auditor_id,
+        expira_em = excluded.expira_em
+"""
+
+SQL_INSERIR_AUDITORIA = """
+    INSERT INTO auditoria (documento_id, status_anterior, status_novo, motivo_glosa,
+                           comentarios, auditor_id)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+# Documentos da fila, na ordem da fila. INDEXED BY: sem estatísticas (ANALYZE)
+# o planejador prefere idx_documentos_status_data e ordena em memória
+SQL_ORIGEM_FILA = 'documentos d INDEXED BY idx_documentos_pendentes'
+
+
+def _sql_fila(condicoes, origem=SQL_ORIGEM_FILA):
+    """Monta o SELECT da fila com as condições adicionais informadas"""
+    extras = ''.join(f' AND {condicao}' for condicao in condicoes)
+    return f"""
+        SELECT d.id, d.codigo_unico, d.tipo_documento, d.status, d.data_emissao,
+               p.nome_completo AS paciente_nome, prof.nome AS profissional_nome,
+               r.auditor_id AS reservado_por, r.expira_em AS reserva_expira_em
+        FROM {origem}
+        LEFT JOIN pacientes p ON d.paciente_id = p.id
+        LEFT JOIN profissionais prof ON d.profissional_id = prof.id
+        {SQL_JOIN_RESERVA}
+        WHERE d.{SQL_CONDICAO_PENDENTES}{extras}
+        ORDER BY d.data_emissao, d.id
+        LIMIT ?
+    """
+
+
+def _condicoes_fila(cursor, tipo_documento):
+    """Condições de filtro e continuação (keyset) da fila"""
+    condicoes, parametros = [], []
+
+    if tipo_documento:
+        condicoes.append('d.tipo_documento = ?')
+        parametros.append(tipo_documento)
+
+    if cursor:
+        data_emissao, doc_id = decodificar_cursor(cursor, 2)
+        condicoes.append('(d.data_emissao, d.id) > (?, ?)')
+        parametros.extend([data_emissao, doc_id])
+
+    return condicoes, parametros
+
+
+def fila_auditoria(limite=50, cursor=None, tipo_documento=None):
+    """
+    Lista uma página da fila de auditoria, do documento mais antigo ao mais recente
+
+    Paginação por chave (data_emissao, id) sobre idx_documentos_pendentes:
+    o índice só contém documentos pendentes, então o custo da página não
+    depende do histórico já auditado. Documentos reservados aparecem com
+    'reservado_por' preenchido.
+
+    Args:
+        limite: Quantidade máxima de documentos na página
+        cursor: Cursor opaco retornado na página anterior (None = primeira)
+        tipo_documento: Filtra por tipo de documento (opcional)
+
+    Returns:
+        dict: {'documentos': [...], 'next_cursor': str ou None}
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    condicoes, parametros = _condicoes_fila(cursor, tipo_documento)
+
+    with get_db_leitura() as conn:
+        documentos = [
+            dict(doc) for doc in
+            conn.execute(_sql_fila(condicoes), (*parametros, limite + 1)).fetchall()
+        ]
+
+    proximo = None
+    if len(documentos) > limite:
+        documentos = documentos[:limite]
+        ultimo = documentos[-1]
+        proximo = codificar_cursor([ultimo['data_emissao'], ultimo['id']])
+
+    return {'documentos': documentos, 'next_cursor': proximo}
+
+
+def plano_fila_auditoria(cursor=None, tipo_documento=None):
+    """
+    Retorna o plano de execução (EXPLAIN QUERY PLAN) da fila de auditoria
+
+    Args:
+        cursor: Cursor de continuação (afeta a condição de faixa)
+        tipo_documento: Filtro por tipo, como em fila_auditoria
+
+    Returns:
+        list: Linhas 'detail' do plano
+    """
+    condicoes, parametros = _condicoes_fila(cursor, tipo_documento)
+
+    with get_db_leitura() as conn:
+        linhas = conn.execute('EXPLAIN QUERY PLAN ' + _sql_fila(condicoes), (*parametros, 1)).fetchall()
+
+    return [linha[3] for linha in linhas]
+
+
+def reservar_documentos(auditor_id, quantidade, tipo_documento=None):
+    """
+    Reserva para o auditor os documentos mais antigos da fila
+
+    Em uma transação BEGIN IMMEDIATE (serializada entre escritores):
+    remove reservas expiradas, escolhe os pendentes sem reserva de outro
+    auditor e grava a reserva com prazo de AUDITORIA['reserva_minutos'].
+    Reservas do próprio auditor entre os escolhidos são renovadas, então
+    repetir a chamada não perde nem duplica documentos.
+
+    Args:
+        auditor_id: ID do auditor
+        quantidade: Quantidade de documentos desejada
+        tipo_documento: Reserva apenas documentos deste tipo (opcional)
+
+    Returns:
+        dict: {'documentos': [...], 'expira_em': str ou None}
+    """
+    condicoes = [
+        'NOT EXISTS (SELECT 1 FROM auditoria_reservas r '
+        'WHERE r.documento_id = d.id AND r.auditor_id != ?)'
+    ]
+    parametros = [auditor_id]
+    if tipo_documento:
+        condicoes.append('d.tipo_documento = ?')
+        parametros.append(tipo_documento)
+
+    prazo = f"+{AUDITORIA['reserva_minutos']} minutes"
+
+    with get_db_escrita() as conn:
+        iniciar_transacao_escrita(conn)
+        try:
+            conn.execute("DELETE FROM auditoria_reservas WHERE expira_em <= datetime('now')")
+
+            ids = [linha[0] for linha in conn.execute(f"""
+                SELECT d.id FROM {SQL_ORIGEM_FILA}
+                WHERE d.{SQL_CONDICAO_PENDENTES} AND {' AND '.join(condicoes)}
+                ORDER BY d.data_emissao, d.id
+                LIMIT ?
+            """, (*parametros, quantidade))]
+
+            conn.executemany(SQL_RESERVAR, [(doc_id, auditor_id, prazo) for doc_id in ids])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        documentos = [
+            dict(doc) for doc in conn.execute(
+                _sql_fila([], origem='json_each(?) j JOIN documentos d ON d.id = j.value'),
+                (json.dumps(ids), len(ids))
+            ).fetchall()
+        ]
+
+    return {
+        'documentos': documentos,
+        'expira_em': documentos[0]['reserva_expira_em'] if documentos else None
+    }
+
+
+def liberar_reservas(auditor_id, documento_ids=None):
+    """
+    Devolve à fila documentos reservados pelo auditor
+
+    Args:
+        auditor_id: ID do auditor
+        documento_ids: IDs a liberar (None = todas as reservas do auditor)
+
+    Returns:
+        int: Quantidade de reservas removidas
+    """
+    with get_db_escrita() as conn:
+        if documento_ids is None:
+            cursor = conn.execute(
+                "DELETE FROM auditoria_reservas WHERE auditor_id = ?", (auditor_id,)
+            )
+        else:
+            cursor = conn.execute("""
+                DELETE FROM auditoria_reservas
+                WHERE auditor_id = ? AND documento_id IN (SELECT value FROM json_each(?))
+            """, (auditor_id, json.dumps(list(documento_ids))))
+        conn.commit()
+        return cursor.rowcount
+
+
+def transicionar_documentos(auditor_id, itens, usuario_nome=None, ip_local=None):
+    """
+    Altera o status de vários documentos em uma única transação
+
+    Cada item é conferido contra o estado atual: documentos inexistentes,
+    repetidos no lote, reservados por outro auditor, já no status pedido ou
+    cuja transição não consta de TRANSICOES_AUDITORIA (ex: Aprovado ->
+    Emitido) são relatados e não impedem os demais. Para os válidos, o UPDATE em
+    documentos, os registros em auditoria, a liberação das reservas e uma
+    linha de log resumida são gravados no mesmo commit (contadores e resumos
+    acompanham pelos triggers).
+
+    Args:
+        auditor_id: ID do auditor
+        itens: Lista de dicts validados por AuditoriaSchema
+               (documento_id, status_novo, motivo_glosa, comentarios)
+        usuario_nome: Nome do usuário para o log (se None, não grava log)
+        ip_local: IP do cliente para o log
+
+    Returns:
+        dict: {'processados': [{'documento_id', 'codigo', 'status_anterior', 'status_novo'}],
+               'erros': [{'documento_id', 'erro'}]}
+    """
+    processados, erros = [], []
+
+    with get_db_escrita() as conn:
+        iniciar_transacao_escrita(conn)
+        try:
+            atuais = {
+                linha['id']: linha for linha in conn.execute(f"""
+                    SELECT d.id, d.codigo_unico, d.status, r.auditor_id AS reservado_por
+                    FROM documentos d
+                    {SQL_JOIN_RESERVA}
+                    WHERE d.id IN (SELECT value FROM json_each(?))
+                """, (json.dumps([item['documento_id'] for item in itens]),))
+            }
+
+            vistos = set()
+            for item in itens:
+                doc_id = item['documento_id']
+                atual = atuais.get(doc_id)
+
+                if doc_id in vistos:
+                    erro = 'Documento repetido no lote'
+                elif atual is None:
+                    erro = 'Documento não encontrado'
+                elif atual['reservado_por'] not in (None, auditor_id):
+                    erro = 'Documento reservado por outro auditor'
+                elif atual['status'] == item['status_novo']:
+                    erro = f"Documento já está com status {item['status_novo']}"
+                elif item['status_novo'] not in TRANSICOES_AUDITORIA.get(atual['status'], ()):
+                    erro = f"Transição de status não permitida: {atual['status']} -> {item['status_novo']}"
+                else:
+                    erro = None
+
+                vistos.add(doc_id)
+                if erro:
+                    erros.append({'documento_id': doc_id, 'erro': erro})
+                    continue
+
+                processados.append({
+                    'documento_id': doc_id,
+                    'codigo': atual['codigo_unico'],
+                    'status_anterior': atual['status'],
+                    'status_novo': item['status_novo'],
+                    'motivo_glosa': item.get('motivo_glosa'),
+                    'comentarios': item.get('comentarios')
+                })
+
+            if not processados:
+                conn.rollback()
+                return {'processados': [], 'erros': erros}
+
+            conn.executemany(
+                "UPDATE documentos SET status = ? WHERE id = ?",
+                [(doc['status_novo'], doc['documento_id']) for doc in processados]
+            )
+            conn.executemany(SQL_INSERIR_AUDITORIA, [
+                (doc['documento_id'], doc['status_anterior'], doc['status_novo'],
+                 doc['motivo_glosa'], doc['comentarios'], auditor_id)
+                for doc in processados
+            ])
+            conn.execute(
+                "DELETE FROM auditoria_reservas WHERE documento_id IN (SELECT value FROM json_each(?))",
+                (json.dumps([doc['documento_id'] for doc in processados]),)
+            )
+
+            if usuario_nome is not None:
+                por_status = {}
+                for doc in processados:
+                    por_status.setdefault(doc['status_novo'], []).append(doc['codigo'])
+                conn.execute("""
+                    INSERT INTO logs (usuario_id, usuario_nome, ip_local, modulo, operacao, detalhes)
+                    VALUES (?, ?, ?, 'Auditoria', ?, ?)
+                """, (auditor_id, usuario_nome, ip_local,
+                      f'Auditoria em lote: {len(processados)} documento(s)',
+                      json.dumps(por_status, ensure_ascii=False)))
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    return {
+        'processados': [
+            {chave: doc[chave] for chave in ('documento_id', 'codigo', 'status_anterior', 'status_novo')}
+            for doc in processados
+        ],
+        'erros': erros
+    }
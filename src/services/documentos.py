@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Busca de Documentos
+Filtros combináveis sobre a tabela documentos, todos servidos pelos índices
+compostos (filtro, data_emissao, id) definidos em src/models.py, e pesquisa
+textual no conteúdo clínico (documentos_fts)
+"""
+
+import html
+import itertools
+import logging
+
+from src.core.database import (
+    get_db_leitura, listar_documentos_pagina, iterar_documentos_pagina,
+    plano_listagem_documentos
+)
+from src.utils.helpers import montar_consulta_fts
+
+logger = logging.getLogger(__name__)
+
+# Filtros aceitos e a condição SQL correspondente (alias 'd' = documentos)
+FILTROS_DOCUMENTOS = {
+    'tipo_documento': 'd.tipo_documento = ?',
+    'status': 'd.status = ?',
+    'setor_origem_id': 'd.setor_origem_id = ?',
+    'setor_destino_id': 'd.setor_destino_id = ?',
+    'profissional_id': 'd.profissional_id = ?',
+    'paciente_id': 'd.paciente_id = ?',
+    'prec_cp': 'd.paciente_id = (SELECT id FROM pacientes WHERE prec_cp = ?)',
+    'data_inicio': 'd.data_emissao >= ?',
+    'data_fim': "d.data_emissao < date(?, '+1 day')"  # Dia final inclusivo
+}
+
+# Marcadores do snippet do FTS5: caracteres de controle que não aparecem no
+# texto, trocados por <mark> depois de escapar o conteúdo
+_INICIO_DESTAQUE = '\x02'
+_FIM_DESTAQUE = '\x03'
+
+SQL_PESQUISA_CONTEUDO = """
+    SELECT d.id, d.codigo_unico, d.tipo_documento, d.status, d.data_emissao,
+           p.nome_completo as paciente_nome,
+           snippet(documentos_fts, -1, ?, ?, '…', 16) as trecho,
+           f.rank as relevancia
+    FROM documentos_fts f
+    JOIN documentos d ON d.id = f.rowid
+    LEFT JOIN pacientes p ON d.paciente_id = p.id
+    WHERE documentos_fts MATCH ? {filtro_tipo}
+    ORDER BY f.rank
+    LIMIT ? OFFSET ?
+"""
+
+
+def montar_condicoes(filtros):
+    """
+    Converte os filtros informados em condições SQL
+
+    Args:
+        filtros: Dicionário com chaves de FILTROS_DOCUMENTOS (valores vazios são ignorados)
+
+    Returns:
+        tuple: (condicoes, parametros)
+    """
+    condicoes = []
+    parametros = []
+
+    for chave, condicao in FILTROS_DOCUMENTOS.items():
+        valor = (filtros or {}).get(chave)
+        if valor is None or valor == '':
+            continue
+
+        # Datas (date/datetime) comparadas como texto ISO, formato do SQLite
+        if hasattr(valor, 'isoformat'):
+            valor = valor.isoformat()
+
+        condicoes.append(condicao)
+        parametros.append(valor)
+
+    return condicoes, parametros
+
+
+def buscar_documentos(filtros=None, limite=100, cursor=None):
+    """
+    Busca documentos pelos filtros informados, paginando por cursor
+
+    Args:
+        filtros: Dicionário de filtros (ver FILTROS_DOCUMENTOS)
+        limite: Quantidade máxima de documentos na página
+        cursor: next_cursor da página anterior
+
+    Returns:
+        dict: {'documentos': [...], 'next_cursor': str ou None}
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    condicoes, parametros = montar_condicoes(filtros)
+    return listar_documentos_pagina(limite, cursor, condicoes, parametros)
+
+
+def iterar_busca_documentos(filtros=None, limite=100, cursor=None):
+    """
+    Versão em streaming de buscar_documentos
+
+    Returns:
+        tuple: (gerador de documentos, dict com 'next_cursor' ao final)
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    condicoes, parametros = montar_condicoes(filtros)
+    return iterar_documentos_pagina(limite, cursor, condicoes, parametros)
+
+
+def plano_busca_documentos(filtros=None, cursor=None):
+    """
+    Retorna o plano de execução da busca para os filtros informados
+
+    Returns:
+        list: Linhas do EXPLAIN QUERY PLAN
+    """
+    condicoes, parametros = montar_condicoes(filtros)
+    return plano_listagem_documentos(cursor, condicoes, parametros)
+
+
+def _varredura_completa(plano):
+    """Indica se o plano lê a tabela documentos inteira (SCAN sem índice)"""
+    return any(linha.startswith('SCAN d') and 'USING' not in linha for linha in plano)
+
+
+def verificar_indices_busca():
+    """
+    Confere, pelo planejador do SQLite, que toda combinação de filtros
+    suportada é atendida por índice
+
+    Returns:
+        list: Combinações (tuplas de nomes de filtro) que fariam varredura
+              completa de documentos; vazia quando todas usam índice
+    """
+    exemplos = {
+        'tipo_documento': 'Declaração',
+        'status': 'Emitido',
+        'setor_origem_id': 1,
+        'setor_destino_id': 1,
+        'profissional_id': 1,
+        'paciente_id': 1,
+        'prec_cp': '000000',
+        'data_inicio': '2024-01-01',
+        'data_fim': '2024-12-31'
+    }
+    falhas = []
+
+    for tamanho in range(len(exemplos) + 1):
+        for combinacao in itertools.combinations(exemplos, tamanho):
+            filtros = {chave: exemplos[chave] for chave in combinacao}
+            plano = plano_busca_documentos(filtros)
+
+            if _varredura_completa(plano):
+                logger.warning(f"Busca de documentos sem índice para {combinacao}: {plano}")
+                falhas.append(combinacao)
+
+    return falhas
+
+
+def _destacar(trecho):
+    """Escapa o trecho para HTML e converte os marcadores do snippet em <mark>"""
+    if not trecho:
+        return ''
+    return (
+        html.escape(trecho)
+        .replace(_INICIO_DESTAQUE, '<mark>')
+        .replace(_FIM_DESTAQUE, '</mark>')
+    )
+
+
+def pesquisar_conteudo_documentos(texto, tipo_documento=None, limite=20, deslocamento=0):
+    """
+    Pesquisa no conteúdo clínico dos documentos (diagnóstico, motivo,
+    exame solicitado, texto da declaração e observações)
+
+    Args:
+        texto: Termos pesquisados (prefixos, sem distinção de acentos)
+        tipo_documento: Filtro opcional pelo tipo
+        limite: Quantidade máxima de resultados
+        deslocamento: Resultados a pular (páginas seguintes)
+
+    Returns:
+        list: Documentos por relevância (bm25), cada um com 'trecho' em HTML
+              seguro, termos encontrados entre <mark></mark>
+    """
+    consulta = montar_consulta_fts(texto)
+    if consulta is None:
+        return []
+
+    parametros = [_INICIO_DESTAQUE, _FIM_DESTAQUE, consulta]
+    filtro_tipo = ''
+    if tipo_documento:
+        filtro_tipo = 'AND d.tipo_documento = ?'
+        parametros.append(tipo_documento)
+
+    with get_db_leitura() as conn:
+        resultados = conn.execute(
+            SQL_PESQUISA_CONTEUDO.format(filtro_tipo=filtro_tipo),
+            (*parametros, limite, deslocamento)
+        ).fetchall()
+
+    documentos = []
+    for resultado in resultados:
+        documento = dict(resultado)
+        documento['trecho'] = _destacar(documento['trecho'])
+        documento['relevancia'] = round(-documento['relevancia'], 4)  # bm25: menor é melhor
+        documentos.append(documento)
+
+    return documentos
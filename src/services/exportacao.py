@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Exportação CSV
+Geradores que leem o banco em lotes (fetchmany) e produzem o CSV aos
+pedaços, para respostas em streaming com memória constante, opcionalmente
+compactadas em gzip
+"""
+
+import csv
+import io
+import logging
+import zlib
+
+from src.config import EXPORTACAO
+from src.core.database import get_db_leitura
+from src.services.documentos import montar_condicoes
+
+logger = logging.getLogger(__name__)
+
+# Cabeçalho e consulta de cada exportação (ordem das colunas = ordem do SELECT)
+COLUNAS_DOCUMENTOS = [
+    'Código', 'Tipo', 'Status', 'Data Emissão', 'Paciente', 'PREC-CP',
+    'Profissional', 'Setor Origem', 'Setor Destino'
+]
+
+SQL_EXPORTAR_DOCUMENTOS = """
+    SELECT d.codigo_unico, d.tipo_documento, d.status, d.data_emissao,
+           p.nome_completo, p.prec_cp, prof.nome, so.nome, sd.nome
+    FROM documentos d
+    LEFT JOIN pacientes p ON d.paciente_id = p.id
+    LEFT JOIN profissionais prof ON d.profissional_id = prof.id
+    LEFT JOIN setores so ON d.setor_origem_id = so.id
+    LEFT JOIN setores sd ON d.setor_destino_id = sd.id
+    {where}
+    ORDER BY d.data_emissao DESC, d.id DESC
+"""
+
+COLUNAS_PACIENTES = ['Nome', 'PREC-CP', 'Posto', 'OM', 'Data Nascimento', 'Data Cadastro']
+
+SQL_EXPORTAR_PACIENTES = """
+    SELECT nome_completo, prec_cp, posto, om, data_nascimento, data_cadastro
+    FROM pacientes
+    WHERE ativo = 1
+    ORDER BY nome_completo, id
+"""
+
+COLUNAS_LOGS = ['Data/Hora (UTC)', 'Usuário', 'IP', 'Módulo', 'Operação', 'Detalhes']
+
+SQL_EXPORTAR_LOGS = """
+    SELECT data_hora, usuario_nome, ip_local, modulo, operacao, detalhes
+    FROM logs
+    {where}
+    ORDER BY id
+"""
+
+# Prefixos que planilhas interpretam como fórmula (injeção de CSV)
+_PREFIXOS_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _celula(valor):
+    """Neutraliza textos que seriam interpretados como fórmula na planilha"""
+    if isinstance(valor, str) and valor.startswith(_PREFIXOS_FORMULA):
+        return "'" + valor
+    return valor
+
+
+def _gerar_csv(colunas, sql, parametros=(), lote=None):
+    """
+    Gera o CSV em pedaços de texto: cabeçalho imediatamente e um pedaço por
+    lote de linhas lido do cursor
+
+    A conexão de leitura fica reservada até o fim do gerador (ou até ele ser
+    fechado, quando o cliente desconecta).
+
+    Args:
+        colunas: Títulos do cabeçalho
+        sql: Consulta das linhas
+        parametros: Parâmetros da consulta
+        lote: Linhas por fetchmany (padrão: EXPORTACAO['lote'])
+
+    Yields:
+        str: Pedaços do CSV
+    """
+    lote = lote or EXPORTACAO['lote']
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, delimiter=EXPORTACAO['separador'], lineterminator='\r\n')
+
+    # BOM: o Excel só reconhece UTF-8 (acentos) com ele
+    buffer.write('\ufeff')
+    escritor.writerow(colunas)
+    yield buffer.getvalue()
+
+    total = 0
+    with get_db_leitura() as conn:
+        cursor = conn.execute(sql, parametros)
+        while True:
+            linhas = cursor.fetchmany(lote)
+            if not linhas:
+                break
+
+            buffer.seek(0)
+            buffer.truncate()
+            escritor.writerows([_celula(valor) for valor in linha] for linha in linhas)
+            total += len(linhas)
+            yield buffer.getvalue()
+
+    logger.info(f"Exportação CSV concluída: {total} linha(s)")
+
+
+def _compactar_gzip(pedacos, nivel=None):
+    """
+    Compacta os pedaços de texto em um fluxo gzip, sem acumular o conteúdo
+
+    Args:
+        pedacos: Iterável de str
+        nivel: Nível de compressão (padrão: EXPORTACAO['nivel_gzip'])
+
+    Yields:
+        bytes: Pedaços do arquivo .gz
+    """
+    compressor = zlib.compressobj(
+        EXPORTACAO['nivel_gzip'] if nivel is None else nivel,
+        zlib.DEFLATED,
+        zlib.MAX_WBITS | 16  # Cabeçalho gzip
+    )
+    for pedaco in pedacos:
+        dados = compressor.compress(pedaco.encode('utf-8'))
+        if dados:
+            yield dados
+    yield compressor.flush()
+
+
+def _saida(pedacos, compactar):
+    """Codifica os pedaços em UTF-8 ou em gzip"""
+    if compactar:
+        return _compactar_gzip(pedacos)
+    return (pedaco.encode('utf-8') for pedaco in pedacos)
+
+
+def exportar_documentos(filtros=None, compactar=False):
+    """
+    Exporta documentos em CSV com os mesmos filtros da busca
+
+    Args:
+        filtros: Dicionário de filtros (ver FILTROS_DOCUMENTOS)
+        compactar: Gera gzip em vez de CSV puro
+
+    Returns:
+        generator: Pedaços (bytes) do arquivo
+    """
+    condicoes, parametros = montar_condicoes(filtros)
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ''
+    sql = SQL_EXPORTAR_DOCUMENTOS.format(where=where)
+    return _saida(_gerar_csv(COLUNAS_DOCUMENTOS, sql, parametros), compactar)
+
+
+def exportar_pacientes(compactar=False):
+    """
+    Exporta os pacientes ativos em CSV, em ordem alfabética
+
+    Args:
+        compactar: Gera gzip em vez de CSV puro
+
+    Returns:
+        generator: Pedaços (bytes) do arquivo
+    """
+    return _saida(_gerar_csv(COLUNAS_PACIENTES, SQL_EXPORTAR_PACIENTES), compactar)
+
+
+def exportar_logs(data_inicio=None, data_fim=None, compactar=False):
+    """
+    Exporta os logs de auditoria em CSV, em ordem cronológica
+
+    Args:
+        data_inicio: date inicial (inclusiva), opcional
+        data_fim: date final (inclusiva), opcional
+        compactar: Gera gzip em vez de CSV puro
+
+    Returns:
+        generator: Pedaços (bytes) do arquivo
+    """
+    condicoes = []
+    parametros = []
+    if data_inicio:
+        condicoes.append('data_hora >= ?')
+        parametros.append(data_inicio.isoformat())
+    if data_fim:
+        condicoes.append("data_hora < date(?, '+1 day')")
+        parametros.append(data_fim.isoformat())
+
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ''
+    sql = SQL_EXPORTAR_LOGS.format(where=where)
+    return _saida(_gerar_csv(COLUNAS_LOGS, sql, parametros), compactar)
@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+Importação em Lote
+Leitura de CSV/NDJSON em fluxo e cadastro de pacientes em blocos: cada bloco
+é validado de uma vez (PacienteSchema many=True), tem os PREC-CP conferidos
+contra o banco em uma única consulta e é gravado com executemany em uma
+transação. Rosters de profissionais são sincronizados por CRM/COREN em uma
+única transação
+"""
+
+import csv
+import itertools
+import json
+import logging
+
+from marshmallow import EXCLUDE, ValidationError
+
+from src.config import IMPORTACAO
+from src.core.database import (
+    get_db_escrita, iniciar_transacao_escrita, registrar_log, listar_setores
+)
+from src.schemas import PacienteSchema, ProfissionalRosterSchema
+from src.utils.helpers import normalizar_chave
+
+logger = logging.getLogger(__name__)
+
+FORMATOS_IMPORTACAO = ('csv', 'ndjson')
+
+SQL_INSERIR_PACIENTE = """
+    INSERT INTO pacientes (nome_completo, prec_cp, posto, om, data_nascimento, observacoes)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# PREC-CP já cadastrados entre os do bloco (lista JSON em um único parâmetro)
+SQL_PREC_EXISTENTES = """
+    SELECT prec_cp FROM pacientes
+    WHERE prec_cp IN (SELECT value FROM json_each(?))
+"""
+
+SQL_INSERIR_PROFISSIONAL = """
+    INSERT INTO profissionais (nome, funcao, crm_coren, posto_graduacao, setor_id)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+SQL_ATUALIZAR_PROFISSIONAL = """
+    UPDATE profissionais
+    SET nome = ?, funcao = ?, crm_coren = ?, posto_graduacao = ?, setor_id = ?, ativo = 1
+    WHERE id = ?
+"""
+
+SQL_DESATIVAR_PROFISSIONAL = "UPDATE profissionais SET ativo = 0 WHERE id = ?"
+
+
+def _limpar(registro):
+    """Remove espaços das bordas e descarta campos vazios (CSV usa '' para ausente)"""
+    limpo = {}
+    for chave, valor in registro.items():
+        if chave is None:  # Colunas a mais na linha do CSV
+            continue
+        if isinstance(valor, str):
+            valor = valor.strip()
+        if valor not in (None, ''):
+            limpo[chave.strip()] = valor
+    return limpo
+
+
+def ler_registros(arquivo, formato='csv'):
+    """
+    Lê registros de um arquivo texto, um por vez
+
+    CSV: cabeçalho na primeira linha, separador ';' ou ',' (detectado).
+    NDJSON: um objeto JSON por linha; linhas em branco são ignoradas.
+
+    Args:
+        arquivo: Objeto de arquivo em modo texto
+        formato: 'csv' ou 'ndjson'
+
+    Yields:
+        tuple: (numero_linha, dict) ou (numero_linha, None) se a linha for ilegível
+
+    Raises:
+        ValueError: Se o formato não for suportado
+    """
+    if formato not in FORMATOS_IMPORTACAO:
+        raise ValueError(f"Formato não suportado: {formato}")
+
+    if formato == 'ndjson':
+        for numero, linha in enumerate(arquivo, start=1):
+            if not linha.strip():
+                continue
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError:
+                registro = None
+            yield numero, registro if isinstance(registro, dict) else None
+        return
+
+    cabecalho = arquivo.readline()
+    separador = ';' if cabecalho.count(';') > cabecalho.count(',') else ','
+    colunas = [coluna.strip() for coluna in next(csv.reader([cabecalho], delimiter=separador), [])]
+
+    leitor = csv.DictReader(arquivo, fieldnames=colunas, delimiter=separador)
+    for registro in leitor:
+        # line_num conta a partir da linha após o cabeçalho
+        yield leitor.line_num + 1, registro
+
+
+def _validar_bloco(bloco, schema):
+    """
+    Valida um bloco de registros de uma vez
+
+    Returns:
+        tuple: (validos: [(linha, dados)], erros: [(linha, registro, mensagens)])
+    """
+    legiveis = [(numero, _limpar(registro)) for numero, registro in bloco if registro is not None]
+    erros = [(numero, {}, {'_linha': ['Linha ilegível']}) for numero, registro in bloco if registro is None]
+
+    try:
+        dados = schema.load([registro for _, registro in legiveis])
+        mensagens = {}
+    except ValidationError as err:
+        dados, mensagens = err.valid_data, err.messages
+
+    validos = []
+    for indice, (numero, registro) in enumerate(legiveis):
+        if indice in mensagens:
+            erros.append((numero, registro, mensagens[indice]))
+        else:
+            validos.append((numero, dados[indice]))
+
+    return validos, erros
+
+
+def importar_pacientes(registros, simular=False, lote=None):
+    """
+    Cadastra pacientes em lote
+
+    Linhas inválidas, PREC-CP repetidos no arquivo ou já cadastrados são
+    relatados e não interrompem a importação das demais.
+
+    Args:
+        registros: Iterável de (numero_linha, dict) (ver ler_registros)
+        simular: Apenas valida e confere duplicidades, sem gravar
+                 ('importados' passa a ser quantos seriam cadastrados)
+        lote: Linhas por bloco/transação (padrão: IMPORTACAO['lote'])
+
+    Returns:
+        dict: {'total', 'importados', 'com_erro', 'erros': [{'linha', 'prec_cp', 'erros'}]}
+              ('erros' limitado a IMPORTACAO['max_erros_relatorio'])
+    """
+    lote = lote or IMPORTACAO['lote']
+    schema = PacienteSchema(many=True, unknown=EXCLUDE)
+    relatorio = {'total': 0, 'importados': 0, 'com_erro': 0, 'erros': []}
+    vistos = {}  # PREC-CP -> linha em que apareceu no arquivo
+
+    def relatar(numero, prec_cp, mensagens):
+        relatorio['com_erro'] += 1
+        if len(relatorio['erros']) < IMPORTACAO['max_erros_relatorio']:
+            relatorio['erros'].append({'linha': numero, 'prec_cp': prec_cp, 'erros': mensagens})
+
+    iterador = iter(registros)
+    while True:
+        bloco = list(itertools.islice(iterador, lote))
+        if not bloco:
+            break
+        relatorio['total'] += len(bloco)
+
+        validos, erros = _validar_bloco(bloco, schema)
+        for numero, registro, mensagens in erros:
+            relatar(numero, registro.get('prec_cp'), mensagens)
+
+        # Repetidos dentro do próprio arquivo: vale a primeira ocorrência
+        unicos = []
+        for numero, dados in validos:
+            anterior = vistos.setdefault(dados['prec_cp'], numero)
+            if anterior != numero:
+                relatar(numero, dados['prec_cp'], {'prec_cp': [f'PREC-CP repetido no arquivo (linha {anterior})']})
+            else:
+                unicos.append((numero, dados))
+
+        if not unicos:
+            continue
+
+        # Conferência e gravação na mesma transação: nenhum cadastro
+        # concorrente entra entre a verificação e o INSERT. O escritor é
+        # emprestado por bloco para não bloquear outras gravações até o fim
+        with get_db_escrita() as conn:
+            iniciar_transacao_escrita(conn)
+            try:
+                existentes = {
+                    linha[0] for linha in conn.execute(
+                        SQL_PREC_EXISTENTES, (json.dumps([dados['prec_cp'] for _, dados in unicos]),)
+                    )
+                }
+
+                novos = []
+                for numero, dados in unicos:
+                    if dados['prec_cp'] in existentes:
+                        relatar(numero, dados['prec_cp'], {'prec_cp': ['PREC-CP já cadastrado']})
+                    else:
+                        novos.append((
+                            dados['nome_completo'],
+                            dados['prec_cp'],
+                            dados.get('posto', ''),
+                            dados.get('om', ''),
+                            dados['data_nascimento'].isoformat() if dados.get('data_nascimento') else '',
+                            dados.get('observacoes', '')
+                        ))
+
+                if simular:
+                    conn.rollback()
+                else:
+                    conn.executemany(SQL_INSERIR_PACIENTE, novos)
+                    conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        relatorio['importados'] += len(novos)
+
+    relatorio['erros'].sort(key=lambda erro: erro['linha'])
+    logger.info(
+        f"Importação de pacientes{' (simulação)' if simular else ''}: "
+        f"{relatorio['importados']} de {relatorio['total']} linha(s), {relatorio['com_erro']} com erro"
+    )
+    return relatorio
+
+
+def mapa_setores(setores=None):
+    """
+    Monta o mapa nome/sigla normalizados -> id dos setores ativos
+
+    Args:
+        setores: Lista de setores (padrão: listar_setores())
+
+    Returns:
+        dict: Chave normalizada (ver normalizar_chave) -> id do setor
+    """
+    mapa = {}
+    for setor in listar_setores() if setores is None else setores:
+        for valor in (setor['nome'], setor.get('sigla')):
+            if valor:
+                mapa.setdefault(normalizar_chave(valor), setor['id'])
+    return mapa
+
+
+def importar_profissionais(registros, desativar_ausentes=True, simular=False):
+    """
+    Sincroniza o cadastro de profissionais com um roster completo
+
+    Profissionais são identificados pelo CRM/COREN (sem distinção de
+    pontuação ou maiúsculas): existentes são atualizados (e reativados),
+    novos são cadastrados e, se desativar_ausentes, os ativos que não
+    constam do roster são desativados (exceto os sem CRM/COREN, que o
+    roster não tem como identificar). O setor pode vir por nome ou sigla
+    ('setor') ou por id ('setor_id'). Tudo em uma única transação: o
+    cadastro nunca fica com o roster aplicado pela metade.
+
+    Args:
+        registros: Iterável de (numero_linha, dict) (ver ler_registros)
+        desativar_ausentes: Desativa profissionais ausentes do roster
+        simular: Apenas calcula o resultado, sem gravar
+
+    Returns:
+        dict: {'total', 'inseridos', 'atualizados', 'desativados', 'com_erro',
+               'erros': [{'linha', 'crm_coren', 'erros'}]}
+
+    Raises:
+        ValueError: Se nenhuma linha do roster for válida
+    """
+    registros = list(registros)  # Roster completo: necessário para achar os ausentes
+    setores = mapa_setores()
+    ids_setores = set(setores.values())
+    relatorio = {
+        'total': len(registros), 'inseridos': 0, 'atualizados': 0,
+        'desativados': 0, 'com_erro': 0, 'erros': []
+    }
+
+    def relatar(numero, crm_coren, mensagens):
+        relatorio['com_erro'] += 1
+        if len(relatorio['erros']) < IMPORTACAO['max_erros_relatorio']:
+            relatorio['erros'].append({'linha': numero, 'crm_coren': crm_coren, 'erros': mensagens})
+
+    validos, erros = _validar_bloco(registros, ProfissionalRosterSchema(many=True, unknown=EXCLUDE))
+    for numero, registro, mensagens in erros:
+        relatar(numero, registro.get('crm_coren'), mensagens)
+
+    # Presentes no roster mesmo com erro na linha: não são desativados
+    presentes = {
+        normalizar_chave(str(registro.get('crm_coren')))
+        for _, registro in registros if registro and registro.get('crm_coren')
+    }
+
+    linhas = {}  # CRM/COREN normalizado -> (valores, linha)
+    for numero, dados in validos:
+        chave = normalizar_chave(dados['crm_coren'])
+        if chave in linhas:
+            relatar(numero, dados['crm_coren'], {'crm_coren': [f'CRM/COREN repetido no arquivo (linha {linhas[chave][1]})']})
+            continue
+
+        setor_id = dados.get('setor_id')
+        if dados.get('setor'):
+            setor_id = setores.get(normalizar_chave(dados['setor']))
+            if setor_id is None:
+                relatar(numero, dados['crm_coren'], {'setor': [f"Setor não encontrado: {dados['setor']}"]})
+                continue
+        elif setor_id is not None and setor_id not in ids_setores:
+            relatar(numero, dados['crm_coren'], {'setor_id': ['Setor inexistente ou inativo']})
+            continue
+
+        valores = (dados['nome'], dados['funcao'], dados['crm_coren'], dados.get('posto_graduacao', ''), setor_id)
+        linhas[chave] = (valores, numero)
+
+    if not linhas:
+        raise ValueError('Nenhuma linha válida no roster')
+
+    with get_db_escrita() as conn:
+        iniciar_transacao_escrita(conn)
+        try:
+            # Mapa lido dentro da transação: cadastros concorrentes não escapam
+            cadastrados = conn.execute(
+                "SELECT id, crm_coren, ativo FROM profissionais ORDER BY id"
+            ).fetchall()
+            por_chave = {}
+            for profissional in cadastrados:
+                por_chave.setdefault(normalizar_chave(profissional['crm_coren']), profissional['id'])
+
+            atualizar = []
+            inserir = []
+            for chave, (valores, _) in linhas.items():
+                if chave and chave in por_chave:
+                    atualizar.append((*valores, por_chave[chave]))
+                else:
+                    inserir.append(valores)
+
+            desativar = []
+            if desativar_ausentes:
+                # Sem CRM/COREN o profissional não é identificável no roster: nunca é desativado
+                desativar = [
+                    (profissional['id'],) for profissional in cadastrados
+                    if profissional['ativo'] == 1
+                    and normalizar_chave(profissional['crm_coren'])
+                    and normalizar_chave(profissional['crm_coren']) not in presentes
+                ]
+
+            conn.executemany(SQL_ATUALIZAR_PROFISSIONAL, atualizar)
+            conn.executemany(SQL_INSERIR_PROFISSIONAL, inserir)
+            conn.executemany(SQL_DESATIVAR_PROFISSIONAL, desativar)
+
+            if simular:
+                conn.rollback()
+            else:
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    relatorio['atualizados'] = len(atualizar)
+    relatorio['inseridos'] = len(inserir)
+    relatorio['desativados'] = len(desativar)
+    relatorio['erros'].sort(key=lambda erro: erro['linha'])
+
+    logger.info(
+        f"Roster de profissionais{' (simulação)' if simular else ''}: "
+        f"{relatorio['inseridos']} novo(s), {relatorio['atualizados']} atualizado(s), "
+        f"{relatorio['desativados']} desativado(s), {relatorio['com_erro']} com erro"
+    )
+    return relatorio
+
+
+def registrar_importacao(modulo, operacao, relatorio, usuario_id, usuario_nome, ip_local, origem=''):
+    """
+    Registra uma única entrada de log resumindo a importação
+
+    Args:
+        modulo: Módulo do log (ex: 'Pacientes')
+        operacao: Descrição da operação
+        relatorio: Relatório retornado pela importação (contagens vão nos detalhes)
+        usuario_id, usuario_nome, ip_local: Autor da importação
+        origem: Nome do arquivo importado
+    """
+    detalhes = {'origem': origem}
+    detalhes.update({chave: valor for chave, valor in relatorio.items() if chave != 'erros'})
+
+    registrar_log(
+        usuario_id, usuario_nome, ip_local, modulo, operacao,
+        json.dumps(detalhes, ensure_ascii=False)
+    )
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Consulta dos Logs de Auditoria
+Filtros combináveis sobre a tabela logs, do mais recente ao mais antigo,
+paginados por cursor (data_hora, id) sobre os índices definidos em
+src/models.py. Logs já arquivados (src/core/retencao_logs.py) não entram.
+"""
+
+import itertools
+import logging
+
+from src.core.database import get_db_leitura, consultar_registros
+from src.utils.helpers import codificar_cursor, decodificar_cursor
+
+logger = logging.getLogger(__name__)
+
+# Caracteres de 'detalhes' devolvidos na listagem (texto completo em obter_log)
+TAMANHO_DETALHES_LISTAGEM = 300
+
+# Linhas da faixa do índice conferidas por página quando há filtro residual:
+# um filtro raro (ex: um trecho de operação) nunca percorre o ano inteiro
+VARREDURA_MAXIMA = 10000
+
+# Filtros aceitos e a condição SQL correspondente. usuario_id e modulo têm
+# índice próprio; os residuais são conferidos linha a linha sobre a faixa
+FILTROS_LOGS = {
+    'usuario_id': 'usuario_id = ?',
+    'modulo': 'modulo = ?',
+    'ip_local': 'ip_local = ?',
+    'operacao': "operacao LIKE ? ESCAPE '\\'",  # Trecho, sem distinção de maiúsculas
+    'data_inicio': 'data_hora >= ?',
+    'data_fim': "data_hora < date(?, '+1 day')"  # Dia final inclusivo
+}
+FILTROS_RESIDUAIS = ('ip_local', 'operacao')
+
+SQL_LISTAGEM_LOGS = f"""
+    SELECT id, usuario_id, usuario_nome, ip_local, modulo, operacao,
+           substr(detalhes, 1, {TAMANHO_DETALHES_LISTAGEM}) AS detalhes,
+           length(detalhes) > {TAMANHO_DETALHES_LISTAGEM} AS detalhes_truncados,
+           data_hora
+    FROM logs
+    {{where}}
+    ORDER BY data_hora DESC, id DESC
+    LIMIT ?
+"""
+
+# Faixa limitada (VARREDURA_MAXIMA linhas do índice) filtrada pelos residuais
+SQL_LISTAGEM_LIMITADA = f"""
+    SELECT * FROM ({SQL_LISTAGEM_LOGS})
+    {{where_residual}}
+    ORDER BY data_hora DESC, id DESC
+    LIMIT ?
+"""
+
+# Chave da última linha da faixa limitada (continuação quando ela se esgota)
+SQL_FIM_VARREDURA = """
+    SELECT data_hora, id FROM logs
+    {where}
+    ORDER BY data_hora DESC, id DESC
+    LIMIT 1 OFFSET ?
+"""
+
+
+def _trecho_like(texto):
+    """Padrão LIKE que encontra o texto em qualquer posição (curingas escapados)"""
+    escapado = texto.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escapado}%'
+
+
+def montar_condicoes_logs(filtros, cursor=None):
+    """
+    Converte os filtros e o cursor em condições SQL
+
+    Args:
+        filtros: Dicionário com chaves de FILTROS_LOGS (valores vazios são ignorados)
+        cursor: next_cursor da página anterior (None = primeira página)
+
+    Returns:
+        tuple: ((condicoes, parametros) servidas por índice,
+                (condicoes, parametros) residuais)
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    indice = ([], [])
+    residuo = ([], [])
+
+    for chave, condicao in FILTROS_LOGS.items():
+        valor = (filtros or {}).get(chave)
+        if valor is None or valor == '':
+            continue
+
+        if chave == 'operacao':
+            valor = _trecho_like(valor)
+        elif hasattr(valor, 'isoformat'):
+            valor = valor.isoformat()
+
+        destino = residuo if chave in FILTROS_RESIDUAIS else indice
+        destino[0].append(condicao)
+        destino[1].append(valor)
+
+    if cursor:
+        data_hora, log_id = decodificar_cursor(cursor, 2)
+        indice[0].append('(data_hora, id) < (?, ?)')
+        indice[1].extend([data_hora, log_id])
+
+    return indice, residuo
+
+
+def _where(condicoes):
+    """Cláusula WHERE com as condições unidas por AND (vazia se não houver)"""
+    return f"WHERE {' AND '.join(condicoes)}" if condicoes else ''
+
+
+def _consulta_listagem(indice, residuo, limite):
+    """
+    Monta o SELECT da listagem e seus parâmetros
+
+    Sem filtros residuais, a página é lida direto do índice. Com eles, a
+    página é procurada apenas entre as VARREDURA_MAXIMA primeiras linhas
+    da faixa do índice.
+    """
+    if not residuo[0]:
+        return SQL_LISTAGEM_LOGS.format(where=_where(indice[0])), (*indice[1], limite)
+
+    sql = SQL_LISTAGEM_LIMITADA.format(where=_where(indice[0]), where_residual=_where(residuo[0]))
+    return sql, (*indice[1], VARREDURA_MAXIMA, *residuo[1], limite)
+
+
+def listar_logs_pagina(filtros=None, limite=50, cursor=None):
+    """
+    Lista uma página de logs, do mais recente para o mais antigo
+
+    'detalhes' vem limitado a TAMANHO_DETALHES_LISTAGEM caracteres
+    ('detalhes_truncados' indica o corte), mantendo o tamanho da página
+    previsível mesmo com relatórios de importação nos detalhes.
+
+    Com filtro por ip_local ou operacao, cada página confere no máximo
+    VARREDURA_MAXIMA logs: se a faixa se esgotar antes de completar a
+    página, a resposta traz menos logs (possivelmente nenhum) e um
+    next_cursor para continuar a procura a partir do último log conferido.
+
+    Args:
+        filtros: Dicionário de filtros (ver FILTROS_LOGS)
+        limite: Quantidade máxima de logs na página
+        cursor: next_cursor da página anterior
+
+    Returns:
+        dict: {'logs': [...], 'next_cursor': str ou None}
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    indice, residuo = montar_condicoes_logs(filtros, cursor)
+    sql, parametros = _consulta_listagem(indice, residuo, limite + 1)
+
+    with get_db_leitura() as conn:
+        # Uma linha extra indica se existe próxima página
+        logs = consultar_registros(conn, sql, parametros)
+
+        fim_varredura = None
+        if residuo[0] and len(logs) <= limite:
+            fim_varredura = conn.execute(
+                SQL_FIM_VARREDURA.format(where=_where(indice[0])),
+                (*indice[1], VARREDURA_MAXIMA - 1)
+            ).fetchone()
+
+    proximo = None
+    if len(logs) > limite:
+        logs = logs[:limite]
+        ultimo = logs[-1]
+        proximo = codificar_cursor([ultimo['data_hora'], ultimo['id']])
+    elif fim_varredura is not None:
+        proximo = codificar_cursor([fim_varredura['data_hora'], fim_varredura['id']])
+
+    for log in logs:
+        log['detalhes_truncados'] = bool(log['detalhes_truncados'])
+
+    return {'logs': logs, 'next_cursor': proximo}
+
+
+def obter_log(log_id):
+    """
+    Retorna um log com os detalhes completos
+
+    Args:
+        log_id: ID do log
+
+    Returns:
+        dict ou None: Log encontrado
+    """
+    with get_db_leitura() as conn:
+        log = conn.execute("SELECT * FROM logs WHERE id = ?", (log_id,)).fetchone()
+    return dict(log) if log else None
+
+
+def plano_listagem_logs(filtros=None, cursor=None):
+    """
+    Retorna o plano de execução da listagem para os filtros informados
+
+    Returns:
+        list: Linhas do EXPLAIN QUERY PLAN
+    """
+    indice, residuo = montar_condicoes_logs(filtros, cursor)
+    sql, parametros = _consulta_listagem(indice, residuo, 1)
+
+    with get_db_leitura() as conn:
+        linhas = conn.execute('EXPLAIN QUERY PLAN ' + sql, parametros).fetchall()
+
+    return [linha[3] for linha in linhas]
+
+
+def verificar_indices_logs():
+    """
+    Confere, pelo planejador do SQLite, que toda combinação de filtros é
+    servida por índice e sem ordenação em memória da faixa inteira (com
+    filtro residual, apenas a faixa limitada é ordenada)
+
+    Returns:
+        list: Combinações (tuplas de nomes de filtro) com varredura completa
+              ou ORDER BY em B-tree temporária; vazia quando todas usam índice
+    """
+    exemplos = {
+        'usuario_id': 1,
+        'modulo': 'Documentos',
+        'ip_local': '127.0.0.1',
+        'operacao': 'criado',
+        'data_inicio': '2024-01-01',
+        'data_fim': '2024-12-31'
+    }
+    falhas = []
+
+    for tamanho in range(len(exemplos) + 1):
+        for combinacao in itertools.combinations(exemplos, tamanho):
+            filtros = {chave: exemplos[chave] for chave in combinacao}
+            plano = plano_listagem_logs(filtros, codificar_cursor(['2024-06-01 00:00:00', 1]))
+
+            limitada = any(linha.startswith('CO-ROUTINE') for linha in plano)
+            if any(
+                (linha.startswith('SCAN logs') and 'USING' not in linha)
+                or ('TEMP B-TREE' in linha and not limitada)
+                for linha in plano
+            ):
+                logger.warning(f"Listagem de logs sem índice para {combinacao}: {plano}")
+                falhas.append(combinacao)
+
+    return falhas
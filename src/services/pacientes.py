@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Busca de Pacientes
+Sugestões enquanto o usuário digita (FTS5) e listagem paginada por cursor
+"""
+
+import logging
+
+from src.core.database import get_db_leitura, consultar_registros
+from src.utils.helpers import montar_consulta_fts, codificar_cursor, decodificar_cursor
+
+logger = logging.getLogger(__name__)
+
+# Termos com menos caracteres que os prefixos indexados em pacientes_fts são ignorados
+TAMANHO_MINIMO_TERMO = 2
+
+# Sugestões: percorre o índice FTS na ordem de rowid (cadastros mais recentes
+# primeiro) e para no LIMIT. Ordenar por bm25 exigiria pontuar todos os
+# pacientes que casam com prefixos curtos ('jo'*), o que não cabe em uma
+# digitação.
+SQL_SUGESTOES = """
+    SELECT p.id, p.nome_completo, p.prec_cp, p.posto, p.om
+    FROM pacientes_fts f
+    JOIN pacientes p ON p.id = f.rowid
+    WHERE pacientes_fts MATCH ? AND p.ativo = 1
+    ORDER BY f.rowid DESC
+    LIMIT ?
+"""
+
+
+def sugerir_pacientes(texto, limite=10):
+    """
+    Sugere pacientes ativos pelo nome, PREC-CP, posto ou OM (parcial e sem acentos)
+
+    Args:
+        texto: Texto digitado (cada palavra é tratada como prefixo)
+        limite: Quantidade máxima de sugestões
+
+    Returns:
+        list: Dicionários com id, nome_completo, prec_cp, posto e om
+    """
+    consulta = montar_consulta_fts(texto, TAMANHO_MINIMO_TERMO)
+    if consulta is None:
+        return []
+
+    with get_db_leitura() as conn:
+        return consultar_registros(conn, SQL_SUGESTOES, (consulta, limite))
+
+
+def listar_pacientes(limite=50, cursor=None, busca=None):
+    """
+    Lista pacientes ativos em ordem alfabética, paginando por (nome_completo, id)
+
+    Args:
+        limite: Quantidade máxima de pacientes na página
+        cursor: next_cursor da página anterior
+        busca: Texto opcional para filtrar pelo índice textual
+
+    Returns:
+        dict: {'pacientes': [...], 'next_cursor': str ou None}
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    condicoes = ['p.ativo = 1']
+    parametros = []
+
+    consulta = montar_consulta_fts(busca, TAMANHO_MINIMO_TERMO) if busca else None
+    if consulta:
+        condicoes.append('p.id IN (SELECT rowid FROM pacientes_fts WHERE pacientes_fts MATCH ?)')
+        parametros.append(consulta)
+
+    if cursor:
+        nome, paciente_id = decodificar_cursor(cursor, 2)
+        condicoes.append('(p.nome_completo, p.id) > (?, ?)')
+        parametros.extend([nome, paciente_id])
+
+    with get_db_leitura() as conn:
+        # Uma linha extra indica se existe próxima página
+        pacientes = consultar_registros(conn, f"""
+            SELECT p.id, p.nome_completo, p.prec_cp, p.posto, p.om,
+                   p.data_nascimento, p.data_cadastro
+            FROM pacientes p
+            WHERE {' AND '.join(condicoes)}
+            ORDER BY p.nome_completo, p.id
+            LIMIT ?
+        """, (*parametros, limite + 1))
+
+    proximo = None
+    if len(pacientes) > limite:
+        pacientes = pacientes[:limite]
+        ultimo = pacientes[-1]
+        proximo = codificar_cursor([ultimo['nome_completo'], ultimo['id']])
+
+    return {'pacientes': pacientes, 'next_cursor': proximo}
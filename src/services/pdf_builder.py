@@ -6,8 +6,10 @@ Gerencia templates PDF e geração de formulários preenchidos
 
 import os
 import json
+import hashlib
 import logging
-from datetime import datetime
+import shutil
+from datetime import datetime, timezone
 from io import BytesIO
 import base64
 
@@ -18,7 +20,8 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib.colors import black
 
 from src.config import DIRECTORIES
-from src.core.database import get_db_connection
+from src.core.database import get_db_leitura, get_db_escrita, iterar_registros
+from src.core.backup import calcular_hash_arquivo
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +58,7 @@ def criar_template(nome, descricao, pdf_file, usuario_id):
         width = float(media_box.width)
         height = float(media_box.height)
 
+        hash_arquivo = hashlib.sha256(pdf_bytes).hexdigest()
         pdf_file.seek(0)  # Reset file pointer
 
     except Exception as e:
@@ -72,12 +76,12 @@ def criar_template(nome, descricao, pdf_file, usuario_id):
     file_size = os.path.getsize(filepath)
 
     # Criar registro no banco
-    with get_db_connection() as conn:
+    with get_db_escrita() as conn:
         cursor = conn.cursor()
         cursor.execute("""
-            INSERT INTO templates_pdf (nome, descricao, caminho_arquivo, mapeamento_campos, ativo)
-            VALUES (?, ?, ?, ?, 1)
-        """, (nome, descricao, filepath, json.dumps([])))
+            INSERT INTO templates_pdf (nome, descricao, caminho_arquivo, mapeamento_campos, ativo, hash_arquivo)
+            VALUES (?, ?, ?, ?, 1, ?)
+        """, (nome, descricao, filepath, json.dumps([]), hash_arquivo))
         conn.commit()
         template_id = cursor.lastrowid
 
@@ -95,6 +99,18 @@ def criar_template(nome, descricao, pdf_file, usuario_id):
     }
 
 
+# Listagem de templates: a quantidade de campos é contada pelo SQLite, sem
+# carregar o mapeamento (JSON) de cada template
+SQL_LISTAGEM_TEMPLATES = """
+    SELECT
+        id, nome, descricao, caminho_arquivo, ativo, data_criacao,
+        json_array_length(COALESCE(NULLIF(mapeamento_campos, ''), '[]')) AS num_campos
+    FROM templates_pdf
+    {where}
+    ORDER BY data_criacao DESC
+"""
+
+
 def listar_templates(incluir_inativos=False):
     """
     Lista todos os templates
@@ -105,52 +121,30 @@ def listar_templates(incluir_inativos=False):
     Returns:
         Lista de dicts com informações dos templates
     """
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    return list(iterar_templates(incluir_inativos))
 
-        if incluir_inativos:
-            cursor.execute("""
-                SELECT
-                    id, nome, descricao, caminho_arquivo,
-                    ativo, data_criacao, mapeamento_campos
-                FROM templates_pdf
-                ORDER BY data_criacao DESC
-            """)
-        else:
-            cursor.execute("""
-                SELECT
-                    id, nome, descricao, caminho_arquivo,
-                    ativo, data_criacao, mapeamento_campos
-                FROM templates_pdf
-                WHERE ativo = 1
-                ORDER BY data_criacao DESC
-            """)
-
-        rows = cursor.fetchall()
-
-        templates = []
-        for row in rows:
-            # Contar campos
-            campos = json.loads(row['mapeamento_campos'] or '[]')
-            num_campos = len(campos)
-
-            # Obter tamanho do arquivo
-            file_size = 0
-            if os.path.exists(row['caminho_arquivo']):
-                file_size = os.path.getsize(row['caminho_arquivo'])
-
-            templates.append({
-                'id': row['id'],
-                'nome': row['nome'],
-                'descricao': row['descricao'],
-                'caminho_arquivo': row['caminho_arquivo'],
-                'ativo': bool(row['ativo']),
-                'data_criacao': row['data_criacao'],
-                'num_campos': num_campos,
-                'file_size': file_size
-            })
-
-        return templates
+
+def iterar_templates(incluir_inativos=False):
+    """
+    Versão em streaming de listar_templates
+
+    Args:
+        incluir_inativos: Se True, inclui templates desativados
+
+    Yields:
+        dict: Informações do template (com num_campos e file_size)
+    """
+    sql = SQL_LISTAGEM_TEMPLATES.format(where='' if incluir_inativos else 'WHERE ativo = 1')
+
+    for template in iterar_registros(sql):
+        # Obter tamanho do arquivo
+        file_size = 0
+        if os.path.exists(template['caminho_arquivo']):
+            file_size = os.path.getsize(template['caminho_arquivo'])
+
+        template['ativo'] = bool(template['ativo'])
+        template['file_size'] = file_size
+        yield template
 
 
 def obter_template(template_id):
@@ -163,7 +157,7 @@ def obter_template(template_id):
     Returns:
         dict com informações do template ou None se não encontrado
     """
-    with get_db_connection() as conn:
+    with get_db_leitura() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT
@@ -217,31 +211,47 @@ def obter_template(template_id):
         }
 
 
-def obter_pdf_template(template_id):
+def obter_arquivo_template(template_id):
     """
-    Obtém o arquivo PDF de um template
+    Obtém o caminho e os metadados do arquivo PDF de um template, para envio
+    direto do disco (sem carregar o arquivo na memória)
+
+    Templates cadastrados antes de hash_arquivo existir têm o hash calculado
+    e gravado no primeiro acesso.
 
     Args:
         template_id: ID do template
 
     Returns:
-        bytes do PDF ou None se não encontrado
+        dict com caminho, hash (SHA-256), tamanho e modificado_em (datetime
+        UTC), ou None se o template ou o arquivo não existir
     """
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT caminho_arquivo
+    with get_db_leitura() as conn:
+        row = conn.execute("""
+            SELECT caminho_arquivo, hash_arquivo
             FROM templates_pdf
             WHERE id = ?
-        """, (template_id,))
+        """, (template_id,)).fetchone()
 
-        row = cursor.fetchone()
+    if not row or not os.path.exists(row['caminho_arquivo']):
+        return None
 
-        if not row or not os.path.exists(row['caminho_arquivo']):
-            return None
+    hash_arquivo = row['hash_arquivo']
+    if not hash_arquivo:
+        hash_arquivo = calcular_hash_arquivo(row['caminho_arquivo'])
+        with get_db_escrita() as conn:
+            conn.execute(
+                "UPDATE templates_pdf SET hash_arquivo = ? WHERE id = ?", (hash_arquivo, template_id)
+            )
+            conn.commit()
 
-        with open(row['caminho_arquivo'], 'rb') as f:
-            return f.read()
+    info = os.stat(row['caminho_arquivo'])
+    return {
+        'caminho': row['caminho_arquivo'],
+        'hash': hash_arquivo,
+        'tamanho': info.st_size,
+        'modificado_em': datetime.fromtimestamp(info.st_mtime, timezone.utc)
+    }
 
 
 def atualizar_template(template_id, nome=None, descricao=None, ativo=None):
@@ -278,7 +288,7 @@ def atualizar_template(template_id, nome=None, descricao=None, ativo=None):
 
     params.append(template_id)
 
-    with get_db_connection() as conn:
+    with get_db_escrita() as conn:
         cursor = conn.cursor()
         # Query segura - campos são hardcoded, apenas valores são parametrizados
         query = f"UPDATE templates_pdf SET {', '.join(updates)} WHERE id = ?"
@@ -298,7 +308,7 @@ def deletar_template(template_id):
     Returns:
         bool indicando sucesso
     """
-    with get_db_connection() as conn:
+    with get_db_escrita() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             UPDATE templates_pdf
@@ -337,24 +347,23 @@ def duplicar_template(template_id, usuario_id):
     new_filepath = os.path.join(DIRECTORIES['templates_pdfs'], new_filename)
 
     try:
-        with open(original['caminho_arquivo'], 'rb') as src:
-            with open(new_filepath, 'wb') as dst:
-                dst.write(src.read())
+        shutil.copyfile(original['caminho_arquivo'], new_filepath)
     except Exception as e:
         logger.error(f"Erro ao copiar PDF: {e}")
         return None
 
     # Criar novo template no banco
-    with get_db_connection() as conn:
+    with get_db_escrita() as conn:
         cursor = conn.cursor()
         cursor.execute("""
-            INSERT INTO templates_pdf (nome, descricao, caminho_arquivo, mapeamento_campos, ativo)
-            VALUES (?, ?, ?, ?, 1)
+            INSERT INTO templates_pdf (nome, descricao, caminho_arquivo, mapeamento_campos, ativo, hash_arquivo)
+            VALUES (?, ?, ?, ?, 1, (SELECT hash_arquivo FROM templates_pdf WHERE id = ?))
         """, (
             f"{original['nome']} (Cópia)",
             original['descricao'],
             new_filepath,
-            json.dumps(original['campos'])
+            json.dumps(original['campos']),
+            template_id
         ))
         conn.commit()
         new_template_id = cursor.lastrowid
@@ -387,7 +396,7 @@ def salvar_campos_template(template_id, campos):
     campos_json = json.dumps(campos, ensure_ascii=False)
 
     # Atualizar no banco
-    with get_db_connection() as conn:
+    with get_db_escrita() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             UPDATE templates_pdf
@@ -414,7 +423,7 @@ def obter_campos_template(template_id):
     Returns:
         Lista de dicts com informações dos campos
     """
-    with get_db_connection() as conn:
+    with get_db_leitura() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT mapeamento_campos
@@ -53,9 +53,10 @@ def gerar_pdf_documento(codigo_documento, tipo_documento, dados_documento, camin
     c.setFont("Helvetica-Bold", 16)
     
     # Nome do hospital (obtido das configurações)
-    from src.core.database import obter_configuracao
-    nome_hospital = obter_configuracao('nome_hospital', 'Hospital Militar')
-    sigla_oms = obter_configuracao('sigla_oms', '')
+    from src.core.database import obter_configuracoes
+    configuracoes = obter_configuracoes()
+    nome_hospital = configuracoes.get('nome_hospital', 'Hospital Militar')
+    sigla_oms = configuracoes.get('sigla_oms', '')
     
     c.drawCentredString(largura/2, altura - 1.2*cm, nome_hospital)
     
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Relatórios de Documentos
+Consultas sobre os resumos diário e mensal (resumo_documentos_*), mantidos
+por triggers: nenhum relatório varre a tabela documentos
+"""
+
+import logging
+from datetime import timedelta
+
+from src.core.database import get_db_leitura
+from src.models import DIMENSOES_RESUMO
+
+logger = logging.getLogger(__name__)
+
+# Tabelas com o nome das dimensões identificadas por id
+NOMES_DIMENSOES = {
+    'setor_origem': 'setores',
+    'setor_destino': 'setores',
+    'profissional': 'profissionais'
+}
+
+# Agrupamento temporal combinável com uma dimensão (ex: mes + status)
+AGRUPAMENTO_MES = 'mes'
+
+
+def _primeiro_dia_mes_seguinte(data):
+    """Primeiro dia do mês seguinte ao da data"""
+    return (data.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def _segmentos(data_inicio, data_fim):
+    """
+    Divide o período entre os resumos: meses inteiros no mensal e as
+    frações de mês nas bordas no diário
+
+    Args:
+        data_inicio: date inicial (inclusiva) ou None
+        data_fim: date final (inclusiva) ou None
+
+    Returns:
+        list: Tuplas (tabela, coluna, inicio, fim) com fim exclusivo (None = aberto)
+    """
+    inicio_meses = data_inicio
+    if data_inicio is not None and data_inicio.day != 1:
+        inicio_meses = _primeiro_dia_mes_seguinte(data_inicio)
+
+    fim_exclusivo = data_fim + timedelta(days=1) if data_fim is not None else None
+    fim_meses = fim_exclusivo.replace(day=1) if fim_exclusivo is not None else None
+
+    if inicio_meses is not None and fim_meses is not None and inicio_meses >= fim_meses:
+        # Período sem nenhum mês inteiro: apenas o resumo diário
+        return [('resumo_documentos_diario', 'dia', data_inicio.isoformat(), fim_exclusivo.isoformat())]
+
+    segmentos = [(
+        'resumo_documentos_mensal', 'mes',
+        inicio_meses.strftime('%Y-%m') if inicio_meses else None,
+        fim_meses.strftime('%Y-%m') if fim_meses else None
+    )]
+
+    if data_inicio is not None and data_inicio != inicio_meses:
+        segmentos.append(('resumo_documentos_diario', 'dia', data_inicio.isoformat(), inicio_meses.isoformat()))
+
+    if fim_exclusivo is not None and fim_exclusivo != fim_meses:
+        segmentos.append(('resumo_documentos_diario', 'dia', fim_meses.isoformat(), fim_exclusivo.isoformat()))
+
+    return segmentos
+
+
+def relatorio_documentos(agrupar, data_inicio=None, data_fim=None):
+    """
+    Totais de documentos agrupados por uma dimensão, por mês ou por mês e
+    uma dimensão
+
+    Args:
+        agrupar: Lista com uma chave de DIMENSOES_RESUMO e/ou 'mes'
+                 (ex: ['tipo_documento'], ['mes'], ['mes', 'status'])
+        data_inicio: date inicial (inclusiva), opcional
+        data_fim: date final (inclusiva), opcional
+
+    Returns:
+        list: Dicionários com as chaves agrupadas e 'total'; dimensões por id
+              trazem também '<chave>_nome' (id 0 = não informado)
+
+    Raises:
+        ValueError: Se o agrupamento for inválido
+    """
+    agrupar = list(agrupar or [])
+    por_mes = AGRUPAMENTO_MES in agrupar
+    dimensoes = [chave for chave in agrupar if chave != AGRUPAMENTO_MES]
+
+    if not agrupar or len(dimensoes) > 1 or len(agrupar) != len(set(agrupar)):
+        raise ValueError("Agrupe por uma dimensão, por 'mes' ou por 'mes' e uma dimensão")
+    if dimensoes and dimensoes[0] not in DIMENSOES_RESUMO:
+        raise ValueError(f"Agrupamento inválido: {dimensoes[0]}")
+
+    # Sem dimensão (só 'mes'): qualquer dimensão soma o total de documentos
+    dimensao = dimensoes[0] if dimensoes else 'tipo_documento'
+
+    # Linhas dos resumos no período (UNION ALL dos segmentos)
+    partes = []
+    parametros = []
+    for tabela, coluna, inicio, fim in _segmentos(data_inicio, data_fim):
+        condicoes = ['dimensao = ?']
+        parametros.append(dimensao)
+        if inicio is not None:
+            condicoes.append(f'{coluna} >= ?')
+            parametros.append(inicio)
+        if fim is not None:
+            condicoes.append(f'{coluna} < ?')
+            parametros.append(fim)
+        partes.append(
+            f"SELECT substr({coluna}, 1, 7) AS mes, valor, total FROM {tabela} "
+            f"WHERE {' AND '.join(condicoes)}"
+        )
+
+    colunas = []
+    if por_mes:
+        colunas.append(('mes', 'mes'))
+    if dimensoes:
+        colunas.append(('valor', dimensao))
+
+    selecao = ', '.join(f'{origem} AS {chave}' for origem, chave in colunas)
+    agrupamento = ', '.join(origem for origem, _ in colunas)
+
+    # Nome resolvido depois da agregação (poucas linhas)
+    nome = juncao = ''
+    if dimensao in NOMES_DIMENSOES and dimensoes:
+        nome = f', n.nome AS {dimensao}_nome'
+        juncao = f'LEFT JOIN {NOMES_DIMENSOES[dimensao]} n ON n.id = r.{dimensao}'
+
+    sql = f"""
+        SELECT r.*{nome}
+        FROM (
+            SELECT {selecao}, SUM(total) AS total
+            FROM ({' UNION ALL '.join(partes)})
+            GROUP BY {agrupamento}
+            HAVING SUM(total) <> 0
+        ) r
+        {juncao}
+        ORDER BY {', '.join(f'r.{chave}' for _, chave in colunas)}
+    """
+
+    with get_db_leitura() as conn:
+        linhas = conn.execute(sql, parametros).fetchall()
+
+    return [dict(linha) for linha in linhas]
@@ -4,9 +4,14 @@ Utilitários do Sistema HGU Digital Core
 Funções auxiliares para operações comuns
 """
 
+import base64
+import json
+import re
 import socket
 import secrets
 import string
+import unicodedata
+from collections.abc import Iterator
 from contextlib import closing
 
 
@@ -130,3 +135,129 @@ def sanitize_filename(filename):
         sanitized = sanitized.replace('..', '.')
 
     return sanitized.strip()
+
+
+def codificar_cursor(valores):
+    """
+    Codifica a chave da última linha de uma página em um cursor opaco
+
+    Args:
+        valores: Lista/tupla com os valores da chave de ordenação
+
+    Returns:
+        str: Cursor em base64 url-safe (sem padding)
+    """
+    bruto = json.dumps(list(valores), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(bruto).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(cursor, tamanho):
+    """
+    Decodifica um cursor gerado por codificar_cursor
+
+    Args:
+        cursor: String recebida do cliente
+        tamanho: Quantidade de valores esperada na chave
+
+    Returns:
+        list: Valores da chave de ordenação
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        valores = json.loads(bruto.decode('utf-8'))
+    except (ValueError, TypeError) as e:
+        raise ValueError('Cursor inválido') from e
+
+    if not isinstance(valores, list) or len(valores) != tamanho:
+        raise ValueError('Cursor inválido')
+
+    # Os valores vão como parâmetros do SQL: só texto e inteiros (bool é int em Python)
+    if any(isinstance(v, bool) or not isinstance(v, (str, int)) for v in valores):
+        raise ValueError('Cursor inválido')
+
+    return valores
+
+
+def gerar_json_stream(campos, lote=100):
+    """
+    Serializa um objeto JSON em pedaços, sem montar as listas em memória
+
+    Valores que são iteradores (ex: geradores de registros do banco) viram
+    arrays, com um pedaço a cada `lote` elementos. Valores chamáveis são
+    avaliados apenas quando chega sua vez, depois dos campos anteriores: um
+    next_cursor conhecido só ao fim da lista vem depois dela.
+
+    Args:
+        campos: Dicionário chave -> valor, iterador ou função sem argumentos
+        lote: Elementos por pedaço nos arrays
+
+    Yields:
+        str: Pedaços do JSON
+    """
+    separador = '{'
+    for chave, valor in campos.items():
+        prefixo = f'{separador}{json.dumps(chave)}: '
+        separador = ', '
+
+        if callable(valor):
+            valor = valor()
+
+        if not isinstance(valor, Iterator):
+            yield prefixo + json.dumps(valor, ensure_ascii=False)
+            continue
+
+        # Cada lote é serializado de uma vez, sem os colchetes da lista
+        pedaco = prefixo + '['
+        bloco = []
+        for item in valor:
+            bloco.append(item)
+            if len(bloco) == lote:
+                yield pedaco + json.dumps(bloco, ensure_ascii=False)[1:-1]
+                pedaco = ', '
+                bloco = []
+        if bloco:
+            pedaco += json.dumps(bloco, ensure_ascii=False)[1:-1]
+        yield pedaco + ']'
+
+    yield '{}' if separador == '{' else '}'
+
+
+def montar_consulta_fts(texto, tamanho_minimo=1):
+    """
+    Converte o texto digitado em uma consulta FTS5 segura
+
+    Cada palavra vira um termo entre aspas com busca por prefixo, unidos
+    por AND implícito: 'joão sil' -> '"joão"* "sil"*'. Operadores e
+    caracteres especiais do FTS5 digitados pelo usuário são descartados.
+
+    Args:
+        texto: Texto livre informado pelo usuário
+        tamanho_minimo: Menor termo aceito (termos curtos demais são ignorados)
+
+    Returns:
+        str: Consulta para MATCH, ou None se não restar nenhum termo
+    """
+    termos = [t for t in re.findall(r'\w+', texto or '') if len(t) >= tamanho_minimo]
+    if not termos:
+        return None
+    return ' '.join(f'"{termo}"*' for termo in termos)
+
+
+def normalizar_chave(texto):
+    """
+    Normaliza um texto para comparação tolerante a grafia
+
+    Remove acentos, pontuação e espaços e ignora maiúsculas:
+    'Centro Cirúrgico' -> 'centrocirurgico', 'CRM-BA 12.345' -> 'crmba12345'
+
+    Args:
+        texto: Texto a normalizar (None = '')
+
+    Returns:
+        str: Chave normalizada
+    """
+    decomposto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in decomposto if c.isalnum() and not unicodedata.combining(c)).casefold()
@@ -205,14 +205,19 @@ function formatarDataHora(dataISO) {
  * @param {string} idTabela - ID da tabela
  * @param {Array} dados - Array de objetos com os dados
  * @param {Array} colunas - Array com nomes das colunas
+ * @param {boolean} acrescentar - Mantém as linhas atuais (paginação incremental)
  */
-function preencherTabela(idTabela, dados, colunas) {
+function preencherTabela(idTabela, dados, colunas, acrescentar = false) {
     const tbody = document.querySelector(`#${idTabela} tbody`);
     if (!tbody) return;
     
-    tbody.innerHTML = '';
+    if (!acrescentar) {
+        tbody.innerHTML = '';
+    }
     
     if (dados.length === 0) {
+        if (acrescentar) return;
+
         const tr = document.createElement('tr');
         const td = document.createElement('td');
         td.colSpan = colunas.length;
@@ -12,19 +12,27 @@ import tempfile
 # Adicionar diretório pai ao path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Contadores de rate limit em um arquivo temporário, definido antes de importar
+# src.config: o padrão (hgu_ratelimit.db na raiz) é o de uma instância em uso
+_DIR_RATE_LIMIT = tempfile.TemporaryDirectory(prefix='hgu_testes_')
+os.environ['RATE_LIMIT_STORAGE_URI'] = 'sqlite://' + os.path.join(_DIR_RATE_LIMIT.name, 'ratelimit.db')
+
 
 @pytest.fixture
 def app():
     """
     Fixture que cria uma instância da aplicação Flask para testes
     """
-    from app import app as flask_app
+    from app import app as flask_app, limiter
     from src.config import DATABASE
 
     # Configurar para modo de teste
     flask_app.config['TESTING'] = True
     flask_app.config['WTF_CSRF_ENABLED'] = False  # Desabilitar CSRF para testes
 
+    # Contadores de rate limit não devem vazar entre testes
+    limiter.reset()
+
     # Usar banco de dados em memória para testes
     db_fd, db_path = tempfile.mkstemp()
     DATABASE['name'] = db_path
@@ -35,6 +43,10 @@ def app():
 
     yield flask_app
 
+    # Gravar logs enfileirados antes de remover o banco
+    from src.core.database import descarregar_logs
+    descarregar_logs()
+
     # Limpeza
     os.close(db_fd)
     os.unlink(db_path)
@@ -73,3 +85,55 @@ def auth_client(client, app):
     })
 
     return client
+
+
+@pytest.fixture
+def dados_documento(app):
+    """
+    Fixture que cria paciente, profissional e setores para emissão de documentos
+    """
+    from src.core.database import (
+        criar_setores_padrao, listar_setores, cadastrar_paciente, cadastrar_profissional
+    )
+
+    criar_setores_padrao()
+    setores = listar_setores()
+
+    paciente_id = cadastrar_paciente('João da Silva', '123456789', 'Soldado', '1º Batalhão')
+    profissional_id = cadastrar_profissional(
+        'Dr. Carlos Santos', 'Médico', 'CRM-BA 12345', 'Capitão', setores[0]['id']
+    )
+
+    return {
+        'paciente_id': paciente_id,
+        'profissional_id': profissional_id,
+        'setor_origem_id': setores[0]['id'],
+        'setor_destino_id': setores[1]['id'],
+        'usuario_criador_id': None
+    }
+
+
+@pytest.fixture
+def emitir_teste(dados_documento):
+    """
+    Fixture que retorna uma função para emitir documentos com os dados de dados_documento
+
+    A função aceita tipo, conteudo (dict), data_emissao (fixa, ex:
+    '2024-03-10 09:00:00') e campos que substituem os de dados_documento
+    (ex: setor_destino_id=None), e retorna o código único do documento.
+    """
+    from src.core.database import emitir_documento, get_db_escrita
+
+    def emitir(tipo='Declaração', conteudo=None, data_emissao=None, **alteracoes):
+        parametros = dict(dados_documento, **alteracoes)
+        codigo = emitir_documento(tipo, conteudo_json=conteudo or {}, **parametros)['codigo']
+        if data_emissao:
+            with get_db_escrita() as conn:
+                conn.execute(
+                    "UPDATE documentos SET data_emissao = ? WHERE codigo_unico = ?",
+                    (data_emissao, codigo)
+                )
+                conn.commit()
+        return codigo
+
+    return emitir
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Testes da Fila de Auditoria
+Testa a fila paginada, as reservas entre auditores concorrentes e a
+transição de status em lote
+"""
+
+import threading
+
+import pytest
+
+from src.core.database import criar_usuario, get_db_escrita, obter_contadores
+from src.services.auditoria import (
+    fila_auditoria, plano_fila_auditoria, reservar_documentos, liberar_reservas,
+    transicionar_documentos
+)
+
+
+@pytest.fixture
+def auditores(app):
+    """IDs de dois auditores"""
+    return (
+        criar_usuario('Auditor Um', 'auditor1', 'Auditor123', 'auditor'),
+        criar_usuario('Auditor Dois', 'auditor2', 'Auditor123', 'auditor')
+    )
+
+
+def _emitir(emitir_teste, quantidade, tipo='Guia de Exame'):
+    """Emite documentos pela fixture emitir_teste e retorna seus IDs na ordem de emissão"""
+    codigos = [emitir_teste(tipo) for _ in range(quantidade)]
+    with get_db_escrita() as conn:
+        return [
+            conn.execute("SELECT id FROM documentos WHERE codigo_unico = ?", (codigo,)).fetchone()[0]
+            for codigo in codigos
+        ]
+
+
+class TestFilaAuditoria:
+    """Testes da fila de documentos pendentes"""
+
+    def test_paginacao_fifo(self, emitir_teste):
+        """Testa ordem do mais antigo ao mais recente, cursor e exclusão dos auditados"""
+        ids = _emitir(emitir_teste, 5)
+        with get_db_escrita() as conn:
+            conn.execute("UPDATE documentos SET status = 'Aprovado' WHERE id = ?", (ids[1],))
+            conn.commit()
+
+        primeira = fila_auditoria(limite=2)
+        segunda = fila_auditoria(limite=2, cursor=primeira['next_cursor'])
+
+        assert [doc['id'] for doc in primeira['documentos']] == [ids[0], ids[2]]
+        assert [doc['id'] for doc in segunda['documentos']] == [ids[3], ids[4]]
+        assert segunda['next_cursor'] is None
+
+        with pytest.raises(ValueError):
+            fila_auditoria(cursor='invalido')
+
+    def test_indice_parcial(self, app):
+        """Testa se a fila usa o índice parcial, sem ordenação temporária"""
+        plano = ' | '.join(plano_fila_auditoria(cursor=None))
+
+        assert 'idx_documentos_pendentes' in plano
+        assert 'TEMP B-TREE' not in plano
+
+
+class TestReservas:
+    """Testes das reservas de documentos"""
+
+    def test_auditores_concorrentes_nao_compartilham(self, emitir_teste, auditores):
+        """Testa reservas simultâneas sem documentos repetidos"""
+        _emitir(emitir_teste, 20)
+        resultados = []
+
+        def reservar(auditor_id):
+            resultados.append(reservar_documentos(auditor_id, 5)['documentos'])
+
+        threads = [threading.Thread(target=reservar, args=(auditores[i % 2],)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        por_auditor = {auditor_id: set() for auditor_id in auditores}
+        for documentos in resultados:
+            for doc in documentos:
+                por_auditor[doc['reservado_por']].add(doc['id'])
+
+        assert not por_auditor[auditores[0]] & por_auditor[auditores[1]]
+        assert len(por_auditor[auditores[0]]) == len(por_auditor[auditores[1]]) == 5
+
+    def test_reserva_expirada_e_liberacao(self, emitir_teste, auditores):
+        """Testa que reservas expiradas ou liberadas voltam para a fila"""
+        ids = _emitir(emitir_teste, 3)
+        um, dois = auditores
+
+        assert [doc['id'] for doc in reservar_documentos(um, 2)['documentos']] == ids[:2]
+        assert [doc['id'] for doc in reservar_documentos(dois, 2)['documentos']] == ids[2:]
+
+        with get_db_escrita() as conn:
+            conn.execute(
+                "UPDATE auditoria_reservas SET expira_em = datetime('now', '-1 minute') WHERE documento_id = ?",
+                (ids[0],)
+            )
+            conn.commit()
+        assert [doc['id'] for doc in reservar_documentos(dois, 2)['documentos']] == [ids[0], ids[2]]
+
+        assert liberar_reservas(um) == 1
+        assert [doc['id'] for doc in reservar_documentos(dois, 3)['documentos']] == ids
+
+
+class TestTransicaoLote:
+    """Testes da transição de status em lote"""
+
+    def test_lote_com_recusas(self, emitir_teste, auditores):
+        """Testa UPDATE, histórico e recusa de itens reservados por outro auditor"""
+        ids = _emitir(emitir_teste, 4)
+        um, dois = auditores
+        reservar_documentos(dois, 1)  # ids[0] reservado por outro auditor
+
+        resultado = transicionar_documentos(um, [
+            {'documento_id': ids[0], 'status_novo': 'Aprovado'},
+            {'documento_id': ids[1], 'status_novo': 'Aprovado'},
+            {'documento_id': ids[2], 'status_novo': 'Indeferido', 'motivo_glosa': 'Sem assinatura'},
+            {'documento_id': ids[2], 'status_novo': 'Aprovado'},
+            {'documento_id': ids[3], 'status_novo': 'Emitido'},
+            {'documento_id': 999, 'status_novo': 'Aprovado'}
+        ], usuario_nome='Auditor Um', ip_local='127.0.0.1')
+
+        assert [doc['documento_id'] for doc in resultado['processados']] == [ids[1], ids[2]]
+        assert [erro['documento_id'] for erro in resultado['erros']] == [ids[0], ids[2], ids[3], 999]
+        assert resultado['erros'][0]['erro'] == 'Documento reservado por outro auditor'
+
+        with get_db_escrita() as conn:
+            historico = conn.execute("""
+                SELECT documento_id, status_anterior, status_novo, motivo_glosa, auditor_id
+                FROM auditoria ORDER BY id
+            """).fetchall()
+            log = conn.execute("SELECT operacao FROM logs WHERE modulo = 'Auditoria'").fetchone()
+
+        assert [tuple(linha) for linha in historico] == [
+            (ids[1], 'Emitido', 'Aprovado', None, um),
+            (ids[2], 'Emitido', 'Indeferido', 'Sem assinatura', um)
+        ]
+        assert log['operacao'] == 'Auditoria em lote: 2 documento(s)'
+        assert {item['status']: item['total'] for item in obter_contadores()['documentos_por_status']} == {
+            'Aprovado': 1, 'Emitido': 2, 'Indeferido': 1
+        }
+
+
+    def test_transicoes_permitidas(self, emitir_teste, auditores):
+        """Testa recusa de transições fora da tabela (ex: aprovado de volta a emitido)"""
+        ids = _emitir(emitir_teste, 2)
+        um, _ = auditores
+        transicionar_documentos(um, [
+            {'documento_id': ids[0], 'status_novo': 'Aprovado'},
+            {'documento_id': ids[1], 'status_novo': 'Indeferido', 'motivo_glosa': 'Sem carimbo'}
+        ])
+
+        resultado = transicionar_documentos(um, [
+            {'documento_id': ids[0], 'status_novo': 'Emitido'},
+            {'documento_id': ids[1], 'status_novo': 'Aprovado'}
+        ])
+        assert resultado['processados'] == []
+        assert [erro['erro'] for erro in resultado['erros']] == [
+            'Transição de status não permitida: Aprovado -> Emitido',
+            'Transição de status não permitida: Indeferido -> Aprovado'
+        ]
+
+        resultado = transicionar_documentos(um, [{'documento_id': ids[1], 'status_novo': 'Revisado'}])
+        assert [doc['status_novo'] for doc in resultado['processados']] == ['Revisado']
+
+
+class TestApiAuditoria:
+    """Testes dos endpoints de auditoria"""
+
+    def test_reservar_e_transicionar(self, auth_client, emitir_teste):
+        """Testa o fluxo reservar → transicionar pela API"""
+        _emitir(emitir_teste, 3)
+
+        reserva = auth_client.post('/api/auditoria/reservar', json={'quantidade': 2}).get_json()
+        assert len(reserva['documentos']) == 2
+        assert reserva['expira_em']
+
+        resposta = auth_client.post('/api/auditoria/transicionar', json={'itens': [
+            {'documento_id': doc['id'], 'status_novo': 'Aprovado'} for doc in reserva['documentos']
+        ]})
+        assert resposta.status_code == 200
+        assert len(resposta.get_json()['processados']) == 2
+
+        fila = auth_client.get('/api/auditoria/fila').get_json()
+        assert len(fila['documentos']) == 1
+        assert fila['documentos'][0]['reservado_por'] is None
+
+    def test_validacao_e_permissao(self, auth_client, client, dados_documento):
+        """Testa indeferimento sem motivo, lote vazio e acesso sem login"""
+        resposta = auth_client.post('/api/auditoria/transicionar', json={'itens': [
+            {'documento_id': 1, 'status_novo': 'Indeferido'}
+        ]})
+        assert resposta.status_code == 400
+        assert 'motivo_glosa' in resposta.get_json()['erros']['itens']['0']
+
+        assert auth_client.post('/api/auditoria/transicionar', json={'itens': []}).status_code == 400
+        assert auth_client.get('/api/auditoria/fila?cursor=xyz').status_code == 400
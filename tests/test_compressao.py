@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Testes da Compressão das Respostas
+Testa gzip em respostas completas e em streaming, os casos ignorados e as
+métricas por endpoint
+"""
+
+import gzip
+import json
+import os
+
+from src.core import metricas
+from src.core.database import emitir_documento, get_db_escrita
+
+GZIP = {'Accept-Encoding': 'gzip, deflate'}
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestCompressao:
+    """Testes do after_request de compressão"""
+
+    def test_pagina_html(self, auth_client):
+        """Testa página renderizada compactada, com Content-Length do corpo gzip"""
+        resposta = auth_client.get('/documentos', headers=GZIP)
+
+        assert resposta.headers['Content-Encoding'] == 'gzip'
+        assert int(resposta.headers['Content-Length']) == len(resposta.data)
+        assert b'<html' in gzip.decompress(resposta.data).lower()
+        assert 'Accept-Encoding' in resposta.headers['Vary']
+
+    def test_json_em_streaming(self, auth_client, dados_documento):
+        """Testa listagem em streaming compactada pedaço a pedaço e métricas do endpoint"""
+        metricas.limpar()
+        for _ in range(30):
+            emitir_documento('Declaração', conteudo_json={}, **dados_documento)
+
+        resposta = auth_client.get('/api/documentos/listar?limite=50', headers=GZIP)
+        dados = json.loads(gzip.decompress(resposta.data))
+
+        assert resposta.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in resposta.headers
+        assert len(dados['documentos']) == 30
+
+        resumo = metricas.resumo('compressao.api_listar_documentos')
+        assert resumo['compressao.api_listar_documentos.razao']['media'] > 1
+        assert 'compressao.api_listar_documentos.cpu_ms' in resumo
+
+    def test_arquivo_estatico(self, client):
+        """Testa JavaScript estático compactado, com ETag fraca válida para o 304"""
+        resposta = client.get('/static/js/app.js', headers=GZIP)
+        with open(os.path.join(RAIZ, 'static', 'js', 'app.js'), 'rb') as f:
+            original = f.read()
+
+        assert resposta.headers['Content-Encoding'] == 'gzip'
+        assert int(resposta.headers['Content-Length']) == len(resposta.data) < len(original)
+        assert gzip.decompress(resposta.data) == original
+        assert resposta.headers['ETag'].startswith('W/')
+
+        revalidada = client.get(
+            '/static/js/app.js', headers={**GZIP, 'If-None-Match': resposta.headers['ETag']}
+        )
+        assert revalidada.status_code == 304
+
+    def test_respostas_ignoradas(self, auth_client, tmp_path):
+        """Testa cliente sem gzip, resposta pequena e PDF enviado do disco"""
+        assert 'Content-Encoding' not in auth_client.get('/documentos').headers
+
+        pequena = auth_client.get('/api/pacientes/listar', headers=GZIP)
+        assert 'Content-Encoding' not in pequena.headers
+        assert pequena.get_json()['pacientes'] == []
+
+        caminho = tmp_path / 'template.pdf'
+        caminho.write_bytes(b'%PDF-1.4\n' + b'0' * 4096)
+        with get_db_escrita() as conn:
+            template_id = conn.execute(
+                "INSERT INTO templates_pdf (nome, caminho_arquivo) VALUES ('Guia', ?)", (str(caminho),)
+            ).lastrowid
+            conn.commit()
+
+        pdf = auth_client.get(f'/api/pdf-templates/{template_id}/pdf', headers=GZIP)
+        assert 'Content-Encoding' not in pdf.headers
+        assert pdf.data.startswith(b'%PDF')
@@ -4,12 +4,30 @@ Testes do Banco de Dados
 Testa operações de banco de dados
 """
 
+import json
+import os
+import sqlite3
+import threading
 import pytest
+from datetime import datetime
+from src.config import DATABASE
 from src.core.database import (
-    get_db_connection, criar_usuario_admin, criar_usuario,
-    verificar_senha, cadastrar_paciente, cadastrar_profissional,
-    criar_setores_padrao, listar_setores
+    get_db_connection, get_db_leitura, get_db_escrita, criar_usuario_admin,
+    criar_usuario, verificar_senha, cadastrar_paciente, cadastrar_profissional,
+    criar_setores_padrao, listar_setores, buscar_paciente_por_prec,
+    estatisticas_pool, criar_documento, emitir_documento,
+    reservar_codigos_documento, backfill_sequencias_documentos,
+    salvar_configuracao, obter_configuracao, verificar_setup_inicial,
+    registrar_log, descarregar_logs, estatisticas_logs, listar_documentos_pagina,
+    obter_contadores, recalcular_contadores, listar_profissionais, consultar_registros,
+    inicializar_db, iniciar_pools, obter_pool
 )
+from src.config import LOGS
+from src.core import metricas
+from src.core.log_writer import AuditLogWriter
+from src.core.pool import ConnectionPool, PoolEsgotadoError
+from src.models import VERSAO_ESQUEMA
+from src.utils.helpers import codificar_cursor
 
 
 class TestUsuarios:
@@ -107,6 +125,14 @@ class TestProfissionais:
                 assert prof['nome'] == 'Dr. Carlos Santos'
                 assert prof['funcao'] == 'Médico'
 
+    def test_listar_profissionais(self, dados_documento):
+        """Testa a projeção da listagem: nome do setor e sem colunas de controle"""
+        profissionais = listar_profissionais()
+
+        assert [p['nome'] for p in profissionais] == ['Dr. Carlos Santos']
+        assert profissionais[0]['setor_nome']
+        assert 'ativo' not in profissionais[0]
+
 
 class TestSetores:
     """Testes de gerenciamento de setores"""
@@ -123,3 +149,558 @@ class TestSetores:
             nomes_setores = [s['nome'] for s in setores]
             assert 'UPAT' in nomes_setores
             assert 'ABAS' in nomes_setores
+
+
+class TestEsquema:
+    """Testes da atualização do esquema em bancos existentes"""
+
+    def test_coluna_adicionada(self, app):
+        """Testa que inicializar_db acrescenta colunas novas a tabelas antigas"""
+        with get_db_escrita() as conn:
+            conn.execute("ALTER TABLE templates_pdf DROP COLUMN hash_arquivo")
+            conn.commit()
+
+        inicializar_db(forcar=True)
+
+        with get_db_leitura() as conn:
+            colunas = {linha[1] for linha in conn.execute("PRAGMA table_info(templates_pdf)")}
+        assert 'hash_arquivo' in colunas
+
+    def test_esquema_atualizado_nao_migra(self, app):
+        """Testa que bancos já na versão atual não executam as migrações"""
+        with get_db_leitura() as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == VERSAO_ESQUEMA
+
+        with get_db_escrita() as conn:
+            conn.execute("ALTER TABLE templates_pdf DROP COLUMN hash_arquivo")
+            conn.commit()
+
+        assert inicializar_db() is False
+
+        with get_db_leitura() as conn:
+            colunas = {linha[1] for linha in conn.execute("PRAGMA table_info(templates_pdf)")}
+        assert 'hash_arquivo' not in colunas
+
+
+class TestPoolConexoes:
+    """Testes do pool de conexões"""
+
+    def test_conexao_reutilizada(self, app):
+        """Testa se a conexão é devolvida e reutilizada pelo pool"""
+        with get_db_connection() as conn1:
+            id1 = id(conn1)
+
+        with get_db_connection() as conn2:
+            assert id(conn2) == id1
+
+    def test_pragmas_aplicados(self, app):
+        """Testa se as conexões do pool recebem os PRAGMAs configurados"""
+        with get_db_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == 'wal'
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+    def test_consultar_registros(self, app):
+        """Testa linhas como dicionários sem alterar o row_factory da conexão"""
+        with get_db_leitura() as conn:
+            registros = consultar_registros(conn, "SELECT 1 AS um, 'dois' AS dois")
+
+            assert registros == [{'um': 1, 'dois': 'dois'}]
+            assert conn.row_factory is sqlite3.Row
+
+    def test_pool_limitado(self, tmp_path):
+        """Testa se o pool respeita o limite e falha após o tempo de espera"""
+        pool = ConnectionPool(str(tmp_path / 'pool.db'), tamanho=1, tempo_espera=0.05)
+        conn = pool.obter()
+
+        with pytest.raises(PoolEsgotadoError):
+            pool.obter()
+
+        pool.devolver(conn)
+        assert pool.obter() is conn
+
+        stats = pool.estatisticas()
+        assert stats['timeouts'] == 1
+        assert stats['criadas'] == 1
+        assert stats['checkouts'] == 2
+        pool.fechar()
+
+    def test_transacao_pendente_desfeita(self, app):
+        """Testa se transações não confirmadas são desfeitas na devolução"""
+        with get_db_connection() as conn:
+            conn.execute("INSERT INTO setores (nome, sigla) VALUES ('TESTE', 'TST')")
+
+        with get_db_connection() as conn:
+            total = conn.execute(
+                "SELECT COUNT(*) FROM setores WHERE nome = 'TESTE'"
+            ).fetchone()[0]
+            assert total == 0
+
+    def test_estatisticas_pool(self, app):
+        """Testa se as estatísticas do pool são expostas"""
+        with get_db_connection():
+            stats = estatisticas_pool()
+            assert stats['em_uso'] >= 1
+            assert stats['tamanho'] == DATABASE['pool_tamanho']
+
+    def test_estatisticas_somente_autenticado(self, client, auth_client):
+        """Testa /health sem os pools e /api/metricas com os pools, sem o caminho do banco"""
+        saude = client.get('/health').get_json()
+        assert saude['status'] == 'healthy'
+        assert 'pools' not in saude
+
+        pools = auth_client.get('/api/metricas').get_json()['pools']
+        assert pools
+        assert all('database' not in stats for stats in pools.values())
+        assert DATABASE['name'] not in json.dumps(pools)
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='Requer fork')
+    def test_pools_recriados_apos_fork(self, app):
+        """Testa que o processo filho não reutiliza as conexões herdadas do pai"""
+        herdado = obter_pool('geral')
+        leitura, escrita = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:
+            # Filho: só relata o resultado pelo pipe e sai sem passar pelo pytest
+            try:
+                tipos = iniciar_pools()
+                novo = obter_pool(tipos[0])
+                os.write(escrita, b'1' if novo is not herdado else b'0')
+            finally:
+                os._exit(0)
+
+        os.close(escrita)
+        resultado = os.read(leitura, 1)
+        os.close(leitura)
+        os.waitpid(pid, 0)
+
+        assert resultado == b'1'
+        assert obter_pool('geral') is herdado
+
+
+class TestEscritorUnico:
+    """Testes do modo escritor único / múltiplos leitores"""
+
+    @pytest.fixture
+    def escritor_unico(self, app):
+        DATABASE['escritor_unico'] = True
+        yield
+        DATABASE['escritor_unico'] = False
+
+    def test_leitura_somente_leitura(self, escritor_unico):
+        """Testa se conexões de leitura recusam escritas"""
+        with get_db_leitura() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO setores (nome, sigla) VALUES ('X', 'X')")
+
+    def test_leitura_nao_bloqueia_com_escrita_aberta(self, escritor_unico):
+        """Testa se leituras prosseguem enquanto o escritor mantém transação"""
+        cadastrar_paciente(nome_completo='Maria Souza', prec_cp='987654321')
+
+        with get_db_escrita() as escrita:
+            escrita.execute("BEGIN IMMEDIATE")
+            escrita.execute("UPDATE pacientes SET posto = 'Cabo'")
+
+            paciente = buscar_paciente_por_prec('987654321')
+            assert paciente['nome_completo'] == 'Maria Souza'
+            assert paciente['posto'] == ''
+
+            escrita.commit()
+
+        assert buscar_paciente_por_prec('987654321')['posto'] == 'Cabo'
+
+    def test_escritas_usam_conexao_dedicada(self, escritor_unico):
+        """Testa se as mutações passam pelo escritor único"""
+        criar_setores_padrao()
+
+        stats = estatisticas_pool('escrita')
+        assert stats['tamanho'] == 1
+        assert stats['checkouts'] >= 1
+        assert estatisticas_pool('leitura')['somente_leitura'] is True
+
+
+class TestSequenciaDocumentos:
+    """Testes da numeração sequencial de documentos"""
+
+    def test_codigos_sequenciais(self, dados_documento):
+        """Testa se documentos do mesmo tipo recebem números consecutivos"""
+        codigo1 = criar_documento('Guia de Exame', conteudo_json={'exame': 'RX'}, **dados_documento)
+        codigo2 = criar_documento('Guia de Exame', conteudo_json={'exame': 'TC'}, **dados_documento)
+
+        assert codigo1.endswith('-0001')
+        assert codigo2.endswith('-0002')
+        assert '-EXAM-' in codigo1
+
+    def test_codigos_concorrentes_unicos(self, dados_documento):
+        """Testa se emissões concorrentes nunca repetem o código"""
+        codigos = []
+        erros = []
+
+        def emitir():
+            try:
+                for _ in range(5):
+                    codigos.append(criar_documento(
+                        'Declaração', conteudo_json={}, **dados_documento
+                    ))
+            except Exception as e:
+                erros.append(e)
+
+        threads = [threading.Thread(target=emitir) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not erros
+        assert len(codigos) == 20
+        assert len(set(codigos)) == 20
+
+    def test_reservar_bloco(self, dados_documento):
+        """Testa a reserva de blocos de números para emissão em lote"""
+        bloco = reservar_codigos_documento('Guia de Internação', 3, prefixo='HGU')
+        assert [c[-4:] for c in bloco] == ['0001', '0002', '0003']
+
+        codigo = criar_documento('Guia de Internação', conteudo_json={}, **dados_documento)
+        assert codigo.endswith('-0004')
+
+    def test_backfill_a_partir_de_codigos(self, dados_documento):
+        """Testa se o backfill continua a numeração dos códigos existentes"""
+        ano = datetime.now().year
+
+        with get_db_connection() as conn:
+            conn.execute(f"""
+                INSERT INTO documentos (codigo_unico, tipo_documento)
+                VALUES ('HGU-ATEST-{ano}-0041', 'Atestado Administrativo')
+            """)
+            conn.execute("DELETE FROM document_sequences")
+            conn.commit()
+
+        assert backfill_sequencias_documentos() == 1
+
+        codigo = criar_documento('Atestado Administrativo', conteudo_json={}, **dados_documento)
+        assert codigo == f'HGU-ATEST-{ano}-0042'
+
+
+class TestEmissaoDocumento:
+    """Testes da emissão de documento em transação única"""
+
+    def test_emissao_com_log_em_uma_transacao(self, dados_documento):
+        """Testa se documento e log de auditoria são gravados juntos"""
+        emissao = emitir_documento(
+            'Guia de Exame', conteudo_json={'exame_solicitado': 'Hemograma'},
+            usuario_nome='Operador', ip_local='10.0.0.1', **dados_documento
+        )
+
+        with get_db_connection() as conn:
+            doc = conn.execute(
+                "SELECT hash_documento FROM documentos WHERE codigo_unico = ?",
+                (emissao['codigo'],)
+            ).fetchone()
+            log = conn.execute(
+                "SELECT modulo, ip_local FROM logs WHERE operacao = ?",
+                (f"Documento criado: {emissao['codigo']}",)
+            ).fetchone()
+
+        assert doc['hash_documento']
+        assert log['modulo'] == 'Documentos'
+        assert log['ip_local'] == '10.0.0.1'
+
+    def test_tempos_por_etapa(self, dados_documento):
+        """Testa se a emissão expõe e registra o tempo de cada etapa"""
+        metricas.limpar()
+        emissao = emitir_documento('Declaração', conteudo_json={}, **dados_documento)
+
+        for etapa in ('prefixo', 'codigo', 'hash', 'insert', 'commit', 'total'):
+            assert etapa in emissao['tempos_ms']
+        assert 'log' not in emissao['tempos_ms']
+
+        resumo = metricas.resumo('emissao_documento.')
+        assert resumo['emissao_documento.total']['total'] == 1
+        assert resumo['emissao_documento.total']['p99'] >= 0
+
+    def test_falha_desfaz_transacao(self, dados_documento):
+        """Testa se uma falha no INSERT não consome o número nem grava log"""
+        dados = dict(dados_documento, paciente_id=99999)  # Viola FOREIGN KEY
+
+        with pytest.raises(sqlite3.IntegrityError):
+            emitir_documento('Declaração', conteudo_json={}, usuario_nome='Op', **dados)
+
+        codigo = criar_documento('Declaração', conteudo_json={}, **dados_documento)
+        assert codigo.endswith('-0001')
+
+
+class TestCacheConfiguracoes:
+    """Testes do snapshot em memória das configurações"""
+
+    def test_leitura_sem_consultar_banco(self, app):
+        """Testa se leituras repetidas não emprestam conexões do pool"""
+        salvar_configuracao('nome_hospital', 'HGU Teste')
+        assert obter_configuracao('nome_hospital') == 'HGU Teste'
+
+        checkouts = estatisticas_pool()['checkouts']
+        for _ in range(50):
+            assert obter_configuracao('nome_hospital') == 'HGU Teste'
+            verificar_setup_inicial()
+        assert estatisticas_pool()['checkouts'] == checkouts
+
+    def test_write_through(self, app):
+        """Testa se salvar_configuracao atualiza o snapshot imediatamente"""
+        assert verificar_setup_inicial() is False
+        salvar_configuracao('configurado', '1')
+        assert verificar_setup_inicial() is True
+
+    def test_alteracao_externa_detectada(self, app, monkeypatch):
+        """Testa se alterações de outro processo são detectadas pela versão"""
+        salvar_configuracao('sigla_oms', 'HGUMBA')
+        assert obter_configuracao('sigla_oms') == 'HGUMBA'
+
+        # Simula outro processo com conexão própria
+        externa = sqlite3.connect(DATABASE['name'])
+        externa.execute("UPDATE configuracoes SET valor = 'HGUSP' WHERE chave = 'sigla_oms'")
+        externa.commit()
+        externa.close()
+
+        monkeypatch.setitem(DATABASE, 'config_cache_segundos', 0)
+        assert obter_configuracao('sigla_oms') == 'HGUSP'
+
+
+class TestGravadorLogs:
+    """Testes da gravação assíncrona dos logs de auditoria"""
+
+    def test_registrar_log_assincrono(self, app):
+        """Testa se o log enfileirado é gravado com a hora da ação"""
+        registrar_log(None, 'Operador', '10.0.0.2', 'Pacientes', 'Paciente cadastrado', 'PREC 1')
+        assert descarregar_logs()
+
+        with get_db_leitura() as conn:
+            log = conn.execute(
+                "SELECT usuario_nome, data_hora FROM logs WHERE operacao = ?",
+                ('Paciente cadastrado',)
+            ).fetchone()
+
+        assert log['usuario_nome'] == 'Operador'
+        assert log['data_hora']
+        assert estatisticas_logs()['pendentes'] == 0
+
+    def test_registrar_log_sincrono(self, app, monkeypatch):
+        """Testa se a gravação síncrona continua disponível por configuração"""
+        monkeypatch.setitem(LOGS, 'escrita_assincrona', False)
+        registrar_log(None, 'Operador', '10.0.0.3', 'Sistema', 'Teste síncrono')
+
+        with get_db_leitura() as conn:
+            total = conn.execute(
+                "SELECT COUNT(*) FROM logs WHERE operacao = 'Teste síncrono'"
+            ).fetchone()[0]
+
+        assert total == 1
+
+    def test_group_commit(self, app):
+        """Testa se várias entradas são gravadas em poucos commits"""
+        gravador = AuditLogWriter(get_db_escrita, lote_max=100, intervalo=0.2)
+        try:
+            for i in range(50):
+                gravador.enfileirar((None, 'Lote', None, 'Sistema', f'Entrada {i}', '', '2024-01-01 00:00:00'))
+            assert gravador.descarregar()
+        finally:
+            gravador.parar()
+
+        estatisticas = gravador.estatisticas()
+        assert estatisticas['gravadas'] == 50
+        assert estatisticas['lotes'] < 50
+        assert not estatisticas['ativo']
+
+    def test_fila_cheia_grava_sincrono(self, app):
+        """Testa se, com a fila cheia, a entrada é gravada no chamador sem ser perdida"""
+        liberar = threading.Event()
+
+        def conexao_lenta():
+            # Apenas a thread de fundo fica bloqueada
+            if threading.current_thread().name == 'audit-log-writer':
+                liberar.wait(5)
+            return get_db_escrita()
+
+        gravador = AuditLogWriter(conexao_lenta, fila_max=1, lote_max=1, intervalo=0.01, espera_fila=0.01)
+        try:
+            for i in range(4):
+                gravador.enfileirar((None, 'Fila', None, 'Sistema', f'Cheia {i}', '', '2024-01-01 00:00:00'))
+            assert gravador.estatisticas()['sincronas'] >= 1
+        finally:
+            liberar.set()
+            gravador.parar()
+
+        with get_db_leitura() as conn:
+            total = conn.execute(
+                "SELECT COUNT(*) FROM logs WHERE usuario_nome = 'Fila'"
+            ).fetchone()[0]
+
+        assert total == 4
+
+    def test_falha_de_gravacao_nao_perde_lote(self, app):
+        """Testa lote retido com o banco indisponível e descarte apenas da linha recusada"""
+        falhas = [sqlite3.OperationalError('database is locked')] * 4
+
+        def conexao_instavel():
+            if falhas:
+                raise falhas.pop()
+            return get_db_escrita()
+
+        gravador = AuditLogWriter(conexao_instavel, lote_max=10, intervalo=0.05, tentativas=2)
+        try:
+            for i in range(3):
+                gravador.enfileirar((None, 'Instável', None, 'Sistema', f'Retida {i}', '', '2024-01-01 00:00:00'))
+            # usuario_id inexistente: a chave estrangeira recusa só esta linha
+            gravador.enfileirar((999999, 'Instável', None, 'Sistema', 'Recusada', '', '2024-01-01 00:00:00'))
+            assert gravador.descarregar(10)
+        finally:
+            gravador.parar()
+
+        with get_db_leitura() as conn:
+            operacoes = {
+                linha[0] for linha in conn.execute("SELECT operacao FROM logs WHERE usuario_nome = 'Instável'")
+            }
+
+        assert falhas == []
+        assert operacoes == {'Retida 0', 'Retida 1', 'Retida 2'}
+        assert gravador.estatisticas()['perdidas'] == 1
+        assert gravador.estatisticas()['gravadas'] == 3
+
+
+class TestBackup:
+    """Testes de backup e restauração"""
+
+    def test_restauracao_no_banco_em_uso(self, app, monkeypatch, tmp_path):
+        """Testa restauração sem substituir o arquivo, visível a conexões já abertas"""
+        from src.config import DIRECTORIES
+        from src.core.backup import realizar_backup, restaurar_backup
+
+        monkeypatch.setitem(DIRECTORIES, 'backups', str(tmp_path))
+        backup = realizar_backup()
+
+        with get_db_escrita() as conn:
+            conn.execute("INSERT INTO setores (nome, sigla) VALUES ('Posterior', 'PST')")
+            conn.commit()
+
+        inode = os.stat(DATABASE['name']).st_ino
+        with get_db_leitura() as aberta:
+            assert restaurar_backup(backup['id'])
+
+            # Conexão emprestada antes da restauração já lê o banco restaurado
+            assert aberta.execute("SELECT COUNT(*) FROM setores WHERE sigla = 'PST'").fetchone()[0] == 0
+            assert aberta.execute("PRAGMA integrity_check").fetchone()[0] == 'ok'
+
+        assert os.stat(DATABASE['name']).st_ino == inode
+
+
+class TestPaginacaoDocumentos:
+    """Testes da listagem de documentos paginada por cursor"""
+
+    def test_paginas_sem_repeticao(self, dados_documento):
+        """Testa se as páginas cobrem todos os documentos em ordem, sem repetir"""
+        # Emitidos no mesmo segundo: o desempate é feito pelo id
+        for _ in range(25):
+            emitir_documento('Declaração', conteudo_json={}, **dados_documento)
+
+        vistos = []
+        cursor = None
+        paginas = 0
+        while True:
+            pagina = listar_documentos_pagina(10, cursor)
+            vistos.extend(doc['id'] for doc in pagina['documentos'])
+            paginas += 1
+            cursor = pagina['next_cursor']
+            if cursor is None:
+                break
+
+        assert paginas == 3
+        assert len(vistos) == 25
+        assert vistos == sorted(vistos, reverse=True)
+
+    def test_listagem_sem_conteudo(self, dados_documento):
+        """Testa que a listagem traz o resumo e os nomes, sem o conteúdo clínico"""
+        emitir_documento('Guia de Exame', conteudo_json={'exame_solicitado': 'Hemograma'},
+                         **dados_documento)
+
+        documento = listar_documentos_pagina(10)['documentos'][0]
+
+        assert documento['paciente_nome'] == 'João da Silva'
+        assert documento['status'] == 'Emitido'
+        assert 'conteudo_json' not in documento
+
+    def test_cursor_invalido(self, app):
+        """Testa se cursor inválido é rejeitado"""
+        with pytest.raises(ValueError):
+            listar_documentos_pagina(10, 'invalido')
+
+    def test_api_paginada(self, auth_client, dados_documento):
+        """Testa next_cursor na API e erro 400 para cursor inválido"""
+        for _ in range(3):
+            emitir_documento('Declaração', conteudo_json={}, **dados_documento)
+
+        resposta = auth_client.get('/api/documentos/listar?limite=2').get_json()
+        assert len(resposta['documentos']) == 2
+        assert resposta['next_cursor']
+
+        resposta = auth_client.get(
+            f"/api/documentos/listar?limite=2&cursor={resposta['next_cursor']}"
+        ).get_json()
+        assert len(resposta['documentos']) == 1
+        assert resposta['next_cursor'] is None
+
+        assert auth_client.get('/api/documentos/listar?cursor=xyz').status_code == 400
+        # Cursor bem formado com valor que não é texto/inteiro: 400 antes do streaming
+        cursor = codificar_cursor([{}, 1])
+        assert auth_client.get(f'/api/documentos/listar?cursor={cursor}').status_code == 400
+
+
+class TestContadores:
+    """Testes dos contadores do dashboard mantidos por triggers"""
+
+    def test_contadores_acompanham_alteracoes(self, dados_documento):
+        """Testa inserção, mudança de status, exclusão e ativação/inativação"""
+        for _ in range(3):
+            emitir_documento('Declaração', conteudo_json={}, **dados_documento)
+
+        with get_db_escrita() as conn:
+            conn.execute("UPDATE documentos SET status = 'Aprovado' WHERE id = 1")
+            conn.execute("UPDATE documentos SET status = 'Aprovado' WHERE id = 1")  # Sem mudança
+            conn.execute("DELETE FROM documentos WHERE id = 2")
+            conn.execute("UPDATE pacientes SET ativo = 0 WHERE id = ?", (dados_documento['paciente_id'],))
+            conn.execute("UPDATE profissionais SET ativo = 1 WHERE id = ?", (dados_documento['profissional_id'],))
+            conn.commit()
+
+        contadores = obter_contadores()
+
+        assert contadores['total_documentos'] == 2
+        assert contadores['total_pacientes'] == 0
+        assert contadores['total_profissionais'] == 1
+        assert contadores['documentos_por_status'] == [
+            {'status': 'Aprovado', 'total': 1},
+            {'status': 'Emitido', 'total': 1}
+        ]
+
+    def test_contadores_iguais_a_contagem(self, dados_documento):
+        """Testa se os contadores coincidem com o recálculo a partir das tabelas"""
+        emitir_documento('Guia de Exame', conteudo_json={}, **dados_documento)
+        cadastrar_paciente('Maria Souza', '987654321')
+
+        with get_db_escrita() as conn:
+            mantidos = dict(conn.execute("SELECT chave, valor FROM contadores").fetchall())
+
+        assert recalcular_contadores() == mantidos
+
+    def test_reparo(self, dados_documento):
+        """Testa se o recálculo corrige contadores adulterados"""
+        emitir_documento('Declaração', conteudo_json={}, **dados_documento)
+
+        with get_db_escrita() as conn:
+            conn.execute("UPDATE contadores SET valor = 99")
+            conn.commit()
+
+        recalcular_contadores()
+        contadores = obter_contadores()
+
+        assert contadores['total_documentos'] == 1
+        assert contadores['total_pacientes'] == 1
+        assert contadores['documentos_por_status'] == [{'status': 'Emitido', 'total': 1}]
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Testes da Busca de Documentos
+Testa filtros combináveis, paginação, uso de índices e pesquisa textual
+"""
+
+from src.core.database import get_db_escrita
+from src.services.documentos import (
+    buscar_documentos, plano_busca_documentos, verificar_indices_busca,
+    pesquisar_conteudo_documentos
+)
+
+
+class TestBuscaDocumentos:
+    """Testes dos filtros da busca"""
+
+    def test_filtros_combinados(self, dados_documento, emitir_teste):
+        """Testa se filtros são combinados com AND"""
+        esperado = emitir_teste('Guia de Exame')
+        emitir_teste('Declaração')
+        emitir_teste('Guia de Exame', setor_destino_id=dados_documento['setor_origem_id'])
+
+        pagina = buscar_documentos({
+            'tipo_documento': 'Guia de Exame',
+            'setor_destino_id': dados_documento['setor_destino_id']
+        })
+
+        assert [doc['codigo_unico'] for doc in pagina['documentos']] == [esperado]
+
+    def test_filtro_prec_e_periodo(self, emitir_teste):
+        """Testa filtro por PREC-CP do paciente e por período de emissão"""
+        antigo = emitir_teste()
+        recente = emitir_teste()
+
+        with get_db_escrita() as conn:
+            conn.execute(
+                "UPDATE documentos SET data_emissao = '2023-03-10 09:00:00' WHERE codigo_unico = ?",
+                (antigo,)
+            )
+            conn.commit()
+
+        pagina = buscar_documentos({
+            'prec_cp': '123456789',
+            'data_inicio': '2023-03-01',
+            'data_fim': '2023-03-10'
+        })
+        assert [doc['codigo_unico'] for doc in pagina['documentos']] == [antigo]
+
+        pagina = buscar_documentos({'prec_cp': '123456789', 'data_inicio': '2023-03-11'})
+        assert [doc['codigo_unico'] for doc in pagina['documentos']] == [recente]
+
+        assert buscar_documentos({'prec_cp': '999999999'})['documentos'] == []
+
+    def test_paginacao_com_filtro(self, emitir_teste):
+        """Testa se o cursor respeita os filtros aplicados"""
+        for _ in range(5):
+            emitir_teste('Atestado Administrativo')
+        emitir_teste('Declaração')
+
+        filtros = {'tipo_documento': 'Atestado Administrativo'}
+        primeira = buscar_documentos(filtros, limite=3)
+        segunda = buscar_documentos(filtros, limite=3, cursor=primeira['next_cursor'])
+
+        assert len(primeira['documentos']) == 3
+        assert len(segunda['documentos']) == 2
+        assert segunda['next_cursor'] is None
+        assert all(doc['tipo_documento'] == 'Atestado Administrativo' for doc in segunda['documentos'])
+
+
+class TestIndicesBusca:
+    """Testes do plano de execução da busca"""
+
+    def test_todas_combinacoes_usam_indice(self, app):
+        """Testa se nenhuma combinação de filtros faz varredura completa"""
+        assert verificar_indices_busca() == []
+
+    def test_filtro_usa_indice_composto(self, app):
+        """Testa se filtro + período usam o índice composto sem ordenação extra"""
+        plano = plano_busca_documentos({'profissional_id': 1, 'data_inicio': '2024-01-01'})
+
+        assert any('idx_documentos_profissional_data' in linha for linha in plano)
+        assert not any('TEMP B-TREE' in linha for linha in plano)
+
+
+class TestApiBuscaDocumentos:
+    """Testes do endpoint /api/documentos/buscar"""
+
+    def test_busca_por_status(self, auth_client, emitir_teste):
+        """Testa busca filtrada pela API"""
+        emitir_teste()
+
+        resposta = auth_client.get('/api/documentos/buscar?status=Emitido&limite=10')
+        dados = resposta.get_json()
+
+        assert resposta.status_code == 200
+        assert len(dados['documentos']) == 1
+        assert dados['next_cursor'] is None
+
+    def test_filtro_invalido(self, auth_client):
+        """Testa rejeição de filtros inválidos"""
+        resposta = auth_client.get('/api/documentos/buscar?tipo_documento=Outro')
+        assert resposta.status_code == 400
+
+        resposta = auth_client.get('/api/documentos/buscar?data_inicio=2024-02-01&data_fim=2024-01-01')
+        assert resposta.status_code == 400
+
+
+class TestPesquisaConteudo:
+    """Testes da pesquisa textual no conteúdo dos documentos"""
+
+    def test_pesquisa_com_destaque(self, emitir_teste):
+        """Testa pesquisa sem acentos, com trecho destacado e HTML escapado"""
+        codigo = emitir_teste('Guia de Internação',
+                              {'diagnostico': 'Fratura do fêmur <direito>'})
+        emitir_teste('Declaração', {'texto_declaracao': 'Compareceu à consulta'})
+
+        resultados = pesquisar_conteudo_documentos('femur')
+
+        assert [r['codigo_unico'] for r in resultados] == [codigo]
+        assert '<mark>fêmur</mark>' in resultados[0]['trecho']
+        assert '&lt;direito&gt;' in resultados[0]['trecho']
+
+    def test_ordenacao_e_filtro_por_tipo(self, emitir_teste):
+        """Testa ranqueamento por relevância e filtro por tipo"""
+        fraco = emitir_teste('Guia de Exame',
+                             {'exame_solicitado': 'Raio-X', 'observacoes': 'Paciente relata dor lombar há semanas e febre'})
+        forte = emitir_teste('Atestado Administrativo',
+                             {'motivo_atestado': 'Dor lombar'})
+
+        assert [r['codigo_unico'] for r in pesquisar_conteudo_documentos('dor lombar')] == [forte, fraco]
+        assert [r['codigo_unico'] for r in pesquisar_conteudo_documentos(
+            'dor lombar', tipo_documento='Guia de Exame')] == [fraco]
+
+    def test_indice_acompanha_alteracoes(self, emitir_teste):
+        """Testa se alteração e exclusão do conteúdo atualizam o índice"""
+        codigo = emitir_teste(conteudo={'texto_declaracao': 'Acompanhante do paciente'})
+
+        with get_db_escrita() as conn:
+            conn.execute(
+                "UPDATE documentos SET conteudo_json = ? WHERE codigo_unico = ?",
+                ('{"texto_declaracao": "Doação de sangue"}', codigo)
+            )
+            conn.commit()
+
+        assert pesquisar_conteudo_documentos('acompanhante') == []
+        assert len(pesquisar_conteudo_documentos('doacao sangue')) == 1
+
+        with get_db_escrita() as conn:
+            conn.execute("DELETE FROM documentos WHERE codigo_unico = ?", (codigo,))
+            conn.execute("INSERT INTO documentos_fts (documentos_fts, rank) VALUES ('integrity-check', 1)")
+            conn.commit()
+
+        assert pesquisar_conteudo_documentos('doacao') == []
+
+    def test_api_pesquisa(self, auth_client, emitir_teste):
+        """Testa o endpoint de pesquisa e a validação do tipo"""
+        emitir_teste('Guia de Exame', {'exame_solicitado': 'Hemograma completo'})
+
+        dados = auth_client.get('/api/documentos/pesquisar?q=hemograma').get_json()
+        assert len(dados['documentos']) == 1
+
+        resposta = auth_client.get('/api/documentos/pesquisar?q=hemograma&tipo_documento=Outro')
+        assert resposta.status_code == 400
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Testes da Exportação CSV
+Testa o conteúdo gerado, os filtros, a compactação gzip e a resposta em streaming
+"""
+
+import csv
+import gzip
+import io
+
+from src.core.database import emitir_documento, estatisticas_pools, cadastrar_paciente
+from src.services.exportacao import (
+    exportar_documentos, exportar_pacientes, _gerar_csv, COLUNAS_PACIENTES, SQL_EXPORTAR_PACIENTES
+)
+
+
+def _ler_csv(conteudo):
+    """Converte o CSV exportado (bytes com BOM) em lista de linhas"""
+    return list(csv.reader(io.StringIO(conteudo.decode('utf-8-sig')), delimiter=';'))
+
+
+def _emprestadas():
+    """Conexões emprestadas em todos os pools"""
+    return sum(pool['em_uso'] for pool in estatisticas_pools().values())
+
+
+class TestExportacaoCsv:
+    """Testes dos geradores de CSV"""
+
+    def test_documentos_com_filtro(self, dados_documento):
+        """Testa cabeçalho, filtros da busca e ordem da listagem"""
+        primeiro = emitir_documento('Guia de Exame', conteudo_json={}, **dados_documento)['codigo']
+        emitir_documento('Declaração', conteudo_json={}, **dados_documento)
+        segundo = emitir_documento('Guia de Exame', conteudo_json={}, **dados_documento)['codigo']
+
+        linhas = _ler_csv(b''.join(exportar_documentos({'tipo_documento': 'Guia de Exame'})))
+
+        assert linhas[0][0] == 'Código'
+        assert [linha[0] for linha in linhas[1:]] == [segundo, primeiro]
+        assert linhas[1][4] == 'João da Silva'
+
+    def test_gzip(self, dados_documento):
+        """Testa se o fluxo compactado é um gzip válido com o mesmo conteúdo"""
+        emitir_documento('Declaração', conteudo_json={}, **dados_documento)
+
+        puro = b''.join(exportar_documentos())
+        compactado = b''.join(exportar_documentos(compactar=True))
+
+        assert gzip.decompress(compactado) == puro
+
+    def test_lotes_e_injecao_de_formula(self, app):
+        """Testa a leitura em lotes e a neutralização de fórmulas"""
+        for i in range(5):
+            cadastrar_paciente(f'Paciente {i}', f'10000000{i}')
+        cadastrar_paciente('=HYPERLINK("x")', '200000000')
+
+        pedacos = list(_gerar_csv(COLUNAS_PACIENTES, SQL_EXPORTAR_PACIENTES, lote=2))
+        linhas = _ler_csv(''.join(pedacos).encode('utf-8'))
+
+        assert len(pedacos) == 1 + 3  # Cabeçalho + 6 linhas em lotes de 2
+        assert linhas[1][0] == '\'=HYPERLINK("x")'
+
+    def test_conexao_devolvida_ao_interromper(self, dados_documento):
+        """Testa se fechar o gerador (cliente desconectou) devolve a conexão"""
+        for _ in range(3):
+            emitir_documento('Declaração', conteudo_json={}, **dados_documento)
+        emprestadas = _emprestadas()
+
+        gerador = exportar_pacientes()
+        next(gerador)  # Cabeçalho
+        next(gerador)  # Primeiro lote (conexão reservada)
+        assert _emprestadas() == emprestadas + 1
+
+        gerador.close()
+        assert _emprestadas() == emprestadas
+
+
+class TestApiExportacao:
+    """Testes dos endpoints de exportação"""
+
+    def test_exportar_documentos_streaming(self, auth_client, dados_documento):
+        """Testa resposta em streaming, anexo e validação dos filtros"""
+        emitir_documento('Declaração', conteudo_json={}, **dados_documento)
+
+        resposta = auth_client.get('/api/exportar/documentos?status=Emitido&gzip=true')
+
+        assert resposta.status_code == 200
+        assert resposta.is_streamed
+        assert resposta.mimetype == 'application/gzip'
+        assert '.csv.gz' in resposta.headers['Content-Disposition']
+        assert len(_ler_csv(gzip.decompress(resposta.data))) == 2
+
+        assert auth_client.get('/api/exportar/documentos?status=Outro').status_code == 400
+        assert auth_client.get('/api/exportar/documentos?limite=10').status_code == 400
+
+    def test_exportar_logs(self, auth_client):
+        """Testa exportação dos logs por administrador"""
+        resposta = auth_client.get('/api/exportar/logs?data_inicio=2000-01-01')
+
+        assert resposta.status_code == 200
+        assert _ler_csv(resposta.data)[0][0] == 'Data/Hora (UTC)'
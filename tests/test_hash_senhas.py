@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Testes do Executor de Hash de Senhas
+Testa execução nos workers, admissão limitada (fila e espera estimada),
+descarte de tarefas expiradas e o 503 com Retry-After no login
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.core import metricas
+from src.core.hash_senhas import ExecutorHash, HashSobrecarregadoError
+
+
+def _aguardar(condicao, timeout=2.0):
+    """Aguarda a condição ficar verdadeira"""
+    prazo = time.monotonic() + timeout
+    while not condicao() and time.monotonic() < prazo:
+        time.sleep(0.01)
+
+
+def _bloquear(executor, liberar, quantidade):
+    """
+    Ocupa o worker e enfileira as demais tarefas até `liberar` ser sinalizado
+
+    As tarefas entram uma a uma, para que nenhuma seja recusada antes de o
+    worker retirar a anterior da fila.
+    """
+    threads = []
+    for i in range(quantidade):
+        thread = threading.Thread(target=executor.executar, args=(liberar.wait,), daemon=True)
+        thread.start()
+        threads.append(thread)
+        if i == 0:
+            _aguardar(lambda: executor.estatisticas()['ocupados'] == 1)
+        else:
+            _aguardar(lambda: executor.estatisticas()['fila'] == i)
+    return threads
+
+
+class TestExecutorHash:
+    """Testes do ExecutorHash"""
+
+    def test_executa_e_registra_metricas(self):
+        """Testa resultado, exceção repassada e métricas de espera e hash"""
+        metricas.limpar()
+        executor = ExecutorHash(workers=2)
+
+        assert executor.executar(lambda a, b: a + b, 2, 3) == 5
+        with pytest.raises(ZeroDivisionError):
+            executor.executar(lambda: 1 / 0)
+
+        resumo = metricas.resumo('hash_senha')
+        assert resumo['hash_senha.espera_ms']['total'] == 2
+        assert resumo['hash_senha.hash_ms']['total'] == 2
+        assert executor.estatisticas()['executadas'] == 2
+
+    def test_fila_cheia_recusa(self):
+        """Testa recusa imediata com a fila cheia"""
+        executor = ExecutorHash(workers=1, fila_max=1, espera_max=60, tempo_inicial=0.01)
+        liberar = threading.Event()
+        threads = _bloquear(executor, liberar, 2)
+
+        with pytest.raises(HashSobrecarregadoError) as erro:
+            executor.executar(lambda: None)
+
+        liberar.set()
+        for thread in threads:
+            thread.join(2)
+        assert erro.value.retry_after >= 1
+        assert executor.estatisticas()['recusadas'] == 1
+
+    def test_espera_estimada_recusa(self):
+        """Testa recusa quando a espera estimada passa do limite"""
+        executor = ExecutorHash(workers=1, fila_max=10, espera_max=0.5, tempo_inicial=0.4)
+        liberar = threading.Event()
+        threads = _bloquear(executor, liberar, 2)
+
+        inicio = time.monotonic()
+        with pytest.raises(HashSobrecarregadoError):
+            executor.executar(lambda: None)
+
+        assert time.monotonic() - inicio < 0.1  # Falha rápida, sem esperar na fila
+        liberar.set()
+        for thread in threads:
+            thread.join(2)
+
+    def test_tarefa_expirada_na_fila(self):
+        """Testa descarte, sem executar, da tarefa que esperou além do limite"""
+        executor = ExecutorHash(workers=1, fila_max=10, espera_max=0.05, tempo_inicial=0)
+        executadas = []
+        liberar = threading.Event()
+        threads = _bloquear(executor, liberar, 1)
+
+        threading.Timer(0.2, liberar.set).start()
+        with pytest.raises(HashSobrecarregadoError):
+            executor.executar(executadas.append, 1)
+
+        threads[0].join(2)
+        assert executadas == []
+        assert executor.estatisticas()['expiradas'] == 1
+
+
+class TestLoginSobrecarregado:
+    """Testes do login com o executor saturado"""
+
+    def test_login_503_com_retry_after(self, client, monkeypatch):
+        """Testa 503 com Retry-After quando a verificação da senha é recusada"""
+        from src.core.database import criar_usuario_admin
+
+        criar_usuario_admin('admin_hash', 'TestPass123!', 'Administrador Hash')
+
+        def recusar(self, funcao, *args):
+            raise HashSobrecarregadoError(4)
+
+        monkeypatch.setattr(ExecutorHash, 'executar', recusar)
+        resposta = client.post('/login', json={'login': 'admin_hash', 'senha': 'TestPass123!'})
+
+        assert resposta.status_code == 503
+        assert resposta.headers['Retry-After'] == '4'
+        assert resposta.get_json()['sucesso'] is False
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Testes da Importação em Lote
+Testa leitura de CSV/NDJSON, validação, duplicidades, roster de profissionais
+e os endpoints de importação
+"""
+
+import io
+
+import pytest
+
+from src.core.database import (
+    cadastrar_paciente, cadastrar_profissional, criar_setores_padrao, get_db_escrita,
+    descarregar_logs
+)
+from src.services.importacao import ler_registros, importar_pacientes, importar_profissionais
+
+CSV_PACIENTES = (
+    "nome_completo;prec_cp;posto;om;data_nascimento\n"
+    "Ana Pereira;100000001;Cabo;1º BI;1990-05-10\n"
+    "Jo;100000002;;;\n"                              # Nome curto
+    "Bruno Lima;100000003;Soldado;;\n"
+    "Carla Souza;100000001;;;\n"                     # Repetido no arquivo
+    "Daniel Costa;999999999;;;\n"                    # Já cadastrado
+    "Eva Gomes;12AB;;;\n"                            # PREC-CP inválido
+)
+
+
+def _total_pacientes():
+    """Quantidade de pacientes cadastrados"""
+    with get_db_escrita() as conn:
+        return conn.execute("SELECT COUNT(*) FROM pacientes").fetchone()[0]
+
+
+class TestLeituraRegistros:
+    """Testes da leitura dos arquivos"""
+
+    def test_csv_com_virgula_e_numeracao(self):
+        """Testa detecção do separador e número da linha no arquivo"""
+        registros = list(ler_registros(io.StringIO("nome_completo,prec_cp\nAna,123456\nBia,654321\n")))
+
+        assert registros == [
+            (2, {'nome_completo': 'Ana', 'prec_cp': '123456'}),
+            (3, {'nome_completo': 'Bia', 'prec_cp': '654321'})
+        ]
+
+    def test_ndjson_com_linha_ilegivel(self):
+        """Testa NDJSON ignorando linhas em branco e marcando JSON inválido"""
+        arquivo = io.StringIO('{"nome_completo": "Ana", "prec_cp": "123456"}\n\n{quebrado\n')
+
+        assert list(ler_registros(arquivo, 'ndjson')) == [
+            (1, {'nome_completo': 'Ana', 'prec_cp': '123456'}),
+            (3, None)
+        ]
+
+
+class TestImportacaoPacientes:
+    """Testes da importação"""
+
+    def test_relatorio_por_linha(self, app):
+        """Testa importação parcial com erros de validação e duplicidades"""
+        cadastrar_paciente('Daniel Costa', '999999999')
+
+        relatorio = importar_pacientes(ler_registros(io.StringIO(CSV_PACIENTES)), lote=2)
+
+        assert relatorio['total'] == 6
+        assert relatorio['importados'] == 2
+        assert relatorio['com_erro'] == 4
+        assert [erro['linha'] for erro in relatorio['erros']] == [3, 5, 6, 7]
+        assert 'linha 2' in relatorio['erros'][1]['erros']['prec_cp'][0]
+        assert relatorio['erros'][2]['erros'] == {'prec_cp': ['PREC-CP já cadastrado']}
+        assert _total_pacientes() == 3
+
+    def test_simulacao_nao_grava(self, app):
+        """Testa que a simulação valida sem cadastrar"""
+        relatorio = importar_pacientes(ler_registros(io.StringIO(CSV_PACIENTES)), simular=True)
+
+        assert relatorio['importados'] == 3
+        assert _total_pacientes() == 0
+
+
+class TestRosterProfissionais:
+    """Testes da sincronização do roster de profissionais"""
+
+    def _profissionais(self):
+        """Profissionais por CRM/COREN: (nome, setor, ativo)"""
+        with get_db_escrita() as conn:
+            return {
+                linha['crm_coren']: (linha['nome'], linha['setor'], linha['ativo'])
+                for linha in conn.execute("""
+                    SELECT p.crm_coren, p.nome, s.nome AS setor, p.ativo
+                    FROM profissionais p LEFT JOIN setores s ON s.id = p.setor_id
+                """)
+            }
+
+    def test_upsert_setor_e_desativacao(self, app):
+        """Testa atualização por CRM, setor por nome sem acento, novos e ausentes"""
+        criar_setores_padrao()
+        cadastrar_profissional('Dr. Antigo Nome', 'Médico', 'CRM-BA 111', 'Capitão')
+        cadastrar_profissional('Enf. Transferida', 'Enfermeira', 'COREN-BA 222', '2º Tenente')
+        cadastrar_profissional('Dr. Linha Com Erro', 'Médico', 'CRM-BA 333', 'Major')
+
+        roster = (
+            "nome;funcao;crm_coren;posto_graduacao;setor\n"
+            "Dr. Novo Nome;Médico;crm-ba 111;Capitão;centro cirurgico\n"
+            "Dra. Recém Chegada;Médica;CRM-BA 444;1º Tenente;UPAT\n"
+            "X;Médico;CRM-BA 333;Major;UPAT\n"                      # Nome curto: linha com erro
+            "Dr. Sem Setor;Médico;CRM-BA 555;Major;Inexistente\n"
+        )
+
+        relatorio = importar_profissionais(ler_registros(io.StringIO(roster)))
+
+        assert (relatorio['atualizados'], relatorio['inseridos'], relatorio['desativados']) == (1, 1, 1)
+        assert [erro['linha'] for erro in relatorio['erros']] == [4, 5]
+
+        profissionais = self._profissionais()
+        assert profissionais['crm-ba 111'] == ('Dr. Novo Nome', 'Centro Cirúrgico', 1)
+        assert profissionais['CRM-BA 444'] == ('Dra. Recém Chegada', 'UPAT', 1)
+        assert profissionais['COREN-BA 222'][2] == 0
+        assert profissionais['CRM-BA 333'][2] == 1  # Presente no roster, mesmo com erro
+        assert 'CRM-BA 555' not in profissionais
+
+    def test_sem_crm_coren_nao_desativado(self, app):
+        """Testa que profissionais sem CRM/COREN não são desativados por ausência no roster"""
+        cadastrar_profissional('Téc. Sem Registro', 'Técnico', None, 'Sargento')
+        cadastrar_profissional('Aux. Registro Vazio', 'Auxiliar', '', 'Cabo')
+        cadastrar_profissional('Dr. Ausente', 'Médico', 'CRM-BA 111', 'Capitão')
+        roster = '{"nome": "Dra. Nova", "funcao": "Médica", "crm_coren": "CRM-BA 999"}\n'
+
+        relatorio = importar_profissionais(ler_registros(io.StringIO(roster), 'ndjson'))
+
+        assert (relatorio['inseridos'], relatorio['desativados']) == (1, 1)
+        ativos = {nome: ativo for nome, _, ativo in self._profissionais().values()}
+        assert ativos['Téc. Sem Registro'] == 1
+        assert ativos['Aux. Registro Vazio'] == 1
+        assert ativos['Dr. Ausente'] == 0
+
+    def test_simulacao_e_roster_vazio(self, app):
+        """Testa simulação sem gravar e recusa de roster sem linhas válidas"""
+        cadastrar_profissional('Dr. Fulano', 'Médico', 'CRM-BA 111', 'Capitão')
+        roster = '{"nome": "Dra. Nova", "funcao": "Médica", "crm_coren": "CRM-BA 999"}\n'
+
+        relatorio = importar_profissionais(ler_registros(io.StringIO(roster), 'ndjson'), simular=True)
+
+        assert (relatorio['inseridos'], relatorio['desativados']) == (1, 1)
+        assert self._profissionais() == {'CRM-BA 111': ('Dr. Fulano', None, 1)}
+
+        with pytest.raises(ValueError):
+            importar_profissionais(ler_registros(io.StringIO('{"nome": "X"}\n'), 'ndjson'))
+
+
+class TestApiImportacao:
+    """Testes do endpoint /api/pacientes/importar"""
+
+    def test_importar_ndjson(self, auth_client):
+        """Testa upload NDJSON com um único log de auditoria resumido"""
+        conteudo = (
+            '{"nome_completo": "Ana Pereira", "prec_cp": "100000001"}\n'
+            '{"nome_completo": "Bruno Lima", "prec_cp": "100000002", "posto": "Cabo"}\n'
+        )
+
+        resposta = auth_client.post('/api/pacientes/importar', data={
+            'file': (io.BytesIO(conteudo.encode('utf-8')), 'om.ndjson')
+        }, content_type='multipart/form-data')
+        dados = resposta.get_json()
+
+        assert resposta.status_code == 200
+        assert dados['importados'] == 2
+        assert dados['erros'] == []
+
+        descarregar_logs()
+        with get_db_escrita() as conn:
+            logs = conn.execute(
+                "SELECT operacao FROM logs WHERE modulo = 'Pacientes'"
+            ).fetchall()
+        assert [log['operacao'] for log in logs] == ['Importação em lote: 2 paciente(s) cadastrado(s)']
+
+    def test_sem_arquivo_e_formato_invalido(self, auth_client):
+        """Testa rejeição de requisição sem arquivo ou com formato desconhecido"""
+        assert auth_client.post('/api/pacientes/importar', data={},
+                                content_type='multipart/form-data').status_code == 400
+
+        resposta = auth_client.post('/api/pacientes/importar', data={
+            'file': (io.BytesIO(b'x'), 'pacientes.xlsx'),
+            'formato': 'xlsx'
+        }, content_type='multipart/form-data')
+        assert resposta.status_code == 400
+
+    def test_importar_roster(self, auth_client):
+        """Testa importação do roster pela API mantendo os ausentes"""
+        cadastrar_profissional('Dr. Fulano', 'Médico', 'CRM-BA 111', 'Capitão')
+        roster = 'nome,funcao,crm_coren\nDra. Nova,Médica,CRM-BA 999\n'
+
+        resposta = auth_client.post('/api/profissionais/importar', data={
+            'file': (io.BytesIO(roster.encode('utf-8')), 'roster.csv'),
+            'manter_ausentes': 'true'
+        }, content_type='multipart/form-data')
+        dados = resposta.get_json()
+
+        assert resposta.status_code == 200
+        assert (dados['inseridos'], dados['desativados']) == (1, 0)
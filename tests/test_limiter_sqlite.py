@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Testes do Armazenamento do Rate Limiting em SQLite
+Testa janela fixa, expiração, limpeza em lote, incrementos concorrentes de
+vários processos e o limite de login aplicado pelo Flask-Limiter
+"""
+
+import multiprocessing
+import time
+
+from limits import parse, strategies
+from limits.storage import storage_from_string
+
+from src.core.limiter_sqlite import SQLiteLimiterStorage, _caminho_da_uri
+
+
+def _incrementar(uri, quantidade):
+    """Worker: incrementa a mesma chave `quantidade` vezes"""
+    armazenamento = storage_from_string(uri)
+    for _ in range(quantidade):
+        armazenamento.incr('login/10.0.0.1', 60)
+
+
+class TestSQLiteLimiterStorage:
+    """Testes do SQLiteLimiterStorage"""
+
+    def test_esquema_e_caminho(self, tmp_path):
+        """Testa registro do esquema sqlite:// e caminhos com letra de unidade"""
+        armazenamento = storage_from_string(f"sqlite://{tmp_path / 'limites.db'}")
+
+        assert isinstance(armazenamento, SQLiteLimiterStorage)
+        assert armazenamento.check() is True
+        assert _caminho_da_uri('sqlite:///C:/HGU/limites.db') == 'C:/HGU/limites.db'
+        assert _caminho_da_uri('sqlite:////srv/hgu/limites.db') == '//srv/hgu/limites.db'
+
+    def test_janela_fixa(self, tmp_path):
+        """Testa limite atingido, expiração da janela e limpeza dos contadores"""
+        armazenamento = storage_from_string(f"sqlite://{tmp_path / 'limites.db'}")
+        limitador = strategies.FixedWindowRateLimiter(armazenamento)
+        limite = parse('2 per second')
+
+        assert limitador.hit(limite, '10.0.0.1')
+        assert limitador.hit(limite, '10.0.0.1')
+        assert not limitador.hit(limite, '10.0.0.1')
+        assert limitador.hit(limite, '10.0.0.2')
+        assert limitador.get_window_stats(limite, '10.0.0.1').remaining == 0
+
+        time.sleep(1.05)
+        assert limitador.hit(limite, '10.0.0.1')
+        assert armazenamento.get(limite.key_for('10.0.0.1')) == 1
+
+        armazenamento.clear(limite.key_for('10.0.0.1'))
+        assert armazenamento.get(limite.key_for('10.0.0.1')) == 0
+        assert armazenamento.reset() == 1
+
+    def test_limpeza_em_lote(self, tmp_path):
+        """Testa remoção das janelas vencidas apenas no intervalo de limpeza"""
+        armazenamento = SQLiteLimiterStorage(f"sqlite://{tmp_path / 'limites.db'}", intervalo_limpeza=0)
+        armazenamento.incr('a', 0.01)
+        armazenamento.incr('b', 0.01)
+        time.sleep(0.02)
+
+        armazenamento.incr('c', 60)
+
+        linhas = armazenamento._conexao().execute("SELECT chave FROM contadores").fetchall()
+        assert linhas == [('c',)]
+
+    def test_processos_compartilham_contadores(self, tmp_path):
+        """Testa que incrementos simultâneos de vários processos não se perdem"""
+        uri = f"sqlite://{tmp_path / 'limites.db'}"
+        processos = [
+            multiprocessing.Process(target=_incrementar, args=(uri, 300)) for _ in range(4)
+        ]
+        for processo in processos:
+            processo.start()
+        for processo in processos:
+            processo.join(30)
+
+        assert storage_from_string(uri).get('login/10.0.0.1') == 1200
+
+
+class TestLimiteLogin:
+    """Testes do limite de login com o armazenamento configurado"""
+
+    def test_login_limitado(self, client):
+        """Testa 429 após esgotar as tentativas de login da janela"""
+        from src.config import RATE_LIMITING
+
+        credenciais = {'login': 'inexistente', 'senha': 'SenhaErrada123!'}
+        for _ in range(RATE_LIMITING['login_attempts']):
+            assert client.post('/login', json=credenciais).status_code == 401
+
+        assert client.post('/login', json=credenciais).status_code == 429
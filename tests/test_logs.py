@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Testes da Consulta de Logs de Auditoria
+Testa filtros, paginação por cursor, limite dos detalhes, índices e o endpoint /api/logs
+"""
+
+from src.core.database import get_db_escrita
+from src.services.logs import (
+    listar_logs_pagina, obter_log, verificar_indices_logs, TAMANHO_DETALHES_LISTAGEM
+)
+
+
+def _inserir_logs(linhas):
+    """Insere logs (usuario_id, ip_local, modulo, operacao, detalhes, data_hora)"""
+    with get_db_escrita() as conn:
+        conn.executemany("""
+            INSERT INTO logs (usuario_id, usuario_nome, ip_local, modulo, operacao, detalhes, data_hora)
+            VALUES (?, 'Teste', ?, ?, ?, ?, ?)
+        """, linhas)
+        conn.commit()
+
+
+class TestListagemLogs:
+    """Testes da listagem com filtros"""
+
+    def test_filtros_e_paginacao(self, app):
+        """Testa ordem decrescente, filtros combinados e continuação pelo cursor"""
+        _inserir_logs([
+            (None, '10.0.0.1', 'Documentos', 'Documento criado: A', '', '2024-01-10 08:00:00'),
+            (None, '10.0.0.1', 'Documentos', 'Documento criado: B', '', '2024-01-11 08:00:00'),
+            (None, '10.0.0.2', 'Documentos', 'Documento criado: C', '', '2024-01-11 08:00:00'),
+            (None, '10.0.0.1', 'Pacientes', 'Paciente cadastrado', '', '2024-01-12 08:00:00'),
+            (None, '10.0.0.1', 'Documentos', 'Documento criado: D', '', '2024-02-01 08:00:00')
+        ])
+        filtros = {'modulo': 'Documentos', 'data_fim': '2024-01-31'}
+
+        primeira = listar_logs_pagina(filtros, limite=2)
+        segunda = listar_logs_pagina(filtros, limite=2, cursor=primeira['next_cursor'])
+
+        assert [log['operacao'][-1] for log in primeira['logs']] == ['C', 'B']
+        assert [log['operacao'][-1] for log in segunda['logs']] == ['A']
+        assert segunda['next_cursor'] is None
+
+        por_ip = listar_logs_pagina({'ip_local': '10.0.0.1', 'operacao': 'criado'})
+        assert [log['operacao'][-1] for log in por_ip['logs']] == ['D', 'B', 'A']
+
+    def test_operacao_com_curinga_literal(self, app):
+        """Testa que % e _ no filtro de operação são tratados como texto"""
+        _inserir_logs([
+            (None, '', 'Sistema', 'Cota 100% atingida', '', '2024-01-01 00:00:00'),
+            (None, '', 'Sistema', 'Cota 1000 atingida', '', '2024-01-01 00:00:00')
+        ])
+
+        logs = listar_logs_pagina({'operacao': '100%'})['logs']
+
+        assert [log['operacao'] for log in logs] == ['Cota 100% atingida']
+
+    def test_detalhes_limitados(self, app):
+        """Testa corte dos detalhes na listagem e texto completo em obter_log"""
+        detalhes = 'x' * (TAMANHO_DETALHES_LISTAGEM + 50)
+        _inserir_logs([(None, '', 'Pacientes', 'Importação em lote', detalhes, '2024-01-01 00:00:00')])
+
+        log = listar_logs_pagina()['logs'][0]
+
+        assert len(log['detalhes']) == TAMANHO_DETALHES_LISTAGEM
+        assert log['detalhes_truncados'] is True
+        assert obter_log(log['id'])['detalhes'] == detalhes
+
+    def test_varredura_limitada(self, app, monkeypatch):
+        """Testa filtro residual raro: página vazia com cursor até encontrar o log"""
+        monkeypatch.setattr('src.services.logs.VARREDURA_MAXIMA', 3)
+        _inserir_logs(
+            [(None, '10.0.0.9', 'Auth', 'Login', '', '2024-01-01 00:00:00')]
+            + [(None, '10.0.0.1', 'Auth', 'Login', '', f'2024-01-0{dia} 00:00:00') for dia in range(2, 9)]
+        )
+
+        paginas = []
+        cursor = None
+        while True:
+            pagina = listar_logs_pagina({'ip_local': '10.0.0.9'}, limite=5, cursor=cursor)
+            paginas.append(len(pagina['logs']))
+            cursor = pagina['next_cursor']
+            if cursor is None:
+                break
+
+        assert paginas == [0, 0, 1]
+
+    def test_todas_combinacoes_usam_indice(self, app):
+        """Testa que nenhuma combinação de filtros varre logs ou ordena em memória"""
+        assert verificar_indices_logs() == []
+
+
+class TestApiLogs:
+    """Testes do endpoint /api/logs"""
+
+    def test_listar_e_detalhar(self, auth_client):
+        """Testa listagem filtrada e detalhe de um log"""
+        _inserir_logs([(None, '10.0.0.9', 'Backup', 'Backup manual', '{"ok": true}', '2024-01-01 00:00:00')])
+
+        resposta = auth_client.get('/api/logs?modulo=Backup&limite=10')
+        dados = resposta.get_json()
+
+        assert resposta.status_code == 200
+        assert [log['operacao'] for log in dados['logs']] == ['Backup manual']
+
+        detalhe = auth_client.get(f"/api/logs/{dados['logs'][0]['id']}").get_json()
+        assert detalhe['log']['detalhes'] == '{"ok": true}'
+        assert auth_client.get('/api/logs/999999').status_code == 404
+
+    def test_validacao(self, auth_client):
+        """Testa limite máximo, cursor inválido e período invertido"""
+        assert auth_client.get('/api/logs?limite=1000').status_code == 400
+        assert auth_client.get('/api/logs?cursor=invalido').status_code == 400
+        assert auth_client.get('/api/logs?data_inicio=2024-02-01&data_fim=2024-01-01').status_code == 400
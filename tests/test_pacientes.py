@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Testes da Busca de Pacientes
+Testa o índice textual (FTS5), as sugestões e a listagem paginada
+"""
+
+from src.core.database import cadastrar_paciente, get_db_escrita, inicializar_db
+from src.services.pacientes import sugerir_pacientes, listar_pacientes
+
+
+def _nomes(pacientes):
+    """Nomes dos pacientes retornados"""
+    return [paciente['nome_completo'] for paciente in pacientes]
+
+
+class TestSugestoesPacientes:
+    """Testes das sugestões por FTS5"""
+
+    def test_busca_parcial_sem_acentos(self, app):
+        """Testa busca por prefixos sem acentos"""
+        cadastrar_paciente('João da Conceição', '111111111', 'Cabo', '1º Batalhão')
+        cadastrar_paciente('Maria Souza', '222222222', 'Soldado', 'Hospital Geral')
+
+        assert _nomes(sugerir_pacientes('joao conc')) == ['João da Conceição']
+        assert _nomes(sugerir_pacientes('HOSP')) == ['Maria Souza']
+        assert _nomes(sugerir_pacientes('2222')) == ['Maria Souza']
+        assert sugerir_pacientes('j') == []
+
+    def test_indice_sincronizado(self, app):
+        """Testa se alterações e exclusões refletem no índice"""
+        paciente_id = cadastrar_paciente('Carlos Pereira', '333333333')
+
+        with get_db_escrita() as conn:
+            conn.execute("UPDATE pacientes SET nome_completo = 'Carlos Almeida' WHERE id = ?", (paciente_id,))
+            conn.commit()
+
+        assert sugerir_pacientes('pereira') == []
+        assert _nomes(sugerir_pacientes('almeida')) == ['Carlos Almeida']
+
+        with get_db_escrita() as conn:
+            conn.execute("DELETE FROM pacientes WHERE id = ?", (paciente_id,))
+            conn.commit()
+
+        assert sugerir_pacientes('almeida') == []
+
+    def test_inativos_ignorados(self, app):
+        """Testa se pacientes inativos não são sugeridos"""
+        paciente_id = cadastrar_paciente('Ana Lima', '444444444')
+
+        with get_db_escrita() as conn:
+            conn.execute("UPDATE pacientes SET ativo = 0 WHERE id = ?", (paciente_id,))
+            conn.commit()
+
+        assert sugerir_pacientes('ana lima') == []
+
+    def test_indice_reconstruido_na_inicializacao(self, app):
+        """Testa se pacientes anteriores ao índice textual passam a ser encontrados"""
+        with get_db_escrita() as conn:
+            for evento in ('insert', 'update', 'delete'):
+                conn.execute(f"DROP TRIGGER trg_pacientes_fts_{evento}")
+            conn.execute("DROP TABLE pacientes_fts")
+            conn.execute("INSERT INTO pacientes (nome_completo, prec_cp) VALUES ('Paulo Gomes', '555555555')")
+            conn.commit()
+
+        inicializar_db(forcar=True)
+
+        assert _nomes(sugerir_pacientes('gomes')) == ['Paulo Gomes']
+
+
+class TestListagemPacientes:
+    """Testes da listagem paginada"""
+
+    def test_paginas_em_ordem_alfabetica(self, app):
+        """Testa ordem alfabética e continuidade entre páginas"""
+        for i, nome in enumerate(['Bruno', 'Ana', 'Carla', 'Ana']):
+            cadastrar_paciente(nome, f'60000000{i}')
+
+        primeira = listar_pacientes(3)
+        segunda = listar_pacientes(3, primeira['next_cursor'])
+
+        assert _nomes(primeira['pacientes']) == ['Ana', 'Ana', 'Bruno']
+        assert _nomes(segunda['pacientes']) == ['Carla']
+        assert segunda['next_cursor'] is None
+
+    def test_listagem_filtrada(self, app):
+        """Testa filtro textual na listagem"""
+        cadastrar_paciente('Pedro Costa', '700000001', om='Base Aérea')
+        cadastrar_paciente('Lucas Rocha', '700000002', om='Hospital Geral')
+
+        assert _nomes(listar_pacientes(10, busca='aerea')['pacientes']) == ['Pedro Costa']
+
+
+class TestApiPacientes:
+    """Testes dos endpoints de busca de pacientes"""
+
+    def test_sugestoes(self, auth_client):
+        """Testa o endpoint de sugestões"""
+        cadastrar_paciente('José Ribeiro', '800000001')
+
+        resposta = auth_client.get('/api/pacientes/sugestoes?q=jose rib')
+        dados = resposta.get_json()
+
+        assert resposta.status_code == 200
+        assert _nomes(dados['pacientes']) == ['José Ribeiro']
+
+    def test_listar_cursor_invalido(self, auth_client):
+        """Testa rejeição de cursor inválido"""
+        resposta = auth_client.get('/api/pacientes/listar?cursor=invalido')
+        assert resposta.status_code == 400
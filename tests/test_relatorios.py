@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Testes dos Relatórios de Documentos
+Testa a manutenção dos resumos por triggers, o backfill e a divisão do
+período entre os resumos mensal e diário
+"""
+
+from datetime import date
+
+from src.core.database import get_db_escrita, backfill_resumos_documentos
+from src.services.relatorios import relatorio_documentos, _segmentos
+
+
+def _resumos():
+    """Conteúdo atual das duas tabelas de resumo (sem linhas zeradas)"""
+    with get_db_escrita() as conn:
+        return {
+            tabela: sorted(
+                tuple(linha) for linha in conn.execute(f"SELECT * FROM {tabela} WHERE total <> 0")
+            )
+            for tabela in ('resumo_documentos_diario', 'resumo_documentos_mensal')
+        }
+
+
+class TestResumosDocumentos:
+    """Testes dos resumos mantidos por triggers"""
+
+    def test_emissao_auditoria_e_exclusao(self, emitir_teste):
+        """Testa se emissão, mudança de status e exclusão atualizam os resumos"""
+        primeiro = emitir_teste('Guia de Exame', data_emissao='2024-03-10 09:00:00')
+        emitir_teste('Guia de Exame', data_emissao='2024-03-20 09:00:00')
+        terceiro = emitir_teste('Declaração', data_emissao='2024-04-02 09:00:00')
+
+        with get_db_escrita() as conn:
+            conn.execute("UPDATE documentos SET status = 'Aprovado' WHERE codigo_unico = ?", (primeiro,))
+            conn.execute("DELETE FROM documentos WHERE codigo_unico = ?", (terceiro,))
+            conn.commit()
+
+        assert relatorio_documentos(['tipo_documento']) == [
+            {'tipo_documento': 'Guia de Exame', 'total': 2}
+        ]
+        assert relatorio_documentos(['mes', 'status']) == [
+            {'mes': '2024-03', 'status': 'Aprovado', 'total': 1},
+            {'mes': '2024-03', 'status': 'Emitido', 'total': 1}
+        ]
+
+    def test_nomes_e_valores_nulos(self, dados_documento, emitir_teste):
+        """Testa nome do setor resolvido e setor de destino não informado (id 0)"""
+        emitir_teste()
+        emitir_teste(setor_destino_id=None)
+
+        linhas = relatorio_documentos(['setor_destino'])
+
+        assert [(linha['setor_destino'], linha['total']) for linha in linhas] == [
+            (0, 1), (dados_documento['setor_destino_id'], 1)
+        ]
+        assert linhas[0]['setor_destino_nome'] is None
+        assert linhas[1]['setor_destino_nome']
+
+    def test_backfill_igual_aos_triggers(self, emitir_teste):
+        """Testa se o backfill reconstrói exatamente os resumos mantidos por triggers"""
+        emitir_teste('Guia de Exame', data_emissao='2023-12-31 23:00:00')
+        emitir_teste('Declaração', data_emissao='2024-01-01 08:00:00')
+        emitir_teste('Guia de Internação')
+
+        mantidos = _resumos()
+
+        with get_db_escrita() as conn:
+            conn.execute("UPDATE resumo_documentos_mensal SET total = 99")
+            conn.execute("DELETE FROM resumo_documentos_diario")
+            conn.commit()
+
+        assert backfill_resumos_documentos() >= 2
+        assert _resumos() == mantidos
+
+
+class TestPeriodoRelatorio:
+    """Testes da divisão do período entre os resumos"""
+
+    def test_segmentos_com_bordas_parciais(self):
+        """Testa meses inteiros no mensal e frações de mês no diário"""
+        assert _segmentos(date(2023, 3, 15), date(2024, 11, 20)) == [
+            ('resumo_documentos_mensal', 'mes', '2023-04', '2024-11'),
+            ('resumo_documentos_diario', 'dia', '2023-03-15', '2023-04-01'),
+            ('resumo_documentos_diario', 'dia', '2024-11-01', '2024-11-21')
+        ]
+        assert _segmentos(date(2024, 1, 1), date(2024, 12, 31)) == [
+            ('resumo_documentos_mensal', 'mes', '2024-01', '2025-01')
+        ]
+        assert _segmentos(date(2024, 5, 3), date(2024, 5, 20)) == [
+            ('resumo_documentos_diario', 'dia', '2024-05-03', '2024-05-21')
+        ]
+
+    def test_relatorio_respeita_periodo(self, emitir_teste):
+        """Testa se documentos fora do período (nas bordas) não são somados"""
+        for data_emissao in ('2024-01-31 10:00:00', '2024-02-01 10:00:00',
+                             '2024-03-15 10:00:00', '2024-03-16 10:00:00'):
+            emitir_teste(data_emissao=data_emissao)
+
+        linhas = relatorio_documentos(['mes'], date(2024, 2, 1), date(2024, 3, 15))
+
+        assert linhas == [
+            {'mes': '2024-02', 'total': 1},
+            {'mes': '2024-03', 'total': 1}
+        ]
+
+
+class TestApiRelatorios:
+    """Testes do endpoint /api/relatorios/documentos"""
+
+    def test_relatorio_por_tipo(self, auth_client, emitir_teste):
+        """Testa relatório pela API"""
+        emitir_teste('Guia de Exame')
+
+        dados = auth_client.get('/api/relatorios/documentos?agrupar=tipo_documento').get_json()
+
+        assert dados['sucesso'] is True
+        assert dados['linhas'] == [{'tipo_documento': 'Guia de Exame', 'total': 1}]
+
+    def test_agrupamento_invalido(self, auth_client):
+        """Testa rejeição de agrupamentos e períodos inválidos"""
+        assert auth_client.get('/api/relatorios/documentos?agrupar=paciente').status_code == 400
+        assert auth_client.get('/api/relatorios/documentos?agrupar=status,tipo_documento').status_code == 400
+        assert auth_client.get(
+            '/api/relatorios/documentos?agrupar=mes&data_inicio=2024-02-01&data_fim=2024-01-01'
+        ).status_code == 400
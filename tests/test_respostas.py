@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Testes das Respostas da API
+Testa a serialização JSON em streaming, o GET condicional (ETag por versão
+das tabelas em versoes_tabelas) e o envio dos PDFs de template (Range e ETag)
+"""
+
+import hashlib
+
+from src.core.database import (
+    get_db_escrita, cadastrar_profissional, obter_versoes_tabelas, avancar_versoes_tabelas,
+    emitir_documento
+)
+
+
+def _inserir_template(nome, mapeamento, caminho='/inexistente.pdf'):
+    """Insere um template (sem hash_arquivo, como os cadastrados antes dele)"""
+    with get_db_escrita() as conn:
+        cursor = conn.execute(
+            "INSERT INTO templates_pdf (nome, caminho_arquivo, mapeamento_campos) VALUES (?, ?, ?)",
+            (nome, caminho, mapeamento)
+        )
+        conn.commit()
+        return cursor.lastrowid
+
+
+class TestStreaming:
+    """Testes das listagens em streaming"""
+
+    def test_documentos_em_streaming(self, auth_client, dados_documento):
+        """Testa resposta em streaming com next_cursor após a lista"""
+        for _ in range(3):
+            emitir_documento('Declaração', conteudo_json={}, **dados_documento)
+
+        resposta = auth_client.get('/api/documentos/buscar?limite=2&tipo_documento=Declaração')
+        dados = resposta.get_json()
+
+        assert 'Content-Length' not in resposta.headers  # Enviada em pedaços
+        assert resposta.mimetype == 'application/json'
+        assert dados['sucesso'] is True
+        assert len(dados['documentos']) == 2
+        assert dados['next_cursor']
+
+    def test_templates(self, auth_client):
+        """Testa a listagem de templates com a contagem de campos feita no SQL"""
+        _inserir_template('Guia', '[{"nome": "a"}, {"nome": "b"}]')
+        _inserir_template('Vazio', None)
+
+        templates = auth_client.get('/api/pdf-templates').get_json()['templates']
+
+        assert {t['nome']: t['num_campos'] for t in templates} == {'Guia': 2, 'Vazio': 0}
+        assert templates[0]['ativo'] is True
+        assert templates[0]['file_size'] == 0
+
+
+class TestGetCondicional:
+    """Testes do ETag e das respostas 304"""
+
+    def test_304_sem_executar_consulta(self, auth_client, monkeypatch):
+        """Testa revalidação com If-None-Match: 304 sem corpo e sem consultar a listagem"""
+        primeira = auth_client.get('/api/setores/listar')
+        etag = primeira.headers['ETag']
+
+        assert primeira.status_code == 200
+        assert etag.startswith('W/')
+        assert primeira.headers['Cache-Control'] == 'private, no-cache'
+
+        def falhar():
+            raise AssertionError('listagem consultada')
+
+        monkeypatch.setattr('app.iterar_setores', falhar)
+        resposta = auth_client.get('/api/setores/listar', headers={'If-None-Match': etag})
+
+        assert resposta.status_code == 304
+        assert resposta.data == b''
+        assert resposta.headers['ETag'] == etag
+
+    def test_etag_muda_com_os_dados(self, auth_client, dados_documento):
+        """Testa novo ETag após alteração em qualquer tabela da listagem"""
+        etag = auth_client.get('/api/profissionais/listar').headers['ETag']
+
+        cadastrar_profissional('Enf. Maria', 'Enfermeira', 'COREN-BA 1')
+        resposta = auth_client.get('/api/profissionais/listar', headers={'If-None-Match': etag})
+
+        assert resposta.status_code == 200
+        assert resposta.headers['ETag'] != etag
+        assert len(resposta.get_json()['profissionais']) == 2
+
+        with get_db_escrita() as conn:
+            conn.execute("UPDATE setores SET nome = 'UPAT 2' WHERE id = ?", (dados_documento['setor_origem_id'],))
+            conn.commit()
+
+        etag = resposta.headers['ETag']
+        assert auth_client.get('/api/profissionais/listar', headers={'If-None-Match': etag}).status_code == 200
+
+    def test_versoes_avancam_apos_restauracao(self, app):
+        """Testa que versões restauradas ficam acima das anteriores"""
+        antes = obter_versoes_tabelas(['setores', 'profissionais'])
+
+        with get_db_escrita() as conn:
+            conn.execute("UPDATE versoes_tabelas SET versao = 0")
+            conn.commit()
+        avancar_versoes_tabelas(antes)
+
+        depois = obter_versoes_tabelas(['setores', 'profissionais'])
+        assert all(depois[tabela] > antes[tabela] for tabela in antes)
+
+
+class TestArquivoTemplate:
+    """Testes do envio do PDF de template"""
+
+    def _template(self, tmp_path):
+        """Template com um arquivo de 1000 bytes; retorna (id, conteúdo)"""
+        conteudo = b'%PDF-1.4\n' + bytes(range(256)) * 3 + b'x' * 223
+        caminho = tmp_path / 'template.pdf'
+        caminho.write_bytes(conteudo)
+        return _inserir_template('Guia', '[]', str(caminho)), conteudo
+
+    def test_arquivo_com_etag_do_hash(self, auth_client, tmp_path):
+        """Testa envio completo com ETag forte (SHA-256 gravado no primeiro acesso)"""
+        template_id, conteudo = self._template(tmp_path)
+
+        resposta = auth_client.get(f'/api/pdf-templates/{template_id}/pdf')
+
+        assert resposta.status_code == 200
+        assert resposta.data == conteudo
+        assert resposta.headers['ETag'] == f'"{hashlib.sha256(conteudo).hexdigest()}"'
+        assert resposta.headers['Accept-Ranges'] == 'bytes'
+        assert 'Last-Modified' in resposta.headers
+
+        with get_db_escrita() as conn:
+            gravado = conn.execute(
+                "SELECT hash_arquivo FROM templates_pdf WHERE id = ?", (template_id,)
+            ).fetchone()[0]
+        assert gravado == hashlib.sha256(conteudo).hexdigest()
+
+    def test_range_e_304(self, auth_client, tmp_path):
+        """Testa leitura parcial (206) e revalidação pelo ETag (304)"""
+        template_id, conteudo = self._template(tmp_path)
+        url = f'/api/pdf-templates/{template_id}/pdf'
+
+        parcial = auth_client.get(url, headers={'Range': 'bytes=100-199'})
+
+        assert parcial.status_code == 206
+        assert parcial.data == conteudo[100:200]
+        assert parcial.headers['Content-Range'] == f'bytes 100-199/{len(conteudo)}'
+
+        etag = parcial.headers['ETag']
+        assert auth_client.get(url, headers={'If-None-Match': etag}).status_code == 304
+        assert auth_client.get(url, headers={'Range': 'bytes=5000-'}).status_code == 416
+
+    def test_arquivo_ausente(self, auth_client):
+        """Testa 404 para template sem arquivo e para template inexistente"""
+        template_id = _inserir_template('Sem arquivo', '[]')
+
+        assert auth_client.get(f'/api/pdf-templates/{template_id}/pdf').status_code == 404
+        assert auth_client.get('/api/pdf-templates/999999/pdf').status_code == 404
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Testes da Retenção dos Logs de Auditoria
+Testa o limite de retenção, o arquivamento em lotes, a compactação mensal e
+a consulta dos arquivos via ATTACH
+"""
+
+import gzip
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from src.config import LOGS
+from src.core.database import get_db_escrita
+from src.core.retencao_logs import (
+    limite_retencao, arquivar_logs, listar_arquivos_logs, consultar_logs_arquivados
+)
+
+
+@pytest.fixture
+def pasta_arquivo(app, tmp_path, monkeypatch):
+    """Direciona os arquivos mensais para uma pasta temporária"""
+    monkeypatch.setitem(LOGS, 'arquivamento_dir', str(tmp_path))
+    return tmp_path
+
+
+def _inserir_logs(datas):
+    """Insere um log por data_hora informada"""
+    with get_db_escrita() as conn:
+        conn.executemany(
+            "INSERT INTO logs (usuario_nome, modulo, operacao, data_hora) VALUES ('Teste', 'Teste', ?, ?)",
+            [(f'Operação {i}', data) for i, data in enumerate(datas)]
+        )
+        conn.commit()
+
+
+def _total_logs():
+    """Quantidade de linhas na tabela logs"""
+    with get_db_escrita() as conn:
+        return conn.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+
+
+class TestLimiteRetencao:
+    """Testes do cálculo do limite"""
+
+    def test_primeiro_dia_do_mes(self):
+        """Testa limite no início do mês, atravessando o ano"""
+        agora = datetime(2025, 3, 15, 10, 30, tzinfo=timezone.utc)
+
+        assert limite_retencao(12, agora) == '2024-03-01 00:00:00'
+        assert limite_retencao(3, agora) == '2024-12-01 00:00:00'
+        assert limite_retencao(0, agora) == '2025-03-01 00:00:00'
+
+
+class TestArquivamento:
+    """Testes do arquivamento dos logs expirados"""
+
+    def test_lotes_meses_e_compactacao(self, pasta_arquivo):
+        """Testa que apenas expirados saem da tabela, separados por mês e compactados"""
+        _inserir_logs(
+            ['2020-01-05 10:00:00'] * 3 + ['2020-02-10 08:00:00'] * 2 + ['2999-01-01 00:00:00']
+        )
+
+        resultado = arquivar_logs(retencao_meses=12, lote=2, pausa=0)
+
+        assert resultado['arquivados'] == 5
+        assert resultado['lotes'] == 3
+        assert resultado['meses'] == ['2020-01', '2020-02']
+        assert _total_logs() == 1
+        assert sorted(os.listdir(pasta_arquivo)) == ['logs_2020-01.db.gz', 'logs_2020-02.db.gz']
+
+        with gzip.open(pasta_arquivo / 'logs_2020-01.db.gz') as arquivo:
+            assert arquivo.read(16) == b'SQLite format 3\x00'
+
+    def test_mes_compactado_recebe_novas_linhas(self, pasta_arquivo):
+        """Testa reabertura de um mês já compactado sem duplicar linhas"""
+        _inserir_logs(['2020-01-05 10:00:00'])
+        arquivar_logs(retencao_meses=12, pausa=0)
+        _inserir_logs(['2020-01-20 10:00:00'])
+
+        assert arquivar_logs(retencao_meses=12, pausa=0)['arquivados'] == 1
+        assert [arquivo['mes'] for arquivo in listar_arquivos_logs()] == ['2020-01']
+
+        with consultar_logs_arquivados() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM arquivo_2020_01.logs").fetchone()[0] == 2
+
+    def test_interrupcao_repete_lote_sem_duplicar(self, pasta_arquivo, monkeypatch):
+        """Testa falha na exclusão após gravar o arquivo: a próxima execução conclui"""
+        _inserir_logs(['2020-01-05 10:00:00'] * 3)
+
+        def falhar(*args, **kwargs):
+            raise sqlite3.OperationalError('database is locked')
+
+        with monkeypatch.context() as patch:
+            patch.setattr('src.core.retencao_logs.iniciar_transacao_escrita', falhar)
+            with pytest.raises(sqlite3.OperationalError):
+                arquivar_logs(retencao_meses=12, pausa=0)
+
+        assert _total_logs() == 3
+        assert arquivar_logs(retencao_meses=12, pausa=0)['arquivados'] == 3
+
+        with consultar_logs_arquivados() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM arquivo_2020_01.logs").fetchone()[0] == 3
+
+
+class TestConsultaArquivos:
+    """Testes da consulta dos arquivos via ATTACH"""
+
+    def test_logs_historico(self, pasta_arquivo):
+        """Testa a view que une a tabela atual e os meses do período"""
+        _inserir_logs(['2020-01-05 10:00:00', '2020-02-10 08:00:00', '2020-03-01 00:00:00'])
+        arquivar_logs(retencao_meses=12, pausa=0)
+        _inserir_logs(['2999-01-01 00:00:00'])
+
+        with consultar_logs_arquivados('2020-02') as conn:
+            datas = [linha['data_hora'] for linha in conn.execute(
+                "SELECT data_hora FROM logs_historico ORDER BY data_hora"
+            )]
+
+        assert datas == ['2020-02-10 08:00:00', '2020-03-01 00:00:00', '2999-01-01 00:00:00']
@@ -6,9 +6,12 @@ Testa schemas Marshmallow
 
 import pytest
 from marshmallow import ValidationError
+from src.config import TIPOS_DOCUMENTOS
 from src.schemas import (
     LoginSchema, PacienteSchema, ProfissionalSchema,
-    SetupSchema, DocumentoSchema
+    SetupSchema, DocumentoSchema, BuscaDocumentosSchema, ExportarDocumentosSchema,
+    RelatorioDocumentosSchema, ExportarLogsSchema, BuscaLogsSchema,
+    FilaAuditoriaSchema, ReservaAuditoriaSchema
 )
 
 
@@ -136,3 +139,27 @@ class TestDocumentoSchema:
                 'setor_origem_id': 1,
                 'conteudo': {}
             })
+
+
+class TestFiltrosCompartilhados:
+    """Testes das regras comuns aos schemas de filtros"""
+
+    @pytest.mark.parametrize('schema', [
+        BuscaDocumentosSchema, ExportarDocumentosSchema, RelatorioDocumentosSchema,
+        ExportarLogsSchema, BuscaLogsSchema
+    ])
+    def test_periodo_invertido(self, schema):
+        """Testa recusa de data inicial posterior à final em todos os filtros por período"""
+        dados = {'data_inicio': '2024-02-01', 'data_fim': '2024-01-01'}
+        if schema is RelatorioDocumentosSchema:
+            dados['agrupar'] = 'mes'
+
+        with pytest.raises(ValidationError) as erro:
+            schema().load(dados)
+        assert 'data_inicio' in erro.value.messages
+
+    @pytest.mark.parametrize('schema', [BuscaDocumentosSchema, FilaAuditoriaSchema, ReservaAuditoriaSchema])
+    def test_tipos_documentos_da_configuracao(self, schema):
+        """Testa que os filtros aceitam todos os tipos de TIPOS_DOCUMENTOS"""
+        for tipo in TIPOS_DOCUMENTOS:
+            assert schema().load({'tipo_documento': tipo})['tipo_documento'] == tipo
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Testes do Servidor de Produção Multiprocesso
+Testa o pool limitado de threads e a reciclagem do worker, e o mestre
+(em subprocesso): workers pré-forkados, max_requests, recarga com SIGHUP
+(inclusive de módulos que o mestre já importou) e parada graciosa com SIGTERM
+"""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core.servidor import ServidorWorker
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Mestre com uma aplicação mínima que responde o PID do worker
+SCRIPT_MESTRE = """
+import os, sys
+sys.path.insert(0, {raiz!r})
+from src.core.servidor import ServidorPrefork
+
+def aplicacao(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [str(os.getpid()).encode()]
+
+servidor = ServidorPrefork('127.0.0.1', 0, workers=2, threads=2, max_requests=5,
+                           timeout_graceful=5, carregar_app=lambda: aplicacao, finalizar_app=None)
+servidor.abrir_socket()
+print(servidor.porta, flush=True)
+sys.exit(servidor.executar())
+"""
+
+# Mestre que importa o helper antes do fork, como o CLI faz com src.*; os
+# workers devem ler do disco o helper e a aplicação alterados na recarga
+SCRIPT_MESTRE_RECARGA = """
+import os, sys
+sys.path[:0] = [{raiz!r}, {projeto!r}]
+import helpers_teste
+from src.core.servidor import ServidorPrefork
+
+def carregar():
+    from aplicacao_teste import aplicacao
+    return aplicacao
+
+servidor = ServidorPrefork('127.0.0.1', 0, workers=2, threads=2, timeout_graceful=5,
+                           carregar_app=carregar, finalizar_app=None,
+                           modulos_aplicacao=('aplicacao_teste', 'helpers_teste'))
+servidor.abrir_socket()
+print(servidor.porta, flush=True)
+sys.exit(servidor.executar())
+"""
+
+APLICACAO_V1 = """
+import helpers_teste
+
+def aplicacao(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [helpers_teste.VERSAO.encode()]
+"""
+
+# Versão nova: a aplicação importa um helper que só existe na versão nova
+APLICACAO_V2 = """
+from helpers_teste import rotulo
+
+def aplicacao(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [rotulo().encode()]
+"""
+
+
+def _get(porta, caminho='/'):
+    """GET sem keep-alive, retornando o corpo como texto"""
+    requisicao = urllib.request.Request(f'http://127.0.0.1:{porta}{caminho}', headers={'Connection': 'close'})
+    with urllib.request.urlopen(requisicao, timeout=5) as resposta:
+        return resposta.read().decode()
+
+
+class TestServidorWorker:
+    """Testes do ServidorWorker (no próprio processo)"""
+
+    def test_threads_limitadas_e_reciclagem(self):
+        """Testa no máximo `threads` requisições simultâneas e o sinal de reciclagem"""
+        ativas = []
+        maximo = []
+        lock = threading.Lock()
+
+        def aplicacao(environ, start_response):
+            with lock:
+                ativas.append(1)
+                maximo.append(len(ativas))
+            time.sleep(0.1)
+            with lock:
+                ativas.pop()
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            return [b'ok']
+
+        sock = socket.create_server(('127.0.0.1', 0))
+        porta = sock.getsockname()[1]
+        servidor = ServidorWorker(aplicacao, '127.0.0.1', porta, sock.fileno(), threads=2, max_requests=6)
+        aceite = threading.Thread(target=servidor.serve_forever, daemon=True)
+        aceite.start()
+
+        try:
+            with ThreadPoolExecutor(6) as clientes:
+                respostas = list(clientes.map(lambda _: _get(porta), range(6)))
+
+            assert respostas == ['ok'] * 6
+            assert max(maximo) == 2
+            assert servidor.encerrando.wait(2)
+            aceite.join(2)
+            assert not aceite.is_alive()
+        finally:
+            servidor.encerrando.set()
+            servidor.encerrar()
+            sock.close()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='Requer fork')
+class TestServidorPrefork:
+    """Testes do mestre em um subprocesso"""
+
+    def test_reciclagem_recarga_e_parada(self):
+        """Testa workers reciclados após max_requests, substituídos no SIGHUP e parada com código 0"""
+        mestre = subprocess.Popen(
+            [sys.executable, '-c', SCRIPT_MESTRE.format(raiz=RAIZ)],
+            stdout=subprocess.PIPE, text=True
+        )
+        try:
+            porta = int(mestre.stdout.readline())
+
+            pids = {_get(porta) for _ in range(30)}
+            # 2 workers com 5 requisições cada: 30 requisições exigem reciclagens
+            assert len(pids) >= 4
+
+            mestre.send_signal(signal.SIGHUP)
+            time.sleep(1)
+            depois = {_get(porta) for _ in range(4)}
+            assert not depois & pids
+
+            mestre.send_signal(signal.SIGTERM)
+            assert mestre.wait(10) == 0
+        finally:
+            if mestre.poll() is None:
+                mestre.kill()
+            mestre.stdout.close()
+
+    def test_recarga_reimporta_modulos_do_mestre(self, tmp_path):
+        """Testa que a recarga usa o helper alterado em disco, mesmo já importado pelo mestre"""
+        (tmp_path / 'helpers_teste.py').write_text("VERSAO = 'v1'\n")
+        (tmp_path / 'aplicacao_teste.py').write_text(APLICACAO_V1)
+        mestre = subprocess.Popen(
+            [sys.executable, '-B', '-c', SCRIPT_MESTRE_RECARGA.format(raiz=RAIZ, projeto=str(tmp_path))],
+            stdout=subprocess.PIPE, text=True
+        )
+        try:
+            porta = int(mestre.stdout.readline())
+            assert _get(porta) == 'v1'
+
+            (tmp_path / 'helpers_teste.py').write_text("VERSAO = 'v1'\n\ndef rotulo():\n    return 'v2'\n")
+            (tmp_path / 'aplicacao_teste.py').write_text(APLICACAO_V2)
+            mestre.send_signal(signal.SIGHUP)
+            time.sleep(1)
+
+            assert {_get(porta) for _ in range(4)} == {'v2'}
+
+            mestre.send_signal(signal.SIGTERM)
+            assert mestre.wait(10) == 0
+        finally:
+            if mestre.poll() is None:
+                mestre.kill()
+            mestre.stdout.close()
@@ -4,10 +4,13 @@ Testes de Utilitários
 Testa funções utilitárias do sistema
 """
 
+import json
+
 import pytest
 from src.utils.helpers import (
     find_free_port, validate_prec_cp, sanitize_filename,
-    generate_secret_key, generate_salt
+    generate_secret_key, generate_salt, codificar_cursor, decodificar_cursor,
+    montar_consulta_fts, gerar_json_stream
 )
 
 
@@ -99,3 +102,73 @@ class TestKeyGeneration:
         salt1 = generate_salt(32)
         salt2 = generate_salt(32)
         assert salt1 != salt2
+
+
+class TestCursorPaginacao:
+    """Testes do cursor opaco de paginação"""
+
+    def test_ida_e_volta(self):
+        """Testa se o cursor preserva os valores da chave"""
+        cursor = codificar_cursor(['2024-05-01 10:00:00', 42])
+        assert '=' not in cursor
+        assert decodificar_cursor(cursor, 2) == ['2024-05-01 10:00:00', 42]
+
+    def test_cursor_invalido(self):
+        """Testa se cursores adulterados são rejeitados"""
+        with pytest.raises(ValueError):
+            decodificar_cursor('não é base64!', 2)
+        with pytest.raises(ValueError):
+            decodificar_cursor(codificar_cursor([1, 2, 3]), 2)
+
+    @pytest.mark.parametrize('valores', [[{}, 1], ['2024-05-01', None], ['2024-05-01', 1.5], [True, 1]])
+    def test_cursor_tipos_invalidos(self, valores):
+        """Testa se cursores com valores que não são texto ou inteiro são rejeitados"""
+        with pytest.raises(ValueError):
+            decodificar_cursor(codificar_cursor(valores), 2)
+
+
+class TestConsultaFts:
+    """Testes da montagem de consultas FTS5"""
+
+    def test_termos_com_prefixo(self):
+        """Testa se cada palavra vira um termo de prefixo"""
+        assert montar_consulta_fts('João  sil') == '"João"* "sil"*'
+
+    def test_sintaxe_fts_descartada(self):
+        """Testa se aspas e operadores digitados não chegam ao MATCH como sintaxe"""
+        assert montar_consulta_fts('"a* NEAR(b') == '"a"* "NEAR"* "b"*'
+
+    def test_texto_vazio(self):
+        """Testa textos sem termos válidos"""
+        assert montar_consulta_fts('  -- ') is None
+        assert montar_consulta_fts('a b', tamanho_minimo=2) is None
+
+
+class TestJsonStream:
+    """Testes da serialização JSON em pedaços"""
+
+    def test_listas_em_pedacos(self):
+        """Testa arrays a partir de geradores, em pedaços de `lote` elementos"""
+        pedacos = list(gerar_json_stream(
+            {'sucesso': True, 'itens': ({'n': n, 'nome': 'João'} for n in range(5)), 'vazia': iter([])},
+            lote=2
+        ))
+
+        assert len(pedacos) == 6
+        assert json.loads(''.join(pedacos)) == {
+            'sucesso': True,
+            'itens': [{'n': n, 'nome': 'João'} for n in range(5)],
+            'vazia': []
+        }
+
+    def test_valor_avaliado_apos_a_lista(self):
+        """Testa que funções são chamadas depois de consumir os campos anteriores"""
+        estado = {'proximo': None}
+
+        def itens():
+            yield 1
+            estado['proximo'] = 'cursor'
+
+        texto = ''.join(gerar_json_stream({'itens': itens(), 'next_cursor': lambda: estado['proximo']}))
+
+        assert json.loads(texto) == {'itens': [1], 'next_cursor': 'cursor'}